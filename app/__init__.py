@@ -3,18 +3,23 @@
 
 
 from flask_login import LoginManager, logout_user
-from flask import Flask, flash, redirect, url_for, render_template, request
+from flask import Flask, flash, redirect, url_for, render_template, request, jsonify, make_response
 from flask_wtf.csrf import CSRFProtect
-from config import SECRET_KEY, SCHEDULER_HOUR, SCHEDULER_MINUTE, BOOTSTRAP_CSS_URL, BOOTSTRAP_JS_URL, FONT_AWESOME_CSS_URL, CHART_JS_URL, CHART_JS_DATALABELS_URL, API_TIMEOUT_SECONDS, UI_TIMEOUT_MS, UI_UPDATE_DELAY_MS, YAHOO_FINANCE_BASE_URL, YAHOO_FINANCE_QUOTE_URL, YAHOO_FINANCE_LOOKUP_URL, PORTFOLIO_NAME_MAX_LENGTH, PORTFOLIO_DESCRIPTION_MAX_LENGTH, BOND_SYMBOL_MAX_LENGTH, BOND_WEBSITE_MAX_LENGTH, BOND_COUNTRY_MAX_LENGTH, BOND_INDUSTRY_MAX_LENGTH, EXCHANGE_NAME_MAX_LENGTH, CURRENCY_NAME_MAX_LENGTH, CURRENCY_CODE_MAX_LENGTH, CURRENCY_SYMBOL_MAX_LENGTH
-from app.database.connection.pool import init_db_pool
+from config import SECRET_KEY, SCHEDULER_HOUR, SCHEDULER_MINUTE, SCHEDULER_LEASE_RENEW_SECONDS, BACKFILL_ENABLED, BACKFILL_DAYS, BACKFILL_HOUR, BACKFILL_MINUTE, BOOTSTRAP_CSS_URL, BOOTSTRAP_JS_URL, FONT_AWESOME_CSS_URL, CHART_JS_URL, CHART_JS_DATALABELS_URL, API_TIMEOUT_SECONDS, UI_TIMEOUT_MS, UI_UPDATE_DELAY_MS, YAHOO_FINANCE_BASE_URL, YAHOO_FINANCE_QUOTE_URL, YAHOO_FINANCE_LOOKUP_URL, PORTFOLIO_NAME_MAX_LENGTH, PORTFOLIO_DESCRIPTION_MAX_LENGTH, BOND_SYMBOL_MAX_LENGTH, BOND_WEBSITE_MAX_LENGTH, BOND_COUNTRY_MAX_LENGTH, BOND_INDUSTRY_MAX_LENGTH, EXCHANGE_NAME_MAX_LENGTH, CURRENCY_NAME_MAX_LENGTH, CURRENCY_CODE_MAX_LENGTH, CURRENCY_SYMBOL_MAX_LENGTH
+from app.database.connection.pool import init_db_pool, PoolExhaustedError
+from app.database.connection.instrumentation import init_query_instrumentation
+from app.database.connection.unit_of_work import init_unit_of_work, mark_unit_of_work_failed, unit_of_work
 from app.database.tables.exchangerate.fetch_daily_exchangerates import fetch_daily_exchangerates
 from app.database.tables.bond.fetch_daily_securityrates import fetch_daily_securityrates
+from app.database.tables.bonddata.backfill_bonddata import backfill_bonddata
 from app.database.tables.user.get_user_by_id import get_user_by_id
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.database.tables.bond.fetch_daily_securityrates import fetch_daily_securityrates
 from app.database.tables.exchangerate.fetch_daily_exchangerates import fetch_daily_exchangerates
 from werkzeug.exceptions import HTTPException
 from app.utils.logger import setup_logging, log_error, log_security_event
+from app.utils.scheduler_leader import run_as_leader, renew_scheduler_lease, release_scheduler_leadership
+from app.utils.warmup import start_warmup
 
 
 login_manager = LoginManager()
@@ -36,38 +41,57 @@ def start_scheduler(app):
     
     # Schedule daily updates with proper app context to avoid blocking users
     def fetch_securityrates_with_context():
-        with app.app_context():
+        with app.app_context(), unit_of_work():
             try:
                 from app.database.helpers.fetch_one import fetch_one
                 system_generated = fetch_one("SELECT system_generated FROM status WHERE id = 1")
                 
                 if system_generated and system_generated[0] is not None:
-                    fetch_daily_securityrates()
+                    # Only the worker holding the scheduler lease fetches
+                    run_as_leader(fetch_daily_securityrates, 'scheduled security rates fetch')
                 else:
                     print("⚠️  Skipping scheduled security rates fetch - database not initialized")
             except Exception as e:
                 print(f"⚠️  Scheduled security rates fetch failed: {e}")
     
     def fetch_exchangerates_with_context():
-        with app.app_context():
+        with app.app_context(), unit_of_work():
             try:
                 from app.database.helpers.fetch_one import fetch_one
                 system_generated = fetch_one("SELECT system_generated FROM status WHERE id = 1")
                 
                 if system_generated and system_generated[0] is not None:
-                    fetch_daily_exchangerates()
+                    run_as_leader(fetch_daily_exchangerates, 'scheduled exchange rates fetch')
                 else:
                     print("⚠️  Skipping scheduled exchange rates fetch - database not initialized")
             except Exception as e:
                 print(f"⚠️  Scheduled exchange rates fetch failed: {e}")
     
+    def backfill_bonddata_with_context():
+        with app.app_context(), unit_of_work():
+            try:
+                from app.database.helpers.fetch_one import fetch_one
+                system_generated = fetch_one("SELECT system_generated FROM status WHERE id = 1")
+
+                if system_generated and system_generated[0] is not None:
+                    run_as_leader(backfill_bonddata, 'scheduled bonddata backfill')
+                else:
+                    print("⚠️  Skipping scheduled bonddata backfill - database not initialized")
+            except Exception as e:
+                print(f"⚠️  Scheduled bonddata backfill failed: {e}")
+
     # Schedule to run daily at configured time
     scheduler.add_job(fetch_securityrates_with_context, trigger='cron', hour=SCHEDULER_HOUR, minute=SCHEDULER_MINUTE, id='daily_securityrates')
     scheduler.add_job(fetch_exchangerates_with_context, trigger='cron', hour=SCHEDULER_HOUR, minute=SCHEDULER_MINUTE, id='daily_exchangerates')
+    if BACKFILL_ENABLED:
+        scheduler.add_job(backfill_bonddata_with_context, trigger='cron', hour=BACKFILL_HOUR, minute=BACKFILL_MINUTE, id='bonddata_backfill')
+    # Heartbeat keeping the scheduler lease of the leading worker alive
+    scheduler.add_job(renew_scheduler_lease, trigger='interval', seconds=SCHEDULER_LEASE_RENEW_SECONDS, id='scheduler_lease')
     scheduler.start()
 
     import atexit
     atexit.register(lambda: scheduler.shutdown())
+    atexit.register(release_scheduler_leadership)
 
 def create_app():
     """
@@ -103,6 +127,7 @@ def create_app():
     app.config['CURRENCY_NAME_MAX_LENGTH'] = CURRENCY_NAME_MAX_LENGTH
     app.config['CURRENCY_CODE_MAX_LENGTH'] = CURRENCY_CODE_MAX_LENGTH
     app.config['CURRENCY_SYMBOL_MAX_LENGTH'] = CURRENCY_SYMBOL_MAX_LENGTH
+    app.config['BACKFILL_DAYS'] = BACKFILL_DAYS
 
     # Disable CSRF protection in test environment
     import os
@@ -115,44 +140,17 @@ def create_app():
     # Initialize logging system
     setup_logging(app)
 
+    # Per-request SQL statistics, slow query log and Server-Timing header
+    init_query_instrumentation(app)
+
+    # One pooled connection per request, committed once at the end
+    init_unit_of_work(app)
+
     init_db_pool()
 
-    # Skip data fetching during testing
+    # Initial data refresh and cache priming run in the background so the worker accepts traffic right away
     if not app.config.get('TESTING', False):
-        with app.app_context():
-            # Try to fetch data with retry logic for Docker environments
-            import time
-            max_retries = 3
-            retry_delay = 5
-            
-            for attempt in range(max_retries):
-                try:
-                    from app.database.helpers.fetch_one import fetch_one
-                    system_generated = fetch_one("SELECT system_generated FROM status WHERE id = 1")
-                    
-                    if system_generated and system_generated[0] is not None:
-                        # System is initialized, safe to fetch data
-                        print("🔄 Fetching initial data...")
-                        fetch_daily_exchangerates()
-                        fetch_daily_securityrates()
-                        print("✅ Initial data fetch completed")
-                        break
-                    else:
-                        if attempt < max_retries - 1:
-                            print(f"⚠️  Database not fully initialized (attempt {attempt + 1}/{max_retries}) - retrying in {retry_delay}s...")
-                            time.sleep(retry_delay)
-                        else:
-                            print("⚠️  Database not fully initialized - skipping data fetch during startup")
-                            print("ℹ️  Data will be fetched by scheduled tasks once database is ready")
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"⚠️  Database connection failed (attempt {attempt + 1}/{max_retries}): {e}")
-                        print(f"ℹ️  Retrying in {retry_delay}s...")
-                        time.sleep(retry_delay)
-                    else:
-                        print(f"⚠️  Could not connect to database after {max_retries} attempts - skipping data fetch")
-                        print("ℹ️  Data will be fetched by scheduled tasks once database is ready")
-                        break
+        start_warmup(app)
 
     # Skip scheduler during testing
     if not app.config.get('TESTING', False):
@@ -176,8 +174,23 @@ def create_app():
     from app.routes import bp
     app.register_blueprint(bp)
 
+    @app.errorhandler(PoolExhaustedError)
+    def handle_pool_exhausted(e):
+        # A burst used up the connection pool: ask the client to retry instead of logging it out
+        log_error(e, {'url': request.url, 'method': request.method})
+        message = "The server is busy, please try again in a moment."
+        if request.is_json or request.path.startswith('/api/'):
+            response = jsonify({"error": message})
+        else:
+            response = make_response(message)
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+
     @app.errorhandler(Exception)
     def handle_exception(e):
+        # The error page is a normal response, so discard the request's changes explicitly
+        mark_unit_of_work_failed()
         if isinstance(e, HTTPException) and e.code == 404 and request.path == "/favicon.ico":
             return "", 404
         else:
@@ -2,7 +2,7 @@
 """Admin routes for managing securities, currencies, and users."""
 
 from datetime import date
-from flask import render_template, url_for, redirect, request, flash, session, jsonify
+from flask import current_app, render_template, url_for, redirect, request, flash, session, jsonify
 from flask_login import login_required, current_user
 import mysql.connector
 from werkzeug.security import generate_password_hash
@@ -12,15 +12,20 @@ from app.api.get_eod import get_eod
 from app.database.helpers.fetch_all import fetch_all
 from app.database.helpers.fetch_one import fetch_one
 from app.database.helpers.execute_change_query import execute_change_query
-from app.database.tables.bond.get_all_bonds import get_all_bonds
+from app.database.connection.cursor import db_transaction
+from app.database.tables.bond.get_bonds_page import get_bonds_page, count_bonds
 from app.database.tables.bond.get_full_bond import get_full_bond
 from app.database.tables.exchangerate.fetch_daily_exchangerates import fetch_daily_exchangerates
 from app.database.tables.currency.get_all_currencies import get_all_currencies
 from app.database.tables.bondcategory.get_all_bondcategories import get_all_categories
+from app.database.cache.reference_data import get_exchanges, get_regions, get_sectors, bump_reference_data_version
+from app.database.cache.query_cache import bump_portfolio_data_version
+from app.database.cache.exchange_rates import get_exchange_rates_to
 from app.database.tables.user.get_all_users import get_all_users
 from app.api.get_exchange import get_exchange
 from app.admin.log_viewer import get_log_files, read_log_file, get_log_statistics
 from app.utils.logger import log_user_action, log_security_event, log_error
+from config import SECURITY_PAGE_SIZE, SECURITY_PAGE_MAX_SIZE
 
 @admin_bp.route('/')
 @admin_required
@@ -111,49 +116,76 @@ def view_log_file(filename):
 def securityoverview():
     from app.utils.currency_utils import get_user_default_currency
     base_currency = get_user_default_currency(current_user)
-    bonds = get_all_bonds()
-    for bond in bonds:
-        if bond['bondrate'] == 'N/A':
-            bond['bondrate'] = None
-        else:
-            try:
-                bond['bondrate'] = float(bond['bondrate'])
-            except ValueError:
-                bond['bondrate'] = None
-    
-    # Add exchange rate data for currency conversion
-    from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
-    from app.database.helpers.fetch_one import fetch_one
-    
-    base_currency_id = get_currency_id_by_code(base_currency)
-    
-    for bond in bonds:
-        if bond['bondrate'] is not None:
-            bond_currency_id = get_currency_id_by_code(bond['currencycode'])
-            if bond_currency_id == base_currency_id:
-                bond['exchange_rate_to_base'] = 1.0
-            else:
-                # Get exchange rate from database
-                exchange_rate_query = """
-                SELECT exchangerate FROM exchangerate 
-                WHERE fromcurrencyid = %s AND tocurrencyid = %s 
-                AND exchangeratelogtime = (
-                    SELECT MAX(exchangeratelogtime) 
-                    FROM exchangerate 
-                    WHERE fromcurrencyid = %s AND tocurrencyid = %s
-                )
-                """
-                result = fetch_one(exchange_rate_query, (bond_currency_id, base_currency_id, bond_currency_id, base_currency_id))
-                bond['exchange_rate_to_base'] = result[0] if result else 1.0
-        else:
-            bond['exchange_rate_to_base'] = 1.0
-    
+
+    # The securities themselves are loaded page by page from admin.securities
     currencies = get_all_currencies()
     categories = get_all_categories()
-    exchanges = fetch_all("""SELECT exchangeid, exchangename, r.region, r.regionid FROM exchange JOIN region r ON exchange.region = r.regionid ORDER BY exchangename""", dictionary=True)
-    regions = fetch_all("""SELECT * FROM region""", dictionary=True)
-    sectors = fetch_all("""SELECT sectorid as id, sectorname, sectordisplayname FROM sector""", dictionary=True)
-    return render_template('securityoverview.html', bonds=bonds, currencies=currencies, categories=categories, exchanges=exchanges, regions=regions, sectors=sectors, base_currency=base_currency)
+    exchanges = get_exchanges()
+    regions = get_regions()
+    sectors = get_sectors()
+    return render_template('securityoverview.html', currencies=currencies, categories=categories, exchanges=exchanges, regions=regions, sectors=sectors, base_currency=base_currency, page_size=SECURITY_PAGE_SIZE)
+
+@admin_bp.route('/securities')
+@admin_required
+def securities():
+    """
+    One page of the security overview as JSON for ?search=&category=&region=&sector=
+    &sort=symbol|name|price|date&order=asc|desc&limit=&after=. "next" is the
+    cursor of the following page (null on the last one); "total" is only
+    counted for the first page.
+    """
+    from app.utils.currency_utils import get_user_default_currency
+    from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
+
+    def filter_arg(name):
+        value = request.args.get(name, '').strip()
+        return value if value and value != 'All' else None
+
+    filters = {
+        'search': filter_arg('search'),
+        'category_filter': filter_arg('category'),
+        'region_filter': filter_arg('region'),
+        'sector_filter': filter_arg('sector'),
+    }
+    limit = min(max(request.args.get('limit', SECURITY_PAGE_SIZE, type=int), 1), SECURITY_PAGE_MAX_SIZE)
+    after = request.args.get('after') or None
+
+    try:
+        bonds, next_cursor = get_bonds_page(
+            **filters,
+            sort=request.args.get('sort', 'name'),
+            descending=request.args.get('order', 'asc') == 'desc',
+            after=after,
+            limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Conversion to the base currency for the whole page at once from the cached rate matrix
+    base_currency = get_user_default_currency(current_user)
+    rates = get_exchange_rates_to([bond.bondcurrencyid for bond in bonds], get_currency_id_by_code(base_currency), default=1.0)
+
+    page = {
+        "securities": [{
+            "bondid": bond.bondid,
+            "bondsymbol": bond.bondsymbol,
+            "bondname": bond.bondname,
+            "bondcategoryname": bond.bondcategoryname,
+            "bondrate": bond.bondrate,
+            "bondvolume": bond.bondvolume,
+            "bonddatalogtime": bond.bonddatalogtime.isoformat() if bond.bonddatalogtime else None,
+            "currencycode": bond.currencycode,
+            "value_in_base": bond.bondrate * rate if bond.bondrate is not None else None,
+            "region": bond.region,
+            "sectorname": bond.sectorname,
+            "url": url_for('admin.securityview_admin', bond_id=bond.bondid),
+        } for bond, rate in zip(bonds, rates.tolist())],
+        "next": next_cursor,
+        "base_currency": base_currency,
+    }
+    if after is None:
+        page["total"] = count_bonds(**filters)
+    return jsonify(page)
 
 @admin_bp.route('/securityview_admin/<int:bond_id>')
 @admin_required
@@ -161,9 +193,9 @@ def securityview_admin(bond_id):
     bond = get_full_bond(bond_id)
     currencies = get_all_currencies()
     categories = get_all_categories()
-    exchanges = fetch_all("""SELECT exchangeid, exchangename, r.region, r.regionid FROM exchange JOIN region r ON exchange.region = r.regionid ORDER BY exchangename""", dictionary=True)
-    regions = fetch_all("""SELECT * FROM region""", dictionary=True)
-    sectors = fetch_all("""SELECT sectorid as id, sectorname, sectordisplayname FROM sector""", dictionary=True)
+    exchanges = get_exchanges()
+    regions = get_regions()
+    sectors = get_sectors()
     return render_template('securityview_admin.html', bond=bond, currencies=currencies, categories=categories, exchanges=exchanges, regions=regions, sectors=sectors)
 
 @admin_bp.route('/create_security', methods=['POST'])
@@ -212,23 +244,20 @@ def create_security():
         if not sector_data:
             return jsonify({"status": "error", "message": "Invalid sector selected"})
 
-        # Create the bond (without exchange)
-        query = """INSERT INTO bond (bondname, bondsymbol, bondcategoryid, bondcurrencyid, bondcountry, bondwebsite, bondindustry, bondsectorid, bonddescription) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-        execute_change_query(query, (bondname, bondsymbol, bondcategoryid, bondcurrencyid, bondcountry, bondwebsite, bondindustry, bondsectorid, bonddescription))
+        # Download the initial price first, so no lock is held during the request to the provider
+        bondrate, volume, trade_date = get_eod(bondsymbol)
+
+        # Bond, initial price and status are written together or not at all
+        with db_transaction() as cursor:
+            query = """INSERT INTO bond (bondname, bondsymbol, bondcategoryid, bondcurrencyid, bondcountry, bondwebsite, bondindustry, bondsectorid, bonddescription) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+            cursor.execute(query, (bondname, bondsymbol, bondcategoryid, bondcurrencyid, bondcountry, bondwebsite, bondindustry, bondsectorid, bonddescription))
+            bondid = cursor.lastrowid
 
-        # Get bond data and add initial price
-        bondid = fetch_one("SELECT bondid FROM bond WHERE bondsymbol = %s", (bondsymbol,), dictionary=True)
-        if bondid:
-            bondid = bondid['bondid']
-            bondrate, volume, trade_date = get_eod(bondsymbol)
-            
             if bondrate and trade_date:
-                existing_data = fetch_one("SELECT bondid FROM bonddata WHERE bondid = %s AND bonddatalogtime = %s", (bondid, trade_date))
-                if not existing_data:
-                    query = "INSERT INTO bonddata (bondid, bonddatalogtime, bondrate, bondvolume) VALUES (%s, %s, %s, %s)"
-                    execute_change_query(query, (bondid, trade_date, bondrate, volume))
+                query = "INSERT INTO bonddata (bondid, bonddatalogtime, bondrate, bondvolume) VALUES (%s, %s, %s, %s)"
+                cursor.execute(query, (bondid, trade_date, bondrate, volume))
 
-        execute_change_query("UPDATE status SET securities = %s WHERE id = 1", (date.today(),))
+            cursor.execute("UPDATE status SET securities = %s WHERE id = 1", (date.today(),))
         
         return jsonify({"status": "success", "message": f"Security {bondsymbol} successfully created"})
         
@@ -264,7 +293,8 @@ def edit_security(bondid):
               bonddescription = %s
             WHERE bondid = %s
         """, (name, symbol, categoryid, currencyid, country, exchangeid, website, industry, sector, description, bondid))
-    
+    bump_portfolio_data_version()
+
     flash(f"Security {symbol} successfully updated", "success")
 
     return redirect(url_for('admin.securityview_admin', bond_id=bondid))
@@ -274,6 +304,7 @@ def edit_security(bondid):
 def delete_security(bondid):
     bondsymbol = fetch_one("SELECT bondsymbol FROM bond WHERE bondid = %s", (bondid,), dictionary=True)['bondsymbol']
     execute_change_query("""DELETE FROM bond WHERE bondid = %s""", (bondid,))
+    bump_portfolio_data_version()
     flash(f"Security {bondsymbol} successfully deleted", 'success')
     return redirect(url_for('admin.securityoverview'))
 
@@ -297,6 +328,7 @@ def create_currency():
     else:
         query = """INSERT INTO currency (currencycode, currencyname) VALUES (%s, %s)"""
         execute_change_query(query, (currencycode, currencyname))
+        bump_reference_data_version()
     
     fetch_daily_exchangerates()  # Update exchange rates after adding a new currency
 
@@ -310,6 +342,7 @@ def delete_currency(currencyid):
     currencycode = fetch_one("""SELECT currencycode FROM currency WHERE currencyid = %s""", (currencyid,), dictionary=True)['currencycode']
     try:
         execute_change_query("""DELETE FROM currency WHERE currencyid = %s""", (currencyid,))
+        bump_reference_data_version()
         flash(f"Currency {currencycode} has been successfully deleted", "success")
     except mysql.connector.errors.IntegrityError as e:
         flash(f"Cannot delete Currency {currencycode} because its referenced in other records.", "danger")
@@ -406,8 +439,8 @@ def create_user():
 @admin_bp.route('/exchangeoverview', strict_slashes=False)
 @admin_required
 def exchangeoverview():
-    exchanges = fetch_all("""SELECT exchangeid, exchangename, r.region, r.regionid FROM exchange JOIN region r ON exchange.region = r.regionid""", dictionary=True)
-    regions = fetch_all("""SELECT * FROM region""", dictionary=True)
+    exchanges = get_exchanges()
+    regions = get_regions()
     return render_template('exchangeoverview.html', exchanges=exchanges, regions=regions)
 
 @admin_bp.route('/create_exchange', methods=['POST'])
@@ -429,6 +462,7 @@ def create_exchange():
         "INSERT INTO exchange (exchangename, region) VALUES (%s, %s)",
         (exchangename, regionid)
     )
+    bump_reference_data_version()
     flash(f"Exchange {exchangename} created successfully.", "success")
     return redirect(url_for('admin.exchangeoverview'))
 
@@ -441,6 +475,7 @@ def edit_exchange(exchangeid):
         "UPDATE exchange SET region = %s WHERE exchangeid = %s",
         (new_region, exchangeid)
     )
+    bump_reference_data_version()
     regionsymbol = fetch_one("SELECT exchangename FROM exchange WHERE exchangeid = %s", (exchangeid,), dictionary=True)['exchangename']
     flash(f"Exchange {regionsymbol} updated successfully.", "success")
     return redirect(url_for('admin.exchangeoverview'))
@@ -451,6 +486,7 @@ def delete_exchange(exchangeid):
     exchange = fetch_one("""SELECT exchangename FROM exchange where exchangeid = %s""", (exchangeid,), dictionary=True)['exchangename']
     try:
         execute_change_query("""DELETE FROM exchange WHERE exchangeid = %s""", (exchangeid,))
+        bump_reference_data_version()
         flash(f"Exchange {exchange} has been successfully deleted", "success")
     except mysql.connector.errors.IntegrityError as e:
         flash(f"Cannot delete Exchange {exchange} because its referenced in other records.", "danger")
@@ -484,6 +520,7 @@ def create_security_continued():
             "INSERT INTO exchange (exchangename, region) VALUES (%s, %s)",
             (exchangename, int(regionid))
         )
+        bump_reference_data_version()
 
         pending_bond = session.get("pending_bond")
         if not pending_bond:
@@ -569,6 +606,7 @@ def create_currency_ajax():
         
         # Create the currency
         execute_change_query("INSERT INTO currency (currencycode, currencyname) VALUES (%s, %s)", (currencycode, currencyname))
+        bump_reference_data_version()
         
         # Update exchange rates after adding a new currency
         from app.database.tables.exchangerate.fetch_daily_exchangerates import fetch_daily_exchangerates
@@ -620,7 +658,7 @@ def api_management():
                 afl.fetch_time,
                 afl.retry_count
             FROM api_fetch_logs afl
-            WHERE NOT (afl.status = 'FAILED' AND afl.symbol NOT IN ('STOCK_FETCH_BULK', 'EXCHANGE_FETCH_BULK'))
+            WHERE NOT (afl.status = 'FAILED' AND afl.symbol NOT IN ('STOCK_FETCH_BULK', 'EXCHANGE_FETCH_BULK', 'STOCK_BACKFILL_BULK'))
             ORDER BY afl.fetch_time DESC
             LIMIT 50
         """, dictionary=True)
@@ -664,6 +702,13 @@ def api_management():
                              failed_fetches=[], 
                              api_stats={})
 
+@admin_bp.route('/system_status')
+@admin_required
+def system_status():
+    """Warm-up progress, database reachability and connection pool counters of this worker."""
+    from app.utils.warmup import get_system_status
+    return jsonify(get_system_status())
+
 @admin_bp.route('/manual_fetch_stocks', methods=['POST'])
 @admin_required
 def manual_fetch_stocks():
@@ -722,6 +767,35 @@ def manual_fetch_exchange_rates():
         flash('Error fetching exchange rates: ' + str(e), 'danger')
         return redirect(url_for('admin.api_management'))
 
+@admin_bp.route('/backfill_history', methods=['POST'])
+@admin_required
+def backfill_history():
+    """Manually fill the gaps in the price history of all or one security."""
+    try:
+        from app.database.tables.bonddata.backfill_bonddata import start_backfill
+
+        symbol = request.form.get('symbol', '').strip().upper()
+        days = request.form.get('days', type=int)
+
+        log_user_action('MANUAL_BACKFILL', {
+            'user_id': current_user.id,
+            'action': 'manual_backfill',
+            'symbol': symbol or 'ALL',
+            'days': days
+        })
+
+        # The download can outlast the worker timeout, so it runs in the background
+        if start_backfill(current_app._get_current_object(), days=days, symbols=[symbol] if symbol else None):
+            flash('Backfill started. The result will appear in the fetch logs.', 'info')
+        else:
+            flash('A backfill is already running.', 'warning')
+        return redirect(url_for('admin.api_management'))
+
+    except Exception as e:
+        log_error(e, {'action': 'backfill_history', 'user_id': current_user.id})
+        flash('Error backfilling price history: ' + str(e), 'danger')
+        return redirect(url_for('admin.api_management'))
+
 @admin_bp.route('/fetch_single_security', methods=['POST'])
 @admin_required
 def fetch_single_security():
@@ -736,7 +810,7 @@ def fetch_single_security():
         from app.api.get_eod import get_eod
         from app.database.helpers.fetch_one import fetch_one
         from app.database.helpers.execute_change_query import execute_change_query
-        from app.database.tables.bonddata.bonddata_exists import bonddata_exists
+        from app.database.tables.bonddata.upsert_bonddata import upsert_bonddata
         from app.api.get_last_trading_day import get_last_trading_day
         
         # Log the manual fetch attempt
@@ -755,17 +829,8 @@ def fetch_single_security():
                 bond_id = bond_id[0]
                 
                 # Insert or update the data
-                if bonddata_exists(bond_id, log_date=trade_date):
-                    execute_change_query("""
-                        UPDATE bonddata
-                        SET bondrate = %s, bondvolume = %s
-                        WHERE bondid = %s AND bonddatalogtime = %s
-                    """, (price, volume, bond_id, trade_date))
-                else:
-                    execute_change_query("""
-                        INSERT INTO bonddata (bondid, bondrate, bondvolume, bonddatalogtime)
-                        VALUES (%s, %s, %s, %s)
-                    """, (bond_id, price, volume, trade_date))
+                upsert_bonddata([(bond_id, price, volume, trade_date)])
+                bump_portfolio_data_version()
                 
                 # Log successful individual fetch
                 try:
@@ -813,7 +878,7 @@ def fetch_single_exchange_rate():
         from app.api.get_exchange_matrix import get_exchange_matrix
         from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
         from app.database.helpers.execute_change_query import execute_change_query
-        from app.database.tables.exchangerate.exchange_rate_exists import exchange_rate_exists
+        from app.database.tables.exchangerate.upsert_exchangerates import upsert_exchangerates
         from app.api.get_last_trading_day import get_last_trading_day
         
         # Log the manual fetch attempt
@@ -843,17 +908,8 @@ def fetch_single_exchange_rate():
                     trading_day = date.today().strftime("%Y-%m-%d")
                 
                 # Insert or update the exchange rate
-                if exchange_rate_exists(from_id, to_id, log_date=trading_day):
-                    execute_change_query("""
-                        UPDATE exchangerate
-                        SET exchangerate = %s
-                        WHERE fromcurrencyid = %s AND tocurrencyid = %s AND exchangeratelogtime = %s
-                    """, (rate, from_id, to_id, trading_day))
-                else:
-                    execute_change_query("""
-                        INSERT INTO exchangerate (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
-                        VALUES (%s, %s, %s, %s)
-                    """, (from_id, to_id, rate, trading_day))
+                upsert_exchangerates([(from_id, to_id, rate, trading_day)])
+                bump_portfolio_data_version()
                 
                 # Log successful individual fetch
                 try:
@@ -919,7 +975,7 @@ def retry_failed_fetch(fetch_id):
         # Retry based on fetch type
         if fetch_details['fetch_type'] == 'STOCK':
             from app.api.get_eod import get_eod
-            from app.database.tables.bonddata.bonddata_exists import bonddata_exists
+            from app.database.tables.bonddata.upsert_bonddata import upsert_bonddata
             from app.api.get_last_trading_day import get_last_trading_day
             
             price, volume, trade_date = get_eod(fetch_details['symbol'])
@@ -931,17 +987,8 @@ def retry_failed_fetch(fetch_id):
                     bond_id = bond_id[0]
                     
                     # Insert or update the data
-                    if bonddata_exists(bond_id, log_date=trade_date):
-                        execute_change_query("""
-                            UPDATE bonddata
-                            SET bondrate = %s, bondvolume = %s
-                            WHERE bondid = %s AND bonddatalogtime = %s
-                        """, (price, volume, bond_id, trade_date))
-                    else:
-                        execute_change_query("""
-                            INSERT INTO bonddata (bondid, bondrate, bondvolume, bonddatalogtime)
-                            VALUES (%s, %s, %s, %s)
-                        """, (bond_id, price, volume, trade_date))
+                    upsert_bonddata([(bond_id, price, volume, trade_date)])
+                    bump_portfolio_data_version()
                     
                     # Update the log as successful
                     execute_change_query("""
@@ -970,7 +1017,7 @@ def retry_failed_fetch(fetch_id):
         elif fetch_details['fetch_type'] == 'EXCHANGE':
             from app.api.get_exchange_matrix import get_exchange_matrix
             from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
-            from app.database.tables.exchangerate.exchange_rate_exists import exchange_rate_exists
+            from app.database.tables.exchangerate.upsert_exchangerates import upsert_exchangerates
             from app.api.get_last_trading_day import get_last_trading_day
             
             # Extract currencies from pair
@@ -995,17 +1042,8 @@ def retry_failed_fetch(fetch_id):
                         trading_day = date.today().strftime("%Y-%m-%d")
                     
                     # Insert or update the exchange rate
-                    if exchange_rate_exists(from_id, to_id, log_date=trading_day):
-                        execute_change_query("""
-                            UPDATE exchangerate
-                            SET exchangerate = %s
-                            WHERE fromcurrencyid = %s AND tocurrencyid = %s AND exchangeratelogtime = %s
-                        """, (rate, from_id, to_id, trading_day))
-                    else:
-                        execute_change_query("""
-                            INSERT INTO exchangerate (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
-                            VALUES (%s, %s, %s, %s)
-                        """, (from_id, to_id, rate, trading_day))
+                    upsert_exchangerates([(from_id, to_id, rate, trading_day)])
+                    bump_portfolio_data_version()
                     
                     # Update the log as successful
                     execute_change_query("""
@@ -1058,6 +1096,7 @@ def create_exchange_ajax():
         
         # Create the exchange
         execute_change_query("INSERT INTO exchange (exchangename, region) VALUES (%s, %s)", (exchangename, regionid))
+        bump_reference_data_version()
         
         # Get the new exchange ID
         new_exchange = fetch_one("SELECT exchangeid FROM exchange WHERE exchangename = %s", (exchangename,), dictionary=True)
@@ -0,0 +1,118 @@
+"""Download symbols in rate-limited parallel chunks with retries and per-symbol outcomes."""
+
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import MARKET_DATA_RATE_LIMIT_PER_SECOND, MARKET_DATA_RATE_LIMIT_BURST
+
+# value is whatever the chunk function returned for the symbol (None if it
+# returned nothing); error is None on success
+DownloadOutcome = namedtuple('DownloadOutcome', ['symbol', 'value', 'error', 'attempts'])
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to capacity calls and
+    rate_per_second calls on average. acquire() blocks until a token is free.
+    """
+
+    def __init__(self, rate_per_second, capacity=1):
+        self.rate = float(rate_per_second)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Returns the token bucket shared by all downloads of this process."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(MARKET_DATA_RATE_LIMIT_PER_SECOND, MARKET_DATA_RATE_LIMIT_BURST)
+        return _rate_limiter
+
+
+def chunked(items, size):
+    """Splits items into lists of at most size elements."""
+    size = max(int(size), 1)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _download_chunk(chunk, fetch_chunk, rate_limiter, max_retries, backoff_seconds):
+    """Downloads one chunk with retries; returns the outcomes of its symbols."""
+    error = None
+    for attempt in range(1, max_retries + 2):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            values = fetch_chunk(chunk)
+        except Exception as e:
+            error = e
+        else:
+            outcomes = []
+            for symbol in chunk:
+                value = values.get(symbol)
+                outcomes.append(DownloadOutcome(symbol, value, None if value is not None else 'No data returned', attempt))
+            return outcomes
+        if attempt <= max_retries:
+            # Exponential backoff with jitter so retried chunks do not hit the API together
+            delay = backoff_seconds * 2 ** (attempt - 1)
+            time.sleep(delay + random.uniform(0, delay))
+
+    message = f"Download failed after {max_retries + 1} attempts: {error}"
+    return [DownloadOutcome(symbol, None, message, max_retries + 1) for symbol in chunk]
+
+
+def iter_chunked_download(symbols, fetch_chunk, chunk_size=200, max_workers=4, rate_limiter=None,
+                          max_retries=3, backoff_seconds=1.0):
+    """
+    Downloads symbols in chunks and yields one DownloadOutcome per symbol.
+
+    Args:
+        symbols (list of str): Symbols to download; duplicates are dropped
+        fetch_chunk (callable): Takes a list of symbols and returns a dict
+            symbol -> value. Raising marks the whole chunk as failed and
+            retries it; symbols missing from the dict are reported as errors.
+        chunk_size (int): Symbols per call of fetch_chunk
+        max_workers (int): Chunks downloaded concurrently
+        rate_limiter (TokenBucket, optional): Limits calls of fetch_chunk,
+            including retries
+        max_retries (int): Retries per chunk after the first attempt
+        backoff_seconds (float): Delay before the first retry, doubled for
+            every further retry
+
+    Yields:
+        DownloadOutcome: In the order in which the chunks complete
+    """
+    chunks = chunked(list(dict.fromkeys(symbols)), chunk_size)
+    if not chunks:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks))), thread_name_prefix='download') as executor:
+        futures = [
+            executor.submit(_download_chunk, chunk, fetch_chunk, rate_limiter, max_retries, backoff_seconds)
+            for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
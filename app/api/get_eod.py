@@ -1,19 +1,11 @@
-"""Fetch end-of-day price and date for stock symbol using yfinance."""
+"""Fetch end-of-day price and date for stock symbol from the market data provider."""
 
-import yfinance as yf
-import warnings
-import logging
-from contextlib import redirect_stderr
-from io import StringIO
 from config import YAHOO_FINANCE_PERIOD_DAYS
-
-# Suppress yfinance warnings and logs
-warnings.filterwarnings('ignore')
-logging.getLogger('yfinance').setLevel(logging.ERROR)
+from app.api.providers import get_market_data_provider
 
 def get_eod(symbol):
     """
-    Fetches the end-of-day closing price, volume, and trading date for a given security symbol using yfinance.
+    Fetches the end-of-day closing price, volume, and trading date for a given security symbol from the market data provider.
 
     Args:
         symbol (str): The ticker symbol of the security.
@@ -26,10 +18,8 @@ def get_eod(symbol):
         return None, None, None
 
     try:
-        # Suppress HTTP errors and warnings during download
-        with redirect_stderr(StringIO()):
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=f"{YAHOO_FINANCE_PERIOD_DAYS}d")  # Fetch last few days to cover weekends/holidays
+        # Fetch last few days to cover weekends/holidays
+        hist = get_market_data_provider().history(symbol, YAHOO_FINANCE_PERIOD_DAYS)
 
         if hist.empty or "Close" not in hist.columns:
             return None, None, None
@@ -1,21 +1,85 @@
-"""Fetch end-of-day prices for stock symbols using yfinance."""
+"""Fetch end-of-day prices for stock symbols from the market data provider."""
 
-import yfinance as yf
 import pandas as pd
-import warnings
-import logging
-import sys
-from contextlib import redirect_stderr
-from io import StringIO
-from config import YAHOO_FINANCE_PERIOD_DAYS
+from config import (
+    YAHOO_FINANCE_PERIOD_DAYS, MARKET_DATA_CHUNK_SIZE, MARKET_DATA_MAX_WORKERS,
+    MARKET_DATA_MAX_RETRIES, MARKET_DATA_RETRY_BACKOFF_SECONDS
+)
+from app.api.providers import get_market_data_provider
+from app.api.download_engine import iter_chunked_download, get_rate_limiter
+
+
+def _last_close(frame):
+    """Returns (close, volume, 'YYYY-MM-DD') of the last complete row, or None."""
+    try:
+        sub = frame.dropna()
+        last_valid_idx = sub.index[-1]
+        close_price = sub.loc[last_valid_idx, "Close"]
+        volume = sub.loc[last_valid_idx, "Volume"]
+        return (
+            float(close_price) if not pd.isna(close_price) else None,
+            int(volume) if not pd.isna(volume) else None,
+            last_valid_idx.strftime("%Y-%m-%d")
+        )
+    except Exception:
+        return None
+
+
+def _download_eod_chunk(symbols):
+    """
+    Downloads one chunk of symbols; used as the fetch function of the download engine.
+
+    Raises:
+        ValueError: If the provider returned no data for any symbol of the chunk,
+            which usually means the request was throttled, so the chunk is retried
+    """
+    data = get_market_data_provider().download(symbols, YAHOO_FINANCE_PERIOD_DAYS, auto_adjust=True)
+
+    results = {}
+    if data is not None and not data.empty:
+        # Multiple symbols: multi-index DataFrame
+        if isinstance(data.columns, pd.MultiIndex):
+            available = set(data.columns.get_level_values(0))
+            for symbol in symbols:
+                if symbol in available:
+                    results[symbol] = _last_close(data[symbol])
+        else:
+            # Single symbol case
+            results[symbols[0]] = _last_close(data)
+
+    if not any(value is not None for value in results.values()):
+        raise ValueError(f"No data returned for {len(symbols)} symbols")
+    return results
+
+
+def iter_eod_prices(symbols):
+    """
+    Streams the latest end-of-day prices as the chunks of the download complete.
+
+    Args:
+        symbols (list of str): List of ticker symbols
+
+    Yields:
+        DownloadOutcome: symbol, value (closing price, volume, trading date) or None,
+                         error message or None, number of attempts
+    """
+    if not symbols or not isinstance(symbols, list):
+        return
+
+    yield from iter_chunked_download(
+        symbols,
+        _download_eod_chunk,
+        chunk_size=MARKET_DATA_CHUNK_SIZE,
+        max_workers=MARKET_DATA_MAX_WORKERS,
+        rate_limiter=get_rate_limiter(),
+        max_retries=MARKET_DATA_MAX_RETRIES,
+        backoff_seconds=MARKET_DATA_RETRY_BACKOFF_SECONDS
+    )
 
-# Suppress yfinance warnings and logs
-warnings.filterwarnings('ignore')
-logging.getLogger('yfinance').setLevel(logging.ERROR)
 
 def get_eod_prices(symbols):
     """
-    Fetches the latest end-of-day closing prices, volumes, and trading dates for a list of symbols using yfinance.
+    Fetches the latest end-of-day closing prices, volumes, and trading dates for a list of symbols from the market data provider.
 
     Args:
         symbols (list of str): List of ticker symbols, e.g. ['AAPL', 'MSFT']
@@ -29,51 +93,7 @@ def get_eod_prices(symbols):
     if not symbols or not isinstance(symbols, list):
         return results  # Return empty dict if symbols is not a valid list
 
-    try:
-        # Suppress HTTP errors and warnings during download
-        with redirect_stderr(StringIO()):
-            # Download last few days to cover weekends/holidays
-            data = yf.download(
-                symbols,
-                period=f"{YAHOO_FINANCE_PERIOD_DAYS}d",
-                group_by="ticker",
-                threads=True,
-                progress=False,
-                auto_adjust=True
-            )
-    except Exception:
-        for symbol in symbols:
-            results[symbol] = (None, None, None)
-        return results
-
-    # Multiple symbols: multi-index DataFrame
-    if isinstance(data.columns, pd.MultiIndex):
-        for symbol in symbols:
-            try:
-                sub = data[symbol].dropna()
-                last_valid_idx = sub.index[-1]
-                close_price = sub.loc[last_valid_idx, "Close"]
-                volume = sub.loc[last_valid_idx, "Volume"]
-                results[symbol] = (
-                    float(close_price) if not pd.isna(close_price) else None,
-                    int(volume) if not pd.isna(volume) else None,
-                    last_valid_idx.strftime("%Y-%m-%d")
-                )
-            except Exception:
-                results[symbol] = (None, None, None)
-    else:
-        # Single symbol case
-        try:
-            sub = data.dropna()
-            last_valid_idx = sub.index[-1]
-            close_price = sub.loc[last_valid_idx, "Close"]
-            volume = sub.loc[last_valid_idx, "Volume"]
-            results[symbols[0]] = (
-                float(close_price) if not pd.isna(close_price) else None,
-                int(volume) if not pd.isna(volume) else None,
-                last_valid_idx.strftime("%Y-%m-%d")
-            )
-        except Exception:
-            results[symbols[0]] = (None, None, None)
-
-    return results
\ No newline at end of file
+    for outcome in iter_eod_prices(symbols):
+        results[outcome.symbol] = outcome.value if outcome.value is not None else (None, None, None)
+
+    return results
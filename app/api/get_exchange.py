@@ -1,16 +1,8 @@
-import yfinance as yf
-import warnings
-import logging
-from contextlib import redirect_stderr
-from io import StringIO
-
-# Suppress yfinance warnings and logs
-warnings.filterwarnings('ignore')
-logging.getLogger('yfinance').setLevel(logging.ERROR)
+from app.api.providers import get_market_data_provider
 
 def get_exchange(symbol):
     """
-    Returns the exchange for a given security symbol using yfinance.
+    Returns the exchange for a given security symbol from the market data provider.
     
     Args:
         symbol (str): The ticker symbol of the security.
@@ -22,10 +14,7 @@ def get_exchange(symbol):
         return "Unknown"
 
     try:
-        # Suppress HTTP errors and warnings during download
-        with redirect_stderr(StringIO()):
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+        info = get_market_data_provider().info(symbol)
         return info.get('exchange') or "Unknown"
     except Exception:
         return "Unknown"
\ No newline at end of file
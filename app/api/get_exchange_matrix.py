@@ -1,68 +1,82 @@
-"""Fetch exchange rates for multiple currency pairs using yfinance."""
+"""Fetch exchange rates for multiple currency pairs from the market data provider."""
 
-import yfinance as yf
-from itertools import permutations
-import warnings
-import logging
-from config import YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS
+import numpy as np
+import pandas as pd
+from config import YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS, EXCHANGE_ANCHOR_CURRENCY
+from app.api.providers import get_market_data_provider
+from app.utils.exchange_rate_matrix import cross_rate_matrix, matrix_to_pairs
 
-# Suppress yfinance warnings and HTTP errors
-warnings.filterwarnings('ignore')
-logging.getLogger('yfinance').setLevel(logging.ERROR)
+
+def _last_close(data, symbol):
+    """Returns the last valid close of a symbol from a provider download frame, or None."""
+    try:
+        frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+        rate = frame["Close"].dropna().iloc[-1]
+        return float(rate) if rate is not None else None
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
 
 
-def get_exchange_matrix(currencies: list) -> dict:
+def get_exchange_rate_matrix(currencies: list, anchor: str = None):
     """
-    Fetch today's exchange rates for all permutations of the given currencies.
-    
+    Fetch today's exchange rate matrix for the given currencies.
+
+    Only the legs from the anchor currency to every other currency are
+    downloaded; all other entries, including inverses and the identity
+    diagonal, are derived locally by triangulating through the anchor.
+
     Args:
         currencies (list of str): Currency codes, e.g., ['USD', 'CHF', 'EUR']
+        anchor (str, optional): Anchor currency code. Defaults to EXCHANGE_ANCHOR_CURRENCY.
 
     Returns:
-        dict: Mapping like {'USDCHF': 0.89, 'CHFUSD': 1.12, 'EURUSD': 1.09, ...}
-              If data is unavailable, value is None. Each currency maps to itself as 1.0 (e.g., 'USDUSD': 1.0)
+        tuple: (matrix, observed) where matrix[i, j] is the rate from currencies[i]
+               to currencies[j] (NaN if a needed leg is unavailable) and observed
+               is a boolean mask of the entries downloaded directly.
     """
     if not currencies or not isinstance(currencies, list):
-        return {}
+        return np.empty((0, 0)), np.empty((0, 0), dtype=bool)
 
-    pairs = list(permutations(currencies, 2))  # e.g., [('USD', 'CHF'), ('CHF', 'USD'), ...]
-    symbols = [f"{a}{b}=X" for a, b in pairs]
+    anchor = anchor or EXCHANGE_ANCHOR_CURRENCY
+    others = [c for c in dict.fromkeys([anchor] + currencies) if c != anchor]
+    symbols = [f"{anchor}{c}=X" for c in others]
 
-    try:
-        # Suppress HTTP errors and warnings during download
-        import sys
-        from contextlib import redirect_stderr
-        from io import StringIO
-        
-        # Redirect stderr to suppress HTTP 404 errors
-        with redirect_stderr(StringIO()):
-            # Download configured period of data for all currency pairs
-            data = yf.download(
-                symbols,
-                period=f"{YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS}d",
-                group_by='ticker',
-                threads=True,
-                progress=False,
-                auto_adjust=False
-            )
-    except Exception:
-        # If download fails completely, return dict with all None (except self-mappings)
-        exchange_rates = {f"{a}{b}": None for a, b in pairs}
-        for c in currencies:
-            exchange_rates[f"{c}{c}"] = 1.0
-        return exchange_rates
-
-    exchange_rates = {}
-
-    for (a, b), symbol in zip(pairs, symbols):
+    legs = {anchor: 1.0}
+    if symbols:
         try:
-            rate = data[symbol]["Close"].dropna().iloc[-1]
-            exchange_rates[f"{a}{b}"] = float(rate) if rate is not None else None
-        except (KeyError, IndexError, TypeError):
-            exchange_rates[f"{a}{b}"] = None  # If data is missing or invalid
+            # Download configured period of data for the anchor legs only
+            data = get_market_data_provider().download(symbols, YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS, auto_adjust=False)
+            for c, symbol in zip(others, symbols):
+                legs[c] = _last_close(data, symbol)
+        except Exception:
+            # If download fails completely, only the identity rates are known
+            pass
+
+    anchor_legs = np.array([legs.get(c) or np.nan for c in currencies], dtype=float)
+    matrix = cross_rate_matrix(anchor_legs)
+
+    observed = np.zeros(matrix.shape, dtype=bool)
+    if anchor in currencies:
+        observed[currencies.index(anchor), :] = ~np.isnan(anchor_legs)
+    np.fill_diagonal(observed, False)
+
+    return matrix, observed
+
 
-    # Add identity rates (e.g., USDUSD = 1.0)
-    for c in currencies:
-        exchange_rates[f"{c}{c}"] = 1.0
+def get_exchange_matrix(currencies: list, anchor: str = None) -> dict:
+    """
+    Fetch today's exchange rates for all permutations of the given currencies.
+
+    Args:
+        currencies (list of str): Currency codes, e.g., ['USD', 'CHF', 'EUR']
+        anchor (str, optional): Anchor currency code. Defaults to EXCHANGE_ANCHOR_CURRENCY.
+
+    Returns:
+        dict: Mapping like {'USDCHF': 0.89, 'CHFUSD': 1.12, 'EURUSD': 1.09, ...}
+              If data is unavailable, value is None. Each currency maps to itself as 1.0 (e.g., 'USDUSD': 1.0)
+    """
+    if not currencies or not isinstance(currencies, list):
+        return {}
 
-    return exchange_rates
\ No newline at end of file
+    matrix, _ = get_exchange_rate_matrix(currencies, anchor)
+    return matrix_to_pairs(currencies, matrix)
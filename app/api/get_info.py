@@ -1,21 +1,14 @@
-"""Fetch financial information for a given security symbol using yfinance."""
+"""Fetch financial information for a given security symbol from the market data provider."""
 
-import yfinance as yf
 import pandas as pd
 import re
-import warnings
-import logging
-from contextlib import redirect_stderr
-from io import StringIO
-
-# Suppress yfinance warnings and logs
-warnings.filterwarnings('ignore')
-logging.getLogger('yfinance').setLevel(logging.ERROR)
+from config import YAHOO_FINANCE_INFO_PERIOD_DAYS
+from app.api.providers import get_market_data_provider, MarketDataError
 
 
 def get_info(symbol):
     """
-    Fetches financial information for a given security symbol using yfinance.
+    Fetches financial information for a given security symbol from the market data provider.
 
     Args:
         symbol (str): The ticker symbol of the security.
@@ -28,10 +21,8 @@ def get_info(symbol):
         return {}
 
     try:
-        # Suppress HTTP errors and warnings during download
-        with redirect_stderr(StringIO()):
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+        provider = get_market_data_provider()
+        info = provider.info(symbol)
 
         if not info or not isinstance(info, dict):
             return {}
@@ -47,8 +38,7 @@ def get_info(symbol):
         # Get volume from recent trading data
         volume = None
         try:
-            with redirect_stderr(StringIO()):
-                hist = ticker.history(period="1d")
+            hist = provider.history(symbol, YAHOO_FINANCE_INFO_PERIOD_DAYS)
             if not hist.empty and "Volume" in hist.columns:
                 volume = int(hist["Volume"].iloc[-1]) if not pd.isna(hist["Volume"].iloc[-1]) else None
         except Exception:
@@ -87,5 +77,5 @@ def get_info(symbol):
             "volume": volume
         }
 
-    except (KeyError, TypeError, ValueError, IndexError):
+    except (KeyError, TypeError, ValueError, IndexError, MarketDataError):
         return {}
@@ -1,4 +1,5 @@
-import yfinance as yf
+from config import YAHOO_FINANCE_LOOKUP_PERIOD_DAYS
+from app.api.providers import get_market_data_provider
 
 def get_last_trading_day() -> str | None:
     """
@@ -10,7 +11,7 @@ def get_last_trading_day() -> str | None:
     """
     try:
         # Use SPY as a liquid proxy for the overall market
-        hist = yf.Ticker("SPY").history(period="7d")  # last 7 days to cover holidays/weekends
+        hist = get_market_data_provider().history("SPY", YAHOO_FINANCE_LOOKUP_PERIOD_DAYS)  # last days to cover holidays/weekends
         
         if hist.empty or 'Close' not in hist.columns:
             return None
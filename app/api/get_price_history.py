@@ -0,0 +1,74 @@
+"""Fetch daily OHLCV history for stock symbols and a date range from the market data provider."""
+
+import pandas as pd
+from config import (
+    MARKET_DATA_CHUNK_SIZE, MARKET_DATA_MAX_WORKERS, MARKET_DATA_MAX_RETRIES, MARKET_DATA_RETRY_BACKOFF_SECONDS
+)
+from app.api.providers import get_market_data_provider
+from app.api.download_engine import iter_chunked_download, get_rate_limiter
+
+# A range of up to this many business days may legitimately have no bars
+# (holidays); an empty response for a longer range is treated as throttling
+HOLIDAY_MAX_DAYS = 3
+
+
+def _bars(frame):
+    """Converts an OHLCV frame into (date, open, high, low, close, volume) tuples."""
+    bars = []
+    for idx, row in frame.dropna(subset=["Close"]).iterrows():
+        bars.append((
+            idx.date(),
+            float(row["Open"]) if not pd.isna(row["Open"]) else None,
+            float(row["High"]) if not pd.isna(row["High"]) else None,
+            float(row["Low"]) if not pd.isna(row["Low"]) else None,
+            float(row["Close"]),
+            int(row["Volume"]) if not pd.isna(row["Volume"]) else None,
+        ))
+    return bars
+
+
+def _download_history_chunk(symbols, start, end):
+    """Downloads one chunk of symbols for start..end; returns symbol -> list of bars."""
+    data = get_market_data_provider().download_range(symbols, start, end, auto_adjust=True)
+
+    results = {symbol: [] for symbol in symbols}
+    if data is not None and not data.empty:
+        if isinstance(data.columns, pd.MultiIndex):
+            available = set(data.columns.get_level_values(0))
+            for symbol in symbols:
+                if symbol in available:
+                    results[symbol] = _bars(data[symbol])
+        else:
+            results[symbols[0]] = _bars(data)
+
+    if not any(results.values()) and len(pd.bdate_range(start, end)) > HOLIDAY_MAX_DAYS:
+        raise ValueError(f"No data returned for {len(symbols)} symbols from {start} to {end}")
+    return results
+
+
+def iter_price_history(symbols, start, end):
+    """
+    Streams daily bars of symbols between start and end (inclusive) as the chunks of the download complete.
+
+    Args:
+        symbols (list of str): List of ticker symbols
+        start (date): First day
+        end (date): Last day
+
+    Yields:
+        DownloadOutcome: symbol, value (list of (date, open, high, low, close, volume),
+                         empty if the provider has no bars in the range) or None on error,
+                         error message or None, number of attempts
+    """
+    if not symbols:
+        return
+
+    yield from iter_chunked_download(
+        symbols,
+        lambda chunk: _download_history_chunk(chunk, start, end),
+        chunk_size=MARKET_DATA_CHUNK_SIZE,
+        max_workers=MARKET_DATA_MAX_WORKERS,
+        rate_limiter=get_rate_limiter(),
+        max_retries=MARKET_DATA_MAX_RETRIES,
+        backoff_seconds=MARKET_DATA_RETRY_BACKOFF_SECONDS
+    )
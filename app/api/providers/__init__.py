@@ -0,0 +1,53 @@
+"""
+Market data providers.
+
+The app/api functions fetch raw data through get_market_data_provider(), so
+the backend can be switched with MARKET_DATA_PROVIDER without touching the
+parsing or the jobs: 'yfinance' for live data, 'replay' for deterministic
+offline data from fixtures and synthetic series.
+"""
+
+import threading
+from app.api.providers.base import MarketDataProvider, MarketDataError
+
+_lock = threading.Lock()
+_provider = None
+
+
+def create_market_data_provider(name):
+    """
+    Creates a provider by name.
+
+    Args:
+        name (str): 'yfinance' or 'replay'
+
+    Returns:
+        MarketDataProvider: A new provider instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == 'yfinance':
+        from app.api.providers.yfinance_provider import YFinanceProvider
+        return YFinanceProvider()
+    if name == 'replay':
+        from app.api.providers.replay_provider import ReplayProvider
+        return ReplayProvider.from_config()
+    raise ValueError(f"Unknown market data provider: {name}")
+
+
+def get_market_data_provider():
+    """Returns the provider configured by MARKET_DATA_PROVIDER, created on first use."""
+    global _provider
+    with _lock:
+        if _provider is None:
+            from config import MARKET_DATA_PROVIDER
+            _provider = create_market_data_provider(MARKET_DATA_PROVIDER)
+        return _provider
+
+
+def set_market_data_provider(provider):
+    """Replaces the active provider, e.g. with a ReplayProvider in tests and benchmarks. None resets it."""
+    global _provider
+    with _lock:
+        _provider = provider
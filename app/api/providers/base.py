@@ -0,0 +1,74 @@
+"""Interface every market data backend implements."""
+
+from abc import ABC, abstractmethod
+
+
+class MarketDataError(Exception):
+    """Raised by a provider when a request for a symbol fails."""
+
+
+class MarketDataProvider(ABC):
+    """
+    Source of raw market data for the app/api functions.
+
+    Frames follow the yfinance layout so the parsing in app/api works the
+    same for every backend: a DatetimeIndex and Open, High, Low, Close and
+    Volume columns. A backend missing one of the methods cannot be
+    instantiated.
+    """
+
+    name = None
+
+    @abstractmethod
+    def download(self, symbols, period_days, auto_adjust=True):
+        """
+        Fetch recent daily bars for many symbols at once.
+
+        Args:
+            symbols (list of str): Ticker symbols
+            period_days (int): Number of calendar days back from the last bar
+            auto_adjust (bool): Whether prices are adjusted; if False an
+                                'Adj Close' column is included
+
+        Returns:
+            pd.DataFrame: Columns grouped by ticker as a (symbol, field)
+                          MultiIndex. Failed symbols are missing or all NaN.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def download_range(self, symbols, start, end, auto_adjust=True):
+        """
+        Fetch daily bars for many symbols between two dates.
+
+        Args:
+            symbols (list of str): Ticker symbols
+            start (date): First day, inclusive
+            end (date): Last day, inclusive
+            auto_adjust (bool): Whether prices are adjusted
+
+        Returns:
+            pd.DataFrame: Same layout as download()
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def history(self, symbol, period_days):
+        """
+        Fetch recent daily bars for one symbol.
+
+        Returns:
+            pd.DataFrame: OHLCV frame, empty if the symbol is unknown
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def info(self, symbol):
+        """
+        Fetch descriptive data for one symbol.
+
+        Returns:
+            dict: yfinance style info keys (longName, currency, exchange,
+                  sector, industry, country, quoteType, ...)
+        """
+        raise NotImplementedError
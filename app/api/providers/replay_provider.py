@@ -0,0 +1,316 @@
+"""
+Deterministic offline market data provider.
+
+Serves OHLCV history, quotes, info and FX from local fixtures and generates
+synthetic data for any symbol without one, so ingestion can be tested and
+benchmarked without the network. Latency and failures can be injected.
+
+Fixture layout (CSV or Parquet, Parquet needs pyarrow):
+    history.csv  symbol, date, open, high, low, close, volume
+    info.csv     symbol plus any yfinance info keys (longName, currency, ...)
+"""
+
+import os
+import threading
+import time
+import zlib
+from datetime import date
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from app.api.providers.base import MarketDataProvider, MarketDataError
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+SYNTHETIC_EXCHANGES = ["NMS", "NYQ", "GER", "LSE", "EBS", "PAR", "TOR", "JPX"]
+SYNTHETIC_SECTORS = [
+    "Technology", "Healthcare", "Financial Services", "Consumer Cyclical", "Industrials",
+    "Energy", "Utilities", "Real Estate", "Basic Materials", "Communication Services",
+]
+
+
+def _stable_hash(text):
+    """Process independent hash, unlike hash() which is salted per run."""
+    return zlib.crc32(text.encode('utf-8'))
+
+
+def _is_fx_symbol(symbol):
+    return symbol.endswith("=X") and len(symbol) == 8
+
+
+@lru_cache(maxsize=4096)
+def _currency_path(code, seed, end_date, days):
+    """Value of one unit of a currency in an abstract numeraire over time."""
+    rng = np.random.default_rng([seed, _stable_hash(code)])
+    level = np.exp(rng.uniform(np.log(0.005), np.log(2.0)))
+    steps = rng.normal(0.0, 0.004, days)
+    return level * np.exp(np.cumsum(steps))
+
+
+@lru_cache(maxsize=4096)
+def _synthetic_history(symbol, seed, end_date, days):
+    """Reproducible daily bars for a symbol ending at end_date."""
+    index = pd.bdate_range(end=end_date, periods=days, name="Date")
+
+    if _is_fx_symbol(symbol):
+        # Cross rates of all generated pairs are consistent with each other
+        close = _currency_path(symbol[3:6], seed, end_date, days) / _currency_path(symbol[0:3], seed, end_date, days)
+        rng = np.random.default_rng([seed, _stable_hash(symbol)])
+        volume = np.zeros(days, dtype=np.int64)
+        spread = np.abs(rng.normal(0.0, 0.001, (2, days)))
+    else:
+        rng = np.random.default_rng([seed, _stable_hash(symbol)])
+        start = rng.uniform(5.0, 500.0)
+        drift = rng.normal(0.0003, 0.0004)
+        volatility = rng.uniform(0.008, 0.035)
+        close = start * np.exp(np.cumsum(rng.normal(drift, volatility, days)))
+        volume = rng.lognormal(np.log(rng.uniform(1e4, 5e6)), 0.4, days).astype(np.int64)
+        spread = np.abs(rng.normal(0.0, volatility / 2, (2, days)))
+
+    # Bars open at the previous close
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) * (1 + spread[0])
+    low = np.minimum(open_, close) * (1 - spread[1])
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+def _read_table(directory, name):
+    """Reads name.parquet or name.csv from directory, or returns None."""
+    parquet_path = os.path.join(directory, f"{name}.parquet")
+    csv_path = os.path.join(directory, f"{name}.csv")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path)
+    return None
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Replays fixtures and synthesizes data for unknown symbols.
+
+    Args:
+        fixtures_dir (str, optional): Directory with history/info fixtures
+        end_date (str or date, optional): Last bar date. Defaults to today.
+        history_days (int): Length of generated histories in business days
+        latency_ms (float): Delay added to every request
+        latency_jitter_ms (float): Random extra delay of up to this much
+        failure_rate (float): Probability that a symbol request fails
+        failing_symbols (iterable of str): Symbols that always fail
+        synthetic (bool): Whether to generate data for symbols without fixtures
+        seed (int): Seed for generated data, jitter and failures
+    """
+
+    name = 'replay'
+
+    def __init__(self, fixtures_dir=None, end_date=None, history_days=750, latency_ms=0, latency_jitter_ms=0,
+                 failure_rate=0.0, failing_symbols=(), synthetic=True, seed=42):
+        self.fixtures_dir = fixtures_dir or None
+        self.end_date = pd.Timestamp(end_date or date.today()).normalize()
+        self.history_days = history_days
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.failure_rate = failure_rate
+        self.failing_symbols = set(failing_symbols)
+        self.synthetic = synthetic
+        self.seed = seed
+
+        self._lock = threading.Lock()
+        self._attempts = {}
+        self._jitter_rng = np.random.default_rng(seed)
+        self._history = None
+        self._info = None
+
+    @classmethod
+    def from_config(cls):
+        """Creates a provider from the MARKET_DATA_* settings."""
+        from config import (MARKET_DATA_FIXTURES_DIR, MARKET_DATA_REPLAY_END_DATE, MARKET_DATA_HISTORY_DAYS,
+                            MARKET_DATA_LATENCY_MS, MARKET_DATA_LATENCY_JITTER_MS, MARKET_DATA_FAILURE_RATE,
+                            MARKET_DATA_SEED)
+        return cls(
+            fixtures_dir=MARKET_DATA_FIXTURES_DIR,
+            end_date=MARKET_DATA_REPLAY_END_DATE,
+            history_days=MARKET_DATA_HISTORY_DAYS,
+            latency_ms=MARKET_DATA_LATENCY_MS,
+            latency_jitter_ms=MARKET_DATA_LATENCY_JITTER_MS,
+            failure_rate=MARKET_DATA_FAILURE_RATE,
+            seed=MARKET_DATA_SEED,
+        )
+
+    # --- fixtures ---
+
+    def _load_fixtures(self):
+        with self._lock:
+            if self._history is not None:
+                return
+
+            history, info = {}, {}
+            if self.fixtures_dir:
+                frame = _read_table(self.fixtures_dir, "history")
+                if frame is not None:
+                    frame["date"] = pd.to_datetime(frame["date"])
+                    frame = frame.rename(columns=str.capitalize)
+                    for symbol, rows in frame.groupby("Symbol", sort=False):
+                        history[symbol] = rows.set_index("Date")[OHLCV_COLUMNS].sort_index()
+
+                frame = _read_table(self.fixtures_dir, "info")
+                if frame is not None:
+                    frame = frame.astype(object).where(frame.notna(), None)
+                    info = {row["symbol"]: row for row in frame.to_dict(orient="records")}
+
+            self._history, self._info = history, info
+
+    def _full_history(self, symbol):
+        self._load_fixtures()
+        frame = self._history.get(symbol)
+        if frame is None and self.synthetic:
+            frame = _synthetic_history(symbol, self.seed, self.end_date, self.history_days)
+        return frame
+
+    def _window(self, symbol, period_days):
+        frame = self._full_history(symbol)
+        if frame is None:
+            return None
+        return frame[frame.index > self.end_date - pd.Timedelta(days=period_days)]
+
+    # --- latency and failure injection ---
+
+    def _delay(self):
+        if not self.latency_ms and not self.latency_jitter_ms:
+            return
+        with self._lock:
+            jitter = self._jitter_rng.uniform(0, self.latency_jitter_ms) if self.latency_jitter_ms else 0
+        time.sleep((self.latency_ms + jitter) / 1000)
+
+    def _fails(self, symbol):
+        """Decides if this request for symbol fails; repeatable for the n-th attempt of a symbol."""
+        if symbol in self.failing_symbols:
+            return True
+        if self.failure_rate <= 0:
+            return False
+        with self._lock:
+            attempt = self._attempts.get(symbol, 0)
+            self._attempts[symbol] = attempt + 1
+        return np.random.default_rng([self.seed, _stable_hash(symbol), attempt]).random() < self.failure_rate
+
+    # --- MarketDataProvider ---
+
+    def download(self, symbols, period_days, auto_adjust=True):
+        return self._download(symbols, lambda symbol: self._window(symbol, period_days), auto_adjust)
+
+    def download_range(self, symbols, start, end, auto_adjust=True):
+        def window(symbol):
+            frame = self._full_history(symbol)
+            if frame is None:
+                return None
+            return frame[(frame.index >= pd.Timestamp(start)) & (frame.index <= pd.Timestamp(end))]
+
+        return self._download(symbols, window, auto_adjust)
+
+    def _download(self, symbols, window, auto_adjust):
+        self._delay()
+
+        frames = {}
+        for symbol in dict.fromkeys(symbols):
+            if self._fails(symbol):
+                continue
+            frame = window(symbol)
+            if frame is None or frame.empty:
+                continue
+            if not auto_adjust:
+                frame = frame.assign(**{"Adj Close": frame["Close"]})
+            frames[symbol] = frame
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    def history(self, symbol, period_days):
+        self._delay()
+        if self._fails(symbol):
+            raise MarketDataError(f"Injected failure for {symbol}")
+
+        frame = self._window(symbol, period_days)
+        if frame is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return frame.copy()
+
+    def info(self, symbol):
+        self._delay()
+        if self._fails(symbol):
+            raise MarketDataError(f"Injected failure for {symbol}")
+
+        self._load_fixtures()
+        if symbol in self._info:
+            return dict(self._info[symbol])
+        if not self.synthetic:
+            return {}
+
+        h = _stable_hash(symbol)
+        if _is_fx_symbol(symbol):
+            return {
+                "symbol": symbol,
+                "longName": f"{symbol[0:3]}/{symbol[3:6]}",
+                "currency": symbol[3:6],
+                "exchange": "CCY",
+                "quoteType": "CURRENCY",
+            }
+        return {
+            "symbol": symbol,
+            "longName": f"{symbol} Synthetic Inc.",
+            "country": "United States",
+            "currency": "USD",
+            "exchange": SYNTHETIC_EXCHANGES[h % len(SYNTHETIC_EXCHANGES)],
+            "website": f"https://www.{symbol.lower()}.example.com",
+            "industry": "Synthetic",
+            "sector": SYNTHETIC_SECTORS[(h // 7) % len(SYNTHETIC_SECTORS)],
+            "longBusinessSummary": f"{symbol} is a generated security for offline testing. It has no real-world counterpart.",
+            "quoteType": "ETF" if h % 5 == 0 else "EQUITY",
+        }
+
+
+def generate_symbols(count, prefix="SYN"):
+    """Returns count reproducible ticker symbols, e.g. ['SYN00000', 'SYN00001', ...]."""
+    width = max(5, len(str(count - 1)))
+    return [f"{prefix}{i:0{width}d}" for i in range(count)]
+
+
+def write_fixtures(directory, symbols, days=250, end_date=None, seed=42, fmt="csv"):
+    """
+    Writes generated history and info fixtures for symbols to directory.
+
+    Args:
+        directory (str): Target directory, created if missing
+        symbols (list of str): Symbols to generate, FX pairs as 'USDCHF=X'
+        days (int): Business days of history per symbol
+        end_date (str or date, optional): Last bar date. Defaults to today.
+        seed (int): Seed for the generated data
+        fmt (str): 'csv' or 'parquet'
+
+    Returns:
+        int: Number of history rows written
+    """
+    os.makedirs(directory, exist_ok=True)
+    provider = ReplayProvider(end_date=end_date, history_days=days, seed=seed)
+
+    frames = []
+    for symbol in symbols:
+        frame = provider._full_history(symbol).reset_index()
+        frame.insert(0, "Symbol", symbol)
+        frames.append(frame)
+    history = pd.concat(frames, ignore_index=True).rename(columns=str.lower)
+    history["date"] = history["date"].dt.strftime("%Y-%m-%d")
+    info = pd.DataFrame([provider.info(symbol) for symbol in symbols])
+
+    if fmt == "parquet":
+        history.to_parquet(os.path.join(directory, "history.parquet"), index=False)
+        info.to_parquet(os.path.join(directory, "info.parquet"), index=False)
+    else:
+        history.to_csv(os.path.join(directory, "history.csv"), index=False)
+        info.to_csv(os.path.join(directory, "info.csv"), index=False)
+
+    return len(history)
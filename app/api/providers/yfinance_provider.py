@@ -0,0 +1,54 @@
+"""Market data provider backed by the yfinance API."""
+
+import threading
+from datetime import timedelta
+import yfinance as yf
+import warnings
+import logging
+from app.api.providers.base import MarketDataProvider
+
+# Suppress yfinance warnings and logs. Failed symbols (e.g. HTTP 404) are
+# reported through its logger, so silencing it replaces redirecting
+# sys.stderr, which is process-wide and raced between threads
+warnings.filterwarnings('ignore')
+logging.getLogger('yfinance').setLevel(logging.CRITICAL + 1)
+
+# yf.download keeps the results of a call in module globals, so concurrent
+# calls from the download engine's threads would mix up their frames
+_download_lock = threading.Lock()
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Fetches live data from Yahoo Finance."""
+
+    name = 'yfinance'
+
+    def download(self, symbols, period_days, auto_adjust=True):
+        with _download_lock:
+            return yf.download(
+                symbols,
+                period=f"{period_days}d",
+                group_by='ticker',
+                threads=True,
+                progress=False,
+                auto_adjust=auto_adjust
+            )
+
+    def download_range(self, symbols, start, end, auto_adjust=True):
+        with _download_lock:
+            return yf.download(
+                symbols,
+                start=start.isoformat(),
+                # yfinance treats end as exclusive
+                end=(end + timedelta(days=1)).isoformat(),
+                group_by='ticker',
+                threads=True,
+                progress=False,
+                auto_adjust=auto_adjust
+            )
+
+    def history(self, symbol, period_days):
+        return yf.Ticker(symbol).history(period=f"{period_days}d")
+
+    def info(self, symbol):
+        return yf.Ticker(symbol).info
@@ -8,9 +8,16 @@ from app.api.get_exchange import get_exchange
 from app.api.get_exchange_matrix import get_exchange_matrix
 from app.api.get_last_trading_day import get_last_trading_day
 from flask_login import current_user, login_required
-from flask import jsonify, request
-import yfinance as yf
-from config import YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS
+from flask import current_app, jsonify, request
+from app.api.providers import get_market_data_provider
+from app.database.helpers.fetch_one import fetch_one
+from app.database.tables.portfolio.get_portfolio_history import get_portfolio_history
+from app.database.tables.portfolio.get_portfolio_analytics import get_portfolio_analytics
+from app.database.tables.portfolio.get_portfolio_breakdown import get_portfolio_breakdown
+from app.database.tables.portfolio_risk.portfolio_risk import params_key, get_portfolio_risk
+from app.utils.risk_jobs import risk_params, request_portfolio_risk
+from datetime import date, timedelta
+from config import YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS, PORTFOLIO_HISTORY_DEFAULT_DAYS, PORTFOLIO_HISTORY_MAX_DAYS
 
 @api_bp.route('/securityinfo/<string:symbol>')
 def securityinfo(symbol):
@@ -36,8 +43,7 @@ def exchange_rates():
     try:
         # Create a simple exchange rate lookup
         symbol = f"{from_currency}{to_currency}=X"
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=f"{YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS}d")
+        hist = get_market_data_provider().history(symbol, YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS)
         
         if hist.empty:
             return jsonify({"error": "Exchange rate not found"}), 404
@@ -88,3 +94,113 @@ def eod_prices(symbol):
         return jsonify({"symbol": symbol, "price": price, "volume": volume, "trade_date": trade_date})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+def _owns_portfolio(portfolio_id):
+    """Whether the portfolio belongs to the logged-in user."""
+    return fetch_one(
+        "SELECT portfolioid FROM portfolio WHERE portfolioid = %s AND userid = %s",
+        (portfolio_id, current_user.id)
+    ) is not None
+
+def _date_range_from_args():
+    """
+    Reads the date range from ?start=&end= (YYYY-MM-DD) or ?days=.
+
+    Returns:
+        tuple: (start, end) dates
+
+    Raises:
+        ValueError: If a date is malformed or the range is empty or too long
+    """
+    end = date.fromisoformat(request.args['end']) if request.args.get('end') else date.today()
+    if request.args.get('start'):
+        start = date.fromisoformat(request.args['start'])
+    else:
+        start = end - timedelta(days=request.args.get('days', PORTFOLIO_HISTORY_DEFAULT_DAYS, type=int))
+
+    if start > end:
+        raise ValueError("start must not be after end")
+    if (end - start).days > PORTFOLIO_HISTORY_MAX_DAYS:
+        raise ValueError(f"Range must not exceed {PORTFOLIO_HISTORY_MAX_DAYS} days")
+    return start, end
+
+@api_bp.route('/portfolio/<int:portfolio_id>/history')
+@login_required
+def portfolio_history(portfolio_id):
+    """Daily portfolio value in the portfolio currency for charting."""
+    if not _owns_portfolio(portfolio_id):
+        return jsonify({"error": "Portfolio not found"}), 404
+
+    try:
+        start, end = _date_range_from_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        return jsonify(get_portfolio_history(portfolio_id, start, end))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/portfolio/<int:portfolio_id>/analytics')
+@login_required
+def portfolio_analytics(portfolio_id):
+    """Risk and return metrics of the portfolio and its holdings."""
+    if not _owns_portfolio(portfolio_id):
+        return jsonify({"error": "Portfolio not found"}), 404
+
+    try:
+        start, end = _date_range_from_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        return jsonify(get_portfolio_analytics(portfolio_id, start, end, request.args.get('benchmark')))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/portfolio/<int:portfolio_id>/breakdown')
+@login_required
+def portfolio_breakdown(portfolio_id):
+    """Allocation by ?dimensions=category,sector,region,currency,exchange,country (all by default)."""
+    if not _owns_portfolio(portfolio_id):
+        return jsonify({"error": "Portfolio not found"}), 404
+
+    dimensions = [d.strip() for d in request.args.get('dimensions', '').split(',') if d.strip()] or None
+    try:
+        breakdown = get_portfolio_breakdown(portfolio_id, dimensions)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify(breakdown.to_dict())
+
+@api_bp.route('/portfolio/<int:portfolio_id>/risk', methods=['GET', 'POST'])
+@login_required
+def portfolio_risk(portfolio_id):
+    """
+    VaR and CVaR of the portfolio for ?confidence=&horizon=&lookback=&paths=&asof=.
+
+    GET returns the cached or running job ({"status": null} if never
+    requested); POST starts it in the background unless it is cached.
+    """
+    if not _owns_portfolio(portfolio_id):
+        return jsonify({"error": "Portfolio not found"}), 404
+
+    try:
+        params = risk_params(request.values)
+        as_of = date.fromisoformat(request.values['asof']) if request.values.get('asof') else date.today()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if request.method == 'POST':
+            job = request_portfolio_risk(current_app._get_current_object(), portfolio_id, as_of, params)
+        else:
+            job = get_portfolio_risk(portfolio_id, as_of, params_key(params))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    job = job or {"status": None, "params": params}
+    job['asof'] = as_of.isoformat()
+    return jsonify(job), 202 if job['status'] == 'RUNNING' else 200
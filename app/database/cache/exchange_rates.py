@@ -0,0 +1,131 @@
+"""
+In-process cache of the latest exchange rates as an n×n NumPy matrix keyed
+by currency id.
+
+The matrix is loaded from exchangerate_latest and reloaded when the table
+changes. Writers in this worker call invalidate_exchange_rates() after
+committing; other workers notice the change on their next check (at most
+every REFERENCE_DATA_CHECK_SECONDS) through a cheap signature query.
+"""
+
+import threading
+import time
+import numpy as np
+from app.database.helpers.fetch_all import fetch_all
+from app.database.helpers.fetch_one import fetch_one
+from config import REFERENCE_DATA_CHECK_SECONDS
+
+_lock = threading.Lock()
+_rates = None
+_signature = None
+_checked_at = 0.0
+
+
+def _read_signature():
+    """Returns a value that changes whenever exchangerate_latest changes."""
+    return tuple(fetch_one("""
+        SELECT COUNT(*), MAX(exchangeratelogtime), SUM(exchangerate)
+        FROM exchangerate_latest
+    """) or ())
+
+
+def build_rate_matrix(rows):
+    """
+    Builds the rate matrix from (fromcurrencyid, tocurrencyid, exchangerate) rows.
+
+    Returns:
+        tuple: (matrix, index) where index maps a currency id to its row and
+               column in matrix. Unknown rates are NaN, the diagonal is 1.0.
+    """
+    currency_ids = sorted({row[0] for row in rows} | {row[1] for row in rows})
+    index = {currency_id: i for i, currency_id in enumerate(currency_ids)}
+
+    matrix = np.full((len(currency_ids), len(currency_ids)), np.nan)
+    if rows:
+        from_idx = np.array([index[row[0]] for row in rows])
+        to_idx = np.array([index[row[1]] for row in rows])
+        matrix[from_idx, to_idx] = np.array([float(row[2]) for row in rows])
+    np.fill_diagonal(matrix, 1.0)
+
+    return matrix, index
+
+
+def get_latest_rate_matrix():
+    """
+    Returns the cached latest rate matrix, reloading it if exchangerate_latest
+    has changed since it was loaded.
+
+    Returns:
+        tuple: (matrix, index) as returned by build_rate_matrix
+    """
+    global _rates, _signature, _checked_at
+
+    with _lock:
+        now = time.monotonic()
+        if _rates is not None and now - _checked_at < REFERENCE_DATA_CHECK_SECONDS:
+            return _rates
+
+        signature = _read_signature()
+        _checked_at = now
+        if _rates is None or signature != _signature:
+            rows = fetch_all("SELECT fromcurrencyid, tocurrencyid, exchangerate FROM exchangerate_latest")
+            _rates = build_rate_matrix(rows)
+            _signature = signature
+        return _rates
+
+
+def invalidate_exchange_rates():
+    """Drops the local matrix so the next lookup reloads it."""
+    global _rates, _signature
+    with _lock:
+        _rates = None
+        _signature = None
+
+
+def get_exchange_rate(from_currency_id, to_currency_id, default=None):
+    """
+    Returns the latest rate from one currency id to another.
+
+    Args:
+        from_currency_id (int): Source currency id
+        to_currency_id (int): Target currency id
+        default: Returned if no rate is known
+
+    Returns:
+        float: The rate, 1.0 for identical currencies, otherwise default if unknown
+    """
+    if from_currency_id == to_currency_id:
+        return 1.0
+
+    matrix, index = get_latest_rate_matrix()
+    i, j = index.get(from_currency_id), index.get(to_currency_id)
+    if i is None or j is None or np.isnan(matrix[i, j]):
+        return default
+    return float(matrix[i, j])
+
+
+def get_exchange_rates_to(from_currency_ids, to_currency_id, default=1.0):
+    """
+    Returns the latest rates from many currency ids to one target currency.
+
+    Args:
+        from_currency_ids (list of int): Source currency ids
+        to_currency_id (int): Target currency id
+        default (float): Rate used where none is known
+
+    Returns:
+        np.ndarray: One rate per source currency id
+    """
+    matrix, index = get_latest_rate_matrix()
+    j = index.get(to_currency_id)
+
+    rates = np.full(len(from_currency_ids), np.nan)
+    if j is not None:
+        rows = np.array([index.get(currency_id, -1) for currency_id in from_currency_ids], dtype=int)
+        known = rows >= 0
+        rates[known] = matrix[rows[known], j]
+
+    same = np.array([currency_id == to_currency_id for currency_id in from_currency_ids], dtype=bool)
+    rates[same] = 1.0
+    rates[np.isnan(rates)] = default
+    return rates
@@ -0,0 +1,241 @@
+"""
+Result cache for the portfolio valuation queries.
+
+Decorated functions are cached per call arguments (portfolio id, base
+currency) and data version. The version combines status.portfoliodata_version,
+bumped by the price and exchange rate fetches and by every change to the
+holdings, with status.referencedata_version, so category, sector and
+region renames are picked up too. A bump never deletes entries: entries of
+an old version are simply no longer asked for and age out of the LRU.
+
+The backend is chosen by QUERY_CACHE_BACKEND: 'memory' keeps a size-capped
+LRU per worker, 'redis' shares the entries between all gunicorn workers
+(requires the redis package; the size cap is then Redis' maxmemory with an
+LRU eviction policy). Values are stored pickled, so callers always get
+their own copy and may modify it.
+"""
+
+import functools
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from app.database.helpers.fetch_one import fetch_one
+from app.database.connection.unit_of_work import after_commit
+from config import (
+    QUERY_CACHE_ENABLED, QUERY_CACHE_BACKEND, QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_CHECK_SECONDS,
+    QUERY_CACHE_REDIS_URL, QUERY_CACHE_TTL_SECONDS
+)
+
+
+class MemoryBackend:
+    """Thread-safe LRU of pickled values with at most max_entries entries."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max(1, int(max_entries))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Entries shared by all workers in Redis, expiring after ttl_seconds."""
+
+    PREFIX = 'portfolio-analyzer:query-cache:'
+
+    def __init__(self, url, ttl_seconds):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self.ttl_seconds = int(ttl_seconds)
+
+    def get(self, key):
+        return self._client.get(self.PREFIX + key)
+
+    def set(self, key, value):
+        self._client.set(self.PREFIX + key, value, ex=self.ttl_seconds)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.PREFIX + '*'):
+            self._client.delete(key)
+
+
+def create_query_cache_backend(name):
+    """
+    Creates a cache backend by name.
+
+    Args:
+        name (str): 'memory' or 'redis'
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == 'memory':
+        return MemoryBackend(QUERY_CACHE_MAX_ENTRIES)
+    if name == 'redis':
+        return RedisBackend(QUERY_CACHE_REDIS_URL, QUERY_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown query cache backend: {name}")
+
+
+_lock = threading.Lock()
+_backend = None
+_version = None
+_checked_at = 0.0
+_stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+
+def get_query_cache_backend():
+    """Returns the backend configured by QUERY_CACHE_BACKEND, created on first use."""
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = create_query_cache_backend(QUERY_CACHE_BACKEND)
+        return _backend
+
+
+def set_query_cache_backend(backend):
+    """Replaces the backend, e.g. with a fresh MemoryBackend in tests. None resets it."""
+    global _backend, _checked_at
+    with _lock:
+        _backend = backend
+        _checked_at = 0.0
+
+
+def _read_version():
+    """Returns 'portfoliodata.referencedata' from the status row, or None if it cannot be read."""
+    try:
+        result = fetch_one("SELECT portfoliodata_version, referencedata_version FROM status WHERE id = 1")
+    except Exception:
+        # Columns missing on databases that have not been upgraded yet
+        return None
+    return f"{result[0]}.{result[1]}" if result else None
+
+
+def get_data_version():
+    """
+    Returns the current data version, read from the database at most every
+    QUERY_CACHE_CHECK_SECONDS.
+
+    Returns:
+        str: The version, or None if it is unknown and nothing may be cached
+    """
+    global _version, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _checked_at and now - _checked_at < QUERY_CACHE_CHECK_SECONDS:
+            return _version
+
+    version = _read_version()
+    with _lock:
+        _version = version
+        _checked_at = now
+    return version
+
+
+def invalidate_data_version():
+    """Forces the next lookup of this worker to read the version again."""
+    global _checked_at
+    with _lock:
+        _checked_at = 0.0
+
+
+def bump_portfolio_data_version(cursor=None):
+    """
+    Marks prices, exchange rates or holdings as changed for all workers.
+
+    The local version is dropped only after the change is committed (see
+    after_commit), so readers of the same request cannot cache uncommitted
+    data under the new version. A failed update raises, letting the caller's
+    changes roll back with it.
+
+    Args:
+        cursor: Runs the update in the caller's transaction; by default it is
+            committed with the unit of work, or on its own outside of one
+    """
+    from app.database.helpers.execute_change_query import execute_change_query
+
+    query = "UPDATE status SET portfoliodata_version = portfoliodata_version + 1 WHERE id = 1"
+    if cursor is not None:
+        cursor.execute(query)
+    else:
+        execute_change_query(query)
+    after_commit(invalidate_data_version)
+
+
+def get_query_cache_stats():
+    """Returns hit, miss and error counts of this worker."""
+    with _lock:
+        return dict(_stats)
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def cached_query(func):
+    """
+    Caches the result of func per call arguments and data version.
+
+    Defaults are applied before building the key, so get_x(1) and
+    get_x(1, 'USD') share an entry if 'USD' is the default. Backend errors
+    are counted and fall back to calling func.
+    """
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not QUERY_CACHE_ENABLED:
+            return func(*args, **kwargs)
+
+        version = get_data_version()
+        if version is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = f"{name}:{version}:{':'.join(repr(value) for value in bound.arguments.values())}"
+
+        try:
+            backend = get_query_cache_backend()
+            cached = backend.get(key)
+        except Exception as e:
+            _count('errors')
+            print(f"⚠️  Query cache read failed: {e}")
+            return func(*args, **kwargs)
+
+        if cached is not None:
+            _count('hits')
+            return pickle.loads(cached)
+
+        _count('misses')
+        result = func(*args, **kwargs)
+        try:
+            backend.set(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            _count('errors')
+            print(f"⚠️  Query cache write failed: {e}")
+        return result
+
+    return wrapper
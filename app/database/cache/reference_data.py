@@ -0,0 +1,140 @@
+"""
+In-process cache for the small reference tables (currency, bondcategory,
+sector, region and exchange).
+
+Every worker loads the tables once and serves lookups from dictionaries.
+The cache is versioned by status.referencedata_version: routes that create,
+edit or delete reference rows call bump_reference_data_version(), which
+invalidates the local copy once the change is committed and the copies of
+other workers on their next version check (at most every
+REFERENCE_DATA_CHECK_SECONDS).
+"""
+
+import threading
+import time
+from app.database.helpers.fetch_all import fetch_all
+from app.database.helpers.fetch_one import fetch_one
+from app.database.helpers.execute_change_query import execute_change_query
+from app.database.connection.unit_of_work import after_commit
+from config import REFERENCE_DATA_CHECK_SECONDS
+
+_lock = threading.Lock()
+_snapshot = None
+_loaded_version = None
+_checked_at = 0.0
+
+
+def _read_version():
+    """Returns the shared reference data version, or 0 if it cannot be read."""
+    try:
+        result = fetch_one("SELECT referencedata_version FROM status WHERE id = 1")
+        return result[0] if result and result[0] is not None else 0
+    except Exception:
+        # Column missing on databases that have not been upgraded yet
+        return 0
+
+
+def _load_snapshot():
+    """Loads all reference tables and builds the lookup dictionaries."""
+    currencies = fetch_all("""SELECT currencyid, currencycode, currencyname FROM currency ORDER BY currencyid""", dictionary=True)
+    categories = fetch_all("""SELECT bondcategoryid, bondcategoryname FROM bondcategory ORDER BY bondcategoryid""", dictionary=True)
+    sectors = fetch_all("""SELECT sectorid, sectorname, sectordisplayname FROM sector ORDER BY sectorid""", dictionary=True)
+    regions = fetch_all("""SELECT regionid, region FROM region ORDER BY regionid""", dictionary=True)
+    exchanges = fetch_all("""SELECT exchangeid, exchangename, r.region, r.regionid FROM exchange JOIN region r ON exchange.region = r.regionid ORDER BY exchangename""", dictionary=True)
+
+    # The views address rows by a generic 'id' key next to the column names
+    for rows, key in ((currencies, 'currencyid'), (categories, 'bondcategoryid'), (sectors, 'sectorid'), (regions, 'regionid')):
+        for row in rows:
+            row['id'] = row[key]
+
+    return {
+        'currencies': currencies,
+        'categories': categories,
+        'sectors': sectors,
+        'regions': regions,
+        'exchanges': exchanges,
+        'currency_id_by_code': {row['currencycode']: row['currencyid'] for row in currencies},
+        'currency_code_by_id': {row['currencyid']: row['currencycode'] for row in currencies},
+    }
+
+
+def get_reference_data():
+    """
+    Returns the current reference data snapshot, reloading it if the shared
+    version has changed since it was loaded.
+
+    Returns:
+        dict: Lists of currencies, categories, sectors, regions and exchanges
+              plus the currency code/id lookup dictionaries
+    """
+    global _snapshot, _loaded_version, _checked_at
+
+    with _lock:
+        now = time.monotonic()
+        if _snapshot is not None and now - _checked_at < REFERENCE_DATA_CHECK_SECONDS:
+            return _snapshot
+
+        version = _read_version()
+        _checked_at = now
+        if _snapshot is None or version != _loaded_version:
+            _snapshot = _load_snapshot()
+            _loaded_version = version
+        return _snapshot
+
+
+def invalidate_reference_data():
+    """Drops the local snapshot so the next lookup reloads it."""
+    global _snapshot, _loaded_version
+    with _lock:
+        _snapshot = None
+        _loaded_version = None
+
+
+def bump_reference_data_version():
+    """
+    Marks the reference data as changed for all workers. Call after any
+    insert, update or delete on currency, bondcategory, sector, region or
+    exchange.
+
+    The local snapshot is dropped after the change is committed (see
+    after_commit), so a lookup later in the same request cannot reload and
+    keep uncommitted rows. A failed update raises, letting the change roll
+    back with it.
+    """
+    execute_change_query("UPDATE status SET referencedata_version = referencedata_version + 1 WHERE id = 1")
+    after_commit(invalidate_reference_data)
+
+
+def get_currencies():
+    """Returns all currencies ordered by id (currencyid/id, currencycode, currencyname)."""
+    return [dict(row) for row in get_reference_data()['currencies']]
+
+
+def get_categories():
+    """Returns all bond categories (bondcategoryid/id, bondcategoryname)."""
+    return [dict(row) for row in get_reference_data()['categories']]
+
+
+def get_sectors():
+    """Returns all sectors (sectorid/id, sectorname, sectordisplayname)."""
+    return [dict(row) for row in get_reference_data()['sectors']]
+
+
+def get_regions():
+    """Returns all regions (regionid/id, region)."""
+    return [dict(row) for row in get_reference_data()['regions']]
+
+
+def get_exchanges():
+    """Returns all exchanges with their region, ordered by name (exchangeid, exchangename, region, regionid)."""
+    return [dict(row) for row in get_reference_data()['exchanges']]
+
+
+def currency_id_by_code(currency_code):
+    """Returns the currency id for a currency code, or None if unknown."""
+    return get_reference_data()['currency_id_by_code'].get(currency_code)
+
+
+def currency_code_by_id(currency_id):
+    """Returns the currency code for a currency id, or None if unknown."""
+    return get_reference_data()['currency_code_by_id'].get(currency_id)
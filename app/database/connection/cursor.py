@@ -1,10 +1,29 @@
 from contextlib import contextmanager
 from .pool import get_db_connection
+from .instrumentation import instrument
+from .unit_of_work import current_unit_of_work, transaction_hooks, run_after_commit
+from .statements import get_statement_cache
 
 @contextmanager
 def db_cursor(dictionary=False):
+    """
+    Yields a cursor for reads or single statements. Inside a unit of work it
+    runs on the shared connection, whose changes are committed when the
+    request or job ends; otherwise on a connection of its own that is
+    committed and returned when the block exits.
+    """
+    unit = current_unit_of_work()
+    if unit is not None:
+        # Buffered, so rows left unread do not block the next statement on the shared connection
+        cursor = instrument(unit.connection.cursor(dictionary=dictionary, buffered=True))
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+        return
+
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=dictionary)
+    cursor = instrument(conn.cursor(dictionary=dictionary))
     try:
         yield cursor
         conn.commit()
@@ -13,4 +32,60 @@ def db_cursor(dictionary=False):
         try:
             conn.close()
         except:
-            pass 
\ No newline at end of file
+            pass
+
+@contextmanager
+def db_transaction(dictionary=False):
+    """
+    Yields a cursor whose statements are committed together when the block
+    exits, or rolled back as a whole if it raises.
+
+    Inside a unit of work the block uses the shared connection: the changes
+    made before it are committed first, so a rollback of the block only
+    discards its own statements, and the block is durable when it exits.
+    after_commit callbacks registered in the block run after its commit.
+    """
+    unit = current_unit_of_work()
+    conn = unit.connection if unit is not None else get_db_connection()
+    if unit is not None:
+        conn.commit()
+        run_after_commit(unit.after_commit)
+    cursor = instrument(conn.cursor(dictionary=dictionary, buffered=unit is not None))
+    try:
+        with transaction_hooks() as hooks:
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        run_after_commit(hooks)
+    finally:
+        cursor.close()
+        if unit is None:
+            try:
+                conn.close()
+            except:
+                pass
+
+@contextmanager
+def db_statement(query, dictionary=False):
+    """
+    Yields a cursor with query prepared on the server, taken from the
+    statement cache of the connection; see db_cursor for which connection
+    is used. Execute it with the same query and fetch all its rows.
+    """
+    unit = current_unit_of_work()
+    conn = unit.connection if unit is not None else get_db_connection()
+    cursor = instrument(get_statement_cache(conn).get(conn, query, dictionary))
+    try:
+        yield cursor
+        if unit is None:
+            conn.commit()
+    finally:
+        cursor.close()
+        if unit is None:
+            try:
+                conn.close()
+            except:
+                pass
@@ -0,0 +1,243 @@
+"""
+SQL instrumentation for the database helpers.
+
+db_cursor, db_transaction and execute_change_query hand out instrumented
+cursors. Every statement is timed (execute plus fetching its rows) and
+recorded under a normalized fingerprint in the QueryStats of the current
+Flask request or tracked block. Statements slower than SLOW_QUERY_MS are
+written to logs/slow_queries.log; the per-request totals are sent in a
+Server-Timing header.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from config import SLOW_QUERY_MS, REQUEST_QUERY_COUNT_WARN, SLOW_QUERY_EXPLAIN, SERVER_TIMING_ENABLED
+
+slow_query_logger = logging.getLogger('slow_queries')
+
+_local = threading.local()
+
+# Slow SELECTs kept per request for EXPLAIN in debug mode
+MAX_EXPLAINED_STATEMENTS = 5
+
+_COMMENT = re.compile(r'/\*.*?\*/|--[^\n]*|#[^\n]*', re.DOTALL)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s')
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    Normalizes a statement so that executions differing only in their
+    values share one fingerprint: literals and placeholders become ?,
+    IN lists and multi-row VALUES collapse, whitespace and comments go.
+    """
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode('utf-8', errors='replace')
+    sql = _STRING.sub('?', sql)
+    sql = _COMMENT.sub(' ', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (?+)', sql)
+    sql = _VALUES_LIST.sub(r'\1', sql)
+    return _WHITESPACE.sub(' ', sql).strip().rstrip(';').strip()
+
+
+class QueryStats:
+    """Statement count, cumulative time and per-fingerprint totals of one request or job."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints = {}
+        self.slow_statements = []
+
+    def record(self, sql, elapsed_ms, params=None):
+        key = fingerprint(sql)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        entry = self.fingerprints.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed_ms
+
+        if elapsed_ms >= SLOW_QUERY_MS and len(self.slow_statements) < MAX_EXPLAINED_STATEMENTS:
+            self.slow_statements.append((sql, params))
+
+    def top(self, n=5):
+        """Returns the n fingerprints with the most executions as (fingerprint, count, total_ms)."""
+        ranked = sorted(self.fingerprints.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)
+        return [(key, count, total_ms) for key, (count, total_ms) in ranked[:n]]
+
+
+def start_tracking():
+    """Starts collecting statements of the current thread into a new QueryStats."""
+    _local.stats = QueryStats()
+    return _local.stats
+
+
+def stop_tracking():
+    """Stops collecting and returns the collected QueryStats, or None."""
+    stats = getattr(_local, 'stats', None)
+    _local.stats = None
+    return stats
+
+
+def current_stats():
+    """Returns the QueryStats of the current thread, or None if nothing is tracked."""
+    return getattr(_local, 'stats', None)
+
+
+@contextmanager
+def track_queries():
+    """Collects the statements of a block, e.g. a scheduled job, into a new QueryStats."""
+    previous = current_stats()
+    try:
+        yield start_tracking()
+    finally:
+        _local.stats = previous
+
+
+def _log_slow_statement(sql, elapsed_ms, rowcount):
+    text = sql.decode('utf-8', errors='replace') if isinstance(sql, (bytes, bytearray)) else sql
+    slow_query_logger.warning(
+        f"SLOW_QUERY: {elapsed_ms:.1f} ms | rows: {rowcount} | {fingerprint(text)[:2000]}"
+    )
+
+
+class InstrumentedCursor:
+    """
+    Wraps a mysql.connector cursor and times each statement including the
+    fetching of its rows. A statement is recorded when the next one starts
+    or the cursor is closed; everything else is delegated to the cursor.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._pending = None
+
+    def _begin(self, sql, params):
+        self._finish()
+        self._pending = [sql, params, 0.0]
+
+    def _timed(self, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if self._pending is not None:
+                self._pending[2] += (time.perf_counter() - start) * 1000
+
+    def _finish(self):
+        if self._pending is None:
+            return
+        sql, params, elapsed_ms = self._pending
+        self._pending = None
+
+        stats = current_stats()
+        if stats is not None:
+            stats.record(sql, elapsed_ms, params if SLOW_QUERY_EXPLAIN else None)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            try:
+                rowcount = self._cursor.rowcount
+            except Exception:
+                rowcount = None
+            _log_slow_statement(sql, elapsed_ms, rowcount)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._begin(operation, params)
+        return self._timed(self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._begin(operation, None)
+        return self._timed(self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def callproc(self, procname, args=(), *more, **kwargs):
+        self._begin(f"CALL {procname}", None)
+        return self._timed(self._cursor.callproc, procname, args, *more, **kwargs)
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._timed(self._cursor.fetchmany, *args, **kwargs)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall)
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def instrument(cursor):
+    """Returns cursor wrapped for instrumentation."""
+    return InstrumentedCursor(cursor)
+
+
+def server_timing_header(stats):
+    """Formats QueryStats as a Server-Timing metric, e.g. 'db;dur=12.3;desc="14 queries"'."""
+    return f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+
+
+def _explain_slow_statements(stats):
+    """Runs EXPLAIN for the slow SELECTs of a request and logs the plans."""
+    from app.database.helpers.fetch_all import fetch_all
+
+    for sql, params in stats.slow_statements:
+        text = sql.decode('utf-8', errors='replace') if isinstance(sql, (bytes, bytearray)) else sql
+        if not text.lstrip().upper().startswith(('SELECT', 'WITH')):
+            continue
+        try:
+            plan = fetch_all(f"EXPLAIN {text}", params, dictionary=True)
+            slow_query_logger.warning(f"EXPLAIN: {fingerprint(text)[:500]} | {plan}")
+        except Exception as e:
+            slow_query_logger.warning(f"EXPLAIN failed: {e}")
+
+
+def init_query_instrumentation(app):
+    """Tracks the statements of every request and reports them in logs and response headers."""
+    from flask import request
+
+    @app.before_request
+    def _start_query_tracking():
+        start_tracking()
+
+    @app.after_request
+    def _report_query_stats(response):
+        stats = stop_tracking()
+        if stats is None:
+            return response
+
+        if SERVER_TIMING_ENABLED:
+            existing = response.headers.get('Server-Timing')
+            metric = server_timing_header(stats)
+            response.headers['Server-Timing'] = f"{existing}, {metric}" if existing else metric
+
+        if stats.count > REQUEST_QUERY_COUNT_WARN:
+            top = "; ".join(f"{count}x {total_ms:.1f} ms {key[:200]}" for key, count, total_ms in stats.top())
+            slow_query_logger.warning(
+                f"QUERY_COUNT: {request.method} {request.path} ({request.endpoint}) issued {stats.count} statements "
+                f"in {stats.total_ms:.1f} ms | top: {top}"
+            )
+
+        if app.debug and SLOW_QUERY_EXPLAIN and stats.slow_statements:
+            _explain_slow_statements(stats)
+
+        return response
+
+    @app.teardown_request
+    def _discard_query_tracking(exc):
+        # after_request is skipped on unhandled errors
+        stop_tracking()
@@ -1,18 +1,191 @@
+"""
+MySQL connection pool of a worker process.
+
+mysql-connector's MySQLConnectionPool fails with PoolError as soon as all
+connections are checked out. MonitoredPool puts a bounded wait in front
+of it: a checkout blocks for up to DB_POOL_TIMEOUT_SECONDS for a free
+connection and only then fails with PoolExhaustedError. Stale connections
+are detected on checkout by the underlying pool, which pings each one and
+reconnects it if the server dropped it; a failed reconnect is counted and
+the connection stays in the pool.
+
+Checkouts, wait and hold times, connections in use, their high-water mark
+and exhaustion events are counted per process (get_pool_stats), so the
+pool of each worker can be sized from data: a high-water mark at the pool
+size together with waits means the pool is too small.
+
+Returned connections keep their session by default
+(DB_POOL_RESET_SESSION=false), so their prepared statements serve the
+next checkout; an open transaction is rolled back on return instead, and
+the application keeps no other session state (user variables, temporary
+tables) between checkouts. DB_POOL_RESET_SESSION=true resets the session
+on every return, which costs a round trip each time and drops the
+prepared statements, so each hot query is prepared again on the next one.
+"""
+
+import threading
+import time
 from mysql.connector import pooling
-from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_NAME
+from mysql.connector.errors import PoolError
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_NAME, DB_POOL_TIMEOUT_SECONDS, DB_POOL_RESET_SESSION
+from .statements import drop_statement_cache
 
 connection_pool = None
 
+
+class PoolExhaustedError(PoolError):
+    """No connection became free within the checkout timeout."""
+
+
+class PooledConnection:
+    """Connection checked out of a MonitoredPool; close() hands it back and frees its slot."""
+
+    def __init__(self, conn, pool):
+        self._conn = conn
+        self._pool = pool
+        # The MySQL connection behind mysql-connector's PooledMySQLConnection
+        self.raw_connection = getattr(conn, '_cnx', conn)
+        self._checked_out_at = time.perf_counter()
+        self._closed = False
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._pool.reset_session:
+                drop_statement_cache(self)
+            elif self._conn.in_transaction:
+                self._conn.rollback()
+        except Exception:
+            pass
+        try:
+            self._conn.close()
+        finally:
+            self._pool._release((time.perf_counter() - self._checked_out_at) * 1000)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class MonitoredPool:
+    """
+    Wraps a MySQLConnectionPool with a bounded blocking checkout and usage counters.
+
+    Args:
+        pool: The MySQLConnectionPool, or anything with get_connection() and pool_size
+        timeout_seconds (float): Default time a checkout waits for a free connection
+    """
+
+    def __init__(self, pool, timeout_seconds):
+        self._pool = pool
+        self.pool_size = pool.pool_size
+        self.timeout_seconds = timeout_seconds
+        self.reset_session = getattr(pool, 'reset_session', True)
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'hold_ms_total': 0.0,
+            'hold_ms_max': 0.0,
+            'high_water': 0,
+            'exhausted': 0,
+            'failed': 0,
+        }
+
+    def get_connection(self, timeout=None):
+        """
+        Checks out a connection, waiting for a free one if necessary.
+
+        Args:
+            timeout (float, optional): Seconds to wait, timeout_seconds by default
+
+        Returns:
+            PooledConnection: Returned to the pool by close()
+
+        Raises:
+            PoolExhaustedError: If no connection became free in time
+            mysql.connector.Error: If a stale connection could not be reconnected
+        """
+        timeout = self.timeout_seconds if timeout is None else timeout
+        start = time.perf_counter()
+        # Waiting for a slot first means the pool below always has a connection left
+        acquired = self._slots.acquire(blocking=False) or self._slots.acquire(timeout=max(timeout, 0))
+        waited_ms = (time.perf_counter() - start) * 1000
+
+        if not acquired:
+            with self._lock:
+                self._stats['exhausted'] += 1
+            print(f"⚠️  Database pool exhausted: no connection free within {timeout}s ({self.pool_size} in use)")
+            raise PoolExhaustedError(f"No database connection free within {timeout}s (pool size {self.pool_size})")
+
+        try:
+            conn = self._pool.get_connection()
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._stats['failed'] += 1
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+            if waited_ms >= 1.0:
+                self._stats['waits'] += 1
+            self._stats['wait_ms_total'] += waited_ms
+            self._stats['wait_ms_max'] = max(self._stats['wait_ms_max'], waited_ms)
+            self._stats['high_water'] = max(self._stats['high_water'], self._in_use)
+        return PooledConnection(conn, self)
+
+    def _release(self, held_ms):
+        with self._lock:
+            self._in_use -= 1
+            self._stats['hold_ms_total'] += held_ms
+            self._stats['hold_ms_max'] = max(self._stats['hold_ms_max'], held_ms)
+        self._slots.release()
+
+    def stats(self):
+        """Returns the counters with the current and average figures derived from them."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_use'] = self._in_use
+        checkouts = stats['checkouts']
+        stats['pool_size'] = self.pool_size
+        stats['wait_ms_avg'] = stats['wait_ms_total'] / checkouts if checkouts else 0.0
+        stats['hold_ms_avg'] = stats['hold_ms_total'] / checkouts if checkouts else 0.0
+        for key in ('wait_ms_total', 'wait_ms_max', 'wait_ms_avg', 'hold_ms_total', 'hold_ms_max', 'hold_ms_avg'):
+            stats[key] = round(stats[key], 1)
+        return stats
+
+
 def init_db_pool():
     global connection_pool
     if connection_pool is None:
-        connection_pool = pooling.MySQLConnectionPool(
-            pool_name=DB_POOL_NAME,
-            pool_size=DB_POOL_SIZE,
-            **DB_CONFIG
+        connection_pool = MonitoredPool(
+            pooling.MySQLConnectionPool(
+                pool_name=DB_POOL_NAME,
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=DB_POOL_RESET_SESSION,
+                **DB_CONFIG
+            ),
+            DB_POOL_TIMEOUT_SECONDS
         )
 
 def get_db_connection():
     if connection_pool is None:
         init_db_pool()
-    return connection_pool.get_connection()
\ No newline at end of file
+    return connection_pool.get_connection()
+
+def get_pool_stats():
+    """Usage counters of this worker's pool, or None before it is created."""
+    return connection_pool.stats() if connection_pool is not None else None
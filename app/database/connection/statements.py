@@ -0,0 +1,131 @@
+"""
+Server-side prepared statements for the hot queries.
+
+A helper called with prepared=True runs its statement through a prepared
+cursor taken from the statement cache of the connection: MySQL parses and
+plans the statement once per connection, later executions only send the
+statement handle and the parameters in the binary protocol.
+
+The cache is an LRU of at most DB_STATEMENT_CACHE_SIZE statements per
+connection, keyed by the exact statement text (statements that only share
+a fingerprint differ in their literals or IN lists and cannot share a
+prepared statement). It lives as long as the server session: the pool
+drops it when it resets the session of a returned connection
+(DB_POOL_RESET_SESSION) and it is discarded when the connection was
+reconnected. DB_PREPARED_STATEMENTS=false sends every statement as text.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from config import DB_STATEMENT_CACHE_SIZE
+
+_caches = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'prepares': 0, 'evictions': 0}
+
+
+class CachedStatement:
+    """
+    Prepared cursor of one statement. It stays open in the cache when the
+    caller is done with it, so close() only marks the end of its use.
+    """
+
+    def __init__(self, cursor, sql):
+        self._cursor = cursor
+        self.sql = sql
+
+    def execute(self, operation=None, params=None):
+        # mysql-connector only skips preparing again for the identical str object
+        return self._cursor.execute(self.sql, params)
+
+    def close(self):
+        pass
+
+    def discard(self):
+        """Deallocates the statement on the server."""
+        try:
+            self._cursor.close()
+        except Exception:
+            # The session is already gone, so is the statement
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class StatementCache:
+    """LRU of the prepared statements of one connection."""
+
+    def __init__(self, max_size, connection_id=None):
+        self.max_size = max(1, int(max_size))
+        self.connection_id = connection_id
+        self._statements = OrderedDict()
+
+    def get(self, conn, sql, dictionary=False):
+        """Returns the CachedStatement for sql, preparing it on conn if it is not cached."""
+        key = (sql, dictionary)
+        statement = self._statements.get(key)
+        if statement is not None:
+            self._statements.move_to_end(key)
+            _count('hits')
+            return statement
+
+        statement = CachedStatement(conn.cursor(prepared=True, dictionary=dictionary), sql)
+        self._statements[key] = statement
+        _count('prepares')
+        while len(self._statements) > self.max_size:
+            _, evicted = self._statements.popitem(last=False)
+            evicted.discard()
+            _count('evictions')
+        return statement
+
+    def clear(self, discard=True):
+        """Empties the cache, deallocating the statements unless the session is already gone."""
+        statements, self._statements = list(self._statements.values()), OrderedDict()
+        if discard:
+            for statement in statements:
+                statement.discard()
+
+    def __len__(self):
+        return len(self._statements)
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def raw_connection(conn):
+    """The MySQL connection behind a pooled connection; it outlives a single checkout."""
+    return getattr(conn, 'raw_connection', conn)
+
+
+def get_statement_cache(conn):
+    """
+    Returns the statement cache of a connection, created on first use and
+    replaced after a reconnect, which deallocates all prepared statements.
+    """
+    raw = raw_connection(conn)
+    connection_id = getattr(raw, 'connection_id', None)
+    cache = _caches.get(raw)
+    if cache is not None and cache.connection_id != connection_id:
+        cache.clear(discard=False)
+        cache = None
+    if cache is None:
+        cache = StatementCache(DB_STATEMENT_CACHE_SIZE, connection_id)
+        _caches[raw] = cache
+    return cache
+
+
+def drop_statement_cache(conn):
+    """Deallocates the prepared statements of a connection, e.g. before its session is reset."""
+    cache = _caches.pop(raw_connection(conn), None)
+    if cache is not None:
+        cache.clear()
+
+
+def get_statement_cache_stats():
+    """Returns the hits, prepares and evictions of this worker."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,214 @@
+"""
+Request- and job-scoped unit of work.
+
+Inside a unit of work every helper (fetch_one, fetch_all, call_procedure,
+execute_change_query, db_cursor, db_transaction) runs on the same pooled
+connection instead of checking one out per statement. The connection is
+borrowed on the first statement, so requests without queries never touch
+the pool, and returned when the unit of work ends: its pending changes
+are committed once if the request or job succeeded and rolled back
+otherwise.
+
+init_unit_of_work opens one per Flask request and commits it in
+after_request, before the response leaves the server; if the commit
+fails the client gets a 500 instead of the view's response. A request
+fails if it raises, answers with a 5xx status or passes through the
+application's error handler, which turns exceptions into redirects. Scheduled jobs and
+background threads use the unit_of_work() context manager. Without an
+active unit of work the helpers keep their previous behaviour of one
+connection per call.
+
+after_commit() defers work that must only happen once the changes are
+durable, such as dropping a worker's cached data version, to the commit
+of the unit of work or db_transaction block that made them; on rollback
+it is discarded.
+"""
+
+import threading
+from contextlib import contextmanager
+from .pool import get_db_connection
+
+_local = threading.local()
+
+
+class UnitOfWork:
+    """One lazily borrowed pooled connection shared by all statements of a request or job."""
+
+    def __init__(self):
+        self._conn = None
+        self.failed = False
+        self.after_commit = []
+
+    @property
+    def connection(self):
+        """The borrowed connection, checked out of the pool on first use."""
+        if self._conn is None:
+            self._conn = get_db_connection()
+        return self._conn
+
+    def close(self, commit=True):
+        """
+        Commits or rolls back the pending changes and returns the connection
+        to the pool.
+
+        Raises:
+            Exception: If the commit fails; the changes are rolled back and
+                the connection is returned anyway
+        """
+        conn, self._conn = self._conn, None
+        if conn is None:
+            if commit:
+                run_after_commit(self.after_commit)
+            self.after_commit.clear()
+            return
+        try:
+            if commit:
+                conn.commit()
+            else:
+                conn.rollback()
+        except Exception:
+            self.after_commit.clear()
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        if commit:
+            run_after_commit(self.after_commit)
+        self.after_commit.clear()
+
+
+def current_unit_of_work():
+    """Returns the UnitOfWork of the current thread, or None."""
+    return getattr(_local, 'unit_of_work', None)
+
+
+def begin_unit_of_work():
+    """Starts a unit of work for the current thread and returns it."""
+    _local.unit_of_work = UnitOfWork()
+    return _local.unit_of_work
+
+
+def mark_unit_of_work_failed():
+    """Lets the unit of work of the current thread roll back instead of commit, e.g. from an error handler."""
+    unit = current_unit_of_work()
+    if unit is not None:
+        unit.failed = True
+
+
+def after_commit(callback):
+    """
+    Runs callback once the changes made so far by the current thread are
+    committed: when the enclosing db_transaction block or unit of work
+    commits, and never if it rolls back. Without either every statement is
+    committed on its own, so callback runs right away.
+    """
+    hooks = getattr(_local, 'transaction_hooks', None)
+    if hooks is None:
+        unit = current_unit_of_work()
+        hooks = unit.after_commit if unit is not None else None
+    if hooks is None:
+        callback()
+    else:
+        hooks.append(callback)
+
+
+@contextmanager
+def transaction_hooks():
+    """Collects the after_commit callbacks registered in a db_transaction block; yields the list."""
+    previous = getattr(_local, 'transaction_hooks', None)
+    _local.transaction_hooks = hooks = []
+    try:
+        yield hooks
+    finally:
+        _local.transaction_hooks = previous
+
+
+def run_after_commit(hooks):
+    """Runs and clears the collected callbacks; the changes are already committed, so failures are only reported."""
+    callbacks = list(hooks)
+    hooks.clear()
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"⚠️  After-commit callback failed: {e}")
+
+
+def end_unit_of_work(commit=True):
+    """Ends the unit of work of the current thread, if any; see UnitOfWork.close."""
+    unit = current_unit_of_work()
+    _local.unit_of_work = None
+    if unit is not None:
+        unit.close(commit=commit and not unit.failed)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Runs a block, e.g. a scheduled job, on one connection that is committed
+    when the block exits and rolled back if it raises. Nested blocks join
+    the unit of work already active in the thread.
+    """
+    existing = current_unit_of_work()
+    if existing is not None:
+        yield existing
+        return
+
+    unit = begin_unit_of_work()
+    try:
+        yield unit
+    except BaseException:
+        end_unit_of_work(commit=False)
+        raise
+    end_unit_of_work()
+
+
+def init_unit_of_work(app):
+    """
+    Shares one connection between all statements of a request and commits
+    it once, before the response is sent, so a failed commit still reaches
+    the client as an error.
+    """
+
+    @app.before_request
+    def _begin_unit_of_work():
+        begin_unit_of_work()
+
+    @app.after_request
+    def _commit_unit_of_work(response):
+        try:
+            end_unit_of_work(commit=response.status_code < 500)
+        except Exception as e:
+            app.logger.error(f"Committing the request's database changes failed: {e}")
+            return _commit_failed_response()
+        return response
+
+    @app.teardown_request
+    def _end_unit_of_work(exc):
+        # Only reached with an open unit of work if no response was built, so nothing is committed
+        try:
+            end_unit_of_work(commit=False)
+        except Exception as e:
+            app.logger.error(f"Rolling back the request's database changes failed: {e}")
+
+
+def _commit_failed_response():
+    """Replaces the response of a request whose changes were rolled back at commit."""
+    from flask import request, session, flash, jsonify, make_response
+
+    message = "Your changes could not be saved. Please try again."
+    if request.is_json or request.path.startswith('/api/'):
+        response = jsonify({"error": message})
+    else:
+        # A success message queued by the view would claim the opposite
+        session.pop('_flashes', None)
+        flash(message, "danger")
+        response = make_response(message)
+    response.status_code = 500
+    return response
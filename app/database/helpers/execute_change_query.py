@@ -1,10 +1,22 @@
 from app.database.connection.cursor import get_db_connection
+from app.database.connection.instrumentation import instrument
+from app.database.connection.unit_of_work import current_unit_of_work
 
 
 def execute_change_query(query, args=None):
     args = args or ()
+    unit = current_unit_of_work()
+    if unit is not None:
+        # Committed with the rest of the request or job
+        cursor = instrument(unit.connection.cursor())
+        try:
+            cursor.execute(query, args)
+        finally:
+            cursor.close()
+        return
+
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = instrument(conn.cursor())
     try:
         cursor.execute(query, args)
         conn.commit()
@@ -13,4 +25,4 @@ def execute_change_query(query, args=None):
         raise e
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
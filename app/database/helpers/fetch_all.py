@@ -1,8 +1,15 @@
-from app.database.connection.cursor import db_cursor
+from app.database.connection.cursor import db_cursor, db_statement
+from config import DB_PREPARED_STATEMENTS
 
 
-def fetch_all(query, args=None, dictionary=False):
+def fetch_all(query, args=None, dictionary=False, prepared=False):
     args = args or ()
+    # prepared: run as a cached server-side prepared statement (hot queries)
+    if prepared and DB_PREPARED_STATEMENTS:
+        with db_statement(query, dictionary=dictionary) as cursor:
+            cursor.execute(query, args)
+            return cursor.fetchall()
+
     with db_cursor(dictionary=dictionary) as cursor:
         cursor.execute(query, args)
-        return cursor.fetchall()
\ No newline at end of file
+        return cursor.fetchall()
@@ -0,0 +1,17 @@
+from app.database.connection.cursor import db_cursor, db_statement
+from app.database.helpers.row_mapping import to_columns
+from config import DB_PREPARED_STATEMENTS
+
+
+def fetch_columns(query, args=None, dtypes=None, prepared=False):
+    """
+    Runs query and returns its result as one NumPy array per column, see
+    row_mapping.to_columns. prepared as in fetch_all.
+    """
+    args = args or ()
+    cursor_for = db_statement(query) if prepared and DB_PREPARED_STATEMENTS else db_cursor()
+    with cursor_for as cursor:
+        cursor.execute(query, args)
+        rows = cursor.fetchall()
+        columns = [column[0] for column in cursor.description]
+    return to_columns(rows, columns, dtypes)
@@ -1,8 +1,17 @@
-from app.database.connection.cursor import db_cursor
+from app.database.connection.cursor import db_cursor, db_statement
+from config import DB_PREPARED_STATEMENTS
 
 
-def fetch_one(query, args=None, dictionary=False):
+def fetch_one(query, args=None, dictionary=False, prepared=False):
     args = args or ()
+    # prepared: run as a cached server-side prepared statement (hot queries)
+    if prepared and DB_PREPARED_STATEMENTS:
+        with db_statement(query, dictionary=dictionary) as cursor:
+            cursor.execute(query, args)
+            # All rows are read, so none are left unread on the cached statement
+            rows = cursor.fetchall()
+            return rows[0] if rows else None
+
     with db_cursor(dictionary=dictionary) as cursor:
         cursor.execute(query, args)
-        return cursor.fetchone()
\ No newline at end of file
+        return cursor.fetchone()
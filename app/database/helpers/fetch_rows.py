@@ -0,0 +1,17 @@
+from app.database.connection.cursor import db_cursor, db_statement
+from app.database.helpers.row_mapping import map_rows
+from config import DB_PREPARED_STATEMENTS
+
+
+def fetch_rows(query, row_type, args=None, prepared=False):
+    """
+    Runs query and decodes its rows into row_type instances, see
+    row_mapping.map_rows. prepared as in fetch_all.
+    """
+    args = args or ()
+    cursor_for = db_statement(query) if prepared and DB_PREPARED_STATEMENTS else db_cursor()
+    with cursor_for as cursor:
+        cursor.execute(query, args)
+        rows = cursor.fetchall()
+        columns = [column[0] for column in cursor.description]
+    return map_rows(rows, columns, row_type)
@@ -0,0 +1,141 @@
+"""
+Decoding of result sets into typed rows or columns.
+
+Rows are read as plain tuples, never as per-row dicts, and decoded either
+into instances of a slotted dataclass (map_rows) or into one NumPy array
+per column (to_columns). Numbers are converted once to the Python or NumPy
+type declared for them, so DECIMAL columns arrive as float; NULL stays
+None (NaN in float arrays) instead of a sentinel string.
+
+The decoding plan of a row type is derived from its field annotations
+and cached per (row type, result columns).
+"""
+
+import dataclasses
+import types
+import typing
+from functools import lru_cache
+import numpy as np
+
+# Annotated types converted on read; all others are taken as the driver returns them
+CONVERTERS = {float: float, int: int, bool: bool}
+
+
+def _base_type(annotation):
+    """float for float and Optional[float]; the annotation itself otherwise."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _plan(row_type, columns):
+    """
+    Builds (source, converter) per constructor argument of row_type: source
+    is the column index, or None to pass the field default.
+
+    Raises:
+        ValueError: If a column has no field or a field neither a column nor a default
+    """
+    hints = typing.get_type_hints(row_type)
+    fields = [field for field in dataclasses.fields(row_type) if field.init]
+    names = {field.name for field in fields}
+    unknown = [column for column in columns if column not in names]
+    if unknown:
+        raise ValueError(f"{row_type.__name__} has no field for column(s): {', '.join(unknown)}")
+
+    index = {column: i for i, column in enumerate(columns)}
+    plan = []
+    for field in fields:
+        if field.name in index:
+            plan.append((index[field.name], CONVERTERS.get(_base_type(hints[field.name]))))
+        elif field.default is not dataclasses.MISSING:
+            plan.append((None, field.default))
+        else:
+            raise ValueError(f"{row_type.__name__}.{field.name} is missing from the result")
+    return plan
+
+
+@lru_cache(maxsize=256)
+def row_decoder(row_type, columns):
+    """
+    Returns a function decoding one result tuple into row_type.
+
+    Args:
+        row_type: A dataclass, ideally declared with slots=True
+        columns (tuple of str): Column names of the result, in order
+    """
+    plan = _plan(row_type, columns)
+    if all(source is not None and converter is None for source, converter in plan):
+        order = [source for source, _ in plan]
+        if order == list(range(len(columns))):
+            return lambda row: row_type(*row)
+
+    def decode(row):
+        values = []
+        for source, converter in plan:
+            if source is None:
+                values.append(converter)
+                continue
+            value = row[source]
+            values.append(converter(value) if converter is not None and value is not None else value)
+        return row_type(*values)
+
+    return decode
+
+
+def map_rows(rows, columns, row_type):
+    """
+    Decodes result tuples into row_type instances.
+
+    Args:
+        rows (list of tuple): The result rows
+        columns (sequence of str): Column names of the result
+        row_type: Dataclass with one field per column; fields without a
+            column must have a default
+
+    Returns:
+        list: One row_type instance per row
+    """
+    decode = row_decoder(row_type, tuple(columns))
+    return [decode(row) for row in rows]
+
+
+def to_columns(rows, columns, dtypes=None):
+    """
+    Transposes result tuples into one NumPy array per column.
+
+    Args:
+        rows (list of tuple): The result rows
+        columns (sequence of str): Column names of the result
+        dtypes (dict, optional): column -> float or int; float columns hold
+            NULL as NaN, int columns must not contain NULL, all other
+            columns are object arrays holding NULL as None
+
+    Returns:
+        dict: column -> np.ndarray of len(rows)
+
+    Raises:
+        ValueError: If an int column contains NULL
+    """
+    dtypes = dtypes or {}
+    count = len(rows)
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+
+    result = {}
+    for column, column_values in zip(columns, values):
+        dtype = dtypes.get(column)
+        if dtype is float:
+            result[column] = np.fromiter(
+                (np.nan if value is None else value for value in column_values), dtype=np.float64, count=count
+            )
+        elif dtype is int:
+            if any(value is None for value in column_values):
+                raise ValueError(f"Column {column} contains NULL")
+            result[column] = np.fromiter(column_values, dtype=np.int64, count=count)
+        else:
+            array = np.empty(count, dtype=object)
+            array[:] = column_values
+            result[column] = array
+    return result
@@ -1,4 +1,5 @@
 import os
+import re
 import glob
 import mysql.connector
 from config import DB_CONFIG, DB_ROOT_CONFIG
@@ -13,6 +14,17 @@ from app.database.tables.exchange.insert_exchange import insert_exchanges
 from app.database.tables.region.insert_region import insert_regions
 from app.database.tables.bond.insert_default_stocks import insert_default_stocks
 from app.database.tables.portfolio.insert_portfolios_for_admin import insert_portfolios_for_admin
+from app.database.tables.bonddata.add_bonddata_unique_key import add_bonddata_unique_key
+from app.database.tables.bonddata.add_bonddata_ohlc import add_bonddata_ohlc
+from app.database.tables.bonddata_backfill.add_bonddata_backfill_table import add_bonddata_backfill_table
+from app.database.tables.portfolio_risk.add_portfolio_risk_table import add_portfolio_risk_table
+from app.database.tables.exchangerate.add_exchangerate_unique_key import add_exchangerate_unique_key
+from app.database.tables.status.add_referencedata_version import add_referencedata_version
+from app.database.tables.status.add_portfoliodata_version import add_portfoliodata_version
+from app.database.tables.status.add_scheduler_lease import add_scheduler_lease
+from app.database.tables.bond_latest.add_bond_latest_table import add_bond_latest_table
+from app.database.tables.exchangerate_latest.add_exchangerate_latest_table import add_exchangerate_latest_table
+from app.database.tables.bond.add_bond_indexes import add_bond_indexes
 
 # Constants - will be set dynamically
 MYSQL_DB = None
@@ -252,12 +264,84 @@ def get_sql_files():
                 sql_files.append(full_path)
     return sql_files
 
+def upgrade_database():
+    """Apply schema changes to a database created by an earlier version."""
+    print("🔧 Checking for schema upgrades...")
+
+    if add_bonddata_unique_key():
+        print("    ✅ bonddata unique key (bondid, bonddatalogtime) present")
+    else:
+        print("    ⚠️  Could not add bonddata unique key")
+
+    if add_exchangerate_unique_key():
+        print("    ✅ exchangerate unique key (fromcurrencyid, tocurrencyid, exchangeratelogtime) present")
+    else:
+        print("    ⚠️  Could not add exchangerate unique key")
+
+    if add_referencedata_version():
+        print("    ✅ status.referencedata_version column present")
+    else:
+        print("    ⚠️  Could not add status.referencedata_version column")
+
+    if add_portfoliodata_version():
+        print("    ✅ status.portfoliodata_version column present")
+    else:
+        print("    ⚠️  Could not add status.portfoliodata_version column")
+
+    if add_scheduler_lease():
+        print("    ✅ status scheduler lease columns present")
+    else:
+        print("    ⚠️  Could not add status scheduler lease columns")
+
+    if add_bond_latest_table():
+        print("    ✅ bond_latest table and triggers present")
+    else:
+        print("    ⚠️  Could not add bond_latest table")
+
+    if add_exchangerate_latest_table():
+        print("    ✅ exchangerate_latest table and triggers present")
+    else:
+        print("    ⚠️  Could not add exchangerate_latest table")
+
+    if add_bonddata_ohlc():
+        print("    ✅ bonddata OHLC columns present")
+    else:
+        print("    ⚠️  Could not add bonddata OHLC columns")
+
+    if add_bonddata_backfill_table():
+        print("    ✅ bonddata_backfill table present")
+    else:
+        print("    ⚠️  Could not add bonddata_backfill table")
+
+    if add_portfolio_risk_table():
+        print("    ✅ portfolio_risk table present")
+    else:
+        print("    ⚠️  Could not add portfolio_risk table")
+
+    if add_bond_indexes():
+        print("    ✅ bond indexes for the security overview present")
+    else:
+        print("    ⚠️  Could not add bond indexes")
+
+    refresh_stored_routines()
+
+def refresh_stored_routines():
+    """Re-create all stored procedures and functions so existing databases pick up changed SQL."""
+    for f in sorted(get_sql_files()):
+        with open(f, 'r', encoding='utf-8') as sql_file:
+            match = re.match(r'\s*CREATE\s+(PROCEDURE|FUNCTION)\s+`?(\w+)`?', sql_file.read(), re.IGNORECASE)
+        if not match:
+            continue
+        execute_change_query(f"DROP {match.group(1).upper()} IF EXISTS {match.group(2)}")
+        execute_sql_file(f)
+
 def main():
     print("🚀 Starting database setup...")
     
     # Check if database is already initialized
     if database_exists_and_initialized():
         print("✅ Database is already initialized - skipping setup")
+        upgrade_database()
         print("ℹ️  Application is ready to use existing database")
         return
     
@@ -286,12 +370,16 @@ def main():
         "currency",
         "user",
         "exchangerate",
+        "exchangerate_latest",
         "bondcategory",
         "exchange",
         "bond",
         "bonddata",
+        "bond_latest",
+        "bonddata_backfill",
         "portfolio",
         "portfolio_bond",
+        "portfolio_risk",
         "api_fetch_logs",
         "status"
     ]
@@ -1,6 +1,12 @@
 from app.database.helpers.execute_change_query import execute_change_query
+from app.database.connection.cursor import db_transaction
 from datetime import datetime, timezone
 
+LOG_API_FETCH_QUERY = """
+    INSERT INTO api_fetch_logs (symbol, fetch_type, status, error_message, fetch_time)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
 def log_api_fetch(symbol, fetch_type, status, error_message=None):
     """
     Log an API fetch attempt to the database.
@@ -12,11 +18,7 @@ def log_api_fetch(symbol, fetch_type, status, error_message=None):
         error_message (str, optional): Error message if the fetch failed
     """
     try:
-        query = """
-            INSERT INTO api_fetch_logs (symbol, fetch_type, status, error_message, fetch_time)
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        execute_change_query(query, (symbol, fetch_type, status, error_message, datetime.now(timezone.utc)))
+        execute_change_query(LOG_API_FETCH_QUERY, (symbol, fetch_type, status, error_message, datetime.now(timezone.utc)))
     except Exception as e:
         # Don't let logging errors break the main functionality
         print(f"Failed to log API fetch: {e}")
@@ -27,4 +29,27 @@ def log_api_fetch_success(symbol, fetch_type):
 
 def log_api_fetch_failure(symbol, fetch_type, error_message):
     """Log a failed API fetch."""
-    log_api_fetch(symbol, fetch_type, 'FAILED', error_message)
\ No newline at end of file
+    log_api_fetch(symbol, fetch_type, 'FAILED', error_message)
+
+
+def log_api_fetches(entries, cursor=None):
+    """
+    Log several API fetch results with a single batched insert.
+
+    Args:
+        entries (list of tuple): (symbol, fetch_type, status, error_message) tuples
+        cursor (optional): Cursor of an open transaction to write through, so the
+            log rows are committed together with the data they describe.
+    """
+    if not entries:
+        return
+
+    fetch_time = datetime.now(timezone.utc)
+    rows = [(symbol, fetch_type, status, error_message, fetch_time)
+            for symbol, fetch_type, status, error_message in entries]
+
+    if cursor is None:
+        with db_transaction() as cursor:
+            cursor.executemany(LOG_API_FETCH_QUERY, rows)
+    else:
+        cursor.executemany(LOG_API_FETCH_QUERY, rows)
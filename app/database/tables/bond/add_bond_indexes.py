@@ -0,0 +1,38 @@
+from app.database.helpers.fetch_all import fetch_all
+from app.database.connection.cursor import db_transaction
+
+# InnoDB appends the primary key to every secondary index, so each of them
+# is ordered by (columns..., bondid): the keyset order of the security
+# overview. bondsymbol already has its unique key.
+BOND_INDEXES = {
+    'idx_bond_name': '(bondname)',
+    'idx_bond_category_name': '(bondcategoryid, bondname)',
+    'idx_bond_category_symbol': '(bondcategoryid, bondsymbol)',
+}
+
+def add_bond_indexes():
+    """
+    Adds the indexes serving the sorted and category filtered pages of the
+    admin security overview on databases created before they existed.
+
+    Returns:
+        bool: True if all indexes exist afterwards, False otherwise
+    """
+    try:
+        existing = {row[0] for row in fetch_all("""
+            SELECT DISTINCT index_name
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+            AND table_name = 'bond'
+        """)}
+        missing = [f"ADD INDEX {name} {columns}" for name, columns in BOND_INDEXES.items() if name not in existing]
+        if not missing:
+            return True
+
+        with db_transaction() as cursor:
+            cursor.execute(f"ALTER TABLE bond {', '.join(missing)}")
+        return True
+
+    except Exception as e:
+        print(f"Failed to add bond indexes: {e}")
+        return False
@@ -13,5 +13,8 @@ CREATE TABLE bond (
     FOREIGN KEY (bondcategoryid) REFERENCES bondcategory (bondcategoryid),
     FOREIGN KEY (bondcurrencyid) REFERENCES currency (currencyid) ON DELETE RESTRICT,
     FOREIGN KEY (bondexchangeid) REFERENCES exchange (exchangeid) ON DELETE RESTRICT,
-    FOREIGN KEY (bondsectorid) REFERENCES sector (sectorid) ON DELETE RESTRICT
+    FOREIGN KEY (bondsectorid) REFERENCES sector (sectorid) ON DELETE RESTRICT,
+    INDEX idx_bond_name (bondname),
+    INDEX idx_bond_category_name (bondcategoryid, bondname),
+    INDEX idx_bond_category_symbol (bondcategoryid, bondsymbol)
 );
\ No newline at end of file
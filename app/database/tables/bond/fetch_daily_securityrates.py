@@ -1,86 +1,84 @@
 from datetime import date
-from app.database.tables.user.get_distinct_user_bond_symbols import get_distinct_user_bond_symbols
 from app.database.helpers.fetch_all import fetch_all
 from app.database.helpers.fetch_one import fetch_one
-from app.api.get_eod_prices import get_eod_prices
-from app.database.tables.bonddata.bonddata_exists import bonddata_exists
-from flask import current_app
-from app.database.helpers.execute_change_query import execute_change_query
+from app.database.connection.cursor import db_transaction
+from app.database.cache.query_cache import bump_portfolio_data_version
+from app.database.tables.bonddata.upsert_bonddata import upsert_bonddata
+from app.database.tables.api_fetch_logs.log_api_fetch import log_api_fetches
+from app.api.get_eod_prices import iter_eod_prices
 
 def fetch_daily_securityrates():
-    
+    """
+    Fetches the latest end-of-day prices for all securities and writes them
+    to bonddata. All prices, the api_fetch_logs rows and the status update
+    are written in one transaction with batched statements.
+    """
+
     last_update = fetch_one("SELECT securities FROM status WHERE id = 1")[0]
 
     if last_update == date.today():
         # Already updated today → skip
         return
 
-    query = "SELECT bondsymbol FROM bond"
-    bonds = [i[0] for i in fetch_all(query=query)]
-    
-    rates = get_eod_prices(bonds)
-    
-    # Track results for bulk logging
-    successful_fetches = 0
-    failed_fetches = 0
+    # Resolve all symbol → bondid mappings in one query
+    bond_ids = {symbol: bondid for bondid, symbol in fetch_all("SELECT bondid, bondsymbol FROM bond")}
+
+    # Collect rows for the batched upsert and the failures for bulk logging
+    rows = []
     failed_symbols = []
 
-    for bond_symbol, (rate, volume, trade_date) in rates.items():
-        bond_id = fetch_one("SELECT bondid FROM bond WHERE bondsymbol = %s", (bond_symbol,))[0]
+    # Prices are downloaded in parallel chunks; a failed chunk only fails its own symbols
+    for outcome in iter_eod_prices(list(bond_ids)):
+        bond_symbol = outcome.symbol
+        rate, volume, trade_date = outcome.value or (None, None, None)
+        bond_id = bond_ids.get(bond_symbol)
 
         if not bond_id or not rate or not trade_date:
-            # Track failed fetch
-            failed_fetches += 1
             error_msg = "No data available"
-            if not bond_id:
+            if outcome.error and outcome.value is None:
+                error_msg = outcome.error
+            elif not bond_id:
                 error_msg = "Bond not found in database"
             elif not rate:
                 error_msg = "No price data available"
             elif not trade_date:
                 error_msg = "No trade date available"
-            
+
             failed_symbols.append((bond_symbol, error_msg))
             continue
 
-        # Track successful fetch
-        successful_fetches += 1
+        rows.append((bond_id, rate, volume, trade_date))
+
+    successful_fetches = len(rows)
+    failed_fetches = len(failed_symbols)
+
+    if failed_fetches == 0:
+        # All successful
+        bulk_entry = ('STOCK_FETCH_BULK', 'STOCK', 'SUCCESS', f'Successfully fetched {successful_fetches} stocks')
+    elif successful_fetches == 0:
+        # All failed
+        bulk_entry = ('STOCK_FETCH_BULK', 'STOCK', 'FAILED', f'Failed to fetch all {failed_fetches} stocks')
+    else:
+        # Partially successful
+        bulk_entry = ('STOCK_FETCH_BULK', 'STOCK', 'PARTIAL', f'Successfully fetched {successful_fetches} stocks, {failed_fetches} failed')
+
+    # Individual failures feed the failed fetches section of the API management page
+    log_entries = [bulk_entry] + [(symbol, 'STOCK', 'FAILED', error_msg) for symbol, error_msg in failed_symbols]
+
+    with db_transaction() as cursor:
+        upsert_bonddata(rows, cursor=cursor)
 
-        if bonddata_exists(bond_id, log_date=trade_date):
-            execute_change_query("""
-                UPDATE bonddata
-                SET bondrate = %s, bondvolume = %s
-                WHERE bondid = %s AND bonddatalogtime = %s
-            """, (rate, volume, bond_id, trade_date))
-        else:
-            execute_change_query("""
-                INSERT INTO bonddata (bondid, bondrate, bondvolume, bonddatalogtime)
-                VALUES (%s, %s, %s, %s)
-            """, (bond_id, rate, volume, trade_date))
-    
-    # Log bulk operation result
-    try:
-        from app.database.tables.api_fetch_logs.log_api_fetch import log_api_fetch
-        
-        if failed_fetches == 0:
-            # All successful
-            log_api_fetch('STOCK_FETCH_BULK', 'STOCK', 'SUCCESS', f'Successfully fetched {successful_fetches} stocks')
-        elif successful_fetches == 0:
-            # All failed
-            log_api_fetch('STOCK_FETCH_BULK', 'STOCK', 'FAILED', f'Failed to fetch all {failed_fetches} stocks')
-        else:
-            # Partially successful
-            log_api_fetch('STOCK_FETCH_BULK', 'STOCK', 'PARTIAL', f'Successfully fetched {successful_fetches} stocks, {failed_fetches} failed')
-        
-        # Log individual failures for failed fetches section
-        for symbol, error_msg in failed_symbols:
-            log_api_fetch(symbol, 'STOCK', 'FAILED', error_msg)
-            
-    except Exception as e:
-        # Log to console if API logging fails (e.g., during setup)
-        print(f"⚠️  API logging failed: {e}")
-        pass
+        # A logging failure (e.g. missing api_fetch_logs table during setup)
+        # must not roll back the prices, so it is isolated by a savepoint
+        cursor.execute("SAVEPOINT api_fetch_logs")
+        try:
+            log_api_fetches(log_entries, cursor=cursor)
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT api_fetch_logs")
+            print(f"⚠️  API logging failed: {e}")
 
-    # Update global status (when fetch was executed, not last trading date)
-    execute_change_query("""
-        UPDATE status SET securities = %s WHERE id = 1
-    """, (date.today(),))
+        # Update global status (when fetch was executed, not last trading date)
+        cursor.execute("""
+            UPDATE status SET securities = %s WHERE id = 1
+        """, (date.today(),))
+        bump_portfolio_data_version(cursor)
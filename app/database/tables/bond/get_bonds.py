@@ -4,12 +4,7 @@ def get_bonds(search=None, category_filter=None):
     query = """
         SELECT b.*, bc.bondcategoryname, bd.bondrate, bd.bonddatalogtime, c.currencycode
         FROM bond b JOIN bondcategory bc USING(bondcategoryid)
-        JOIN (
-            SELECT bondid, bondrate, bonddatalogtime
-            FROM bonddata bd1 WHERE bonddatalogtime = (
-            SELECT MAX(bd2.bonddatalogtime) FROM bonddata bd2
-            WHERE bd2.bondid = bd1.bondid))
-            bd ON bd.bondid = b.bondid
+        JOIN bond_latest bd ON bd.bondid = b.bondid
         JOIN currency c ON c.currencyid = b.bondcurrencyid
         WHERE (%s IS NULL OR bondcategoryname = %s)
         AND (%s IS NULL OR (bondsymbol LIKE %s OR bondname LIKE %s))
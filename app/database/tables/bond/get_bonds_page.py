@@ -0,0 +1,209 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from app.database.helpers.fetch_one import fetch_one
+from app.database.helpers.fetch_rows import fetch_rows
+
+
+@dataclass(slots=True)
+class SecurityRow:
+    """A security of the admin overview with its latest price; the price fields are None without one."""
+    bondid: int
+    bondsymbol: str
+    bondname: str
+    bonddescription: Optional[str]
+    bondcountry: Optional[str]
+    bondexchangeid: Optional[int]
+    bondwebsite: Optional[str]
+    bondindustry: Optional[str]
+    bondsectorid: Optional[int]
+    bondcategoryid: int
+    bondcurrencyid: int
+    bondcategoryname: str
+    bondrate: Optional[float]
+    bondvolume: Optional[int]
+    bonddatalogtime: Optional[date]
+    currencycode: str
+    region: Optional[str]
+    sectorname: Optional[str]
+    sectordisplayname: Optional[str]
+    exchange_rate_to_base: Optional[float] = None
+
+
+SELECT_SECURITIES = """
+    SELECT
+        b.bondid,
+        b.bondsymbol,
+        b.bondname,
+        b.bonddescription,
+        b.bondcountry,
+        b.bondexchangeid,
+        b.bondwebsite,
+        b.bondindustry,
+        b.bondsectorid,
+        b.bondcategoryid,
+        b.bondcurrencyid,
+        bc.bondcategoryname,
+        bd.bondrate,
+        bd.bondvolume,
+        bd.bonddatalogtime,
+        c.currencycode,
+        r.region,
+        s.sectorname,
+        s.sectordisplayname
+"""
+
+FROM_SECURITIES = """
+    FROM bond b
+    JOIN bondcategory bc USING(bondcategoryid)
+    LEFT JOIN bond_latest bd ON bd.bondid = b.bondid
+    JOIN currency c ON c.currencyid = b.bondcurrencyid
+    LEFT JOIN exchange e ON e.exchangeid = b.bondexchangeid
+    LEFT JOIN region r ON r.regionid = e.region
+    LEFT JOIN sector s ON s.sectorid = b.bondsectorid
+"""
+
+# Sort key -> (SQL expression, SecurityRow field, nullable). Symbol and name
+# pages are read in order from the bond indexes (add_bond_indexes); price and
+# date pages are sorted by MySQL, which still only sends one page.
+SORT_KEYS = {
+    'symbol': ('b.bondsymbol', 'bondsymbol', False),
+    'name': ('b.bondname', 'bondname', False),
+    'price': ('bd.bondrate', 'bondrate', True),
+    'date': ('bd.bonddatalogtime', 'bonddatalogtime', True),
+}
+
+
+def _filters(search=None, category_filter=None, region_filter=None, sector_filter=None):
+    """Returns the WHERE conditions and their parameters for the given filters."""
+    conditions, params = [], []
+    if category_filter:
+        conditions.append("bc.bondcategoryname = %s")
+        params.append(category_filter)
+    if region_filter:
+        conditions.append("r.region = %s")
+        params.append(region_filter)
+    if sector_filter:
+        conditions.append("s.sectorname = %s")
+        params.append(sector_filter)
+    if search:
+        conditions.append("(b.bondsymbol LIKE %s OR b.bondname LIKE %s)")
+        params.extend([f"%{search}%", f"%{search}%"])
+    return conditions, params
+
+
+def _where(conditions):
+    return "WHERE " + "\n      AND ".join(conditions) if conditions else ""
+
+
+def encode_cursor(row, sort):
+    """Returns the opaque position after row in a listing sorted by sort."""
+    value = getattr(row, SORT_KEYS[sort][1])
+    if isinstance(value, date):
+        value = value.isoformat()
+    raw = json.dumps([value, row.bondid]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, sort):
+    """
+    Returns the (sort value, bondid) encoded by encode_cursor.
+
+    Raises:
+        ValueError: If token is not a cursor of this sort key
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        value, bondid = json.loads(raw)
+        if value is not None:
+            if sort == 'price':
+                # Exact, so the position compares equal to the DECIMAL it came from
+                value = Decimal(str(value))
+            elif sort == 'date':
+                value = date.fromisoformat(value)
+            elif not isinstance(value, str):
+                raise TypeError(value)
+        elif not SORT_KEYS[sort][2]:
+            raise TypeError(value)
+        return value, int(bondid)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+def _keyset(sort, descending, after):
+    """
+    Returns the ORDER BY clause and, for a position, the condition for the
+    rows after it. Nullable keys list securities without a value last in
+    both directions; bondid breaks ties, so every position is unique.
+    """
+    expression, _, nullable = SORT_KEYS[sort]
+    direction, op = ('DESC', '<') if descending else ('ASC', '>')
+    order_by = f"{expression} {direction}, b.bondid {direction}"
+    if nullable:
+        order_by = f"{expression} IS NULL, {order_by}"
+    if after is None:
+        return order_by, None, []
+
+    value, bondid = after
+    if value is None:
+        return order_by, f"({expression} IS NULL AND b.bondid {op} %s)", [bondid]
+    condition = f"{expression} {op} %s OR ({expression} = %s AND b.bondid {op} %s)"
+    if nullable:
+        condition = f"{expression} IS NULL OR {condition}"
+    return order_by, f"({condition})", [value, value, bondid]
+
+
+def get_bonds_page(search=None, category_filter=None, region_filter=None, sector_filter=None,
+                   sort='name', descending=False, after=None, limit=50):
+    """
+    Returns one page of the security listing with keyset pagination: a page
+    continues after the position of the previous page's last row instead of
+    skipping an OFFSET, so every page costs the same.
+
+    Args:
+        search (str, optional): Part of the symbol or name
+        category_filter, region_filter, sector_filter (str, optional): Exact
+            category name, region and sector name
+        sort (str): One of SORT_KEYS
+        descending (bool): Sort direction
+        after (str, optional): Cursor returned with the previous page
+        limit (int): Rows per page
+
+    Returns:
+        tuple: (list of SecurityRow, cursor of the next page or None on the last page)
+
+    Raises:
+        ValueError: If sort or after is invalid
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+
+    conditions, params = _filters(search, category_filter, region_filter, sector_filter)
+    order_by, condition, keyset_params = _keyset(sort, descending, decode_cursor(after, sort) if after else None)
+    if condition:
+        conditions.append(condition)
+        params.extend(keyset_params)
+
+    query = f"""
+        {SELECT_SECURITIES}
+        {FROM_SECURITIES}
+        {_where(conditions)}
+        ORDER BY {order_by}
+        LIMIT %s
+    """
+    # One extra row tells whether another page follows
+    rows = fetch_rows(query, SecurityRow, params + [limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], sort)
+
+
+def count_bonds(search=None, category_filter=None, region_filter=None, sector_filter=None):
+    """Returns the number of securities matching the filters of get_bonds_page."""
+    conditions, params = _filters(search, category_filter, region_filter, sector_filter)
+    row = fetch_one(f"SELECT COUNT(*) {FROM_SECURITIES} {_where(conditions)}", params)
+    return row[0] if row else 0
@@ -32,10 +32,8 @@ def get_full_bond(bond_id):
     LEFT JOIN bondcategory bc ON b.bondcategoryid = bc.bondcategoryid
     LEFT JOIN exchange e on b.bondexchangeid = e.exchangeid
     LEFT JOIN sector s ON b.bondsectorid = s.sectorid
-    LEFT JOIN bonddata bd ON bd.bondid = b.bondid
+    LEFT JOIN bond_latest bd ON bd.bondid = b.bondid
     WHERE b.bondid = %s
-    ORDER BY bd.bonddatalogtime DESC
-    LIMIT 1
     """
-    bond = fetch_one(query, (bond_id,), dictionary=True)
+    bond = fetch_one(query, (bond_id,), dictionary=True, prepared=True)
     return bond if bond else None
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+from app.database.helpers.fetch_one import fetch_one
+from app.database.connection.cursor import db_transaction
+
+TABLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SQL_FILES = [
+    os.path.join(TABLES_DIR, 'bond_latest', 'create_bond_latest.sql'),
+    os.path.join(TABLES_DIR, 'bonddata', 'trigger_update_bond_latest_after_insert.sql'),
+    os.path.join(TABLES_DIR, 'bonddata', 'trigger_update_bond_latest_after_update.sql'),
+    os.path.join(TABLES_DIR, 'bonddata', 'trigger_update_bond_latest_after_delete.sql'),
+]
+
+BACKFILL_QUERY = """
+    INSERT INTO bond_latest (bondid, bondrate, bondvolume, bonddatalogtime)
+    SELECT bd.bondid, bd.bondrate, bd.bondvolume, bd.bonddatalogtime
+    FROM bonddata bd
+    JOIN (
+        SELECT bondid, MAX(bonddatalogtime) AS max_time
+        FROM bonddata
+        GROUP BY bondid
+    ) latest ON bd.bondid = latest.bondid AND bd.bonddatalogtime = latest.max_time
+    ON DUPLICATE KEY UPDATE bondid = bond_latest.bondid
+"""
+
+def add_bond_latest_table():
+    """
+    Creates the bond_latest table and the bonddata triggers that maintain it
+    on databases created before it existed, then fills it from bonddata.
+
+    Returns:
+        bool: True if the table exists afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+            AND table_name = 'bond_latest'
+        """)
+        if existing and existing[0] > 0:
+            return True
+
+        with db_transaction() as cursor:
+            # Triggers first, so prices written during the backfill are not missed
+            for path in SQL_FILES:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cursor.execute(f.read())
+            cursor.execute(BACKFILL_QUERY)
+        return True
+
+    except Exception as e:
+        print(f"Failed to add bond_latest table: {e}")
+        return False
@@ -0,0 +1,7 @@
+CREATE TABLE bond_latest (
+    bondid INT PRIMARY KEY NOT NULL,
+    bondrate DECIMAL(15, 5) NOT NULL,
+    bondvolume BIGINT,
+    bonddatalogtime DATE NOT NULL,
+    FOREIGN KEY (bondid) REFERENCES bond (bondid) ON DELETE CASCADE
+);
\ No newline at end of file
@@ -1,7 +1,6 @@
-from app.database.helpers.fetch_all import fetch_all
+from app.database.cache.reference_data import get_categories
 
 
 def get_all_categories():
-    query = """SELECT bondcategoryid, bondcategoryname FROM bondcategory"""
-    categories = fetch_all(query=query, dictionary=True)
+    categories = get_categories()
     return categories
\ No newline at end of file
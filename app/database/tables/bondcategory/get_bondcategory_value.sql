@@ -10,32 +10,17 @@ BEGIN
 
     SELECT ROUND(SUM(
         bd.bondrate * pb.quantity *
-        COALESCE((
-            SELECT er.exchangerate
-            FROM exchangerate er
-            WHERE er.fromcurrencyid = b.bondcurrencyid
-              AND er.tocurrencyid = (
-                  SELECT portfoliocurrencyid FROM portfolio WHERE portfolioid = p_portfolioid
-              )
-              AND er.exchangeratelogtime = (
-                  SELECT MAX(er2.exchangeratelogtime)
-                  FROM exchangerate er2
-                  WHERE er2.fromcurrencyid = er.fromcurrencyid
-                    AND er2.tocurrencyid = er.tocurrencyid
-              )
-        ), 1.0)
+        COALESCE(fx.exchangerate, 1.0)
     ), 2)
     INTO total_value
     FROM portfolio_bond pb
     JOIN bond b ON pb.bondid = b.bondid
-    JOIN bonddata bd ON bd.bondid = b.bondid
+    JOIN bond_latest bd ON bd.bondid = b.bondid
+    JOIN portfolio p ON p.portfolioid = pb.portfolioid
+    LEFT JOIN exchangerate_latest fx
+        ON fx.fromcurrencyid = b.bondcurrencyid AND fx.tocurrencyid = p.portfoliocurrencyid
     WHERE pb.portfolioid = p_portfolioid
-      AND b.bondcategoryid = b_bondcategoryid
-      AND bd.bonddatalogtime = (
-          SELECT MAX(bd2.bonddatalogtime)
-          FROM bonddata bd2
-          WHERE bd2.bondid = pb.bondid
-      );
+      AND b.bondcategoryid = b_bondcategoryid;
 
     RETURN total_value;
 END;
\ No newline at end of file
@@ -0,0 +1,33 @@
+from app.database.helpers.fetch_one import fetch_one
+from app.database.helpers.execute_change_query import execute_change_query
+
+def add_bonddata_ohlc():
+    """
+    Adds the bondopen, bondhigh and bondlow columns to bonddata on databases
+    created before they existed. Existing rows keep NULL in them.
+
+    Returns:
+        bool: True if the columns exist afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.columns
+            WHERE table_schema = DATABASE()
+            AND table_name = 'bonddata'
+            AND column_name IN ('bondopen', 'bondhigh', 'bondlow')
+        """)
+        if existing and existing[0] == 3:
+            return True
+
+        execute_change_query("""
+            ALTER TABLE bonddata
+            ADD COLUMN bondopen DECIMAL(15, 5) DEFAULT NULL AFTER bondvolume,
+            ADD COLUMN bondhigh DECIMAL(15, 5) DEFAULT NULL AFTER bondopen,
+            ADD COLUMN bondlow DECIMAL(15, 5) DEFAULT NULL AFTER bondhigh
+        """)
+        return True
+
+    except Exception as e:
+        print(f"Failed to add bonddata OHLC columns: {e}")
+        return False
@@ -0,0 +1,37 @@
+from app.database.helpers.fetch_one import fetch_one
+from app.database.connection.cursor import db_transaction
+
+def add_bonddata_unique_key():
+    """
+    Adds the (bondid, bonddatalogtime) unique key to bonddata on databases
+    created before it existed. Duplicate rows per bond and day are removed
+    first, keeping the most recently inserted one.
+
+    Returns:
+        bool: True if the key exists afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+            AND table_name = 'bonddata'
+            AND index_name = 'uq_bond_logtime'
+        """)
+        if existing and existing[0] > 0:
+            return True
+
+        with db_transaction() as cursor:
+            cursor.execute("""
+                DELETE bd1 FROM bonddata bd1
+                JOIN bonddata bd2
+                  ON bd1.bondid = bd2.bondid
+                 AND bd1.bonddatalogtime = bd2.bonddatalogtime
+                 AND bd1.bonddataid < bd2.bonddataid
+            """)
+            cursor.execute("ALTER TABLE bonddata ADD UNIQUE KEY uq_bond_logtime (bondid, bonddatalogtime)")
+        return True
+
+    except Exception as e:
+        print(f"Failed to add bonddata unique key: {e}")
+        return False
@@ -0,0 +1,234 @@
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from config import BACKFILL_DAYS, MARKET_DATA_CHUNK_SIZE
+from app.database.helpers.fetch_all import fetch_all
+from app.database.connection.cursor import db_transaction
+from app.database.connection.unit_of_work import unit_of_work
+from app.database.cache.query_cache import bump_portfolio_data_version
+from app.database.tables.bonddata.upsert_bonddata import upsert_bonddata_history
+from app.database.tables.api_fetch_logs.log_api_fetch import log_api_fetches
+from app.api.get_price_history import iter_price_history
+
+# Held while a manual backfill of this worker runs
+_manual_backfill = threading.Lock()
+
+MARK_CHECKED_QUERY = """
+    INSERT INTO bonddata_backfill (bondid, startdate, enddate)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE checkedat = CURRENT_TIMESTAMP
+"""
+
+def find_bonddata_gaps(bondids, existing, checked, start, end):
+    """
+    Computes the business-day ranges without prices per bond.
+
+    Args:
+        bondids (list of int): Bonds to check
+        existing (iterable of tuple): (bondid, date) of the bonddata rows between start and end
+        checked (iterable of tuple): (bondid, startdate, enddate) ranges already requested
+            from the provider; days in them without data are holidays or before the listing
+        start (date): First day of the window
+        end (date): Last day of the window
+
+    Returns:
+        dict: bondid -> list of (startdate, enddate) ranges, oldest first
+    """
+    days = pd.bdate_range(start, end).values.astype('datetime64[D]')
+    if not len(days) or not bondids:
+        return {}
+
+    row_of = {bondid: i for i, bondid in enumerate(bondids)}
+    covered = np.zeros((len(bondids), len(days)), dtype=bool)
+
+    existing = [(row_of[bondid], d) for bondid, d in existing if bondid in row_of]
+    if existing:
+        rows, dates = zip(*existing)
+        dates = np.array(dates, dtype='datetime64[D]')
+        cols = np.minimum(np.searchsorted(days, dates), len(days) - 1)
+        hit = days[cols] == dates
+        covered[np.array(rows)[hit], cols[hit]] = True
+
+    for bondid, range_start, range_end in checked:
+        if bondid in row_of:
+            first = np.searchsorted(days, np.datetime64(range_start, 'D'), side='left')
+            last = np.searchsorted(days, np.datetime64(range_end, 'D'), side='right')
+            covered[row_of[bondid], first:last] = True
+
+    # Runs of missing business days become ranges: +1 where a run starts, -1 after it ends
+    padded = np.pad(~covered, ((0, 0), (1, 1))).astype(np.int8)
+    edges = np.diff(padded, axis=1)
+    gaps = {}
+    for row in np.flatnonzero(edges.any(axis=1)):
+        starts = np.flatnonzero(edges[row] == 1)
+        ends = np.flatnonzero(edges[row] == -1) - 1
+        gaps[bondids[row]] = [(days[s].item(), days[e].item()) for s, e in zip(starts, ends)]
+    return gaps
+
+
+def group_gap_ranges(gaps):
+    """
+    Groups bonds with identical missing ranges so each range is downloaded once for all of them.
+
+    Returns:
+        dict: (startdate, enddate) -> list of bondids, ordered by startdate
+    """
+    groups = defaultdict(list)
+    for bondid, ranges in gaps.items():
+        for gap in ranges:
+            groups[gap].append(bondid)
+    return dict(sorted(groups.items()))
+
+
+def _write_batch(rows, checked):
+    """Writes the bars and checked ranges of completed downloads in one transaction."""
+    if not rows and not checked:
+        return
+    with db_transaction() as cursor:
+        upsert_bonddata_history(rows, cursor=cursor)
+        if checked:
+            cursor.executemany(MARK_CHECKED_QUERY, checked)
+
+
+def backfill_bonddata(days=None, symbols=None, today=None):
+    """
+    Fills the gaps in the price history of the last days for all or some securities.
+
+    Missing business days are computed per bond from bonddata, bonds with
+    identical gaps are downloaded together and the OHLCV rows are written in
+    batches. Every completed batch is committed together with the ranges it
+    covered (bonddata_backfill), so an interrupted run resumes where it
+    stopped and days without trading are not requested again.
+
+    Args:
+        days (int, optional): Size of the window in calendar days, defaults to BACKFILL_DAYS
+        symbols (list of str, optional): Only backfill these securities
+        today (date, optional): Reference date, the window ends the day before
+
+    Returns:
+        dict: ranges downloaded, requests (symbol and range pairs), errors,
+              rows written and failed symbols with their error
+    """
+    today = today or date.today()
+    start = today - timedelta(days=days or BACKFILL_DAYS)
+    end = today - timedelta(days=1)
+
+    if symbols:
+        placeholders = ', '.join(['%s'] * len(symbols))
+        bonds = fetch_all(f"SELECT bondid, bondsymbol FROM bond WHERE bondsymbol IN ({placeholders})", tuple(symbols))
+    else:
+        bonds = fetch_all("SELECT bondid, bondsymbol FROM bond")
+    symbol_of = {bondid: symbol for bondid, symbol in bonds}
+
+    # A run limited to some symbols only reads their rows
+    bond_filter, bond_args = '', ()
+    if symbols:
+        bond_filter = f"AND bondid IN ({', '.join(['%s'] * len(symbol_of))})"
+        bond_args = tuple(symbol_of)
+
+    existing, checked = [], []
+    if symbol_of:
+        existing = fetch_all(f"""
+            SELECT bondid, bonddatalogtime FROM bonddata
+            WHERE bonddatalogtime BETWEEN %s AND %s {bond_filter}
+        """, (start, end, *bond_args))
+        checked = fetch_all(f"""
+            SELECT bondid, startdate, enddate FROM bonddata_backfill
+            WHERE enddate >= %s {bond_filter}
+        """, (start, *bond_args))
+
+    groups = group_gap_ranges(find_bonddata_gaps(list(symbol_of), existing, checked, start, end))
+
+    summary = {'ranges': len(groups), 'requests': 0, 'errors': 0, 'rows': 0, 'failed': {}}
+    for (range_start, range_end), bondids in groups.items():
+        bondid_of = {symbol_of[bondid]: bondid for bondid in bondids}
+        rows, done = [], []
+
+        for outcome in iter_price_history(list(bondid_of), range_start, range_end):
+            bondid = bondid_of[outcome.symbol]
+            summary['requests'] += 1
+            if outcome.error:
+                summary['errors'] += 1
+                summary['failed'][outcome.symbol] = f"Backfill {range_start} to {range_end} failed: {outcome.error}"
+                continue
+
+            rows.extend((bondid, o, h, l, c, v, d) for d, o, h, l, c, v in outcome.value)
+            done.append((bondid, range_start, range_end))
+            if len(done) >= MARKET_DATA_CHUNK_SIZE:
+                _write_batch(rows, done)
+                summary['rows'] += len(rows)
+                rows, done = [], []
+
+        _write_batch(rows, done)
+        summary['rows'] += len(rows)
+
+    _log_backfill(summary)
+
+    # Ranges that ended before the nightly window can no longer overlap a gap. A
+    # shorter manual run must not prune them, nor touch securities it skipped.
+    prune_before = today - timedelta(days=BACKFILL_DAYS)
+    with db_transaction() as cursor:
+        if symbol_of:
+            placeholders = ', '.join(['%s'] * len(symbol_of))
+            cursor.execute(
+                f"DELETE FROM bonddata_backfill WHERE enddate < %s AND bondid IN ({placeholders})",
+                (prune_before, *symbol_of)
+            )
+        # A backfilled last trading day can move bond_latest
+        if summary['rows']:
+            bump_portfolio_data_version(cursor)
+
+    return summary
+
+
+def start_backfill(app, days=None, symbols=None):
+    """
+    Runs backfill_bonddata in a daemon thread, so a manual run does not hold
+    the request until the worker timeout. The result is written to
+    api_fetch_logs like the nightly run.
+
+    Returns:
+        bool: False if a manual backfill of this worker is still running
+    """
+    if not _manual_backfill.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            with app.app_context(), unit_of_work():
+                backfill_bonddata(days=days, symbols=symbols)
+        except Exception as e:
+            print(f"⚠️  Manual bonddata backfill failed: {e}")
+        finally:
+            _manual_backfill.release()
+
+    try:
+        threading.Thread(target=run, name='backfill', daemon=True).start()
+    except Exception:
+        _manual_backfill.release()
+        raise
+    return True
+
+
+def _log_backfill(summary):
+    """Writes the bulk result and the failed symbols to api_fetch_logs."""
+    if not summary['ranges']:
+        return
+
+    failed = summary['failed']
+    message = f"Backfilled {summary['rows']} rows in {summary['ranges']} ranges"
+    if not failed:
+        status = 'SUCCESS'
+    elif summary['errors'] == summary['requests']:
+        status, message = 'FAILED', f"Backfill failed for all {len(failed)} securities"
+    else:
+        status, message = 'PARTIAL', f"{message}, {len(failed)} securities failed"
+
+    entries = [('STOCK_BACKFILL_BULK', 'STOCK', status, message)]
+    entries += [(symbol, 'STOCK', 'FAILED', error) for symbol, error in failed.items()]
+    try:
+        log_api_fetches(entries)
+    except Exception as e:
+        print(f"⚠️  API logging failed: {e}")
@@ -3,7 +3,10 @@ CREATE TABLE bonddata (
     bondid INT NOT NULL,
     bondrate DECIMAL(15, 5) NOT NULL,
     bondvolume BIGINT,
+    bondopen DECIMAL(15, 5),
+    bondhigh DECIMAL(15, 5),
+    bondlow DECIMAL(15, 5),
     bonddatalogtime DATE NOT NULL,
     FOREIGN KEY (bondid) REFERENCES bond (bondid) ON DELETE CASCADE,
-    INDEX idx_bond_logtime (bondid, bonddatalogtime)
+    UNIQUE KEY uq_bond_logtime (bondid, bonddatalogtime)
 );
\ No newline at end of file
@@ -0,0 +1,15 @@
+CREATE TRIGGER update_bond_latest_after_bonddata_delete
+AFTER DELETE ON bonddata
+FOR EACH ROW
+BEGIN
+    DELETE FROM bond_latest
+    WHERE bondid = OLD.bondid AND bonddatalogtime = OLD.bonddatalogtime;
+
+    INSERT INTO bond_latest (bondid, bondrate, bondvolume, bonddatalogtime)
+    SELECT bondid, bondrate, bondvolume, bonddatalogtime
+    FROM bonddata
+    WHERE bondid = OLD.bondid
+    ORDER BY bonddatalogtime DESC
+    LIMIT 1
+    ON DUPLICATE KEY UPDATE bondid = bond_latest.bondid;
+END;
\ No newline at end of file
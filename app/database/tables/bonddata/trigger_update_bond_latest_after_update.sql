@@ -0,0 +1,11 @@
+CREATE TRIGGER update_bond_latest_after_bonddata_update
+AFTER UPDATE ON bonddata
+FOR EACH ROW
+BEGIN
+    INSERT INTO bond_latest (bondid, bondrate, bondvolume, bonddatalogtime)
+    VALUES (NEW.bondid, NEW.bondrate, NEW.bondvolume, NEW.bonddatalogtime)
+    ON DUPLICATE KEY UPDATE
+        bondrate = IF(VALUES(bonddatalogtime) >= bonddatalogtime, VALUES(bondrate), bondrate),
+        bondvolume = IF(VALUES(bonddatalogtime) >= bonddatalogtime, VALUES(bondvolume), bondvolume),
+        bonddatalogtime = GREATEST(bonddatalogtime, VALUES(bonddatalogtime));
+END;
\ No newline at end of file
@@ -0,0 +1,61 @@
+from app.database.connection.cursor import db_transaction
+
+UPSERT_BONDDATA_QUERY = """
+    INSERT INTO bonddata (bondid, bondrate, bondvolume, bonddatalogtime)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE bondrate = VALUES(bondrate), bondvolume = VALUES(bondvolume)
+"""
+
+def upsert_bonddata(rows, cursor=None):
+    """
+    Inserts or updates bonddata rows with a single batched statement.
+
+    Args:
+        rows (list of tuple): (bondid, bondrate, bondvolume, bonddatalogtime) tuples
+        cursor (optional): Cursor of an open transaction to write through.
+            If omitted, the rows are written in their own transaction.
+
+    Returns:
+        int: Number of rows written
+    """
+    if not rows:
+        return 0
+
+    if cursor is None:
+        with db_transaction() as cursor:
+            cursor.executemany(UPSERT_BONDDATA_QUERY, rows)
+    else:
+        cursor.executemany(UPSERT_BONDDATA_QUERY, rows)
+
+    return len(rows)
+
+UPSERT_BONDDATA_HISTORY_QUERY = """
+    INSERT INTO bonddata (bondid, bondopen, bondhigh, bondlow, bondrate, bondvolume, bonddatalogtime)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        bondopen = VALUES(bondopen), bondhigh = VALUES(bondhigh), bondlow = VALUES(bondlow),
+        bondrate = VALUES(bondrate), bondvolume = VALUES(bondvolume)
+"""
+
+def upsert_bonddata_history(rows, cursor=None):
+    """
+    Inserts or updates full OHLCV bonddata rows with a single batched statement.
+
+    Args:
+        rows (list of tuple): (bondid, open, high, low, close, volume, bonddatalogtime) tuples
+        cursor (optional): Cursor of an open transaction to write through.
+            If omitted, the rows are written in their own transaction.
+
+    Returns:
+        int: Number of rows written
+    """
+    if not rows:
+        return 0
+
+    if cursor is None:
+        with db_transaction() as cursor:
+            cursor.executemany(UPSERT_BONDDATA_HISTORY_QUERY, rows)
+    else:
+        cursor.executemany(UPSERT_BONDDATA_HISTORY_QUERY, rows)
+
+    return len(rows)
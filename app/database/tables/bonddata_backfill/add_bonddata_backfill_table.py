@@ -0,0 +1,31 @@
+import os
+from app.database.helpers.fetch_one import fetch_one
+from app.database.connection.cursor import db_transaction
+
+CREATE_SQL = os.path.join(os.path.dirname(__file__), 'create_bonddata_backfill.sql')
+
+def add_bonddata_backfill_table():
+    """
+    Creates the bonddata_backfill table on databases created before it existed.
+
+    Returns:
+        bool: True if the table exists afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+            AND table_name = 'bonddata_backfill'
+        """)
+        if existing and existing[0] > 0:
+            return True
+
+        with db_transaction() as cursor:
+            with open(CREATE_SQL, 'r', encoding='utf-8') as f:
+                cursor.execute(f.read())
+        return True
+
+    except Exception as e:
+        print(f"Failed to add bonddata_backfill table: {e}")
+        return False
@@ -0,0 +1,8 @@
+CREATE TABLE bonddata_backfill (
+    bondid INT NOT NULL,
+    startdate DATE NOT NULL,
+    enddate DATE NOT NULL,
+    checkedat TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (bondid, startdate, enddate),
+    FOREIGN KEY (bondid) REFERENCES bond (bondid) ON DELETE CASCADE
+);
\ No newline at end of file
@@ -1,7 +1,6 @@
-from app.database.helpers.fetch_all import fetch_all
+from app.database.cache.reference_data import get_currencies
 
 
 def get_all_currencies():
-    query = """SELECT currencyid, currencycode, currencyname FROM currency ORDER BY currencycode"""
-    currencies = fetch_all(query=query, dictionary=True)
+    currencies = sorted(get_currencies(), key=lambda currency: currency['currencycode'])
     return currencies
\ No newline at end of file
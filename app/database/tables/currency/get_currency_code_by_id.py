@@ -1,5 +1,4 @@
-from app.database.helpers.fetch_one import fetch_one
+from app.database.cache.reference_data import currency_code_by_id
 
 def get_currency_code_by_id(currency_id):
-    result = fetch_one('SELECT currencycode FROM currency WHERE currencyid = %s', (currency_id,))
-    return result[0] if result else None
\ No newline at end of file
+    return currency_code_by_id(currency_id)
\ No newline at end of file
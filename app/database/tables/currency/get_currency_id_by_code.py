@@ -1,5 +1,4 @@
-from app.database.helpers.fetch_one import fetch_one
+from app.database.cache.reference_data import currency_id_by_code
 
 def get_currency_id_by_code(currency_code):
-    result = fetch_one('SELECT currencyid FROM currency WHERE currencycode = %s', (currency_code,))
-    return result[0] if result else None
\ No newline at end of file
+    return currency_id_by_code(currency_code)
\ No newline at end of file
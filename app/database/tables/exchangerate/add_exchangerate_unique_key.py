@@ -0,0 +1,41 @@
+from app.database.helpers.fetch_one import fetch_one
+from app.database.connection.cursor import db_transaction
+
+def add_exchangerate_unique_key():
+    """
+    Adds the (fromcurrencyid, tocurrencyid, exchangeratelogtime) unique key to
+    exchangerate on databases created before it existed. Duplicate rows per pair
+    and day are removed first, keeping the most recently inserted one.
+
+    Returns:
+        bool: True if the key exists afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+            AND table_name = 'exchangerate'
+            AND index_name = 'uq_fromcurrency_tocurrency_logtime'
+        """)
+        if existing and existing[0] > 0:
+            return True
+
+        with db_transaction() as cursor:
+            cursor.execute("""
+                DELETE er1 FROM exchangerate er1
+                JOIN exchangerate er2
+                  ON er1.fromcurrencyid = er2.fromcurrencyid
+                 AND er1.tocurrencyid = er2.tocurrencyid
+                 AND er1.exchangeratelogtime = er2.exchangeratelogtime
+                 AND er1.exchangerateid < er2.exchangerateid
+            """)
+            cursor.execute("""
+                ALTER TABLE exchangerate
+                ADD UNIQUE KEY uq_fromcurrency_tocurrency_logtime (fromcurrencyid, tocurrencyid, exchangeratelogtime)
+            """)
+        return True
+
+    except Exception as e:
+        print(f"Failed to add exchangerate unique key: {e}")
+        return False
@@ -6,5 +6,5 @@ CREATE TABLE exchangerate (
     exchangeratelogtime DATE NOT NULL,
     FOREIGN KEY (fromcurrencyid) REFERENCES currency (currencyid) ON DELETE CASCADE,
     FOREIGN KEY (tocurrencyid) REFERENCES currency (currencyid) ON DELETE CASCADE,
-    INDEX idx_fromcurrency_tocurrency_logtime (fromcurrencyid, tocurrencyid, exchangeratelogtime)
+    UNIQUE KEY uq_fromcurrency_tocurrency_logtime (fromcurrencyid, tocurrencyid, exchangeratelogtime)
 );
\ No newline at end of file
@@ -1,129 +1,101 @@
 from datetime import date
-from app.database.tables.exchangerate.exchange_rate_exists import exchange_rate_exists
-from app.database.helpers.execute_change_query import execute_change_query
-from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
+import numpy as np
 from app.database.helpers.fetch_all import fetch_all
 from app.database.helpers.fetch_one import fetch_one
-from app.api.get_exchange_matrix import get_exchange_matrix
+from app.database.connection.cursor import db_transaction
+from app.database.tables.exchangerate.upsert_exchangerates import upsert_exchangerates
+from app.database.cache.exchange_rates import invalidate_exchange_rates
+from app.database.cache.query_cache import bump_portfolio_data_version
+from app.database.tables.api_fetch_logs.log_api_fetch import log_api_fetches
+from app.api.get_exchange_matrix import get_exchange_rate_matrix
 from app.api.get_last_trading_day import get_last_trading_day
+from config import EXCHANGE_ANCHOR_CURRENCY
 
 def fetch_daily_exchangerates():
     """
-    Fetches todays exchange rates for all currencies in the database
-    and inserts them into the exchangerate table if they do not already exist.
+    Fetches todays exchange rates for all currencies in the database and
+    upserts the full rate matrix into the exchangerate table.
+
+    Only the anchor currency legs are downloaded; the full matrix is derived
+    from them locally. Rates, fetch logs and the status update are written in
+    one transaction with batched statements.
     """
 
     # Check last full update
     last_update = fetch_one("SELECT exchangerates FROM status WHERE id = 1")[0]
 
     if last_update == date.today():
-        #print("Exchangerates already updated today, skipping.")
         return
 
-    #print("Fetching today's exchange rates...")
-
-    # Fetch all currencies
-    all_currencies = [row[0] for row in fetch_all("SELECT currencycode FROM currency")]
+    # Load the code → id map once
+    currency_rows = fetch_all("SELECT currencyid, currencycode FROM currency")
+    currency_ids = np.array([row[0] for row in currency_rows])
+    all_currencies = [row[1] for row in currency_rows]
 
     # Get full exchange matrix for all currencies
     try:
-        exchange_rates = get_exchange_matrix(all_currencies)
+        matrix, _ = get_exchange_rate_matrix(all_currencies)
     except Exception as e:
         # Log failure for the entire operation
         try:
-            from app.database.tables.api_fetch_logs.log_api_fetch import log_api_fetch
-            log_api_fetch('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'FAILED', f'Failed to fetch exchange matrix: {str(e)}')
+            log_api_fetches([('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'FAILED', f'Failed to fetch exchange matrix: {str(e)}')])
         except:
             pass
         raise e
 
     trading_day = get_last_trading_day()
-    
+
     # Fallback to current date if get_last_trading_day() returns None
     if trading_day is None:
         trading_day = date.today().strftime("%Y-%m-%d")
-    
-    # Track results for bulk logging
-    successful_fetches = 0
-    failed_fetches = 0
-    failed_pairs = []
 
-    # Insert or update all exchange rates
-    for pair, rate in exchange_rates.items():
-        from_currency, to_currency = pair[:3], pair[3:]
-        from_id = get_currency_id_by_code(from_currency)
-        to_id = get_currency_id_by_code(to_currency)
-        is_calculated = False
-
-        if not from_id or not to_id or not rate:
-            # Try to calculate cross-rate using USD as base
-            if from_currency != 'USD' and to_currency != 'USD':
-                usd_from_rate = exchange_rates.get(f'USD{from_currency}')
-                usd_to_rate = exchange_rates.get(f'USD{to_currency}')
-                if usd_from_rate and usd_to_rate:
-                    calculated_rate = usd_to_rate / usd_from_rate
-                    # Use calculated rate instead of skipping
-                    rate = calculated_rate
-                    is_calculated = True
-                else:
-                    # Track failed fetch
-                    failed_fetches += 1
-                    failed_pairs.append((pair, 'No data available and cannot calculate cross-rate'))
-                    continue
-            else:
-                # Track failed fetch
-                failed_fetches += 1
-                failed_pairs.append((pair, 'No data available'))
-                continue
-
-        # Track successful fetch
-        successful_fetches += 1
-
-        # Upsert logic (pseudo):
-        if exchange_rate_exists(from_id, to_id, log_date=trading_day):
-            execute_change_query("""
-                UPDATE exchangerate
-                SET exchangerate = %s
-                WHERE fromcurrencyid = %s AND tocurrencyid = %s AND exchangeratelogtime = %s
-            """, (rate, from_id, to_id, trading_day))
-            if is_calculated:
-                print(f"        🔄 Updated {pair}: {rate} (calculated)")
-            else:
-                print(f"        🔄 Updated {pair}: {rate}")
-        else:
-            execute_change_query("""
-                INSERT INTO exchangerate (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
-                VALUES (%s, %s, %s, %s)
-            """, (from_id, to_id, rate, trading_day))
-            if is_calculated:
-                print(f"        ➕ Inserted {pair}: {rate} (calculated)")
-            else:
-                print(f"        ➕ Inserted {pair}: {rate}")
-    
-    # Log bulk operation result
-    try:
-        from app.database.tables.api_fetch_logs.log_api_fetch import log_api_fetch
-        
-        if failed_fetches == 0:
-            # All successful
-            log_api_fetch('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'SUCCESS', f'Successfully fetched {successful_fetches} exchange rates')
-        elif successful_fetches == 0:
-            # All failed
-            log_api_fetch('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'FAILED', f'Failed to fetch all {failed_fetches} exchange rates')
+    known = ~np.isnan(matrix)
+    from_idx, to_idx = np.nonzero(known)
+    rows = [
+        (int(from_id), int(to_id), float(rate), trading_day)
+        for from_id, to_id, rate in zip(currency_ids[from_idx], currency_ids[to_idx], matrix[from_idx, to_idx])
+    ]
+
+    failed_pairs = []
+    for i, j in zip(*np.nonzero(~known)):
+        a, b = all_currencies[i], all_currencies[j]
+        if EXCHANGE_ANCHOR_CURRENCY in (a, b):
+            failed_pairs.append((f"{a}{b}", 'No data available'))
         else:
-            # Partially successful
-            log_api_fetch('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'PARTIAL', f'Successfully fetched {successful_fetches} exchange rates, {failed_fetches} failed')
-        
-        # Log individual failures for failed fetches section
-        for pair, error_msg in failed_pairs:
-            log_api_fetch(pair, 'EXCHANGE', 'FAILED', error_msg)
-            
-    except Exception as e:
-        # Log to console if API logging fails (e.g., during setup)
-        print(f"⚠️  API logging failed: {e}")
-        pass
-
-    # Update global status
-    execute_change_query("""
-        UPDATE status SET exchangerates = %s WHERE id = 1""",
-        (date.today(),))
\ No newline at end of file
+            failed_pairs.append((f"{a}{b}", 'No data available and cannot calculate cross-rate'))
+
+    successful_fetches = len(rows)
+    failed_fetches = len(failed_pairs)
+
+    if failed_fetches == 0:
+        # All successful
+        bulk_entry = ('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'SUCCESS', f'Successfully fetched {successful_fetches} exchange rates')
+    elif successful_fetches == 0:
+        # All failed
+        bulk_entry = ('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'FAILED', f'Failed to fetch all {failed_fetches} exchange rates')
+    else:
+        # Partially successful
+        bulk_entry = ('EXCHANGE_FETCH_BULK', 'EXCHANGE', 'PARTIAL', f'Successfully fetched {successful_fetches} exchange rates, {failed_fetches} failed')
+
+    # Individual failures feed the failed fetches section of the API management page
+    log_entries = [bulk_entry] + [(pair, 'EXCHANGE', 'FAILED', error_msg) for pair, error_msg in failed_pairs]
+
+    with db_transaction() as cursor:
+        upsert_exchangerates(rows, cursor=cursor)
+
+        # A logging failure (e.g. missing api_fetch_logs table during setup)
+        # must not roll back the rates, so it is isolated by a savepoint
+        cursor.execute("SAVEPOINT api_fetch_logs")
+        try:
+            log_api_fetches(log_entries, cursor=cursor)
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT api_fetch_logs")
+            print(f"⚠️  API logging failed: {e}")
+
+        # Update global status
+        cursor.execute("""
+            UPDATE status SET exchangerates = %s WHERE id = 1""",
+            (date.today(),))
+        bump_portfolio_data_version(cursor)
+
+    invalidate_exchange_rates()
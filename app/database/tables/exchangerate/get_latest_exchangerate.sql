@@ -9,15 +9,9 @@ BEGIN
     DECLARE exchrate FLOAT;
 
     SELECT exchangerate INTO exchrate
-    FROM exchangerate e
+    FROM exchangerate_latest e
     WHERE e.fromcurrencyid = in_fromcurrencyid
-      AND e.tocurrencyid = in_tocurrencyid
-      AND e.exchangeratelogtime = (
-          SELECT MAX(e2.exchangeratelogtime)
-          FROM exchangerate e2
-          WHERE e2.fromcurrencyid = in_fromcurrencyid
-            AND e2.tocurrencyid = in_tocurrencyid
-      );
+      AND e.tocurrencyid = in_tocurrencyid;
 
     RETURN exchrate;
 
@@ -0,0 +1,18 @@
+CREATE TRIGGER update_exchangerate_latest_after_exchangerate_delete
+AFTER DELETE ON exchangerate
+FOR EACH ROW
+BEGIN
+    DELETE FROM exchangerate_latest
+    WHERE fromcurrencyid = OLD.fromcurrencyid
+      AND tocurrencyid = OLD.tocurrencyid
+      AND exchangeratelogtime = OLD.exchangeratelogtime;
+
+    INSERT INTO exchangerate_latest (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
+    SELECT fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime
+    FROM exchangerate
+    WHERE fromcurrencyid = OLD.fromcurrencyid
+      AND tocurrencyid = OLD.tocurrencyid
+    ORDER BY exchangeratelogtime DESC
+    LIMIT 1
+    ON DUPLICATE KEY UPDATE fromcurrencyid = exchangerate_latest.fromcurrencyid;
+END;
\ No newline at end of file
@@ -0,0 +1,10 @@
+CREATE TRIGGER update_exchangerate_latest_after_exchangerate_insert
+AFTER INSERT ON exchangerate
+FOR EACH ROW
+BEGIN
+    INSERT INTO exchangerate_latest (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
+    VALUES (NEW.fromcurrencyid, NEW.tocurrencyid, NEW.exchangerate, NEW.exchangeratelogtime)
+    ON DUPLICATE KEY UPDATE
+        exchangerate = IF(VALUES(exchangeratelogtime) >= exchangeratelogtime, VALUES(exchangerate), exchangerate),
+        exchangeratelogtime = GREATEST(exchangeratelogtime, VALUES(exchangeratelogtime));
+END;
\ No newline at end of file
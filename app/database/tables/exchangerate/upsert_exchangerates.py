@@ -0,0 +1,34 @@
+from app.database.connection.cursor import db_transaction
+from app.database.cache.exchange_rates import invalidate_exchange_rates
+
+UPSERT_EXCHANGERATE_QUERY = """
+    INSERT INTO exchangerate (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE exchangerate = VALUES(exchangerate)
+"""
+
+def upsert_exchangerates(rows, cursor=None):
+    """
+    Inserts or updates exchange rates with a single batched statement.
+
+    Args:
+        rows (list of tuple): (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime) tuples
+        cursor (optional): Cursor of an open transaction to write through.
+            If omitted, the rows are written in their own transaction and the
+            cached rate matrix is invalidated; otherwise the caller does that
+            after committing.
+
+    Returns:
+        int: Number of rows written
+    """
+    if not rows:
+        return 0
+
+    if cursor is None:
+        with db_transaction() as cursor:
+            cursor.executemany(UPSERT_EXCHANGERATE_QUERY, rows)
+        invalidate_exchange_rates()
+    else:
+        cursor.executemany(UPSERT_EXCHANGERATE_QUERY, rows)
+
+    return len(rows)
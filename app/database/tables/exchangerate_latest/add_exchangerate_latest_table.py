@@ -0,0 +1,57 @@
+import os
+from app.database.helpers.fetch_one import fetch_one
+from app.database.connection.cursor import db_transaction
+
+TABLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SQL_FILES = [
+    os.path.join(TABLES_DIR, 'exchangerate_latest', 'create_exchangerate_latest.sql'),
+    os.path.join(TABLES_DIR, 'exchangerate', 'trigger_update_exchangerate_latest_after_insert.sql'),
+    os.path.join(TABLES_DIR, 'exchangerate', 'trigger_update_exchangerate_latest_after_update.sql'),
+    os.path.join(TABLES_DIR, 'exchangerate', 'trigger_update_exchangerate_latest_after_delete.sql'),
+]
+
+BACKFILL_QUERY = """
+    INSERT INTO exchangerate_latest (fromcurrencyid, tocurrencyid, exchangerate, exchangeratelogtime)
+    SELECT er.fromcurrencyid, er.tocurrencyid, er.exchangerate, er.exchangeratelogtime
+    FROM exchangerate er
+    JOIN (
+        SELECT fromcurrencyid, tocurrencyid, MAX(exchangeratelogtime) AS max_time
+        FROM exchangerate
+        GROUP BY fromcurrencyid, tocurrencyid
+    ) latest ON er.fromcurrencyid = latest.fromcurrencyid
+            AND er.tocurrencyid = latest.tocurrencyid
+            AND er.exchangeratelogtime = latest.max_time
+    ON DUPLICATE KEY UPDATE fromcurrencyid = exchangerate_latest.fromcurrencyid
+"""
+
+def add_exchangerate_latest_table():
+    """
+    Creates the exchangerate_latest table and the exchangerate triggers that
+    maintain it on databases created before it existed, then fills it from
+    exchangerate.
+
+    Returns:
+        bool: True if the table exists afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+            AND table_name = 'exchangerate_latest'
+        """)
+        if existing and existing[0] > 0:
+            return True
+
+        with db_transaction() as cursor:
+            # Triggers first, so rates written during the backfill are not missed
+            for path in SQL_FILES:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cursor.execute(f.read())
+            cursor.execute(BACKFILL_QUERY)
+        return True
+
+    except Exception as e:
+        print(f"Failed to add exchangerate_latest table: {e}")
+        return False
@@ -0,0 +1,9 @@
+CREATE TABLE exchangerate_latest (
+    fromcurrencyid INT NOT NULL,
+    tocurrencyid INT NOT NULL,
+    exchangerate DECIMAL(15, 5) NOT NULL,
+    exchangeratelogtime DATE NOT NULL,
+    PRIMARY KEY (fromcurrencyid, tocurrencyid),
+    FOREIGN KEY (fromcurrencyid) REFERENCES currency (currencyid) ON DELETE CASCADE,
+    FOREIGN KEY (tocurrencyid) REFERENCES currency (currencyid) ON DELETE CASCADE
+);
\ No newline at end of file
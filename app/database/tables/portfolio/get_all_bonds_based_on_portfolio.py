@@ -16,12 +16,7 @@ def get_all_bonds_based_on_portfolio(portfolio_id):
             s.sectordisplayname
         FROM bond b
         JOIN bondcategory bc USING (bondcategoryid)
-        JOIN bonddata bd ON b.bondid = bd.bondid
-        JOIN (
-            SELECT bondid, MAX(bonddatalogtime) AS maxlogtime
-            FROM bonddata
-            GROUP BY bondid
-        ) latest ON bd.bondid = latest.bondid AND bd.bonddatalogtime = latest.maxlogtime
+        JOIN bond_latest bd ON b.bondid = bd.bondid
         LEFT JOIN portfolio_bond pb 
             ON b.bondid = pb.bondid AND pb.portfolioid = %s
         JOIN currency c ON c.currencyid = b.bondcurrencyid
@@ -30,5 +25,5 @@ def get_all_bonds_based_on_portfolio(portfolio_id):
         LEFT JOIN sector s ON s.sectorid = b.bondsectorid
     """
     args = (portfolio_id,)
-    bonds = fetch_all(query, args, dictionary=True)
+    bonds = fetch_all(query, args, dictionary=True, prepared=True)
     return bonds
\ No newline at end of file
@@ -0,0 +1,165 @@
+from datetime import timedelta
+import numpy as np
+from config import (
+    PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS, ANALYTICS_BENCHMARK_SYMBOL, ANALYTICS_RISK_FREE_RATE, ANALYTICS_TRADING_DAYS
+)
+from app.database.helpers.fetch_one import fetch_one
+from app.database.tables.portfolio.get_portfolio_history import (
+    load_portfolio, load_panel_rows, align_prices, business_days
+)
+from app.utils.risk_metrics import compute_risk_metrics
+
+METRICS = ['total_return', 'annualized_return', 'volatility', 'sharpe', 'max_drawdown', 'beta']
+
+
+def _clean(value, digits=4):
+    """Rounds a float for JSON, None for NaN."""
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+def portfolio_value_index(position_values):
+    """
+    Chains the daily portfolio returns into an index starting at 1.0.
+
+    The return of a day only uses the positions priced on that day and the
+    day before, so a holding whose history starts within the range does not
+    show up as a jump in the portfolio value.
+
+    Args:
+        position_values (np.ndarray): Day × holding position values, NaN where unpriced
+
+    Returns:
+        np.ndarray: Index level per day, NaN before the first priced day
+    """
+    index = np.full(position_values.shape[0], np.nan)
+    priced = ~np.isnan(position_values)
+    if not priced.any():
+        return index
+
+    both = priced[1:] & priced[:-1]
+    change = np.where(both, position_values[1:] - position_values[:-1], 0.0).sum(axis=1)
+    base = np.where(both, position_values[:-1], 0.0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(base > 0, 1.0 + change / base, 1.0)
+
+    first = int(np.argmax(priced.any(axis=1)))
+    index[first:] = np.cumprod(np.concatenate([[1.0], growth[first:]]))
+    return index
+
+
+def compute_portfolio_analytics(holdings, prices, benchmark_prices=None, periods_per_year=252, risk_free_rate=0.0):
+    """
+    Risk and return metrics of a portfolio and each of its holdings.
+
+    Args:
+        holdings (list of tuple): (bondid, quantity, bondcurrencyid, bondsymbol, bondname)
+        prices (np.ndarray): Business day × holding prices in the portfolio currency
+        benchmark_prices (np.ndarray, optional): Benchmark prices on the same days
+        periods_per_year (int): Trading days per year
+        risk_free_rate (float): Annual risk-free rate for the Sharpe ratio
+
+    Returns:
+        dict: portfolio metrics, per-holding metrics with current weights and
+              the correlation matrix of the holdings
+    """
+    quantities = np.array([holding[1] for holding in holdings], dtype=float)
+    position_values = prices * quantities[np.newaxis, :]
+    portfolio_index = portfolio_value_index(position_values)
+
+    # One panel: portfolio, holdings and optionally the benchmark as columns
+    columns = [portfolio_index[:, np.newaxis], prices]
+    if benchmark_prices is not None:
+        columns.append(benchmark_prices[:, np.newaxis])
+    levels = np.hstack(columns)
+
+    metrics = compute_risk_metrics(
+        levels,
+        periods_per_year=periods_per_year,
+        risk_free_rate=risk_free_rate,
+        benchmark_column=levels.shape[1] - 1 if benchmark_prices is not None else None
+    )
+
+    latest = position_values[-1] if len(position_values) else np.zeros(len(holdings))
+    total = np.nansum(latest)
+    weights = np.where(np.isnan(latest), 0.0, latest) / total if total else np.zeros(len(holdings))
+
+    result = {
+        'portfolio': {name: _clean(metrics[name][0]) for name in METRICS},
+        'holdings': [
+            {
+                'bondid': holding[0],
+                'symbol': holding[3],
+                'name': holding[4],
+                'weight': _clean(weights[i]),
+                **{name: _clean(metrics[name][i + 1]) for name in METRICS},
+            }
+            for i, holding in enumerate(holdings)
+        ],
+        'correlation': {
+            'symbols': [holding[3] for holding in holdings],
+            'matrix': [[_clean(value) for value in row] for row in metrics['correlation'][1:len(holdings) + 1, 1:len(holdings) + 1]],
+        },
+        'observations': int(np.sum(~np.isnan(portfolio_index))),
+    }
+    if benchmark_prices is not None:
+        result['benchmark'] = {name: _clean(metrics[name][-1]) for name in METRICS}
+    return result
+
+
+def get_portfolio_analytics(portfolio_id, start, end, benchmark_symbol=None):
+    """
+    Returns, volatility, Sharpe ratio, max drawdown, beta and correlations of
+    a portfolio and its holdings between two dates, in the portfolio currency.
+
+    Prices of all holdings and the benchmark and the exchange rates are each
+    loaded with one query; all metrics are computed column-wise on one NumPy
+    panel, so the cost does not grow with a Python loop per holding.
+
+    Args:
+        portfolio_id (int): The portfolio
+        start (date): First day
+        end (date): Last day
+        benchmark_symbol (str, optional): Defaults to ANALYTICS_BENCHMARK_SYMBOL
+
+    Returns:
+        dict: As compute_portfolio_analytics plus currencycode, start, end and
+              benchmark_symbol, or None if the portfolio does not exist
+    """
+    portfolio = load_portfolio(portfolio_id)
+    if portfolio is None:
+        return None
+    currency_id, currency_code, holdings = portfolio
+
+    benchmark_symbol = benchmark_symbol or ANALYTICS_BENCHMARK_SYMBOL
+    benchmark = fetch_one("SELECT bondid, bondcurrencyid FROM bond WHERE bondsymbol = %s", (benchmark_symbol,))
+
+    # The benchmark may also be a holding, so each bond gets one panel column
+    bonds = [(holding[0], holding[2]) for holding in holdings]
+    if benchmark is not None:
+        bonds.append(tuple(benchmark))
+    unique_bonds = list(dict.fromkeys(bonds))
+    column_of = {bond: i for i, bond in enumerate(unique_bonds)}
+
+    origin = start - timedelta(days=PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS)
+    n_days = (end - origin).days + 1
+    price_rows, fx_rows = load_panel_rows(unique_bonds, currency_id, origin, end)
+    panel = align_prices(unique_bonds, price_rows, fx_rows, currency_id, n_days)
+
+    _, rows = business_days(origin, start, n_days)
+    panel = panel[rows][:, [column_of[bond] for bond in bonds]]
+
+    result = compute_portfolio_analytics(
+        holdings,
+        panel[:, :len(holdings)],
+        benchmark_prices=panel[:, -1] if benchmark is not None else None,
+        periods_per_year=ANALYTICS_TRADING_DAYS,
+        risk_free_rate=ANALYTICS_RISK_FREE_RATE
+    )
+    result.update({
+        'portfolioid': portfolio_id,
+        'currencycode': currency_code,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'benchmark_symbol': benchmark_symbol if benchmark is not None else None,
+    })
+    return result
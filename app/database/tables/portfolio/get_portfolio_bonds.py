@@ -1,24 +1,42 @@
-from app.database.helpers.fetch_all import fetch_all
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+import numpy as np
+from app.database.helpers.fetch_rows import fetch_rows
+from app.database.cache.exchange_rates import get_exchange_rates_to
+from app.database.cache.query_cache import cached_query
 
+
+@dataclass(slots=True)
+class PortfolioBond:
+    """One holding of a portfolio with its latest price."""
+    bondid: int
+    bondsymbol: str
+    bondname: str
+    bondcategoryname: str
+    bondrate: float
+    bonddatalogtime: date
+    quantity: float
+    currencycode: str
+    currencyid: int
+    base_currency_id: int
+    region: Optional[str]
+    sectorname: Optional[str]
+    sectordisplayname: Optional[str]
+    exchange_rate_to_base: Optional[float] = None
+
+
+@cached_query
 def get_portfolio_bonds(portfolio_id, base_currency_code='USD'):
     query = """
             SELECT b.bondid, b.bondsymbol, b.bondname, bc.bondcategoryname, bd.bondrate, bd.bonddatalogtime, pb.quantity, c.currencycode,
                    c.currencyid, base_c.currencyid as base_currency_id,
-                   CASE 
-                       WHEN c.currencycode = %s THEN 1.0
-                       ELSE get_latest_exchangerate(c.currencyid, base_c.currencyid)
-                   END as exchange_rate_to_base,
                    r.region,
                    s.sectorname,
                    s.sectordisplayname
             FROM bond b
             JOIN bondcategory bc USING (bondcategoryid)
-            JOIN bonddata bd ON b.bondid = bd.bondid
-            JOIN (
-                SELECT bondid, MAX(bonddatalogtime) AS maxlogtime
-                FROM bonddata
-                GROUP BY bondid
-            ) latest ON bd.bondid = latest.bondid AND bd.bonddatalogtime = latest.maxlogtime
+            JOIN bond_latest bd ON b.bondid = bd.bondid
             JOIN portfolio_bond pb ON b.bondid = pb.bondid
             JOIN currency c ON c.currencyid = b.bondcurrencyid
             CROSS JOIN currency base_c ON base_c.currencycode = %s
@@ -27,16 +45,13 @@ def get_portfolio_bonds(portfolio_id, base_currency_code='USD'):
             LEFT JOIN sector s ON s.sectorid = b.bondsectorid
             WHERE pb.portfolioid = %s
             """
-    args = (base_currency_code, base_currency_code, portfolio_id)
-    bonds = fetch_all(query, args, dictionary=True)
-    
-    # Convert decimal.Decimal values to float to avoid TypeError in templates
-    for bond in bonds:
-        if 'exchange_rate_to_base' in bond and bond['exchange_rate_to_base'] is not None:
-            bond['exchange_rate_to_base'] = float(bond['exchange_rate_to_base'])
-        if 'bondrate' in bond and bond['bondrate'] is not None:
-            bond['bondrate'] = float(bond['bondrate'])
-        if 'quantity' in bond and bond['quantity'] is not None:
-            bond['quantity'] = float(bond['quantity'])
-    
-    return bonds
\ No newline at end of file
+    args = (base_currency_code, portfolio_id)
+    bonds = fetch_rows(query, PortfolioBond, args, prepared=True)
+
+    # Conversion to the base currency goes through the cached rate matrix
+    if bonds:
+        rates = get_exchange_rates_to([bond.currencyid for bond in bonds], bonds[0].base_currency_id, default=np.nan)
+        for bond, rate in zip(bonds, rates.tolist()):
+            bond.exchange_rate_to_base = None if np.isnan(rate) else rate
+
+    return bonds
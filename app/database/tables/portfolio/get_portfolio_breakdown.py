@@ -0,0 +1,128 @@
+import numpy as np
+from app.database.helpers.fetch_all import fetch_all
+from app.database.helpers.fetch_columns import fetch_columns
+from app.database.cache.reference_data import get_categories, get_sectors
+from app.utils.breakdown import compute_breakdowns
+from app.utils.formatters import format_percent
+
+# dimension -> (column of HOLDINGS_QUERY, label for holdings without one)
+DIMENSIONS = {
+    'category': ('bondcategoryname', 'Other'),
+    'sector': ('sectorname', 'other'),
+    'region': ('region', 'Other'),
+    'currency': ('currencycode', 'Other'),
+    'exchange': ('exchangename', 'Other'),
+    'country': ('bondcountry', 'Unknown'),
+}
+
+PORTFOLIOS_QUERY = """
+    SELECT p.portfolioid, c.currencycode
+    FROM portfolio p
+    JOIN currency c ON c.currencyid = p.portfoliocurrencyid
+    WHERE p.portfolioid IN ({placeholders})
+"""
+
+# One row per holding with its value in the portfolio currency; only the
+# holdings of the requested portfolios are read, not every bond
+HOLDINGS_QUERY = """
+    SELECT
+        pb.portfolioid,
+        CAST(pb.quantity * bd.bondrate * COALESCE(fx.exchangerate, 1.0) AS DOUBLE) AS value,
+        bc.bondcategoryname,
+        s.sectorname,
+        r.region,
+        c.currencycode,
+        e.exchangename,
+        b.bondcountry
+    FROM portfolio_bond pb
+    JOIN portfolio p ON p.portfolioid = pb.portfolioid
+    JOIN bond b ON b.bondid = pb.bondid
+    JOIN currency c ON c.currencyid = b.bondcurrencyid
+    LEFT JOIN bondcategory bc ON bc.bondcategoryid = b.bondcategoryid
+    LEFT JOIN sector s ON s.sectorid = b.bondsectorid
+    LEFT JOIN exchange e ON e.exchangeid = b.bondexchangeid
+    LEFT JOIN region r ON r.regionid = e.region
+    LEFT JOIN bond_latest bd ON bd.bondid = b.bondid
+    LEFT JOIN exchangerate_latest fx
+        ON fx.fromcurrencyid = b.bondcurrencyid AND fx.tocurrencyid = p.portfoliocurrencyid
+    WHERE pb.portfolioid IN ({placeholders})
+"""
+
+
+def get_portfolio_breakdowns(portfolio_ids, dimensions=None, currencies=None):
+    """
+    Allocation of several portfolios over any set of dimensions.
+
+    The holdings with their latest prices and exchange rates are loaded
+    once; every dimension is then a vectorized group-by in memory, so more
+    dimensions cost no extra query.
+
+    Args:
+        portfolio_ids (list of int): The portfolios
+        dimensions (list of str, optional): Keys of DIMENSIONS, all by default
+        currencies (dict, optional): portfolio_id -> currency code of the
+            portfolios, if the caller already loaded them
+
+    Returns:
+        dict: portfolio_id -> PortfolioBreakdown, unknown ids omitted
+
+    Raises:
+        ValueError: If a dimension is unknown
+    """
+    dimensions = list(dimensions or DIMENSIONS)
+    unknown = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown breakdown dimension: {', '.join(unknown)}")
+
+    portfolio_ids = list(dict.fromkeys(portfolio_ids))
+    if not portfolio_ids:
+        return {}
+
+    if currencies is None:
+        placeholders = ', '.join(['%s'] * len(portfolio_ids))
+        currencies = dict(fetch_all(PORTFOLIOS_QUERY.format(placeholders=placeholders), tuple(portfolio_ids)))
+    portfolio_ids = [portfolio_id for portfolio_id in portfolio_ids if portfolio_id in currencies]
+    if not portfolio_ids:
+        return {}
+    columns = fetch_columns(
+        HOLDINGS_QUERY.format(placeholders=', '.join(['%s'] * len(portfolio_ids))), tuple(portfolio_ids),
+        dtypes={'portfolioid': int, 'value': float}
+    )
+
+    labels = {}
+    for dimension in dimensions:
+        column, fallback = DIMENSIONS[dimension]
+        labels[dimension] = np.array([value or fallback for value in columns[column]], dtype=object)
+
+    return compute_breakdowns(portfolio_ids, currencies, columns['portfolioid'], columns['value'], labels)
+
+
+def get_portfolio_breakdown(portfolio_id, dimensions=None):
+    """Allocation of one portfolio, see get_portfolio_breakdowns; None if it does not exist."""
+    return get_portfolio_breakdowns([portfolio_id], dimensions).get(portfolio_id)
+
+
+def portfolio_breakdown_fields(breakdown, total_value):
+    """
+    Flat category, sector and region entries of the portfolio templates.
+
+    Every category and sector is listed, with 0 if the portfolio holds none
+    of it; regions without holdings are left out. Category percentages are
+    relative to total_value.
+
+    Args:
+        breakdown (PortfolioBreakdown): With the category, sector and region dimensions
+        total_value (float): Value of the portfolio
+    """
+    fields = {}
+    category_totals = breakdown.values('category')
+    total_for_percent = total_value if total_value != 0 else 1
+    for category in get_categories():
+        value = category_totals.get(category['bondcategoryname']) or 0
+        name = category['bondcategoryname'].lower()
+        fields[f'{name}_value'] = value
+        fields[f'{name}_percent'] = format_percent(value, total_for_percent)
+
+    fields.update(breakdown.shares('sector', lower=True, include=[sector['sectorname'] for sector in get_sectors()]))
+    fields.update(breakdown.shares('region', positive_only=True))
+    return fields
@@ -0,0 +1,184 @@
+from datetime import timedelta
+import numpy as np
+from config import PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS
+from app.database.helpers.fetch_all import fetch_all
+from app.database.helpers.fetch_one import fetch_one
+from app.utils.timeseries import build_panel, forward_fill
+
+PORTFOLIO_CURRENCY_QUERY = """
+    SELECT p.portfoliocurrencyid, c.currencycode
+    FROM portfolio p
+    JOIN currency c ON c.currencyid = p.portfoliocurrencyid
+    WHERE p.portfolioid = %s
+"""
+
+HOLDINGS_QUERY = """
+    SELECT pb.bondid, CAST(pb.quantity AS DOUBLE), b.bondcurrencyid, b.bondsymbol, b.bondname
+    FROM portfolio_bond pb
+    JOIN bond b ON b.bondid = pb.bondid
+    WHERE pb.portfolioid = %s
+    ORDER BY pb.bondid
+"""
+
+# Dates come back as day offsets and prices as doubles, so the panel is built
+# without converting a Python date and Decimal object per row
+PRICE_PANEL_QUERY = """
+    SELECT bondid, DATEDIFF(bonddatalogtime, %s), CAST(bondrate AS DOUBLE)
+    FROM bonddata
+    WHERE bondid IN ({placeholders})
+    AND bonddatalogtime BETWEEN %s AND %s
+"""
+
+FX_PANEL_QUERY = """
+    SELECT fromcurrencyid, tocurrencyid, DATEDIFF(exchangeratelogtime, %s), CAST(exchangerate AS DOUBLE)
+    FROM exchangerate
+    WHERE exchangeratelogtime BETWEEN %s AND %s
+    AND ((fromcurrencyid IN ({placeholders}) AND tocurrencyid = %s)
+      OR (fromcurrencyid = %s AND tocurrencyid IN ({placeholders})))
+"""
+
+
+def align_prices(bonds, price_rows, fx_rows, currency_id, n_days):
+    """
+    Builds the forward-filled day × bond price panel converted into one currency.
+
+    Args:
+        bonds (list of tuple): (bondid, bondcurrencyid), one column each
+        price_rows (list of tuple): (bondid, day offset, close)
+        fx_rows (list of tuple): (fromcurrencyid, tocurrencyid, day offset, rate)
+            between the bond currencies and currency_id, in either direction
+        currency_id (int): Target currency
+        n_days (int): Calendar days in the panel
+
+    Returns:
+        np.ndarray: Shape (n_days, len(bonds)), NaN before the first price of a bond
+    """
+    column_of = {bond[0]: i for i, bond in enumerate(bonds)}
+
+    # Prices: carried over weekends and exchange holidays
+    prices = forward_fill(build_panel(price_rows, column_of, n_days))
+
+    # FX per bond currency; direct rates win over inverted ones
+    currencies = sorted({bond[1] for bond in bonds})
+    currency_of = {c: i for i, c in enumerate(currencies)}
+    direct = build_panel([(f, day, rate) for f, t, day, rate in fx_rows if t == currency_id], currency_of, n_days)
+    inverse = build_panel([(t, day, 1.0 / rate) for f, t, day, rate in fx_rows if f == currency_id and rate], currency_of, n_days)
+    fx = forward_fill(np.where(np.isnan(direct), inverse, direct))
+    if currency_id in currency_of:
+        fx[:, currency_of[currency_id]] = 1.0
+
+    return prices * fx[:, [currency_of[bond[1]] for bond in bonds]]
+
+
+def business_days(origin, start, n_days):
+    """Returns the business days from start on and their row indices in a panel starting at origin."""
+    calendar = np.datetime64(origin, 'D') + np.arange(n_days)
+    rows = (start - origin).days + np.flatnonzero(np.is_busday(calendar[(start - origin).days:]))
+    return calendar[rows], rows
+
+
+def compute_value_history(holdings, price_rows, fx_rows, currency_id, origin, start, end):
+    """
+    Computes the daily value of a set of holdings from dense price and FX panels.
+
+    Args:
+        holdings (list of tuple): (bondid, quantity, bondcurrencyid, ...)
+        price_rows (list of tuple): (bondid, day offset from origin, close)
+        fx_rows (list of tuple): (fromcurrencyid, tocurrencyid, day offset from origin, rate)
+            between the bond currencies and currency_id, in either direction
+        currency_id (int): Currency the values are expressed in
+        origin (date): Day 0 of the offsets; rows before start only seed the forward fill
+        start (date): First day of the result
+        end (date): Last day of the result
+
+    Returns:
+        tuple: (dates, values) with one entry per business day from start to
+               end; values are NaN before the first priced day of any holding
+    """
+    n_days = (end - origin).days + 1
+    quantities = np.array([holding[1] for holding in holdings], dtype=float)
+    prices = align_prices([(holding[0], holding[2]) for holding in holdings], price_rows, fx_rows, currency_id, n_days)
+
+    # Holdings × prices × FX, summed per day; unpriced holdings count as 0 once any holding is priced
+    position_values = prices * quantities[np.newaxis, :]
+    priced = ~np.isnan(position_values)
+    values = np.where(priced.any(axis=1), np.nansum(position_values, axis=1), np.nan)
+
+    dates, rows = business_days(origin, start, n_days)
+    return dates, values[rows]
+
+
+def load_portfolio(portfolio_id):
+    """Returns (portfoliocurrencyid, currencycode, holdings) or None if the portfolio does not exist."""
+    portfolio = fetch_one(PORTFOLIO_CURRENCY_QUERY, (portfolio_id,))
+    if portfolio is None:
+        return None
+    return portfolio[0], portfolio[1], fetch_all(HOLDINGS_QUERY, (portfolio_id,))
+
+
+def load_panel_rows(bonds, currency_id, origin, end):
+    """
+    Loads the price rows of bonds and the exchange rates between their
+    currencies and currency_id from origin to end, one query each.
+
+    Args:
+        bonds (list of tuple): (bondid, bondcurrencyid)
+
+    Returns:
+        tuple: (price_rows, fx_rows) as expected by align_prices
+    """
+    if not bonds:
+        return [], []
+
+    bondids = [bond[0] for bond in bonds]
+    price_rows = fetch_all(
+        PRICE_PANEL_QUERY.format(placeholders=', '.join(['%s'] * len(bondids))),
+        (origin, *bondids, origin, end)
+    )
+
+    fx_rows = []
+    foreign = sorted({bond[1] for bond in bonds} - {currency_id})
+    if foreign:
+        placeholders = ', '.join(['%s'] * len(foreign))
+        fx_rows = fetch_all(
+            FX_PANEL_QUERY.format(placeholders=placeholders),
+            (origin, origin, end, *foreign, currency_id, currency_id, *foreign)
+        )
+    return price_rows, fx_rows
+
+
+def get_portfolio_history(portfolio_id, start, end):
+    """
+    Daily value of a portfolio in its own currency between two dates.
+
+    Uses today's quantities for every day, since the holdings have no
+    transaction history. The prices of all holdings and the exchange rates
+    are each loaded with one query and aligned as NumPy panels.
+
+    Args:
+        portfolio_id (int): The portfolio
+        start (date): First day
+        end (date): Last day
+
+    Returns:
+        dict: currencycode, start, end, dates ('YYYY-MM-DD') and values (float or None)
+    """
+    portfolio = load_portfolio(portfolio_id)
+    if portfolio is None:
+        return None
+    currency_id, currency_code, holdings = portfolio
+
+    # Rows before start only seed the forward fill of the first days
+    origin = start - timedelta(days=PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS)
+    price_rows, fx_rows = load_panel_rows([(h[0], h[2]) for h in holdings], currency_id, origin, end)
+
+    dates, values = compute_value_history(holdings, price_rows, fx_rows, currency_id, origin, start, end)
+
+    return {
+        'portfolioid': portfolio_id,
+        'currencycode': currency_code,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'dates': np.datetime_as_string(dates, unit='D').tolist(),
+        'values': [None if np.isnan(value) else round(float(value), 2) for value in values],
+    }
@@ -0,0 +1,107 @@
+from datetime import timedelta
+import numpy as np
+from config import PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS
+from app.database.tables.portfolio.get_portfolio_history import (
+    load_portfolio, load_panel_rows, align_prices, business_days
+)
+from app.utils.risk_metrics import simple_returns
+from app.utils.value_at_risk import historical_var, parametric_var, monte_carlo_var
+
+
+def _amounts(var, cvar, value):
+    """VaR and CVaR in the portfolio currency and as a fraction of its value."""
+    def clean(x, digits):
+        return None if not np.isfinite(x) else round(float(x), digits)
+
+    return {
+        'var': clean(var, 2),
+        'cvar': clean(cvar, 2),
+        'var_pct': clean(var / value, 6) if value else None,
+        'cvar_pct': clean(cvar / value, 6) if value else None,
+    }
+
+
+def compute_portfolio_risk(prices, quantities, confidence, horizon_days=1, paths=0, chunk_paths=10000, seed=None, executor=None):
+    """
+    Historical, parametric and optionally Monte Carlo VaR and CVaR of a portfolio.
+
+    Every method revalues today's positions: the scenarios are the daily
+    returns of the holdings, with holdings that were not priced on a day
+    contributing no profit or loss.
+
+    Args:
+        prices (np.ndarray): Business day × holding prices in the portfolio currency
+        quantities (np.ndarray): Quantity per holding
+        confidence (float): e.g. 0.99
+        horizon_days (int): Holding period in trading days
+        paths (int): Monte Carlo paths, 0 to skip the simulation
+        chunk_paths (int): Paths per Monte Carlo chunk
+        seed (int, optional): Seed of the simulation
+        executor (concurrent.futures.Executor, optional): Runs the Monte Carlo chunks
+
+    Returns:
+        dict: value, observations and per method var, cvar, var_pct and cvar_pct
+    """
+    returns = np.nan_to_num(simple_returns(prices), nan=0.0)
+    latest = prices[-1] * quantities if len(prices) else np.zeros(len(quantities))
+    exposures = np.nan_to_num(latest, nan=0.0)
+    value = float(exposures.sum())
+
+    result = {
+        'value': round(value, 2),
+        'observations': int(returns.shape[0]),
+        'historical': _amounts(*historical_var(returns, exposures, confidence, horizon_days), value),
+        'parametric': _amounts(*parametric_var(returns, exposures, confidence, horizon_days), value),
+    }
+    if paths > 0:
+        result['montecarlo'] = {
+            **_amounts(*monte_carlo_var(returns, exposures, confidence, horizon_days, paths, chunk_paths, seed, executor), value),
+            'paths': paths,
+        }
+    return result
+
+
+def get_portfolio_risk(portfolio_id, as_of, params, chunk_paths=10000, seed=None, executor=None):
+    """
+    VaR and CVaR of a portfolio as of a date from its price history.
+
+    Args:
+        portfolio_id (int): The portfolio
+        as_of (date): Last day of the history
+        params (dict): confidence, horizon_days, lookback_days and paths
+
+    Returns:
+        dict: As compute_portfolio_risk plus currencycode, asof and start,
+              or None if the portfolio does not exist
+    """
+    portfolio = load_portfolio(portfolio_id)
+    if portfolio is None:
+        return None
+    currency_id, currency_code, holdings = portfolio
+
+    start = as_of - timedelta(days=params['lookback_days'])
+    origin = start - timedelta(days=PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS)
+    n_days = (as_of - origin).days + 1
+
+    bonds = [(holding[0], holding[2]) for holding in holdings]
+    price_rows, fx_rows = load_panel_rows(bonds, currency_id, origin, as_of)
+    _, rows = business_days(origin, start, n_days)
+    prices = align_prices(bonds, price_rows, fx_rows, currency_id, n_days)[rows]
+
+    result = compute_portfolio_risk(
+        prices,
+        np.array([holding[1] for holding in holdings], dtype=float),
+        params['confidence'],
+        params['horizon_days'],
+        params['paths'],
+        chunk_paths=chunk_paths,
+        seed=seed,
+        executor=executor
+    )
+    result.update({
+        'portfolioid': portfolio_id,
+        'currencycode': currency_code,
+        'asof': as_of.isoformat(),
+        'start': start.isoformat(),
+    })
+    return result
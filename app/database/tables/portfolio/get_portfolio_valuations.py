@@ -0,0 +1,76 @@
+from app.database.helpers.fetch_all import fetch_all
+from app.database.cache.reference_data import currency_id_by_code
+from app.database.cache.exchange_rates import get_exchange_rates_to
+from app.database.tables.portfolio.get_portfolio_breakdown import get_portfolio_breakdowns, portfolio_breakdown_fields
+
+PORTFOLIO_QUERY = """
+    SELECT
+        p.portfolioid,
+        p.portfolioname,
+        p.portfoliodescription,
+        c.currencycode,
+        p.portfoliocurrencyid
+    FROM portfolio p
+    JOIN currency c ON c.currencyid = p.portfoliocurrencyid
+    WHERE p.portfolioid IN ({placeholders})
+"""
+
+
+def get_portfolio_valuations(portfolio_ids, base_currency=None):
+    """
+    Values many portfolios at once: totals plus category, sector and region
+    breakdowns from one load of all their holdings (see get_portfolio_breakdowns).
+
+    Args:
+        portfolio_ids (list of int): The portfolios to value
+        base_currency (str, optional): If given, every portfolio also gets
+                                       exchange_rate_to_base and converted_value
+
+    Returns:
+        dict: portfolio_id -> portfolio dict in the order of portfolio_ids;
+              unknown ids are omitted
+    """
+    portfolio_ids = list(portfolio_ids)
+    if not portfolio_ids:
+        return {}
+
+    query = PORTFOLIO_QUERY.format(placeholders=','.join(['%s'] * len(portfolio_ids)))
+    rows = {row['portfolioid']: row for row in fetch_all(query, tuple(portfolio_ids), dictionary=True)}
+    portfolio_ids = [portfolio_id for portfolio_id in portfolio_ids if portfolio_id in rows]
+    if not portfolio_ids:
+        return {}
+
+    breakdowns = get_portfolio_breakdowns(
+        portfolio_ids,
+        ['category', 'sector', 'region'],
+        currencies={portfolio_id: rows[portfolio_id]['currencycode'] for portfolio_id in portfolio_ids},
+    )
+
+    rates = None
+    if base_currency:
+        # Conversion to the base currency goes through the cached rate matrix
+        rates = get_exchange_rates_to(
+            [rows[portfolio_id]['portfoliocurrencyid'] for portfolio_id in portfolio_ids],
+            currency_id_by_code(base_currency),
+        )
+
+    valuations = {}
+    for i, portfolio_id in enumerate(portfolio_ids):
+        row = rows[portfolio_id]
+        breakdown = breakdowns[portfolio_id]
+        portfolio = {
+            'portfolioid': portfolio_id,
+            'portfolioname': row['portfolioname'],
+            'portfoliodescription': row['portfoliodescription'],
+            'currencycode': row['currencycode'],
+            'total_value': breakdown.total_value,
+        }
+        portfolio.update(portfolio_breakdown_fields(breakdown, breakdown.total_value))
+
+        if rates is not None:
+            portfolio['exchange_rate_to_base'] = float(rates[i])
+            portfolio['converted_value'] = breakdown.total_value * portfolio['exchange_rate_to_base']
+
+        valuations[portfolio_id] = portfolio
+
+    return valuations
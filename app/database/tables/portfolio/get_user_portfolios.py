@@ -1,10 +1,8 @@
 from app.database.helpers.fetch_all import fetch_all
-from app.database.tables.portfolio.get_portfolio import get_portfolio
+from app.database.tables.portfolio.get_portfolio_valuations import get_portfolio_valuations
 
-def get_user_portfolios(userid):
+def get_user_portfolios(userid, base_currency=None):
     portfolio_ids = fetch_all("""SELECT portfolioid from portfolio where userid = %s""", (userid,))
-    portfolios = []
-    for portfolio_id in portfolio_ids:
-        portfolios.append(get_portfolio(portfolio_id[0]))
+    valuations = get_portfolio_valuations([row[0] for row in portfolio_ids], base_currency)
 
-    return portfolios
\ No newline at end of file
+    return list(valuations.values())
\ No newline at end of file
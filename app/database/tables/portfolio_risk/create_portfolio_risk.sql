@@ -0,0 +1,14 @@
+CREATE TABLE portfolio_risk (
+    riskid INT PRIMARY KEY NOT NULL AUTO_INCREMENT,
+    portfolioid INT NOT NULL,
+    asofdate DATE NOT NULL,
+    paramskey CHAR(64) NOT NULL,
+    params VARCHAR(500) NOT NULL,
+    status ENUM('RUNNING', 'DONE', 'FAILED') NOT NULL DEFAULT 'RUNNING',
+    result MEDIUMTEXT,
+    error_message TEXT,
+    startedat TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finishedat TIMESTAMP NULL DEFAULT NULL,
+    UNIQUE KEY uq_portfolio_risk (portfolioid, asofdate, paramskey),
+    FOREIGN KEY (portfolioid) REFERENCES portfolio (portfolioid) ON DELETE CASCADE
+);
\ No newline at end of file
@@ -0,0 +1,80 @@
+import hashlib
+import json
+from app.database.helpers.fetch_one import fetch_one
+from app.database.helpers.execute_change_query import execute_change_query
+from app.database.connection.cursor import db_transaction
+
+
+def params_key(params):
+    """Stable SHA-256 of a parameter dict, independent of the key order."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def get_portfolio_risk(portfolio_id, as_of, key):
+    """
+    Returns the risk job of a portfolio, as-of date and parameter key.
+
+    Returns:
+        dict: status ('RUNNING', 'DONE', 'FAILED'), params, result (dict or
+              None), error, startedat and finishedat; None if never requested
+    """
+    row = fetch_one("""
+        SELECT status, params, result, error_message, startedat, finishedat
+        FROM portfolio_risk
+        WHERE portfolioid = %s AND asofdate = %s AND paramskey = %s
+    """, (portfolio_id, as_of, key))
+    if row is None:
+        return None
+
+    status, params, result, error, started, finished = row
+    return {
+        'status': status,
+        'params': json.loads(params),
+        'result': json.loads(result) if result else None,
+        'error': error,
+        'startedat': started.isoformat() if started else None,
+        'finishedat': finished.isoformat() if finished else None,
+    }
+
+
+def claim_portfolio_risk(portfolio_id, as_of, key, params, timeout_seconds):
+    """
+    Registers a risk job unless an equal one is done or still running.
+
+    A failed job, or one running for longer than timeout_seconds (its worker
+    died), is taken over. The unique key makes sure that only one worker
+    wins when several request the same job at once.
+
+    Returns:
+        bool: True if the caller should run the job
+    """
+    with db_transaction() as cursor:
+        cursor.execute("""
+            INSERT IGNORE INTO portfolio_risk (portfolioid, asofdate, paramskey, params)
+            VALUES (%s, %s, %s, %s)
+        """, (portfolio_id, as_of, key, json.dumps(params, sort_keys=True)))
+        if cursor.rowcount == 1:
+            return True
+
+        cursor.execute("""
+            UPDATE portfolio_risk
+            SET status = 'RUNNING', result = NULL, error_message = NULL,
+                startedat = CURRENT_TIMESTAMP, finishedat = NULL
+            WHERE portfolioid = %s AND asofdate = %s AND paramskey = %s
+            AND (status = 'FAILED' OR (status = 'RUNNING' AND startedat < NOW() - INTERVAL %s SECOND))
+        """, (portfolio_id, as_of, key, int(timeout_seconds)))
+        return cursor.rowcount == 1
+
+
+def finish_portfolio_risk(portfolio_id, as_of, key, result=None, error=None):
+    """Stores the result of a risk job, or its error if result is None."""
+    execute_change_query("""
+        UPDATE portfolio_risk
+        SET status = %s, result = %s, error_message = %s, finishedat = CURRENT_TIMESTAMP
+        WHERE portfolioid = %s AND asofdate = %s AND paramskey = %s
+    """, (
+        'DONE' if error is None else 'FAILED',
+        json.dumps(result) if error is None else None,
+        error,
+        portfolio_id, as_of, key
+    ))
@@ -0,0 +1,28 @@
+from app.database.helpers.fetch_one import fetch_one
+from app.database.helpers.execute_change_query import execute_change_query
+
+def add_portfoliodata_version():
+    """
+    Adds the portfoliodata_version column to status on databases created
+    before it existed.
+
+    Returns:
+        bool: True if the column exists afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.columns
+            WHERE table_schema = DATABASE()
+            AND table_name = 'status'
+            AND column_name = 'portfoliodata_version'
+        """)
+        if existing and existing[0] > 0:
+            return True
+
+        execute_change_query("ALTER TABLE status ADD COLUMN portfoliodata_version INT NOT NULL DEFAULT 0")
+        return True
+
+    except Exception as e:
+        print(f"Failed to add status.portfoliodata_version: {e}")
+        return False
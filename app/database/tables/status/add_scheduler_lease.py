@@ -0,0 +1,32 @@
+from app.database.helpers.fetch_one import fetch_one
+from app.database.helpers.execute_change_query import execute_change_query
+
+def add_scheduler_lease():
+    """
+    Adds the scheduler_owner and scheduler_lease_until columns to status on
+    databases created before they existed.
+
+    Returns:
+        bool: True if the columns exist afterwards, False otherwise
+    """
+    try:
+        existing = fetch_one("""
+            SELECT COUNT(*)
+            FROM information_schema.columns
+            WHERE table_schema = DATABASE()
+            AND table_name = 'status'
+            AND column_name IN ('scheduler_owner', 'scheduler_lease_until')
+        """)
+        if existing and existing[0] == 2:
+            return True
+
+        execute_change_query("""
+            ALTER TABLE status
+            ADD COLUMN scheduler_owner VARCHAR(100) DEFAULT NULL,
+            ADD COLUMN scheduler_lease_until DATETIME DEFAULT NULL
+        """)
+        return True
+
+    except Exception as e:
+        print(f"Failed to add status scheduler lease columns: {e}")
+        return False
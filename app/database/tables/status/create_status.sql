@@ -2,5 +2,9 @@ CREATE TABLE status (
     id INT PRIMARY KEY NOT NULL AUTO_INCREMENT,
     exchangerates DATE DEFAULT NULL,
     securities DATE DEFAULT NULL,
-    system_generated DATE DEFAULT NULL
-);
\ No newline at end of file
+    system_generated DATE DEFAULT NULL,
+    referencedata_version INT NOT NULL DEFAULT 0,
+    portfoliodata_version INT NOT NULL DEFAULT 0,
+    scheduler_owner VARCHAR(100) DEFAULT NULL,
+    scheduler_lease_until DATETIME DEFAULT NULL
+);
@@ -0,0 +1,41 @@
+from app.database.connection.cursor import db_transaction
+from app.database.helpers.execute_change_query import execute_change_query
+
+def acquire_scheduler_lease(owner, ttl_seconds):
+    """
+    Takes or renews the scheduler lease in the status row.
+
+    The lease is granted if it is free, expired or already held by owner;
+    the row lock of the UPDATE guarantees a single winner. Expiry uses the
+    database clock so workers in different containers agree on it.
+
+    Args:
+        owner (str): Identifier of the calling process
+        ttl_seconds (int): How long the lease is valid without renewal
+
+    Returns:
+        bool: True if owner holds the lease afterwards
+    """
+    with db_transaction() as cursor:
+        cursor.execute("""
+            UPDATE status
+            SET scheduler_owner = %s,
+                scheduler_lease_until = NOW() + INTERVAL %s SECOND
+            WHERE id = 1
+            AND (scheduler_owner IS NULL OR scheduler_owner = %s OR scheduler_lease_until IS NULL OR scheduler_lease_until < NOW())
+        """, (owner, int(ttl_seconds), owner))
+
+        # rowcount is 0 for a renewal within the same second, so read the owner back
+        cursor.execute("SELECT scheduler_owner FROM status WHERE id = 1")
+        row = cursor.fetchone()
+
+    return bool(row) and row[0] == owner
+
+
+def release_scheduler_lease(owner):
+    """Gives up the scheduler lease if owner holds it, so another worker can take over immediately."""
+    execute_change_query("""
+        UPDATE status
+        SET scheduler_owner = NULL, scheduler_lease_until = NULL
+        WHERE id = 1 AND scheduler_owner = %s
+    """, (owner,))
@@ -3,7 +3,7 @@
 
 
 from flask_login import login_required, current_user
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from app.database.tables.portfolio.get_portfolio_bonds import get_portfolio_bonds
 from app.database.tables.portfolio.get_all_bonds_based_on_portfolio import get_all_bonds_based_on_portfolio
 from app.database.tables.portfolio.get_portfolio import get_portfolio
@@ -11,12 +11,29 @@ from app.database.tables.portfolio.get_user_portfolios import get_user_portfolio
 from app.database.helpers.fetch_all import fetch_all
 from app.database.helpers.fetch_one import fetch_one
 from app.database.helpers.execute_change_query import execute_change_query
+from app.database.connection.cursor import db_transaction
 from app.database.helpers.call_procedure import call_procedure
 from app.database.tables.bond.get_full_bond import get_full_bond
+from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
+from app.database.cache.reference_data import get_currencies, get_categories, get_sectors, get_regions
+from app.database.cache.exchange_rates import get_exchange_rate
+from app.database.cache.query_cache import bump_portfolio_data_version
 from app.utils.logger import log_user_action, log_error
+from app.utils.warmup import get_readiness
 
 bp = Blueprint('main', __name__)
 
+# liveness: the process serves requests, nothing else is checked
+@bp.route('/health')
+def health():
+    return jsonify({"status": "alive"})
+
+# readiness: background warm-up finished and the database answers
+@bp.route('/ready')
+def ready():
+    readiness = get_readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
 # home
 @bp.route('/')
 def home():
@@ -26,55 +43,13 @@ def home():
     from app.utils.currency_utils import get_user_default_currency
     base_currency = request.args.get('base_currency', get_user_default_currency(current_user))
     
-    # Optimize: Fetch all data in parallel queries
-    from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
-    from app.database.helpers.fetch_one import fetch_one
-    
-    # Get portfolios and currencies in parallel
-    portfolios = get_user_portfolios(current_user.id)
-    currencies = fetch_all(query="""SELECT currencyid as id, currencycode FROM currency""", dictionary=True)
+    # Portfolios are valued and converted to the base currency in one batched query
+    portfolios = get_user_portfolios(current_user.id, base_currency)
+    currencies = get_currencies()
     
     if not portfolios:
         return render_template('home.html', user=current_user, portfolios=[], currencies=currencies, base_currency=base_currency, total_value=0)
     
-    # Optimize: Get all unique currency codes and fetch exchange rates in one query
-    base_currency_id = get_currency_id_by_code(base_currency)
-    unique_currencies = set(p['currencycode'] for p in portfolios)
-    unique_currencies.add(base_currency)
-    
-    # Build optimized exchange rate query for all currency pairs at once
-    currency_ids = [get_currency_id_by_code(currency) for currency in unique_currencies if get_currency_id_by_code(currency)]
-    currency_pairs = [(from_id, base_currency_id) for from_id in currency_ids if from_id != base_currency_id]
-    
-    # Fetch all exchange rates in one query if needed
-    exchange_rates = {}
-    if currency_pairs:
-        placeholders = ','.join(['(%s,%s)'] * len(currency_pairs))
-        exchange_rate_query = f"""
-        SELECT fromcurrencyid, tocurrencyid, exchangerate FROM exchangerate 
-        WHERE (fromcurrencyid, tocurrencyid) IN ({placeholders})
-        AND exchangeratelogtime = (
-            SELECT MAX(exchangeratelogtime) 
-            FROM exchangerate er2
-            WHERE er2.fromcurrencyid = exchangerate.fromcurrencyid 
-            AND er2.tocurrencyid = exchangerate.tocurrencyid
-        )
-        """
-        params = [param for pair in currency_pairs for param in pair]
-        results = fetch_all(exchange_rate_query, params, dictionary=True)
-        exchange_rates = {(r['fromcurrencyid'], r['tocurrencyid']): float(r['exchangerate']) for r in results}
-    
-    # Convert portfolio values using cached exchange rates
-    for portfolio in portfolios:
-        portfolio_currency_id = get_currency_id_by_code(portfolio['currencycode'])
-        if portfolio_currency_id != base_currency_id:
-            exchange_rate = exchange_rates.get((portfolio_currency_id, base_currency_id), 1.0)
-            portfolio['converted_value'] = portfolio['total_value'] * exchange_rate
-            portfolio['exchange_rate_to_base'] = exchange_rate
-        else:
-            portfolio['converted_value'] = portfolio['total_value']
-            portfolio['exchange_rate_to_base'] = 1.0
-    
     # Calculate total value and percentages
     total_value = sum(portfolio['converted_value'] for portfolio in portfolios)
     for p in portfolios:
@@ -89,36 +64,21 @@ def portfolioview(portfolio_id):
     base_currency = request.args.get('base_currency', get_user_default_currency(current_user))
     
     # Optimize: Fetch all static data in parallel
-    from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
     from app.database.helpers.fetch_one import fetch_one
     
     # Get portfolio and all static data in parallel
     portfolio = get_portfolio(portfolio_id, base_currency)
     bonds = get_portfolio_bonds(portfolio_id, base_currency)
-    currencies = fetch_all(query="""SELECT currencyid as id, currencycode FROM currency""", dictionary=True)
-    categories = fetch_all(query="""SELECT bondcategoryid as id, bondcategoryname FROM bondcategory""", dictionary=True)
-    sectors = fetch_all(query="""SELECT sectorid as id, sectorname, sectordisplayname FROM sector""", dictionary=True)
-    regions = fetch_all(query="""SELECT regionid as id, region FROM region""", dictionary=True)
+    currencies = get_currencies()
+    categories = get_categories()
+    sectors = get_sectors()
+    regions = get_regions()
     
-    # Optimize: Get exchange rate if needed
+    # Exchange rate from portfolio currency to base currency from the cached rate matrix
     portfolio_currency_id = get_currency_id_by_code(portfolio['currencycode'])
     base_currency_id = get_currency_id_by_code(base_currency)
     
-    if portfolio_currency_id != base_currency_id:
-        # Get exchange rate from portfolio currency to base currency
-        exchange_rate_query = """
-        SELECT exchangerate FROM exchangerate 
-        WHERE fromcurrencyid = %s AND tocurrencyid = %s 
-        AND exchangeratelogtime = (
-            SELECT MAX(exchangeratelogtime) 
-            FROM exchangerate 
-            WHERE fromcurrencyid = %s AND tocurrencyid = %s
-        )
-        """
-        result = fetch_one(exchange_rate_query, (portfolio_currency_id, base_currency_id, portfolio_currency_id, base_currency_id))
-        portfolio['exchange_rate_to_base'] = float(result[0]) if result else 1.0
-    else:
-        portfolio['exchange_rate_to_base'] = 1.0
+    portfolio['exchange_rate_to_base'] = get_exchange_rate(portfolio_currency_id, base_currency_id, default=1.0)
     
     return render_template('portfolioview.html', portfolio=portfolio, bonds=bonds, currencies=currencies, categories=categories, regions=regions, sectors=sectors, base_currency=base_currency)
 
@@ -129,36 +89,21 @@ def securites_view(portfolio_id):
     base_currency = request.args.get('base_currency', get_user_default_currency(current_user))
     
     # Optimize: Fetch all data in parallel
-    from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
     from app.database.helpers.fetch_one import fetch_one
     
     # Get portfolio and all static data in parallel
     portfolio = get_portfolio(portfolio_id)
     bonds = get_portfolio_bonds(portfolio_id, base_currency)
-    currencies = fetch_all(query="""SELECT currencyid as id, currencycode FROM currency""", dictionary=True)
-    categories = fetch_all(query="""SELECT bondcategoryid as id, bondcategoryname FROM bondcategory""", dictionary=True)
-    sectors = fetch_all(query="""SELECT sectorid as id, sectorname, sectordisplayname FROM sector""", dictionary=True)
-    regions = fetch_all(query="""SELECT regionid as id, region FROM region""", dictionary=True)
+    currencies = get_currencies()
+    categories = get_categories()
+    sectors = get_sectors()
+    regions = get_regions()
     
-    # Optimize: Get exchange rate if needed
+    # Exchange rate from portfolio currency to base currency from the cached rate matrix
     portfolio_currency_id = get_currency_id_by_code(portfolio['currencycode'])
     base_currency_id = get_currency_id_by_code(base_currency)
     
-    if portfolio_currency_id != base_currency_id:
-        # Get exchange rate from portfolio currency to base currency
-        exchange_rate_query = """
-        SELECT exchangerate FROM exchangerate 
-        WHERE fromcurrencyid = %s AND tocurrencyid = %s 
-        AND exchangeratelogtime = (
-            SELECT MAX(exchangeratelogtime) 
-            FROM exchangerate 
-            WHERE fromcurrencyid = %s AND tocurrencyid = %s
-        )
-        """
-        result = fetch_one(exchange_rate_query, (portfolio_currency_id, base_currency_id, portfolio_currency_id, base_currency_id))
-        portfolio['exchange_rate_to_base'] = float(result[0]) if result else 1.0
-    else:
-        portfolio['exchange_rate_to_base'] = 1.0
+    portfolio['exchange_rate_to_base'] = get_exchange_rate(portfolio_currency_id, base_currency_id, default=1.0)
     
     return render_template('securitiesview.html', portfolio=portfolio, bonds=bonds, currencies=currencies, categories=categories, regions=regions, sectors=sectors, base_currency=base_currency)
 
@@ -167,10 +112,8 @@ def securites_view(portfolio_id):
 @login_required
 def securityview(bond_id, portfolio_id):
     bond = get_full_bond(bond_id)
-    query = """SELECT currencyid, currencycode FROM currency"""
-    currencies = fetch_all(query=query, dictionary=True)
-    query = """SELECT bondcategoryid, bondcategoryname FROM bondcategory"""
-    categories = fetch_all(query=query, dictionary=True)
+    currencies = get_currencies()
+    categories = get_categories()
     return render_template('securityview.html', bond=bond, portfolio_id=portfolio_id, currencies=currencies, categories=categories)
 
 @bp.route('/create_portfolio', methods=['POST'])
@@ -208,7 +151,7 @@ def create_portfolio():
             return redirect(url_for('main.home'))
         
         # Get currency ID
-        currency_id = fetch_one("SELECT currencyid FROM currency WHERE currencycode = %s", (selected_symbol,))
+        currency_id = get_currency_id_by_code(selected_symbol)
         if not currency_id:
             flash("Invalid currency selected.", "danger")
             return redirect(url_for('main.home'))
@@ -218,7 +161,7 @@ def create_portfolio():
             INSERT INTO portfolio
             SET portfolioname = %s, portfoliodescription = %s, portfoliocurrencyid = %s, userid = %s
         """
-        update_args = (new_name, new_description, currency_id[0], current_user.id)
+        update_args = (new_name, new_description, currency_id, current_user.id)
         execute_change_query(query=update_query, args=update_args)
         
         # Log portfolio creation
@@ -254,6 +197,7 @@ def delete_portfolio(portfolio_id):
         
         # Delete portfolio (CASCADE will handle related records)
         execute_change_query("DELETE FROM portfolio WHERE portfolioid = %s", (portfolio_id,))
+        bump_portfolio_data_version()
         flash(f"Portfolio '{name}' has been successfully deleted", "success")
         return redirect(url_for('main.home'))
         
@@ -269,10 +213,10 @@ def edit_portfolio(portfolio_id):
     # Optimize: Fetch all data in parallel
     portfolio = get_portfolio(portfolio_id)
     bonds = get_all_bonds_based_on_portfolio(portfolio_id)
-    currencies = fetch_all(query="""SELECT currencyid as id, currencycode FROM currency""", dictionary=True)
-    categories = fetch_all(query="""SELECT bondcategoryid as id, bondcategoryname FROM bondcategory""", dictionary=True)
-    sectors = fetch_all(query="""SELECT sectorid as id, sectorname, sectordisplayname FROM sector""", dictionary=True)
-    regions = fetch_all(query="""SELECT regionid as id, region FROM region""", dictionary=True)
+    currencies = get_currencies()
+    categories = get_categories()
+    sectors = get_sectors()
+    regions = get_regions()
     
     base_currency = get_user_default_currency(current_user)
     is_admin = current_user.is_admin
@@ -322,7 +266,7 @@ def update_portfolio_details(portfolio_id):
             return redirect(url_for('main.portfolioview', portfolio_id=portfolio_id))
         
         # Get currency ID
-        currency_id = fetch_one("SELECT currencyid FROM currency WHERE currencycode = %s", (selected_symbol,))
+        currency_id = get_currency_id_by_code(selected_symbol)
         if not currency_id:
             flash("Invalid currency selected.", "danger")
             return redirect(url_for('main.portfolioview', portfolio_id=portfolio_id))
@@ -333,8 +277,9 @@ def update_portfolio_details(portfolio_id):
             SET portfolioname = %s, portfoliodescription = %s, portfoliocurrencyid = %s
             WHERE portfolioid = %s
         """
-        update_args = (new_name, new_description, currency_id[0], portfolio_id)
+        update_args = (new_name, new_description, currency_id, portfolio_id)
         execute_change_query(query=update_query, args=update_args)
+        bump_portfolio_data_version()
         flash(f"Portfolio details for '{new_name}' have been successfully updated", "success")
         return redirect(url_for('main.portfolioview', portfolio_id=portfolio_id))
         
@@ -386,7 +331,9 @@ def update_securities(portfolio_id):
                 SET quantity = %s
                 WHERE portfolioid = %s AND bondid = %s
             """
-            execute_change_query(update_query, (quantity_value, portfolio_id, int(bond_id)))
+            with db_transaction() as cursor:
+                cursor.execute(update_query, (quantity_value, portfolio_id, int(bond_id)))
+                bump_portfolio_data_version(cursor)
             symbol = fetch_one("SELECT bondsymbol FROM bond WHERE bondid = %s", (bond_id,), dictionary=True)
             if symbol:
                 flash(f"Quantity for {symbol['bondsymbol']} has been successfully updated", "success")
@@ -410,7 +357,9 @@ def update_securities(portfolio_id):
                 DELETE FROM portfolio_bond
                 WHERE portfolioid = %s AND bondid = %s
             """
-            execute_change_query(query=delete_query, args=(portfolio_id, int(bond_id)))
+            with db_transaction() as cursor:
+                cursor.execute(delete_query, (portfolio_id, int(bond_id)))
+                bump_portfolio_data_version(cursor)
             symbol = fetch_one("SELECT bondsymbol FROM bond WHERE bondid = %s", (bond_id,), dictionary=True)
             if symbol:
                 flash(f"Security {symbol['bondsymbol']} has been successfully removed", "success")
@@ -451,7 +400,9 @@ def update_securities(portfolio_id):
                 INSERT INTO portfolio_bond (portfolioid, bondid, quantity)
                 VALUES (%s, %s, %s)
             """
-            execute_change_query(query=insert_query, args=(portfolio_id, int(bond_id), quantity_value))
+            with db_transaction() as cursor:
+                cursor.execute(insert_query, (portfolio_id, int(bond_id), quantity_value))
+                bump_portfolio_data_version(cursor)
             symbol = fetch_one("SELECT bondsymbol FROM bond WHERE bondid = %s", (bond_id,), dictionary=True)
             if symbol:
                 flash(f"Security {symbol['bondsymbol']} has been successfully added", "success")
@@ -467,7 +418,7 @@ def update_securities(portfolio_id):
 def settings():
     """User settings page"""
     # Optimize: Fetch currencies and user data in parallel
-    currencies = fetch_all(query="""SELECT currencyid as id, currencycode FROM currency""", dictionary=True)
+    currencies = get_currencies()
     
     # Get user's current currency code
     from app.database.tables.currency.get_currency_code_by_id import get_currency_code_by_id
@@ -684,7 +635,6 @@ def update_currency():
             return redirect(url_for('main.settings'))
         
         # Get currency ID from currency code
-        from app.database.tables.currency.get_currency_id_by_code import get_currency_id_by_code
         new_currency_id = get_currency_id_by_code(new_currency_code)
         if not new_currency_id:
             flash('Selected currency does not exist.', 'danger')
@@ -1,6 +1,7 @@
 let sectorChart = null; // global variable to hold chart instance
 let assetChart = null; // global variable to hold chart instance
 let regionalChart = null; // global variable to hold chart instance
+let valueHistoryChart = null; // global variable to hold chart instance
 
 document.addEventListener('DOMContentLoaded', () => {
 
@@ -8,9 +9,256 @@ document.addEventListener('DOMContentLoaded', () => {
   renderAssetBreakdown(json.categories, json.portfolio);
   renderSectorBreakdown(json.sectors, json.portfolio);
   renderRegionalBreakdown(json.regions, json.portfolio);
+  initValueHistory(json.historyUrl, json.analyticsUrl, json.portfolio);
+  initValueAtRisk(json.riskUrl, json.portfolio);
 
 });
 
+function initValueHistory(historyUrl, analyticsUrl, portfolio) {
+  // The range buttons drive both the value chart and the risk metrics
+  const buttons = document.querySelectorAll('#historyRangeButtons button');
+  buttons.forEach(button => {
+    button.addEventListener('click', () => {
+      buttons.forEach(b => b.classList.remove('active'));
+      button.classList.add('active');
+      loadValueHistory(historyUrl, button.dataset.days, portfolio);
+      loadRiskMetrics(analyticsUrl, button.dataset.days);
+    });
+  });
+
+  const active = document.querySelector('#historyRangeButtons button.active');
+  const days = active ? active.dataset.days : 365;
+  loadValueHistory(historyUrl, days, portfolio);
+  loadRiskMetrics(analyticsUrl, days);
+}
+
+async function loadValueHistory(historyUrl, days, portfolio) {
+  const note = document.getElementById('valueHistoryNote');
+  try {
+    const response = await fetch(`${historyUrl}?days=${encodeURIComponent(days)}`, {
+      headers: { 'Accept': 'application/json' }
+    });
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.error || response.statusText);
+    }
+    renderValueHistory(data, portfolio);
+  } catch (error) {
+    if (note) note.textContent = 'Error loading value history: ' + error.message;
+  }
+}
+
+async function loadRiskMetrics(analyticsUrl, days) {
+  const note = document.getElementById('riskMetricsNote');
+  try {
+    const response = await fetch(`${analyticsUrl}?days=${encodeURIComponent(days)}`, {
+      headers: { 'Accept': 'application/json' }
+    });
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.error || response.statusText);
+    }
+    renderRiskMetrics(data);
+    renderHoldingsRisk(data.holdings);
+    renderCorrelationMatrix(data.correlation);
+  } catch (error) {
+    if (note) note.textContent = 'Error loading risk metrics: ' + error.message;
+  }
+}
+
+function formatPercentValue(value) {
+  return value === null || value === undefined ? '–' : `${(value * 100).toFixed(2)}%`;
+}
+
+function formatRatio(value) {
+  return value === null || value === undefined ? '–' : value.toFixed(2);
+}
+
+function renderRiskMetrics(data) {
+  const tbody = document.querySelector('#riskMetricsTable tbody');
+  const benchmark = data.benchmark || {};
+  const rows = [
+    ['Total Return', 'total_return', formatPercentValue],
+    ['Annualized Return', 'annualized_return', formatPercentValue],
+    ['Volatility p.a.', 'volatility', formatPercentValue],
+    ['Sharpe Ratio', 'sharpe', formatRatio],
+    ['Max Drawdown', 'max_drawdown', formatPercentValue],
+    ['Beta', 'beta', formatRatio]
+  ];
+
+  document.getElementById('riskBenchmarkHeader').textContent = data.benchmark_symbol || 'Benchmark';
+  tbody.innerHTML = '';
+  rows.forEach(([label, key, format]) => {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `<td>${label}</td><td class="text-end">${format(data.portfolio[key])}</td><td class="text-end">${format(benchmark[key])}</td>`;
+    tbody.appendChild(tr);
+  });
+
+  const note = document.getElementById('riskMetricsNote');
+  if (note) note.textContent = `${data.observations} trading days from ${data.start} to ${data.end}, in ${data.currencycode}.`;
+}
+
+function renderHoldingsRisk(holdings) {
+  const tbody = document.querySelector('#holdingsRiskTable tbody');
+  tbody.innerHTML = '';
+  [...holdings].sort((a, b) => (b.weight || 0) - (a.weight || 0)).forEach(h => {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `<td title="${h.name}">${h.symbol}</td>` +
+      `<td class="text-end">${formatPercentValue(h.weight)}</td>` +
+      `<td class="text-end">${formatPercentValue(h.annualized_return)}</td>` +
+      `<td class="text-end">${formatPercentValue(h.volatility)}</td>` +
+      `<td class="text-end">${formatRatio(h.sharpe)}</td>` +
+      `<td class="text-end">${formatPercentValue(h.max_drawdown)}</td>` +
+      `<td class="text-end">${formatRatio(h.beta)}</td>`;
+    tbody.appendChild(tr);
+  });
+}
+
+function renderCorrelationMatrix(correlation) {
+  const table = document.getElementById('correlationTable');
+  const symbols = correlation.symbols;
+  table.innerHTML = '';
+  if (symbols.length === 0) return;
+
+  const header = document.createElement('tr');
+  header.innerHTML = '<th></th>' + symbols.map(s => `<th>${s}</th>`).join('');
+  table.appendChild(header);
+
+  correlation.matrix.forEach((row, i) => {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `<th>${symbols[i]}</th>` + row.map(value => {
+      if (value === null) return '<td>–</td>';
+      // Blue for positive, red for negative correlation
+      const color = value >= 0 ? hexToRgba('#007bff', Math.abs(value) * 0.6) : hexToRgba('#dc3545', Math.abs(value) * 0.6);
+      return `<td style="background-color: ${color}">${value.toFixed(2)}</td>`;
+    }).join('');
+    table.appendChild(tr);
+  });
+}
+
+const RISK_POLL_INTERVAL_MS = 1500;
+let riskPollTimer = null;
+
+function initValueAtRisk(riskUrl, portfolio) {
+  const form = document.getElementById('riskForm');
+  if (!form) return;
+
+  // Show a cached result for the selected settings without starting a job
+  const refresh = () => pollValueAtRisk(riskUrl, portfolio, false);
+  form.querySelectorAll('select').forEach(select => select.addEventListener('change', refresh));
+  form.addEventListener('submit', event => {
+    event.preventDefault();
+    pollValueAtRisk(riskUrl, portfolio, true);
+  });
+  refresh();
+}
+
+async function pollValueAtRisk(riskUrl, portfolio, start) {
+  const form = document.getElementById('riskForm');
+  const note = document.getElementById('valueAtRiskNote');
+  const button = document.getElementById('riskRunButton');
+  const query = new URLSearchParams(new FormData(form)).toString();
+  clearTimeout(riskPollTimer);
+
+  try {
+    const response = await fetch(`${riskUrl}?${query}`, {
+      method: start ? 'POST' : 'GET',
+      headers: {
+        'Accept': 'application/json',
+        'X-CSRFToken': document.querySelector('meta[name="csrf-token"]').content
+      }
+    });
+    const job = await response.json();
+    if (!response.ok) {
+      throw new Error(job.error || response.statusText);
+    }
+
+    button.disabled = job.status === 'RUNNING';
+    if (job.status === 'RUNNING') {
+      note.textContent = 'Calculating…';
+      riskPollTimer = setTimeout(() => pollValueAtRisk(riskUrl, portfolio, false), RISK_POLL_INTERVAL_MS);
+    } else if (job.status === 'DONE') {
+      renderValueAtRisk(job.result, portfolio);
+    } else if (job.status === 'FAILED') {
+      note.textContent = 'Calculation failed: ' + job.error;
+    } else {
+      document.querySelector('#valueAtRiskTable tbody').innerHTML = '';
+      note.textContent = 'Not calculated yet for these settings.';
+    }
+  } catch (error) {
+    button.disabled = false;
+    note.textContent = 'Error loading value at risk: ' + error.message;
+  }
+}
+
+function renderValueAtRisk(result, portfolio) {
+  const tbody = document.querySelector('#valueAtRiskTable tbody');
+  const methods = [
+    ['Historical', result.historical],
+    ['Parametric', result.parametric],
+    ['Monte Carlo', result.montecarlo]
+  ];
+  const amount = value => value === null || value === undefined ? '–' : `${value.toLocaleString(undefined, { maximumFractionDigits: 0 })} ${result.currencycode}`;
+
+  tbody.innerHTML = '';
+  methods.filter(([, risk]) => risk).forEach(([label, risk]) => {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `<td>${label}</td>` +
+      `<td class="text-end">${amount(risk.var)}</td>` +
+      `<td class="text-end">${formatPercentValue(risk.var_pct)}</td>` +
+      `<td class="text-end">${amount(risk.cvar)}</td>` +
+      `<td class="text-end">${formatPercentValue(risk.cvar_pct)}</td>`;
+    tbody.appendChild(tr);
+  });
+
+  const paths = result.montecarlo ? `, ${result.montecarlo.paths.toLocaleString()} simulated paths` : '';
+  document.getElementById('valueAtRiskNote').textContent =
+    `As of ${result.asof}: ${result.observations} daily scenarios since ${result.start}${paths}. ` +
+    'Losses on the current holdings; CVaR is the average loss beyond the VaR.';
+}
+
+function renderValueHistory(data, portfolio) {
+  const ctx = document.getElementById('valueHistoryChart').getContext('2d');
+  const currency = data.currencycode || portfolio.currencycode || "";
+
+  if (window.valueHistoryChart) window.valueHistoryChart.destroy();
+
+  window.valueHistoryChart = new Chart(ctx, {
+    type: 'line',
+    data: {
+      labels: data.dates,
+      datasets: [{
+        data: data.values,
+        borderColor: '#007bff',
+        backgroundColor: hexToRgba('#007bff', 0.1),
+        borderWidth: 2,
+        pointRadius: 0,
+        fill: true,
+        spanGaps: false
+      }]
+    },
+    options: {
+      responsive: true,
+      maintainAspectRatio: false,
+      animation: false,
+      interaction: { mode: 'index', intersect: false },
+      scales: {
+        x: { ticks: { maxTicksLimit: 8, autoSkip: true } },
+        y: { ticks: { callback: value => formatCurrency(value, currency) } }
+      },
+      plugins: {
+        legend: { display: false },
+        datalabels: { display: false },
+        tooltip: {
+          callbacks: {
+            label: context => ` ${formatCurrency(context.raw || 0, currency)}`
+          }
+        }
+      }
+    }
+  });
+}
+
 function formatCurrency(value, currency = "") {
   return `${currency} ${Number(value).toLocaleString('en-US', { minimumFractionDigits: 2, maximumFractionDigits: 2 })}`;
 }
@@ -5,107 +5,189 @@ document.addEventListener('DOMContentLoaded', () => {
   const sectorFilter = document.getElementById('sectorFilter');
   const sortBySelect = document.getElementById('sortBySelect');
   const sortOrderRadios = document.querySelectorAll('input[name="sortOrder"]');
+  const securitiesCount = document.getElementById('securitiesCount');
+  const scrollContainer = document.getElementById('securitiesScroll');
   const table = document.getElementById('bondsTable3');
   const tbody = table.querySelector('tbody');
 
-  // Save original rows to preserve unfiltered data
-  const originalRows = Array.from(tbody.querySelectorAll('tr'));
-
-  function normalize(str) {
-    return str.toLowerCase();
-  }
+  // Pages are fetched from the server as the list is scrolled
+  let nextCursor = null;
+  let loading = false;
+  let controller = null;
+  let searchTimer = null;
 
   function getSortOrder() {
     const checkedRadio = document.querySelector('input[name="sortOrder"]:checked');
     return checkedRadio ? checkedRadio.value : 'asc';
   }
 
-  function getConvertedValue(row) {
-    const exchangeRate = parseFloat(row.dataset.exchangeRate) || 1.0;
-    const originalValue = parseFloat(row.dataset.originalValue) || 0;
-    return originalValue * exchangeRate;
+  function pageUrl(after) {
+    const params = new URLSearchParams({
+      search: searchInput.value.trim(),
+      category: categoryFilter.value,
+      region: regionFilter.value,
+      sector: sectorFilter.value,
+      sort: sortBySelect.value,
+      order: getSortOrder(),
+      limit: table.dataset.pageSize
+    });
+    if (after) {
+      params.set('after', after);
+    }
+    return `${table.dataset.url}?${params}`;
   }
 
-  function filterAndSort() {
-    const searchText = normalize(searchInput.value.trim());
-    const category = categoryFilter.value;
-    const region = regionFilter.value;
-    const sector = sectorFilter.value;
-    const sortBy = sortBySelect.value;
-    const sortOrder = getSortOrder();
-
-    // Copy original rows
-    let rows = originalRows.slice();
-
-    // Filter rows by search, category, region, and sector
-    rows = rows.filter(row => {
-      const symbol = normalize(row.cells[0].textContent);
-      const name = normalize(row.cells[1].textContent);
-      // Get category text from the badge span element
-      const categoryElement = row.cells[2].querySelector('.badge');
-      const cat = categoryElement ? normalize(categoryElement.textContent) : normalize(row.cells[2].textContent);
-      const rowRegion = normalize(row.dataset.region || '');
-      const rowSector = normalize(row.dataset.sector || '');
-      
-      const matchesSearch = symbol.includes(searchText) || name.includes(searchText);
-      const matchesCategory = category === 'All' || cat === normalize(category);
-      const matchesRegion = region === 'All' || rowRegion === normalize(region);
-      const matchesSector = sector === 'All' || rowSector === normalize(sector);
-      
-      return matchesSearch && matchesCategory && matchesRegion && matchesSector;
-    });
+  function cell(content, className) {
+    const td = document.createElement('td');
+    td.className = 'py-3' + (className ? ' ' + className : '');
+    if (content) {
+      td.appendChild(content);
+    }
+    return td;
+  }
 
-    // Sort rows
-    rows.sort((a, b) => {
-      let comparison = 0;
-      
-      if (sortBy === 'name') {
-        const nameA = a.cells[1].textContent.toLowerCase();
-        const nameB = b.cells[1].textContent.toLowerCase();
-        if (nameA < nameB) comparison = -1;
-        else if (nameA > nameB) comparison = 1;
-      } else if (sortBy === 'value') {
-        // Use converted values for proper currency comparison
-        const valA = getConvertedValue(a);
-        const valB = getConvertedValue(b);
-        comparison = valA - valB;
-      } else if (sortBy === 'date') {
-        const dateA = new Date(a.cells[4].textContent);
-        const dateB = new Date(b.cells[4].textContent);
-        comparison = dateA - dateB;
-      }
-      
-      return sortOrder === 'desc' ? -comparison : comparison;
-    });
+  function span(text, className) {
+    const element = document.createElement('span');
+    element.className = className;
+    element.textContent = text;
+    return element;
+  }
+
+  function messageRow(text) {
+    const row = document.createElement('tr');
+    const td = document.createElement('td');
+    td.colSpan = 7;
+    td.textContent = text;
+    td.classList.add('text-center', 'text-muted', 'py-3');
+    row.appendChild(td);
+    return row;
+  }
 
-    // Clear tbody and re-append sorted and filtered rows
-    tbody.innerHTML = '';
-
-    if (rows.length === 0) {
-      const noRow = document.createElement('tr');
-      const noCell = document.createElement('td');
-      noCell.colSpan = 6; // number of columns
-      noCell.textContent = 'No bonds found';
-      noCell.classList.add('text-center', 'text-muted');
-      noRow.appendChild(noCell);
-      tbody.appendChild(noRow);
+  function securityRow(bond, baseCurrency) {
+    const row = document.createElement('tr');
+    row.className = 'border-0';
+
+    row.appendChild(cell(span(bond.bondsymbol, 'fw-semibold text-primary')));
+    row.appendChild(cell(span(bond.bondname, 'text-dark')));
+    row.appendChild(cell(span(bond.bondcategoryname, 'badge bg-light text-dark border')));
+
+    if (bond.bondrate !== null) {
+      const value = document.createElement('div');
+      value.appendChild(span(`${bond.bondrate.toFixed(2)} ${bond.currencycode}`, 'fw-semibold original-value'));
+      if (bond.currencycode !== baseCurrency) {
+        value.appendChild(document.createElement('br'));
+        const converted = document.createElement('small');
+        converted.className = 'text-muted converted-value';
+        converted.textContent = `${bond.value_in_base.toFixed(2)} ${baseCurrency}`;
+        value.appendChild(converted);
+      }
+      row.appendChild(cell(value));
     } else {
-      rows.forEach(row => tbody.appendChild(row));
+      row.appendChild(cell(span('N/A', 'text-muted')));
     }
+
+    row.appendChild(cell(bond.bondvolume !== null
+      ? span(bond.bondvolume.toLocaleString('en-US'), 'fw-semibold text-primary')
+      : span('N/A', 'text-muted')));
+
+    const updated = document.createElement('small');
+    updated.className = 'text-muted';
+    updated.textContent = bond.bonddatalogtime || 'N/A';
+    row.appendChild(cell(updated));
+
+    const view = document.createElement('a');
+    view.href = bond.url;
+    view.className = 'btn btn-sm btn-outline-primary';
+    view.innerHTML = '<i class="fas fa-eye me-1"></i>View';
+    row.appendChild(cell(view, 'text-center'));
+    return row;
   }
 
+  async function loadPage(reset) {
+    if (reset) {
+      // A changed filter or sort order supersedes any page still in flight
+      if (controller) {
+        controller.abort();
+      }
+      nextCursor = null;
+    } else if (loading || !nextCursor) {
+      return;
+    }
+
+    controller = new AbortController();
+    const signal = controller.signal;
+    loading = true;
+
+    try {
+      const response = await fetch(pageUrl(reset ? null : nextCursor), {
+        headers: { 'Accept': 'application/json' },
+        signal
+      });
+      const page = await response.json();
+      if (!response.ok) {
+        throw new Error(page.error || `HTTP ${response.status}`);
+      }
+
+      if (reset) {
+        tbody.innerHTML = '';
+        scrollContainer.scrollTop = 0;
+        securitiesCount.textContent = `${page.total} Securities`;
+        if (page.securities.length === 0) {
+          tbody.appendChild(messageRow('No bonds found'));
+        }
+      }
+      const rows = document.createDocumentFragment();
+      page.securities.forEach(bond => rows.appendChild(securityRow(bond, page.base_currency)));
+      tbody.appendChild(rows);
+      nextCursor = page.next;
+    } catch (error) {
+      if (error.name === 'AbortError') {
+        return;
+      }
+      console.error('Error loading securities:', error);
+      if (reset) {
+        tbody.innerHTML = '';
+      }
+      tbody.appendChild(messageRow('Error loading securities: ' + error.message));
+      nextCursor = null;
+    } finally {
+      if (controller && controller.signal === signal) {
+        loading = false;
+      }
+    }
+
+    // Keep loading until the list can be scrolled
+    if (nextCursor && scrollContainer.scrollHeight <= scrollContainer.clientHeight) {
+      loadPage(false);
+    }
+  }
+
+  function reload() {
+    loadPage(true);
+  }
+
+  scrollContainer.addEventListener('scroll', () => {
+    const remaining = scrollContainer.scrollHeight - scrollContainer.scrollTop - scrollContainer.clientHeight;
+    if (remaining < 200) {
+      loadPage(false);
+    }
+  });
+
   // Event listeners
-  searchInput.addEventListener('input', filterAndSort);
-  categoryFilter.addEventListener('change', filterAndSort);
-  regionFilter.addEventListener('change', filterAndSort);
-  sectorFilter.addEventListener('change', filterAndSort);
-  sortBySelect.addEventListener('change', filterAndSort);
+  searchInput.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(reload, 300);
+  });
+  categoryFilter.addEventListener('change', reload);
+  regionFilter.addEventListener('change', reload);
+  sectorFilter.addEventListener('change', reload);
+  sortBySelect.addEventListener('change', reload);
   sortOrderRadios.forEach(radio => {
-    radio.addEventListener('change', filterAndSort);
+    radio.addEventListener('change', reload);
   });
 
   // Initial call
-  filterAndSort();
+  reload();
 });
 
 const createSecurityModal = document.getElementById('createSecurityModal');
@@ -0,0 +1,125 @@
+# Allocation breakdowns for Portfolio Analyzer - vectorized group-by of holding values over any set of dimensions
+from collections import namedtuple
+import numpy as np
+
+BreakdownItem = namedtuple('BreakdownItem', ['label', 'value', 'percent'])
+
+
+def group_totals(group_index, labels, values, n_groups):
+    """
+    Sums values per (group, label) in one pass.
+
+    Args:
+        group_index (np.ndarray): Group (e.g. portfolio) index per holding
+        labels (np.ndarray): Label per holding (object array of str)
+        values (np.ndarray): Value per holding, NaN counts as 0
+        n_groups (int): Number of groups
+
+    Returns:
+        tuple: (unique labels, n_groups × n_labels totals)
+    """
+    unique, codes = np.unique(labels.astype(str), return_inverse=True)
+    keys = group_index * len(unique) + codes
+    totals = np.bincount(keys, weights=np.nan_to_num(values, nan=0.0), minlength=n_groups * len(unique))
+    return unique, totals.reshape(n_groups, len(unique))
+
+
+class PortfolioBreakdown:
+    """
+    Totals of one portfolio per label of every requested dimension.
+
+    Each dimension is a list of BreakdownItem sorted by value, largest
+    first; percent is relative to total_value.
+    """
+
+    def __init__(self, portfolio_id, currencycode, total_value, dimensions):
+        self.portfolio_id = portfolio_id
+        self.currencycode = currencycode
+        self.total_value = total_value
+        self.dimensions = dimensions
+
+    def __getitem__(self, dimension):
+        return self.dimensions[dimension]
+
+    def __contains__(self, dimension):
+        return dimension in self.dimensions
+
+    def values(self, dimension):
+        """Returns {label: value} of a dimension."""
+        return {item.label: item.value for item in self.dimensions[dimension]}
+
+    def shares(self, dimension, lower=False, include=(), positive_only=False):
+        """
+        Flat {label}_value / {label}_percent entries as used by the portfolio templates.
+
+        Args:
+            dimension (str): e.g. 'sector'
+            lower (bool): Lower-case the labels in the keys
+            include (iterable): Labels listed with 0 even without holdings
+            positive_only (bool): Leave out labels whose value is not positive
+        """
+        items = list(self.dimensions[dimension])
+        present = {item.label.lower() if lower else item.label for item in items}
+        for label in include:
+            if (label.lower() if lower else label) not in present:
+                items.append(BreakdownItem(label, 0.0, 0.0))
+
+        flat = {}
+        for item in items:
+            if positive_only and not item.value > 0:
+                continue
+            label = item.label.lower() if lower else item.label
+            flat[f"{label}_value"] = item.value
+            flat[f"{label}_percent"] = item.percent
+        return flat
+
+    def to_dict(self):
+        """JSON-serializable form: dimension -> list of {label, value, percent}."""
+        return {
+            'portfolioid': self.portfolio_id,
+            'currencycode': self.currencycode,
+            'total_value': self.total_value,
+            'breakdowns': {
+                dimension: [item._asdict() for item in items]
+                for dimension, items in self.dimensions.items()
+            },
+        }
+
+
+def compute_breakdowns(portfolio_ids, currencies, holding_portfolio, values, labels_by_dimension):
+    """
+    Breakdowns of several portfolios over several dimensions.
+
+    Args:
+        portfolio_ids (list of int): The portfolios, one result each
+        currencies (dict): portfolio_id -> currency code
+        holding_portfolio (np.ndarray): Portfolio id per holding
+        values (np.ndarray): Value per holding in its portfolio's currency
+        labels_by_dimension (dict): dimension -> label per holding
+
+    Returns:
+        dict: portfolio_id -> PortfolioBreakdown
+    """
+    index_of = {portfolio_id: i for i, portfolio_id in enumerate(portfolio_ids)}
+    group_index = np.array([index_of[p] for p in holding_portfolio], dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    totals = np.bincount(group_index, weights=np.nan_to_num(values, nan=0.0), minlength=len(portfolio_ids))
+
+    grouped = {
+        dimension: group_totals(group_index, np.asarray(labels, dtype=object), values, len(portfolio_ids))
+        for dimension, labels in labels_by_dimension.items()
+    }
+
+    result = {}
+    for i, portfolio_id in enumerate(portfolio_ids):
+        total = float(totals[i])
+        dimensions = {}
+        for dimension, (unique, sums) in grouped.items():
+            row = sums[i]
+            order = np.argsort(-row, kind='stable')
+            dimensions[dimension] = [
+                BreakdownItem(str(unique[j]), round(float(row[j]), 2), round(float(row[j] / total * 100) if total else 0.0, 2))
+                for j in order if row[j] != 0
+            ]
+        result[portfolio_id] = PortfolioBreakdown(portfolio_id, currencies.get(portfolio_id), round(total, 2), dimensions)
+    return result
@@ -0,0 +1,41 @@
+# Exchange rate matrix helpers for Portfolio Analyzer - derives full NumPy cross-rate matrices from the legs of one anchor currency
+import numpy as np
+
+def cross_rate_matrix(anchor_legs):
+    """
+    Builds the full n×n rate matrix from the rates of one anchor currency,
+    i.e. rate(a, b) = rate(anchor, b) / rate(anchor, a), as one outer division.
+
+    Args:
+        anchor_legs (np.ndarray): Rate from the anchor to each currency, 1.0 for
+            the anchor itself and NaN where the leg is unavailable
+
+    Returns:
+        np.ndarray: matrix[i, j] is the rate from currency i to currency j,
+                    NaN where a leg is missing. The diagonal is always 1.0.
+    """
+    legs = np.asarray(anchor_legs, dtype=float).copy()
+    legs[~(legs > 0)] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        matrix = legs[np.newaxis, :] / legs[:, np.newaxis]
+
+    np.fill_diagonal(matrix, 1.0)
+    return matrix
+
+def matrix_to_pairs(currencies, matrix):
+    """
+    Flattens a rate matrix into a pair mapping.
+
+    Args:
+        currencies (list of str): Currency codes in matrix order
+        matrix (np.ndarray): n×n rate matrix
+
+    Returns:
+        dict: Mapping like {'USDCHF': 0.89, ...}, None where the rate is unknown
+    """
+    return {
+        f"{a}{b}": (None if np.isnan(matrix[i, j]) else float(matrix[i, j]))
+        for i, a in enumerate(currencies)
+        for j, b in enumerate(currencies)
+    }
@@ -10,7 +10,7 @@ import os
 from datetime import datetime, timezone
 from flask import request
 from functools import wraps
-from config import LOG_MAX_BYTES, LOG_BACKUP_COUNT, SECURITY_LOG_MAX_BYTES, SECURITY_LOG_BACKUP_COUNT, ERROR_LOG_MAX_BYTES, ERROR_LOG_BACKUP_COUNT
+from config import LOG_MAX_BYTES, LOG_BACKUP_COUNT, SECURITY_LOG_MAX_BYTES, SECURITY_LOG_BACKUP_COUNT, ERROR_LOG_MAX_BYTES, ERROR_LOG_BACKUP_COUNT, SLOW_QUERY_LOG_MAX_BYTES, SLOW_QUERY_LOG_BACKUP_COUNT
 
 def setup_logging(app):
     """
@@ -20,6 +20,7 @@ def setup_logging(app):
     - logs/portfolio_analyzer.log (main application log)
     - logs/security.log (security-related events)
     - logs/errors.log (error logs only)
+    - logs/slow_queries.log (slow statements and query-heavy requests)
     - Console output (for development)
     """
     
@@ -91,7 +92,24 @@ def setup_logging(app):
     error_logger.addHandler(error_handler)
     error_logger.propagate = False
     
-    # 4. Console handler (for development)
+    # 4. Slow query log (statements over SLOW_QUERY_MS, requests over REQUEST_QUERY_COUNT_WARN)
+    slow_query_log_file = os.path.join(log_dir, 'slow_queries.log')
+    slow_query_handler = logging.handlers.RotatingFileHandler(
+        slow_query_log_file,
+        maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=SLOW_QUERY_LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    slow_query_handler.setLevel(logging.WARNING)
+    slow_query_handler.setFormatter(simple_formatter)
+    
+    # Create slow query logger
+    slow_query_logger = logging.getLogger('slow_queries')
+    slow_query_logger.setLevel(logging.WARNING)
+    slow_query_logger.addHandler(slow_query_handler)
+    slow_query_logger.propagate = False
+    
+    # 5. Console handler (for development)
     if app.debug:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.DEBUG)
@@ -0,0 +1,117 @@
+# Background risk jobs for Portfolio Analyzer - runs VaR/CVaR calculations outside the request and caches the results
+"""
+Background VaR/CVaR jobs.
+
+A request only registers the job in portfolio_risk and starts a daemon
+thread; the thread loads the price panel and hands the Monte Carlo chunks
+to a process pool shared by all jobs of this worker, so a 100k-path
+simulation neither blocks the gunicorn worker nor holds the GIL. The
+result is stored per (portfolio, as-of date, parameters) and served to
+every worker from the table until the parameters or the day change.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from config import (
+    RISK_DEFAULT_CONFIDENCE, RISK_DEFAULT_HORIZON_DAYS, RISK_DEFAULT_LOOKBACK_DAYS, RISK_DEFAULT_PATHS,
+    RISK_MAX_HORIZON_DAYS, RISK_MAX_PATHS, RISK_MC_CHUNK_PATHS, RISK_MC_WORKERS, RISK_JOB_TIMEOUT_SECONDS,
+    PORTFOLIO_HISTORY_MAX_DAYS
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_risk_executor():
+    """
+    Returns the process pool of this worker, created on first use.
+
+    The pool spawns fresh interpreters instead of forking, since forking a
+    multi-threaded gunicorn worker can copy held locks into the children.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, RISK_MC_WORKERS),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def risk_params(values):
+    """
+    Reads and validates the job parameters.
+
+    Args:
+        values (Mapping): confidence, horizon, lookback and paths; missing
+            entries use the RISK_DEFAULT_* settings
+
+    Returns:
+        dict: confidence, horizon_days, lookback_days and paths
+
+    Raises:
+        ValueError: If a parameter is malformed or out of range
+    """
+    params = {
+        'confidence': float(values.get('confidence') or RISK_DEFAULT_CONFIDENCE),
+        'horizon_days': int(values.get('horizon') or RISK_DEFAULT_HORIZON_DAYS),
+        'lookback_days': int(values.get('lookback') or RISK_DEFAULT_LOOKBACK_DAYS),
+        'paths': int(values.get('paths') if values.get('paths') not in (None, '') else RISK_DEFAULT_PATHS),
+    }
+
+    if not 0.5 <= params['confidence'] < 1.0:
+        raise ValueError("confidence must be between 0.5 and 1")
+    if not 1 <= params['horizon_days'] <= RISK_MAX_HORIZON_DAYS:
+        raise ValueError(f"horizon must be between 1 and {RISK_MAX_HORIZON_DAYS} days")
+    if not 30 <= params['lookback_days'] <= PORTFOLIO_HISTORY_MAX_DAYS:
+        raise ValueError(f"lookback must be between 30 and {PORTFOLIO_HISTORY_MAX_DAYS} days")
+    if not 0 <= params['paths'] <= RISK_MAX_PATHS:
+        raise ValueError(f"paths must be between 0 and {RISK_MAX_PATHS}")
+    return params
+
+
+def run_risk_job(app, portfolio_id, as_of, key, params):
+    """Computes one job and stores its result or error; used by the background thread."""
+    from app.database.tables.portfolio.get_portfolio_risk import get_portfolio_risk
+    from app.database.tables.portfolio_risk.portfolio_risk import finish_portfolio_risk
+    from app.database.connection.unit_of_work import unit_of_work
+
+    with app.app_context(), unit_of_work():
+        try:
+            result = get_portfolio_risk(
+                portfolio_id, as_of, params,
+                chunk_paths=RISK_MC_CHUNK_PATHS,
+                # Same parameters, same paths: a cached result can be reproduced
+                seed=int(key[:16], 16),
+                executor=get_risk_executor() if params['paths'] > 0 else None
+            )
+            if result is None:
+                raise ValueError("Portfolio not found")
+            finish_portfolio_risk(portfolio_id, as_of, key, result=result)
+        except Exception as e:
+            print(f"⚠️  Risk job for portfolio {portfolio_id} failed: {e}")
+            finish_portfolio_risk(portfolio_id, as_of, key, error=str(e))
+
+
+def request_portfolio_risk(app, portfolio_id, as_of, params):
+    """
+    Starts the risk job unless it is cached or already running.
+
+    Returns:
+        dict: The job as returned by get_portfolio_risk (status RUNNING,
+              DONE or FAILED)
+    """
+    from app.database.tables.portfolio_risk.portfolio_risk import (
+        params_key, claim_portfolio_risk, get_portfolio_risk
+    )
+
+    key = params_key(params)
+    if claim_portfolio_risk(portfolio_id, as_of, key, params, RISK_JOB_TIMEOUT_SECONDS):
+        thread = threading.Thread(
+            target=run_risk_job, args=(app, portfolio_id, as_of, key, params),
+            name=f'risk-{portfolio_id}', daemon=True
+        )
+        thread.start()
+    return get_portfolio_risk(portfolio_id, as_of, key)
@@ -0,0 +1,139 @@
+# Risk and return metrics for Portfolio Analyzer - column-wise NumPy statistics over day × series panels
+import numpy as np
+
+def simple_returns(levels):
+    """
+    Daily simple returns of each column of a day × series level panel.
+
+    Returns:
+        np.ndarray: Shape (days - 1, series), NaN where either level is missing
+    """
+    levels = np.asarray(levels, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = levels[1:] / levels[:-1] - 1.0
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def annualized_return(returns, periods_per_year):
+    """Geometric annualized return per column, NaN for columns without returns."""
+    count = np.sum(~np.isnan(returns), axis=0)
+    growth = np.nansum(np.log1p(returns), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, np.expm1(growth * periods_per_year / count), np.nan)
+
+
+def annualized_volatility(returns, periods_per_year):
+    """Annualized standard deviation of the returns per column."""
+    count = np.sum(~np.isnan(returns), axis=0)
+    x = np.where(np.isnan(returns), 0.0, returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = x.sum(axis=0) / count
+        variance = ((x - mean) ** 2 * ~np.isnan(returns)).sum(axis=0) / (count - 1)
+    return np.where(count > 1, np.sqrt(np.maximum(variance, 0.0) * periods_per_year), np.nan)
+
+
+def sharpe_ratio(returns, periods_per_year, risk_free_rate=0.0):
+    """Annualized mean excess return over annualized volatility per column."""
+    count = np.sum(~np.isnan(returns), axis=0)
+    mean = np.nansum(returns, axis=0) / np.maximum(count, 1) * periods_per_year
+    volatility = annualized_volatility(returns, periods_per_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (mean - risk_free_rate) / volatility
+    return np.where(np.isfinite(ratio), ratio, np.nan)
+
+
+def max_drawdown(levels):
+    """Largest peak-to-trough decline per column as a negative fraction (0 if none)."""
+    levels = np.asarray(levels, dtype=float)
+    # fmax ignores NaN, so the running peak starts at the first valid level
+    peaks = np.fmax.accumulate(levels, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = levels / peaks - 1.0
+    drawdowns[~np.isfinite(drawdowns)] = np.nan
+    valid = ~np.isnan(drawdowns).all(axis=0)
+    result = np.full(levels.shape[1], np.nan)
+    result[valid] = np.nanmin(drawdowns[:, valid], axis=0)
+    return result
+
+
+def pairwise_moments(returns):
+    """
+    Pairwise-complete covariance and variances of all column pairs with
+    matrix products only: every statistic of pair (i, j) uses just the days
+    on which both columns have a return.
+
+    Returns:
+        tuple: (cov, var_i, var_j, n) matrices; var_i[i, j] is the variance of
+               column i over the days shared with column j
+    """
+    present = (~np.isnan(returns)).astype(float)
+    x = np.where(np.isnan(returns), 0.0, returns)
+
+    n = present.T @ present
+    sum_i = x.T @ present
+    sum_sq_i = (x * x).T @ present
+    sum_ij = x.T @ x
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denominator = n - 1
+        cov = (sum_ij - sum_i * sum_i.T / n) / denominator
+        var_i = (sum_sq_i - sum_i ** 2 / n) / denominator
+    var_j = var_i.T
+    return cov, var_i, var_j, n
+
+
+def correlation_matrix(returns, min_periods=2):
+    """Pairwise-complete Pearson correlation of the columns, NaN with fewer than min_periods shared days."""
+    cov, var_i, var_j, n = pairwise_moments(returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.sqrt(var_i * var_j)
+    corr[(n < min_periods) | ~np.isfinite(corr)] = np.nan
+    np.fill_diagonal(corr, np.where(np.diag(n) >= min_periods, 1.0, np.nan))
+    return np.clip(corr, -1.0, 1.0)
+
+
+def betas(returns, benchmark_column, min_periods=2):
+    """Beta of every column against one column, over the days both have returns."""
+    cov, _, var_j, n = pairwise_moments(returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov[:, benchmark_column] / var_j[:, benchmark_column]
+    beta[(n[:, benchmark_column] < min_periods) | ~np.isfinite(beta)] = np.nan
+    return beta
+
+
+def compute_risk_metrics(levels, periods_per_year=252, risk_free_rate=0.0, benchmark_column=None):
+    """
+    All metrics of every column of a day × series level panel at once.
+
+    Args:
+        levels (np.ndarray): Prices or values, NaN where unknown
+        periods_per_year (int): Trading days per year for annualization
+        risk_free_rate (float): Annual risk-free rate for the Sharpe ratio
+        benchmark_column (int, optional): Column the betas are computed against
+
+    Returns:
+        dict: Arrays with one entry per column (total_return, annualized_return,
+              volatility, sharpe, max_drawdown, beta) and the correlation matrix
+    """
+    levels = np.asarray(levels, dtype=float)
+    if levels.shape[0] == 0:
+        levels = np.full((1, levels.shape[1]), np.nan)
+    returns = simple_returns(levels)
+
+    first = np.argmax(~np.isnan(levels), axis=0)
+    last = levels.shape[0] - 1 - np.argmax(~np.isnan(levels[::-1]), axis=0)
+    columns = np.arange(levels.shape[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_return = levels[last, columns] / levels[first, columns] - 1.0
+
+    metrics = {
+        'total_return': np.where(np.isfinite(total_return), total_return, np.nan),
+        'annualized_return': annualized_return(returns, periods_per_year),
+        'volatility': annualized_volatility(returns, periods_per_year),
+        'sharpe': sharpe_ratio(returns, periods_per_year, risk_free_rate),
+        'max_drawdown': max_drawdown(levels),
+        'correlation': correlation_matrix(returns),
+    }
+    metrics['beta'] = betas(returns, benchmark_column) if benchmark_column is not None else np.full(levels.shape[1], np.nan)
+    return metrics
@@ -0,0 +1,74 @@
+# Scheduler leader election for Portfolio Analyzer - ensures only one worker process runs the daily jobs
+"""
+Leader election between gunicorn workers.
+
+Every worker starts a scheduler, but only the holder of the lease in the
+status row runs the startup fetch and the daily jobs. The leader renews the
+lease every SCHEDULER_LEASE_RENEW_SECONDS; if it dies, another worker takes
+over once SCHEDULER_LEASE_SECONDS have passed without renewal.
+"""
+
+import os
+import socket
+import uuid
+from app.database.tables.status.scheduler_lease import acquire_scheduler_lease, release_scheduler_lease
+from config import SCHEDULER_LEASE_SECONDS
+
+_instance_token = uuid.uuid4().hex[:8]
+
+
+def get_worker_id():
+    """Identifier of this process as stored in status.scheduler_owner (host:pid:token)."""
+    # The pid is read on every call so forked workers never share an id
+    return f"{socket.gethostname()}:{os.getpid()}:{_instance_token}"
+
+
+def is_scheduler_leader():
+    """
+    Takes or renews the lease for this process.
+
+    Returns:
+        bool: True if this process may run the scheduled jobs, False if
+              another worker holds the lease or the database is unavailable
+    """
+    try:
+        return acquire_scheduler_lease(get_worker_id(), SCHEDULER_LEASE_SECONDS)
+    except Exception as e:
+        print(f"⚠️  Could not acquire scheduler lease: {e}")
+        return False
+
+
+def renew_scheduler_lease():
+    """Heartbeat job: keeps the lease of the leader alive and lets a worker take over an expired one."""
+    try:
+        acquire_scheduler_lease(get_worker_id(), SCHEDULER_LEASE_SECONDS)
+    except Exception:
+        # Database not ready yet; the next heartbeat tries again
+        pass
+
+
+def release_scheduler_leadership():
+    """Releases the lease if this process holds it."""
+    try:
+        release_scheduler_lease(get_worker_id())
+    except Exception:
+        pass
+
+
+def run_as_leader(job, name):
+    """
+    Runs job only if this process is the scheduler leader.
+
+    Args:
+        job (callable): The job to run
+        name (str): Job name for the log output
+
+    Returns:
+        bool: True if the job ran, False if it was left to another worker
+    """
+    if not is_scheduler_leader():
+        print(f"ℹ️  Skipping {name} - another worker holds the scheduler lease")
+        return False
+
+    job()
+    return True
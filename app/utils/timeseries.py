@@ -0,0 +1,48 @@
+# Time series helpers for Portfolio Analyzer - dense NumPy day × column panels with forward fill
+import numpy as np
+
+def build_panel(rows, column_of, n_days):
+    """
+    Scatters (key, day offset, value) rows into a dense day × column array.
+
+    Args:
+        rows (list of tuple): (key, day, value) with an integer key and day an
+            integer offset from the first day of the panel; rows outside the
+            panel or with unknown keys are ignored
+        column_of (dict): key (int) -> column index
+        n_days (int): Number of days (rows of the panel)
+
+    Returns:
+        np.ndarray: Shape (n_days, len(column_of)), NaN where no value exists
+    """
+    panel = np.full((n_days, len(column_of)), np.nan)
+    if not rows or not column_of:
+        return panel
+
+    # One conversion of the row tuples into a structured array, the rest is vectorized
+    data = np.array(rows, dtype=[('key', np.int64), ('day', np.int64), ('value', float)])
+    keys = np.array(sorted(column_of), dtype=np.int64)
+    columns = np.array([column_of[key] for key in keys], dtype=np.int64)
+
+    pos = np.minimum(np.searchsorted(keys, data['key']), len(keys) - 1)
+    valid = (keys[pos] == data['key']) & (data['day'] >= 0) & (data['day'] < n_days)
+    panel[data['day'][valid], columns[pos[valid]]] = data['value'][valid]
+    return panel
+
+
+def forward_fill(panel):
+    """
+    Carries the last known value of each column forward over NaN rows.
+    Leading NaNs stay NaN.
+
+    Returns:
+        np.ndarray: A filled copy of panel
+    """
+    if panel.size == 0:
+        return panel.copy()
+
+    n_days = panel.shape[0]
+    # Row index of the last valid value at or before each row, per column
+    last_valid = np.where(~np.isnan(panel), np.arange(n_days)[:, np.newaxis], 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return panel[last_valid, np.arange(panel.shape[1])]
@@ -0,0 +1,143 @@
+# Value at risk for Portfolio Analyzer - historical, parametric and Monte Carlo VaR/CVaR of a portfolio
+"""
+Value at risk and conditional value at risk (expected shortfall).
+
+All functions work on a scenario matrix of daily returns (day × holding,
+in the portfolio currency) and the current exposure per holding. Losses
+are reported as positive amounts in the portfolio currency.
+
+simulate_chunk only takes and returns NumPy arrays, so the Monte Carlo
+chunks can be pickled to a spawned process pool. Unpickling it imports
+this module and with it the app package (app/__init__.py and its
+imports) in every pool process; the pool is long-lived (see
+risk_jobs.get_risk_executor), so that happens once per process, not per
+chunk, and create_app is never called there.
+"""
+
+from statistics import NormalDist
+import numpy as np
+
+
+def tail_risk(pnl, confidence):
+    """
+    VaR and CVaR of a sample of profits and losses.
+
+    Args:
+        pnl (np.ndarray): Profit (positive) or loss (negative) per scenario
+        confidence (float): e.g. 0.99
+
+    Returns:
+        tuple: (var, cvar) as positive losses, NaN for an empty sample
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    pnl = pnl[~np.isnan(pnl)]
+    if pnl.size == 0:
+        return np.nan, np.nan
+
+    cutoff = np.quantile(pnl, 1.0 - confidence)
+    return -cutoff, -pnl[pnl <= cutoff].mean()
+
+
+def covariance(returns):
+    """Sample covariance matrix of the columns, 2-D also for a single holding."""
+    return np.atleast_2d(np.cov(returns, rowvar=False, ddof=1))
+
+
+def horizon_pnl(daily_pnl, horizon_days):
+    """Overlapping sums of horizon_days consecutive daily profits and losses."""
+    daily_pnl = np.asarray(daily_pnl, dtype=float)
+    if horizon_days <= 1:
+        return daily_pnl
+    if daily_pnl.size < horizon_days:
+        return np.array([])
+    cumulative = np.concatenate([[0.0], np.cumsum(daily_pnl)])
+    return cumulative[horizon_days:] - cumulative[:-horizon_days]
+
+
+def historical_var(returns, exposures, confidence, horizon_days=1):
+    """
+    Historical simulation: today's exposures revalued with every past day's returns.
+
+    Returns:
+        tuple: (var, cvar)
+    """
+    return tail_risk(horizon_pnl(returns @ exposures, horizon_days), confidence)
+
+
+def parametric_var(returns, exposures, confidence, horizon_days=1):
+    """
+    Variance-covariance VaR and CVaR under normally distributed returns.
+
+    Returns:
+        tuple: (var, cvar)
+    """
+    if returns.shape[0] < 2:
+        return np.nan, np.nan
+
+    mean = returns.mean(axis=0) @ exposures * horizon_days
+    sigma = np.sqrt(max(exposures @ covariance(returns) @ exposures, 0.0) * horizon_days)
+    z = NormalDist().inv_cdf(1.0 - confidence)
+    var = -(mean + z * sigma)
+    cvar = -(mean - sigma * NormalDist().pdf(z) / (1.0 - confidence))
+    return var, cvar
+
+
+def correlated_factor(cov):
+    """
+    A matrix L with L @ L.T == cov: the Cholesky factor, or an eigenvalue
+    factor if cov is only positive semi-definite (e.g. a constant holding or
+    more holdings than days).
+    """
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def simulate_chunk(seed, n_paths, mean, factor, exposures, horizon_days):
+    """
+    Profit and loss of n_paths correlated normal horizon returns.
+
+    Only the per-path totals are returned, so a chunk sends back n_paths
+    floats instead of a paths × holdings matrix.
+    """
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_paths, factor.shape[0])) @ factor.T
+    returns = mean * horizon_days + shocks * np.sqrt(horizon_days)
+    return returns @ exposures
+
+
+def monte_carlo_var(returns, exposures, confidence, horizon_days=1, paths=100000, chunk_paths=10000, seed=None, executor=None):
+    """
+    Monte Carlo VaR and CVaR from Cholesky-correlated normal returns.
+
+    The paths are simulated in chunks with independent seeds spawned from
+    seed, so the result does not depend on how many processes run them.
+
+    Args:
+        returns (np.ndarray): Day × holding daily returns
+        exposures (np.ndarray): Current value per holding
+        confidence (float): e.g. 0.99
+        horizon_days (int): Holding period
+        paths (int): Number of simulated paths
+        chunk_paths (int): Paths per chunk
+        seed (int, optional): Seed for reproducible results
+        executor (concurrent.futures.Executor, optional): Runs the chunks; inline if None
+
+    Returns:
+        tuple: (var, cvar)
+    """
+    if returns.shape[0] < 2 or paths <= 0:
+        return np.nan, np.nan
+
+    mean = returns.mean(axis=0)
+    factor = correlated_factor(covariance(returns))
+
+    sizes = [min(chunk_paths, paths - offset) for offset in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (seeds, sizes, [mean] * len(sizes), [factor] * len(sizes),
+            [exposures] * len(sizes), [horizon_days] * len(sizes))
+
+    results = executor.map(simulate_chunk, *args) if executor is not None else map(simulate_chunk, *args)
+    return tail_risk(np.concatenate(list(results)), confidence)
@@ -0,0 +1,163 @@
+# Background warm-up for Portfolio Analyzer - refreshes market data and primes caches without blocking worker boot
+"""
+Background warm-up after application startup.
+
+create_app() only sets up the pool, blueprints and login and then starts
+this task in a daemon thread. It waits for the database, lets the scheduler
+leader run the initial data refresh and primes the per-worker caches. The
+progress is reported by the /ready endpoint; /health only reports liveness.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from config import WARMUP_DB_RETRIES, WARMUP_DB_RETRY_DELAY_SECONDS
+
+STEPS = ['database', 'exchangerates', 'securityrates', 'reference_data', 'exchange_rate_matrix']
+
+_lock = threading.Lock()
+_state = {
+    'status': 'pending',
+    'steps': {step: 'pending' for step in STEPS},
+    'started_at': None,
+    'finished_at': None,
+}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _set_status(status):
+    with _lock:
+        _state['status'] = status
+        if status == 'running':
+            _state['started_at'] = _now()
+        elif status in ('ready', 'failed'):
+            _state['finished_at'] = _now()
+
+
+def _set_step(step, status):
+    with _lock:
+        _state['steps'][step] = status
+
+
+def get_warmup_status():
+    """Returns a copy of the warm-up progress."""
+    with _lock:
+        return {**_state, 'steps': dict(_state['steps'])}
+
+
+def _run_step(step, func):
+    """Runs one warm-up step; a failure is recorded but does not stop the warm-up."""
+    _set_step(step, 'running')
+    try:
+        func()
+        _set_step(step, 'done')
+    except Exception as e:
+        _set_step(step, 'failed')
+        print(f"⚠️  Warm-up step {step} failed: {e}")
+
+
+def _wait_for_database():
+    """Returns True once the database is reachable and initialized."""
+    from app.database.helpers.fetch_one import fetch_one
+
+    for attempt in range(WARMUP_DB_RETRIES):
+        try:
+            system_generated = fetch_one("SELECT system_generated FROM status WHERE id = 1")
+            if system_generated and system_generated[0] is not None:
+                return True
+            print(f"⚠️  Database not fully initialized (attempt {attempt + 1}/{WARMUP_DB_RETRIES})")
+        except Exception as e:
+            print(f"⚠️  Database connection failed (attempt {attempt + 1}/{WARMUP_DB_RETRIES}): {e}")
+
+        if attempt < WARMUP_DB_RETRIES - 1:
+            time.sleep(WARMUP_DB_RETRY_DELAY_SECONDS)
+    return False
+
+
+def run_warmup(app):
+    """Runs the warm-up steps in order; used by the background thread."""
+    from app.database.tables.exchangerate.fetch_daily_exchangerates import fetch_daily_exchangerates
+    from app.database.tables.bond.fetch_daily_securityrates import fetch_daily_securityrates
+    from app.database.cache.reference_data import get_reference_data
+    from app.database.cache.exchange_rates import get_latest_rate_matrix
+    from app.utils.scheduler_leader import is_scheduler_leader
+
+    _set_status('running')
+    with app.app_context():
+        _set_step('database', 'running')
+        if not _wait_for_database():
+            _set_step('database', 'failed')
+            for step in STEPS[1:]:
+                _set_step(step, 'skipped')
+            print("ℹ️  Data will be fetched by scheduled tasks once database is ready")
+            _set_status('failed')
+            return
+        _set_step('database', 'done')
+
+        # Only the scheduler leader refreshes data; the other workers just prime their caches
+        if is_scheduler_leader():
+            print("🔄 Fetching initial data...")
+            _run_step('exchangerates', fetch_daily_exchangerates)
+            _run_step('securityrates', fetch_daily_securityrates)
+            print("✅ Initial data fetch completed")
+        else:
+            _set_step('exchangerates', 'skipped')
+            _set_step('securityrates', 'skipped')
+
+        _run_step('reference_data', get_reference_data)
+        _run_step('exchange_rate_matrix', get_latest_rate_matrix)
+
+    _set_status('ready')
+
+
+def start_warmup(app):
+    """Starts the warm-up in a daemon thread and returns immediately."""
+    thread = threading.Thread(target=run_warmup, args=(app,), name='warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def _database_answers():
+    from app.database.helpers.fetch_one import fetch_one
+
+    try:
+        return fetch_one("SELECT 1") is not None
+    except Exception:
+        return False
+
+
+def get_readiness():
+    """
+    Reports whether this worker should receive traffic: the warm-up has
+    completed and the database answers right now. A warm-up that gave up
+    waiting for the database is not ready.
+
+    The answer is public, so it only names the warm-up status and steps;
+    get_system_status has the details for admins.
+
+    Returns:
+        dict: 'ready' (bool), 'status' of the warm-up and 'steps', the
+              state of each step
+    """
+    status = get_warmup_status()
+    return {
+        'ready': status['status'] == 'ready' and _database_answers(),
+        'status': status['status'],
+        'steps': status['steps'],
+    }
+
+
+def get_system_status():
+    """
+    Returns the warm-up progress of this worker with its timestamps plus
+    'database' (bool) and 'pool', the connection pool counters.
+    """
+    from app.database.connection.pool import get_pool_stats
+
+    status = get_warmup_status()
+    status['database'] = _database_answers()
+    status['pool'] = get_pool_stats()
+    return status
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for Portfolio Analyzer.
+
+Times the page renders and ingestion jobs against a generated database and
+writes JSON results that can be compared across commits. See README.md.
+"""
@@ -0,0 +1,96 @@
+"""
+Compares two benchmark result files.
+
+A target regresses if its p95 latency or its rows examined grow by more than
+the threshold, or if it issues more queries per iteration than before (the
+signature of a new N+1 pattern).
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json --threshold 20
+"""
+
+import json
+import sys
+
+
+def _change_pct(old, new):
+    if not old:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(baseline, current, threshold_pct=20.0):
+    """
+    Compares the results of two runs.
+
+    Args:
+        baseline (dict): Result of the reference run
+        current (dict): Result of the run to check
+        threshold_pct (float): Allowed growth of p95 and rows examined in percent
+
+    Returns:
+        tuple: (rows, regressions) where rows holds one comparison dict per
+               target present in both runs and regressions lists the names
+               of the regressed targets
+    """
+    rows, regressions = [], []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+
+        p95_change = _change_pct(old['p95_ms'], new['p95_ms'])
+        rows_change = _change_pct(old['rows_examined_mean'], new['rows_examined_mean'])
+        query_change = new['queries_mean'] - old['queries_mean']
+
+        regressed = (
+            (p95_change is not None and p95_change > threshold_pct)
+            or (rows_change is not None and rows_change > threshold_pct)
+            or query_change > 0.5
+        )
+        rows.append({
+            'target': name,
+            'p95_ms': (old['p95_ms'], new['p95_ms'], p95_change),
+            'queries': (old['queries_mean'], new['queries_mean'], query_change),
+            'rows_examined': (old['rows_examined_mean'], new['rows_examined_mean'], rows_change),
+            'regressed': regressed,
+        })
+        if regressed:
+            regressions.append(name)
+
+    return rows, regressions
+
+
+def _format_change(change, unit='%'):
+    if change is None:
+        return 'n/a'
+    return f"{change:+.1f}{unit}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline', help='Result file of the reference commit')
+    parser.add_argument('current', help='Result file to check')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed growth in percent')
+
+    args = parser.parse_args()
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+
+    rows, regressions = compare(baseline, current, args.threshold)
+
+    print(f"Baseline {baseline['meta'].get('commit')} → current {current['meta'].get('commit')}")
+    for row in rows:
+        old_p95, new_p95, p95_change = row['p95_ms']
+        old_q, new_q, q_change = row['queries']
+        old_rows, new_rows, rows_change = row['rows_examined']
+        marker = '❌' if row['regressed'] else '✅'
+        print(f"{marker} {row['target']:28s} p95 {old_p95:9.2f} → {new_p95:9.2f} ms ({_format_change(p95_change)})  "
+              f"queries {old_q:7.1f} → {new_q:7.1f} ({_format_change(q_change, '')})  "
+              f"rows {old_rows:10.0f} → {new_rows:10.0f} ({_format_change(rows_change)})")
+
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,221 @@
+"""
+Synthetic data generator for the benchmark database.
+
+Builds the schema from tests/database_setup.py (same tables, triggers and
+routines as the test database) and fills it with N users, M portfolios per
+user, K holdings per portfolio and D business days of bonddata and
+exchangerate history. Prices and rates come from the replay market data
+provider, so the same parameters always produce the same database.
+"""
+
+import os
+import sys
+from datetime import date
+import numpy as np
+from werkzeug.security import generate_password_hash
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tests'))
+
+CURRENCIES = [
+    ('USD', 'US Dollar'), ('EUR', 'Euro'), ('CHF', 'Swiss Franc'), ('GBP', 'British Pound'),
+    ('JPY', 'Japanese Yen'), ('CAD', 'Canadian Dollar'), ('AUD', 'Australian Dollar'),
+    ('SEK', 'Swedish Krona'), ('NOK', 'Norwegian Krone'), ('DKK', 'Danish Krone'),
+    ('HKD', 'Hong Kong Dollar'), ('SGD', 'Singapore Dollar'),
+]
+
+BENCH_PASSWORD = 'BenchPass1!'
+INSERT_CHUNK_SIZE = 5000
+
+
+def get_bench_db_config():
+    """Database configuration of the benchmark database (BENCH_DB_NAME, default portfolioanalyzer_bench)."""
+    from test_config import get_test_db_config
+    bench_config = get_test_db_config()
+    bench_config['database'] = os.getenv('BENCH_DB_NAME', 'portfolioanalyzer_bench')
+    return bench_config
+
+
+def use_bench_database():
+    """Points config.DB_CONFIG and the connection pool at the benchmark database."""
+    import config
+    from app.database.connection import pool
+
+    config.DB_CONFIG.update(get_bench_db_config())
+    pool.connection_pool = None
+
+
+def _chunks(rows, size=INSERT_CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _insert_many(query, rows):
+    from app.database.connection.cursor import db_transaction
+    for chunk in _chunks(rows):
+        with db_transaction() as cursor:
+            cursor.executemany(query, chunk)
+
+
+def generate(users=20, portfolios=3, holdings=25, days=250, securities=500, currencies=6,
+             seed=42, end_date=None, verbose=True):
+    """
+    Recreates the benchmark database and fills it with synthetic data.
+
+    Args:
+        users (int): Number of regular users (N)
+        portfolios (int): Portfolios per user (M)
+        holdings (int): Holdings per portfolio (K), at most securities
+        days (int): Business days of price and rate history (D)
+        securities (int): Number of securities in the bond table
+        currencies (int): Number of currencies, at most len(CURRENCIES)
+        seed (int): Seed for the generated data
+        end_date (str or date, optional): Last history date. Defaults to today.
+        verbose (bool): Print progress
+
+    Returns:
+        dict: Row counts per generated table
+    """
+    from database_setup import setup_test_database
+    from app.api.providers.replay_provider import ReplayProvider, generate_symbols
+    from app.database.helpers.fetch_all import fetch_all
+    from app.database.helpers.execute_change_query import execute_change_query
+    from app.database.tables.bonddata.upsert_bonddata import UPSERT_BONDDATA_QUERY
+    from app.database.tables.exchangerate.upsert_exchangerates import UPSERT_EXCHANGERATE_QUERY
+
+    def log(message):
+        if verbose:
+            print(message)
+
+    holdings = min(holdings, securities)
+    currencies = min(currencies, len(CURRENCIES))
+    end_date = end_date or date.today()
+    rng = np.random.default_rng(seed)
+    provider = ReplayProvider(end_date=end_date, history_days=days, seed=seed)
+    window_days = days * 7 // 5 + 7  # calendar days covering the business day history
+
+    # Schema and minimal reference data are shared with the test database
+    os.environ['TEST_DB_NAME'] = get_bench_db_config()['database']
+    log(f"🔧 Creating benchmark database '{os.environ['TEST_DB_NAME']}'...")
+    if not setup_test_database():
+        raise RuntimeError("Benchmark database setup failed")
+    use_bench_database()
+
+    counts = {}
+
+    # Currencies
+    execute_change_query(
+        "INSERT IGNORE INTO currency (currencycode, currencyname) VALUES "
+        + ", ".join(["(%s, %s)"] * currencies),
+        tuple(value for pair in CURRENCIES[:currencies] for value in pair)
+    )
+    currency_rows = fetch_all("SELECT currencyid, currencycode FROM currency ORDER BY currencyid")
+    currency_ids = [row[0] for row in currency_rows]
+    counts['currency'] = len(currency_rows)
+
+    category_ids = [row[0] for row in fetch_all("SELECT bondcategoryid FROM bondcategory")]
+    sector_ids = [row[0] for row in fetch_all("SELECT sectorid FROM sector")]
+    exchange_ids = [row[0] for row in fetch_all("SELECT exchangeid FROM exchange")]
+
+    # Securities
+    log(f"📈 Generating {securities} securities...")
+    symbols = generate_symbols(securities, prefix='BEN')
+    _insert_many("""
+        INSERT INTO bond (bondsymbol, bondname, bonddescription, bondcountry, bondexchangeid,
+                          bondwebsite, bondindustry, bondsectorid, bondcategoryid, bondcurrencyid)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, [
+        (
+            symbol, f"{symbol} Synthetic Inc.", 'Generated security for benchmarks.', 'United States',
+            int(rng.choice(exchange_ids)), None, 'Synthetic', int(rng.choice(sector_ids)),
+            int(rng.choice(category_ids)), int(rng.choice(currency_ids)),
+        )
+        for symbol in symbols
+    ])
+    bond_ids = {symbol: bondid for bondid, symbol in fetch_all("SELECT bondid, bondsymbol FROM bond")}
+    bench_bond_ids = [bond_ids[symbol] for symbol in symbols]
+    counts['bond'] = len(bond_ids)
+
+    # Price history; the bond_latest triggers run for every row
+    log(f"🗄️  Generating {days} days of prices for {len(bond_ids)} securities...")
+    price_rows = []
+    for symbol, bondid in bond_ids.items():
+        history = provider.history(symbol, window_days)
+        price_rows.extend(
+            (bondid, round(float(close), 5), int(volume), day.date())
+            for day, close, volume in zip(history.index, history['Close'], history['Volume'])
+        )
+    _insert_many(UPSERT_BONDDATA_QUERY, price_rows)
+    counts['bonddata'] = len(price_rows)
+
+    # Exchange rate history for every ordered currency pair
+    log(f"💱 Generating {days} days of rates for {len(currency_rows)} currencies...")
+    rate_rows = []
+    for from_id, from_code in currency_rows:
+        for to_id, to_code in currency_rows:
+            # Synthetic FX is built from per-currency paths, so identities are exactly 1.0
+            history = provider.history(f"{from_code}{to_code}=X", window_days)
+            rate_rows.extend(
+                (from_id, to_id, round(float(close), 5), day.date())
+                for day, close in zip(history.index, history['Close'])
+            )
+    _insert_many(UPSERT_EXCHANGERATE_QUERY, rate_rows)
+    counts['exchangerate'] = len(rate_rows)
+
+    # Users; hashing once keeps generation fast
+    log(f"👤 Generating {users} users with {portfolios} portfolios of {holdings} holdings...")
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+    _insert_many("""
+        INSERT INTO user (username, userpwd, email, default_base_currency, is_admin)
+        VALUES (%s, %s, %s, %s, FALSE)
+    """, [
+        (f"bench_user_{i:05d}", password_hash, f"bench_user_{i:05d}@example.com", int(rng.choice(currency_ids)))
+        for i in range(users)
+    ])
+    user_ids = [row[0] for row in fetch_all("SELECT userid FROM user WHERE username LIKE 'bench\\_user\\_%' ORDER BY userid")]
+    counts['user'] = len(user_ids)
+
+    _insert_many("""
+        INSERT INTO portfolio (userid, portfolioname, portfoliodescription, portfoliocurrencyid)
+        VALUES (%s, %s, %s, %s)
+    """, [
+        (userid, f"Portfolio {j + 1}", f"Benchmark portfolio {j + 1}", int(rng.choice(currency_ids)))
+        for userid in user_ids
+        for j in range(portfolios)
+    ])
+    portfolio_ids = [row[0] for row in fetch_all(
+        "SELECT portfolioid FROM portfolio WHERE userid IN (" + ",".join(["%s"] * len(user_ids)) + ") ORDER BY portfolioid",
+        tuple(user_ids)
+    )] if user_ids else []
+    counts['portfolio'] = len(portfolio_ids)
+
+    holding_rows = []
+    for portfolioid in portfolio_ids:
+        for bondid in rng.choice(bench_bond_ids, size=holdings, replace=False):
+            holding_rows.append((portfolioid, int(bondid), round(float(rng.uniform(1, 500)), 5)))
+    _insert_many("INSERT INTO portfolio_bond (portfolioid, bondid, quantity) VALUES (%s, %s, %s)", holding_rows)
+    counts['portfolio_bond'] = len(holding_rows)
+
+    execute_change_query("UPDATE status SET system_generated = NOW()")
+
+    log(f"✅ Benchmark database ready: {counts}")
+    return counts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the benchmark database')
+    parser.add_argument('--users', type=int, default=20, help='Number of users (N)')
+    parser.add_argument('--portfolios', type=int, default=3, help='Portfolios per user (M)')
+    parser.add_argument('--holdings', type=int, default=25, help='Holdings per portfolio (K)')
+    parser.add_argument('--days', type=int, default=250, help='Business days of price and rate history (D)')
+    parser.add_argument('--securities', type=int, default=500, help='Number of securities')
+    parser.add_argument('--currencies', type=int, default=6, help='Number of currencies')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end-date', default=None, help='Last history date (YYYY-MM-DD), defaults to today')
+
+    args = parser.parse_args()
+    generate(args.users, args.portfolios, args.holdings, args.days, args.securities, args.currencies,
+             args.seed, args.end_date)
@@ -0,0 +1,136 @@
+"""
+Compares the hot queries of the portfolio pages sent as text with the same
+queries run as cached server-side prepared statements.
+
+Each target calls the real query function (get_portfolio_bonds,
+get_all_bonds_based_on_portfolio, get_full_bond) on one connection, as a
+request does, first with DB_PREPARED_STATEMENTS off and then on. The query
+result cache is disabled so every call reaches MySQL. Besides the latency
+the session counters of the connection show how often MySQL prepared a
+statement: with the cache it prepares each query once per connection
+instead of parsing it on every execution.
+
+Usage:
+    python -m benchmarks.datagen --users 50 --portfolios 4 --holdings 40 --days 500
+    python -m benchmarks.prepared_statements --iterations 200
+"""
+
+import time
+import numpy as np
+
+from benchmarks.datagen import use_bench_database
+from benchmarks.stats import summarize
+
+MODES = ['text', 'prepared']
+
+SESSION_STATUS_QUERY = """
+    SHOW SESSION STATUS WHERE Variable_name IN ('Com_select', 'Com_stmt_prepare', 'Com_stmt_execute')
+"""
+
+
+def _set_prepared(enabled):
+    import app.database.helpers.fetch_all as fetch_all_module
+    import app.database.helpers.fetch_one as fetch_one_module
+    fetch_all_module.DB_PREPARED_STATEMENTS = enabled
+    fetch_one_module.DB_PREPARED_STATEMENTS = enabled
+
+
+def _session_counters():
+    from app.database.helpers.fetch_all import fetch_all
+    return {name: int(value) for name, value in fetch_all(SESSION_STATUS_QUERY)}
+
+
+def speedup(results):
+    """Returns text p50 / prepared p50 per target, or None where a value is missing."""
+    ratios = {}
+    for name, modes in results.items():
+        text, prepared = modes.get('text', {}).get('p50_ms'), modes.get('prepared', {}).get('p50_ms')
+        ratios[name] = round(text / prepared, 3) if text and prepared else None
+    return ratios
+
+
+def run(iterations=200, warmup=10, seed=42, verbose=True):
+    """
+    Times every target in both modes.
+
+    Returns:
+        dict: target -> mode -> latency summary plus the session counter deltas
+    """
+    use_bench_database()
+
+    from app.database.cache import query_cache
+    from app.database.connection.unit_of_work import unit_of_work
+    from app.database.helpers.fetch_all import fetch_all
+    from app.database.tables.portfolio.get_portfolio_bonds import get_portfolio_bonds
+    from app.database.tables.portfolio.get_all_bonds_based_on_portfolio import get_all_bonds_based_on_portfolio
+    from app.database.tables.bond.get_full_bond import get_full_bond
+
+    portfolio_ids = [row[0] for row in fetch_all("SELECT portfolioid FROM portfolio ORDER BY portfolioid")]
+    bond_ids = [row[0] for row in fetch_all("SELECT bondid FROM bond ORDER BY bondid")]
+    if not portfolio_ids or not bond_ids:
+        raise RuntimeError("Benchmark database is empty, run python -m benchmarks.datagen first")
+
+    rng = np.random.default_rng(seed)
+    portfolios = [int(p) for p in rng.choice(portfolio_ids, size=iterations + warmup)]
+    bonds = [int(b) for b in rng.choice(bond_ids, size=iterations + warmup)]
+
+    targets = {
+        'get_portfolio_bonds': lambda i: get_portfolio_bonds(portfolios[i], 'USD'),
+        'get_all_bonds_based_on_portfolio': lambda i: get_all_bonds_based_on_portfolio(portfolios[i]),
+        'get_full_bond': lambda i: get_full_bond(bonds[i]),
+    }
+
+    cache_enabled = query_cache.QUERY_CACHE_ENABLED
+    query_cache.QUERY_CACHE_ENABLED = False
+    results = {}
+    try:
+        for name, func in targets.items():
+            results[name] = {}
+            for mode in MODES:
+                _set_prepared(mode == 'prepared')
+                with unit_of_work():
+                    for i in range(warmup):
+                        func(i)
+                    before = _session_counters()
+                    durations = []
+                    for i in range(warmup, warmup + iterations):
+                        start = time.perf_counter()
+                        func(i)
+                        durations.append((time.perf_counter() - start) * 1000)
+                    after = _session_counters()
+
+                result = summarize(durations)
+                result.update({key: after[key] - before[key] for key in before})
+                results[name][mode] = result
+                if verbose:
+                    print(f"  {name:34s} {mode:8s} p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms  "
+                          f"prepares {result.get('Com_stmt_prepare', 0):5d}  executes {result.get('Com_stmt_execute', 0):5d}")
+    finally:
+        query_cache.QUERY_CACHE_ENABLED = cache_enabled
+        from config import DB_PREPARED_STATEMENTS
+        _set_prepared(DB_PREPARED_STATEMENTS)
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Compare text and prepared execution of the hot queries')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls per target and mode')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed calls per target and mode')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    args = parser.parse_args()
+    print("⏱️  Comparing text and prepared statements...")
+    results = run(args.iterations, args.warmup, args.seed)
+    for name, ratio in speedup(results).items():
+        print(f"  {name:34s} speedup {ratio}x")
+    if args.output:
+        import os
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'speedup': speedup(results)}, f, indent=2, sort_keys=True)
+        print(f"✅ Results written to {args.output}")
@@ -0,0 +1,273 @@
+"""
+Runs the benchmark suite against the benchmark database.
+
+Every page is rendered through the Flask test client as a generated user,
+every ingestion job runs against the replay market data provider and every
+compute target runs on synthetic in-memory inputs of 10 years × 500 holdings
+(goal: well under a second each). For each
+target the latency percentiles, the number of SQL statements and the rows
+read by MySQL per iteration are recorded and written to a JSON file.
+
+Usage:
+    python -m benchmarks.datagen --users 50 --portfolios 4 --holdings 40 --days 500
+    python -m benchmarks.run_benchmarks --iterations 30
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+import numpy as np
+
+from benchmarks.datagen import PROJECT_ROOT, get_bench_db_config, use_bench_database
+from benchmarks.stats import ServerCounters, summarize
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+
+PAGE_TARGETS = ['home', 'portfolioview', 'securites_view', 'edit_portfolio', 'admin.securityoverview', 'admin.securities']
+JOB_TARGETS = ['fetch_daily_securityrates', 'fetch_daily_exchangerates']
+COMPUTE_TARGETS = ['compute_value_history', 'compute_portfolio_analytics']
+ALL_TARGETS = PAGE_TARGETS + JOB_TARGETS + COMPUTE_TARGETS
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def _dataset_info():
+    from app.database.helpers.fetch_one import fetch_one
+    info = {}
+    for table in ['user', 'portfolio', 'portfolio_bond', 'bond', 'bonddata', 'currency', 'exchangerate']:
+        info[table] = fetch_one(f"SELECT COUNT(*) FROM `{table}`")[0]
+    return info
+
+
+def _value_history_inputs(seed):
+    """Arguments of compute_value_history for 10 years of 500 holdings in 5 currencies."""
+    from datetime import date
+
+    rng = np.random.default_rng(seed)
+    origin, start, end = date(2014, 5, 18), date(2014, 6, 1), date(2024, 6, 1)
+    n_days = (end - origin).days + 1
+    days = np.flatnonzero(np.is_busday(np.datetime64(origin) + np.arange(n_days)))
+
+    holdings = [(b, 10.0, 1 + b % 5) for b in range(500)]
+    price_rows = [(b, int(d), float(p)) for b in range(500) for d, p in zip(days, rng.uniform(50, 150, len(days)))]
+    fx_rows = [(c, 1, int(d), 1.1) for c in range(2, 6) for d in days]
+    return holdings, price_rows, fx_rows, 1, origin, start, end
+
+
+def _analytics_inputs(seed):
+    """Arguments of compute_portfolio_analytics for 10 years of 500 holdings, 50 of them listed later."""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (2600, 500)), axis=0)
+    prices[:300, :50] = np.nan
+    holdings = [(b, 1.0, 1, f'S{b}', f'Security {b}') for b in range(500)]
+    return holdings, prices, prices[:, 0]
+
+
+def _measure(counters, func, iterations, warmup, setup=None):
+    """
+    Runs func warmup + iterations times and returns the measurements of the
+    timed iterations. setup runs before every iteration and is not measured.
+    """
+    for i in range(warmup):
+        if setup:
+            setup()
+        func(i)
+
+    durations, queries, rows_examined, errors = [], [], [], 0
+    for i in range(warmup, warmup + iterations):
+        if setup:
+            setup()
+        before = counters.snapshot()
+        start = time.perf_counter()
+        ok = func(i)
+        durations.append((time.perf_counter() - start) * 1000)
+        delta = counters.delta(before)
+        queries.append(delta['queries'])
+        rows_examined.append(delta['rows_examined'])
+        if ok is False:
+            errors += 1
+
+    result = summarize(durations)
+    result.update({
+        'queries_mean': round(float(np.mean(queries)), 2),
+        'queries_max': int(max(queries)),
+        'rows_examined_mean': round(float(np.mean(rows_examined)), 2),
+        'rows_examined_max': int(max(rows_examined)),
+        'errors': errors,
+    })
+    return result
+
+
+def run(iterations=20, warmup=2, targets=None, provider_latency_ms=0, seed=42, verbose=True):
+    """
+    Runs the selected benchmarks.
+
+    Args:
+        iterations (int): Timed iterations per target
+        warmup (int): Untimed iterations per target (fills the per-worker caches)
+        targets (list of str, optional): Subset of ALL_TARGETS
+        provider_latency_ms (float): Simulated market data latency for the jobs
+        seed (int): Seed for choosing users and portfolios
+        verbose (bool): Print a line per target
+
+    Returns:
+        dict: meta and per-target results
+    """
+    targets = targets or ALL_TARGETS
+    use_bench_database()
+
+    # Jobs must never reach the network; the replay provider generates data for any symbol
+    from app.api.providers import set_market_data_provider
+    from app.api.providers.replay_provider import ReplayProvider
+    set_market_data_provider(ReplayProvider(latency_ms=provider_latency_ms, seed=seed))
+
+    from flask import url_for
+    from app import create_app
+    from app.database.helpers.fetch_all import fetch_all
+    from app.database.helpers.execute_change_query import execute_change_query
+    from app.database.tables.bond.fetch_daily_securityrates import fetch_daily_securityrates
+    from app.database.tables.exchangerate.fetch_daily_exchangerates import fetch_daily_exchangerates
+    from app.database.tables.portfolio.get_portfolio_history import compute_value_history
+    from app.database.tables.portfolio.get_portfolio_analytics import compute_portfolio_analytics
+
+    from app.utils.warmup import get_warmup_status
+
+    app = create_app()
+    app.config.update({'TESTING': True, 'WTF_CSRF_ENABLED': False})
+
+    # The startup warm-up writes prices and rates; it must not overlap the measurements
+    while get_warmup_status()['status'] in ('pending', 'running'):
+        time.sleep(0.1)
+
+    portfolios = fetch_all("""
+        SELECT p.portfolioid, p.userid FROM portfolio p
+        JOIN user u ON u.userid = p.userid
+        WHERE u.is_admin = FALSE
+        ORDER BY p.portfolioid
+    """)
+    admin_ids = [row[0] for row in fetch_all("SELECT userid FROM user WHERE is_admin = TRUE ORDER BY userid")]
+    if not portfolios or not admin_ids:
+        raise RuntimeError("Benchmark database is empty, run python -m benchmarks.datagen first")
+
+    rng = np.random.default_rng(seed)
+    sample = [tuple(portfolios[i]) for i in rng.integers(0, len(portfolios), size=iterations + warmup)]
+
+    client = app.test_client()
+
+    def login(userid):
+        with client.session_transaction() as session:
+            session['_user_id'] = str(userid)
+            session['_fresh'] = True
+
+    def page(endpoint, with_portfolio=True, as_admin=False):
+        def request(i):
+            portfolio_id, userid = sample[i]
+            login(admin_ids[0] if as_admin else userid)
+            with app.test_request_context():
+                url = url_for(endpoint, portfolio_id=portfolio_id) if with_portfolio else url_for(endpoint)
+            return client.get(url).status_code == 200
+        return request
+
+    def job(func):
+        def request(i):
+            func()
+        return request
+
+    def compute(func, make_inputs):
+        inputs = []
+        def prepare():
+            # Built once, by the first unmeasured setup call
+            if not inputs:
+                inputs.append(make_inputs(seed))
+        def request(i):
+            func(*inputs[0])
+        return request, prepare
+
+    def reset_status(status_column):
+        # The jobs run once per day; clearing the marker makes every iteration do the full work
+        return lambda: execute_change_query(f"UPDATE status SET {status_column} = NULL WHERE id = 1")
+
+    benchmarks = {
+        'home': (page('main.home', with_portfolio=False), None),
+        'portfolioview': (page('main.portfolioview'), None),
+        'securites_view': (page('main.securites_view'), None),
+        'edit_portfolio': (page('main.edit_portfolio'), None),
+        'admin.securityoverview': (page('admin.securityoverview', with_portfolio=False, as_admin=True), None),
+        'admin.securities': (page('admin.securities', with_portfolio=False, as_admin=True), None),
+        'fetch_daily_securityrates': (job(fetch_daily_securityrates), reset_status('securities')),
+        'fetch_daily_exchangerates': (job(fetch_daily_exchangerates), reset_status('exchangerates')),
+        'compute_value_history': compute(compute_value_history, _value_history_inputs),
+        'compute_portfolio_analytics': compute(compute_portfolio_analytics, _analytics_inputs),
+    }
+
+    unknown = set(targets) - set(benchmarks)
+    if unknown:
+        raise ValueError(f"Unknown benchmark targets: {', '.join(sorted(unknown))}")
+
+    counters = ServerCounters(get_bench_db_config())
+    results = {}
+    try:
+        for name in targets:
+            func, setup = benchmarks[name]
+            results[name] = _measure(counters, func, iterations, warmup, setup)
+            if verbose:
+                r = results[name]
+                print(f"  {name:28s} p50 {r['p50_ms']:9.2f} ms  p95 {r['p95_ms']:9.2f} ms  "
+                      f"queries {r['queries_mean']:8.1f}  rows {r['rows_examined_mean']:12.0f}"
+                      + (f"  errors {r['errors']}" if r['errors'] else ""))
+    finally:
+        counters.close()
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'provider_latency_ms': provider_latency_ms,
+            'seed': seed,
+            'dataset': _dataset_info(),
+        },
+        'results': results,
+    }
+
+
+def write_results(results, output=None):
+    """Writes results as JSON, by default to benchmarks/results/<timestamp>-<commit>.json."""
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{results['meta']['commit'] or 'unknown'}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return output
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the Portfolio Analyzer benchmarks')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed iterations per target')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed iterations per target')
+    parser.add_argument('--targets', nargs='+', choices=ALL_TARGETS, help='Targets to run (default: all)')
+    parser.add_argument('--provider-latency-ms', type=float, default=0, help='Simulated market data latency')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<timestamp>-<commit>.json)')
+
+    args = parser.parse_args()
+    print("⏱️  Running benchmarks...")
+    results = run(args.iterations, args.warmup, args.targets, args.provider_latency_ms, args.seed)
+    print(f"✅ Results written to {write_results(results, args.output)}")
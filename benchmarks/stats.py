@@ -0,0 +1,74 @@
+"""
+Measurement helpers: latency summaries and MySQL server counters.
+"""
+
+import numpy as np
+import mysql.connector
+
+# Questions counts statements sent by clients; Innodb_rows_read counts rows
+# read from InnoDB tables, i.e. rows scanned including those filtered out
+STATUS_QUERY = """
+    SHOW GLOBAL STATUS WHERE Variable_name IN ('Questions', 'Innodb_rows_read')
+"""
+
+
+def summarize(samples_ms):
+    """
+    Summarizes latency samples.
+
+    Args:
+        samples_ms (list of float): One duration per iteration in milliseconds
+
+    Returns:
+        dict: count, mean, min, max, p50 and p95 in milliseconds
+    """
+    if not samples_ms:
+        return {'count': 0, 'mean_ms': None, 'min_ms': None, 'max_ms': None, 'p50_ms': None, 'p95_ms': None}
+
+    samples = np.asarray(samples_ms, dtype=float)
+    return {
+        'count': int(samples.size),
+        'mean_ms': round(float(samples.mean()), 3),
+        'min_ms': round(float(samples.min()), 3),
+        'max_ms': round(float(samples.max()), 3),
+        'p50_ms': round(float(np.percentile(samples, 50)), 3),
+        'p95_ms': round(float(np.percentile(samples, 95)), 3),
+    }
+
+
+class ServerCounters:
+    """
+    Reads query and row counters from the MySQL server.
+
+    The counters are global, so the benchmark database should not be used by
+    anything else while benchmarks run. The statements of the counter
+    connection itself are measured once and subtracted.
+    """
+
+    def __init__(self, db_config):
+        self.connection = mysql.connector.connect(**db_config)
+        self.connection.autocommit = True
+        first = self._read()
+        second = self._read()
+        self.overhead = {key: second[key] - first[key] for key in first}
+
+    def _read(self):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(STATUS_QUERY)
+            values = {name: int(value) for name, value in cursor.fetchall()}
+        finally:
+            cursor.close()
+        return {'queries': values.get('Questions', 0), 'rows_examined': values.get('Innodb_rows_read', 0)}
+
+    def snapshot(self):
+        """Returns the current counters."""
+        return self._read()
+
+    def delta(self, before):
+        """Returns the counters accumulated since snapshot() returned before."""
+        after = self._read()
+        return {key: max(after[key] - before[key] - self.overhead[key], 0) for key in before}
+
+    def close(self):
+        self.connection.close()
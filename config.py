@@ -39,6 +39,21 @@ TIMEZONE = os.getenv('TIMEZONE', 'UTC')
 # Database connection pool configuration
 DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
 DB_POOL_NAME = os.getenv('DB_POOL_NAME', 'mypool')
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', 5))  # How long a request waits for a free connection before failing
+DB_POOL_RESET_SESSION = os.getenv('DB_POOL_RESET_SESSION', 'false').lower() == 'true'  # Reset sessions on return; drops the prepared statements
+DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'true').lower() == 'true'  # Hot queries as server-side prepared statements
+DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 32))  # Prepared statements kept per connection
+
+# Reference data cache configuration
+REFERENCE_DATA_CHECK_SECONDS = int(os.getenv('REFERENCE_DATA_CHECK_SECONDS', 30))  # max staleness across workers
+
+# Query result cache configuration
+QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'true').lower() == 'true'
+QUERY_CACHE_BACKEND = os.getenv('QUERY_CACHE_BACKEND', 'memory')  # 'memory' (per worker) or 'redis' (shared)
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', 2000))  # LRU size cap of the memory backend
+QUERY_CACHE_CHECK_SECONDS = int(os.getenv('QUERY_CACHE_CHECK_SECONDS', 5))  # max staleness across workers
+QUERY_CACHE_REDIS_URL = os.getenv('QUERY_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+QUERY_CACHE_TTL_SECONDS = int(os.getenv('QUERY_CACHE_TTL_SECONDS', 86400))  # expiry of redis entries
 
 # Logging configuration
 LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))  # 10MB
@@ -47,6 +62,14 @@ SECURITY_LOG_MAX_BYTES = int(os.getenv('SECURITY_LOG_MAX_BYTES', 5 * 1024 * 1024
 SECURITY_LOG_BACKUP_COUNT = int(os.getenv('SECURITY_LOG_BACKUP_COUNT', 10))
 ERROR_LOG_MAX_BYTES = int(os.getenv('ERROR_LOG_MAX_BYTES', 5 * 1024 * 1024))  # 5MB
 ERROR_LOG_BACKUP_COUNT = int(os.getenv('ERROR_LOG_BACKUP_COUNT', 5))
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024))  # 5MB
+SLOW_QUERY_LOG_BACKUP_COUNT = int(os.getenv('SLOW_QUERY_LOG_BACKUP_COUNT', 5))
+
+# SQL instrumentation configuration
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))  # statements slower than this go to logs/slow_queries.log
+REQUEST_QUERY_COUNT_WARN = int(os.getenv('REQUEST_QUERY_COUNT_WARN', 100))  # requests with more statements are logged
+SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'false').lower() == 'true'  # only in debug mode
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
 
 # Password validation configuration
 PASSWORD_MAX_LENGTH = int(os.getenv('PASSWORD_MAX_LENGTH', 128))
@@ -69,10 +92,58 @@ YAHOO_FINANCE_PERIOD_DAYS = int(os.getenv('YAHOO_FINANCE_PERIOD_DAYS', 5))
 YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS = int(os.getenv('YAHOO_FINANCE_EXCHANGE_PERIOD_DAYS', 1))
 YAHOO_FINANCE_INFO_PERIOD_DAYS = int(os.getenv('YAHOO_FINANCE_INFO_PERIOD_DAYS', 1))
 YAHOO_FINANCE_LOOKUP_PERIOD_DAYS = int(os.getenv('YAHOO_FINANCE_LOOKUP_PERIOD_DAYS', 7))
+EXCHANGE_ANCHOR_CURRENCY = os.getenv('EXCHANGE_ANCHOR_CURRENCY', 'USD')  # only legs from this currency are downloaded
+
+# Market data provider configuration
+MARKET_DATA_PROVIDER = os.getenv('MARKET_DATA_PROVIDER', 'yfinance')  # 'yfinance' or 'replay'
+MARKET_DATA_FIXTURES_DIR = os.getenv('MARKET_DATA_FIXTURES_DIR', '')  # replay: history/info fixtures, empty for synthetic only
+MARKET_DATA_REPLAY_END_DATE = os.getenv('MARKET_DATA_REPLAY_END_DATE', '')  # replay: last bar date, empty for today
+MARKET_DATA_HISTORY_DAYS = int(os.getenv('MARKET_DATA_HISTORY_DAYS', 750))
+MARKET_DATA_LATENCY_MS = float(os.getenv('MARKET_DATA_LATENCY_MS', 0))
+MARKET_DATA_LATENCY_JITTER_MS = float(os.getenv('MARKET_DATA_LATENCY_JITTER_MS', 0))
+MARKET_DATA_FAILURE_RATE = float(os.getenv('MARKET_DATA_FAILURE_RATE', 0))
+MARKET_DATA_SEED = int(os.getenv('MARKET_DATA_SEED', 42))
+MARKET_DATA_CHUNK_SIZE = int(os.getenv('MARKET_DATA_CHUNK_SIZE', 200))  # symbols per price download request
+MARKET_DATA_MAX_WORKERS = int(os.getenv('MARKET_DATA_MAX_WORKERS', 4))  # chunks downloaded concurrently
+MARKET_DATA_RATE_LIMIT_PER_SECOND = float(os.getenv('MARKET_DATA_RATE_LIMIT_PER_SECOND', 2))  # 0 disables the limit
+MARKET_DATA_RATE_LIMIT_BURST = int(os.getenv('MARKET_DATA_RATE_LIMIT_BURST', 4))
+MARKET_DATA_MAX_RETRIES = int(os.getenv('MARKET_DATA_MAX_RETRIES', 3))  # retries per failed chunk
+MARKET_DATA_RETRY_BACKOFF_SECONDS = float(os.getenv('MARKET_DATA_RETRY_BACKOFF_SECONDS', 1))  # doubled per retry
 
 # Scheduler configuration
 SCHEDULER_HOUR = int(os.getenv('SCHEDULER_HOUR', 0))
 SCHEDULER_MINUTE = int(os.getenv('SCHEDULER_MINUTE', 0))
+SCHEDULER_LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', 300))  # another worker takes over after this
+SCHEDULER_LEASE_RENEW_SECONDS = int(os.getenv('SCHEDULER_LEASE_RENEW_SECONDS', 60))
+BACKFILL_ENABLED = os.getenv('BACKFILL_ENABLED', 'true').lower() == 'true'  # daily gap-filling of bonddata history
+BACKFILL_DAYS = int(os.getenv('BACKFILL_DAYS', 365))  # calendar days of history kept gap-free
+BACKFILL_HOUR = int(os.getenv('BACKFILL_HOUR', 1))
+BACKFILL_MINUTE = int(os.getenv('BACKFILL_MINUTE', 0))
+
+# Startup warm-up configuration (runs in the background, see /ready)
+WARMUP_DB_RETRIES = int(os.getenv('WARMUP_DB_RETRIES', 3))
+WARMUP_DB_RETRY_DELAY_SECONDS = int(os.getenv('WARMUP_DB_RETRY_DELAY_SECONDS', 5))
+
+# Portfolio analytics configuration
+PORTFOLIO_HISTORY_DEFAULT_DAYS = int(os.getenv('PORTFOLIO_HISTORY_DEFAULT_DAYS', 365))
+PORTFOLIO_HISTORY_MAX_DAYS = int(os.getenv('PORTFOLIO_HISTORY_MAX_DAYS', 3660))  # longest range the history endpoint serves
+PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS = int(os.getenv('PORTFOLIO_HISTORY_FILL_LOOKBACK_DAYS', 14))  # prices before the start that seed the forward fill
+ANALYTICS_BENCHMARK_SYMBOL = os.getenv('ANALYTICS_BENCHMARK_SYMBOL', 'SPY')  # security the betas are measured against
+ANALYTICS_RISK_FREE_RATE = float(os.getenv('ANALYTICS_RISK_FREE_RATE', 0.0))  # annual, e.g. 0.02 for 2%
+ANALYTICS_TRADING_DAYS = int(os.getenv('ANALYTICS_TRADING_DAYS', 252))  # periods per year for annualization
+RISK_DEFAULT_CONFIDENCE = float(os.getenv('RISK_DEFAULT_CONFIDENCE', 0.99))
+RISK_DEFAULT_HORIZON_DAYS = int(os.getenv('RISK_DEFAULT_HORIZON_DAYS', 1))
+RISK_DEFAULT_LOOKBACK_DAYS = int(os.getenv('RISK_DEFAULT_LOOKBACK_DAYS', 730))  # calendar days of history the scenarios come from
+RISK_DEFAULT_PATHS = int(os.getenv('RISK_DEFAULT_PATHS', 100000))  # Monte Carlo paths, 0 to skip the simulation
+RISK_MAX_HORIZON_DAYS = int(os.getenv('RISK_MAX_HORIZON_DAYS', 20))
+RISK_MAX_PATHS = int(os.getenv('RISK_MAX_PATHS', 1000000))
+RISK_MC_CHUNK_PATHS = int(os.getenv('RISK_MC_CHUNK_PATHS', 10000))  # paths per process pool task
+RISK_MC_WORKERS = int(os.getenv('RISK_MC_WORKERS', 2))  # processes per gunicorn worker
+RISK_JOB_TIMEOUT_SECONDS = int(os.getenv('RISK_JOB_TIMEOUT_SECONDS', 900))  # a running job older than this is restarted
+
+# Admin security overview configuration
+SECURITY_PAGE_SIZE = int(os.getenv('SECURITY_PAGE_SIZE', 50))  # rows per page of /admin/securities
+SECURITY_PAGE_MAX_SIZE = int(os.getenv('SECURITY_PAGE_MAX_SIZE', 200))  # largest ?limit= served
 
 # Timeout configuration
 API_TIMEOUT_SECONDS = int(os.getenv('API_TIMEOUT_SECONDS', 15))
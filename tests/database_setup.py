@@ -150,12 +150,16 @@ def setup_test_database(verbose=False):
             "currency",
             "user",
             "exchangerate",
+            "exchangerate_latest",
             "bondcategory",
             "exchange",
             "bond",
             "bonddata",
+            "bond_latest",
+            "bonddata_backfill",
             "portfolio",
             "portfolio_bond",
+            "portfolio_risk",
             "api_fetch_logs",
             "status"
         ]
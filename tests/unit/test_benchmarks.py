@@ -0,0 +1,50 @@
+"""
+Benchmark harness tests for Portfolio Analyzer.
+"""
+
+
+def _result(p95, queries, rows):
+    return {'p95_ms': p95, 'queries_mean': queries, 'rows_examined_mean': rows}
+
+
+class TestBenchmarkStats:
+    """Test the latency summary of the benchmark runner."""
+
+    def test_summarize(self):
+        """Test percentiles and the empty case."""
+        from benchmarks.stats import summarize
+
+        summary = summarize([float(i) for i in range(1, 101)])
+
+        assert summary['count'] == 100
+        assert summary['p50_ms'] == 50.5
+        assert summary['p95_ms'] == 95.05
+        assert summary['max_ms'] == 100.0
+        assert summarize([])['p95_ms'] is None
+
+
+class TestBenchmarkCompare:
+    """Test regression detection between two result files."""
+
+    def test_regressions(self):
+        """Test that slower, scan-heavier or chattier targets are flagged."""
+        from benchmarks.compare import compare
+
+        baseline = {'results': {
+            'home': _result(10.0, 4, 1000),
+            'portfolioview': _result(10.0, 8, 1000),
+            'securites_view': _result(10.0, 8, 1000),
+            'edit_portfolio': _result(10.0, 8, 1000),
+        }}
+        current = {'results': {
+            'home': _result(11.0, 4, 1100),
+            'portfolioview': _result(15.0, 8, 1000),
+            'securites_view': _result(10.0, 9, 1000),
+            'edit_portfolio': _result(10.0, 8, 5000),
+            'admin.securityoverview': _result(10.0, 1, 10),
+        }}
+
+        rows, regressions = compare(baseline, current, threshold_pct=20)
+
+        assert regressions == ['portfolioview', 'securites_view', 'edit_portfolio']
+        assert len(rows) == 4
@@ -0,0 +1,140 @@
+"""
+Price history backfill tests for Portfolio Analyzer.
+"""
+
+from datetime import date
+import pytest
+from unittest.mock import patch, MagicMock
+
+
+class TestGapDetection:
+    """Test computing and grouping the missing ranges per bond."""
+
+    def test_gaps_are_business_day_ranges(self):
+        """Test that missing business days collapse into ranges and weekends are ignored."""
+        from app.database.tables.bonddata.backfill_bonddata import find_bonddata_gaps
+
+        # Mon 2024-06-03 .. Fri 2024-06-14
+        existing = [(1, date(2024, 6, d)) for d in (3, 4, 5, 11, 12, 13, 14)]
+        existing += [(2, date(2024, 6, d)) for d in (3, 4, 5, 6, 7, 10, 11, 12, 13, 14)]
+
+        gaps = find_bonddata_gaps([1, 2, 3], existing, [], date(2024, 6, 3), date(2024, 6, 14))
+
+        assert gaps[1] == [(date(2024, 6, 6), date(2024, 6, 10))]
+        assert 2 not in gaps
+        assert gaps[3] == [(date(2024, 6, 3), date(2024, 6, 14))]
+
+    def test_checked_ranges_are_not_requested_again(self):
+        """Test that ranges already requested from the provider count as covered."""
+        from app.database.tables.bonddata.backfill_bonddata import find_bonddata_gaps
+
+        existing = [(1, date(2024, 6, 3)), (1, date(2024, 6, 5))]
+        checked = [(1, date(2024, 6, 4), date(2024, 6, 4))]
+
+        gaps = find_bonddata_gaps([1], existing, checked, date(2024, 6, 3), date(2024, 6, 6))
+
+        assert gaps == {1: [(date(2024, 6, 6), date(2024, 6, 6))]}
+
+    def test_identical_ranges_are_grouped(self):
+        """Test that bonds with the same gap share one download."""
+        from app.database.tables.bonddata.backfill_bonddata import group_gap_ranges
+
+        first = (date(2024, 6, 3), date(2024, 6, 7))
+        second = (date(2024, 6, 10), date(2024, 6, 10))
+        groups = group_gap_ranges({1: [first, second], 2: [first], 3: [second]})
+
+        assert list(groups) == [first, second]
+        assert groups[first] == [1, 2]
+        assert groups[second] == [1, 3]
+
+
+class TestBackfill:
+    """Test the backfill job with a replay provider and mocked database access."""
+
+    @pytest.fixture
+    def replay(self):
+        """Install a replay provider without rate limit and backoff."""
+        from app.api import get_price_history
+        from app.api.providers import set_market_data_provider
+        from app.api.providers.replay_provider import ReplayProvider
+
+        set_market_data_provider(ReplayProvider(end_date='2024-06-28', history_days=60, seed=5, failing_symbols=['DEAD']))
+        with patch.object(get_price_history, 'MARKET_DATA_RETRY_BACKOFF_SECONDS', 0), \
+             patch.object(get_price_history, 'get_rate_limiter', return_value=None):
+            yield
+        set_market_data_provider(None)
+
+    def test_fills_gaps_and_marks_ranges(self, replay):
+        """Test that only the missing days are written and failed symbols stay unchecked."""
+        from app.database.tables.bonddata import backfill_bonddata as module
+
+        bonds = [(1, 'AAPL'), (2, 'DEAD')]
+        existing = [(1, date(2024, 6, d)) for d in (3, 4, 5, 6, 7, 24, 25, 26, 27)]
+        write_batch = MagicMock()
+
+        with patch.object(module, 'fetch_all', side_effect=[bonds, existing, []]), \
+             patch.object(module, '_write_batch', write_batch), \
+             patch.object(module, 'log_api_fetches') as log, \
+             patch.object(module, 'db_transaction', MagicMock()):
+            summary = module.backfill_bonddata(days=25, today=date(2024, 6, 28))
+
+        rows = [row for call in write_batch.call_args_list for row in call.args[0]]
+        checked = [mark for call in write_batch.call_args_list for mark in call.args[1]]
+
+        assert {row[-1] for row in rows if row[0] == 1} == {date(2024, 6, d) for d in (10, 11, 12, 13, 14, 17, 18, 19, 20, 21)}
+        assert all(len(row) == 7 for row in rows)
+        assert (1, date(2024, 6, 10), date(2024, 6, 21)) in checked
+        assert all(mark[0] != 2 for mark in checked)
+        assert 'DEAD' in summary['failed']
+        assert log.call_args.args[0][0][:3] == ('STOCK_BACKFILL_BULK', 'STOCK', 'PARTIAL')
+
+    def test_manual_run_keeps_markers_of_other_bonds(self, replay):
+        """Test that a short run for one symbol only reads and prunes that bond's rows, against the full window."""
+        from app.database.tables.bonddata import backfill_bonddata as module
+
+        transaction = MagicMock()
+        cursor = transaction.return_value.__enter__.return_value
+        fetch_all = MagicMock(side_effect=[[(1, 'AAPL')], [], []])
+
+        with patch.object(module, 'fetch_all', fetch_all), \
+             patch.object(module, '_write_batch', MagicMock()), \
+             patch.object(module, 'log_api_fetches'), \
+             patch.object(module, 'BACKFILL_DAYS', 365), \
+             patch.object(module, 'db_transaction', transaction):
+            module.backfill_bonddata(days=5, symbols=['AAPL'], today=date(2024, 6, 28))
+
+        for query, params in (call.args for call in fetch_all.call_args_list[1:]):
+            assert 'bondid IN (%s)' in query
+            assert params[-1] == 1
+
+        query, params = next(call.args for call in cursor.execute.call_args_list if 'DELETE' in call.args[0])
+        assert 'bondid IN (%s)' in query
+        assert params == (date(2023, 6, 29), 1)
+
+    def test_manual_run_in_background(self):
+        """Test that a manual backfill runs outside the request and only once per worker at a time."""
+        import threading
+        import time
+        from flask import Flask
+        from app.database.tables.bonddata import backfill_bonddata as module
+
+        started, release = threading.Event(), threading.Event()
+
+        def slow_backfill(days=None, symbols=None):
+            started.set()
+            release.wait(5)
+
+        with patch.object(module, 'backfill_bonddata', side_effect=slow_backfill) as backfill, \
+             patch.object(module, 'unit_of_work', MagicMock()):
+            assert module.start_backfill(Flask(__name__), days=5, symbols=['AAPL'])
+            assert started.wait(5)
+            assert not module.start_backfill(Flask(__name__))
+
+            release.set()
+            for _ in range(500):
+                if not module._manual_backfill.locked():
+                    break
+                time.sleep(0.01)
+
+        backfill.assert_called_once_with(days=5, symbols=['AAPL'])
+        assert not module._manual_backfill.locked()
@@ -0,0 +1,114 @@
+"""
+Connection pool wrapper tests for Portfolio Analyzer.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+
+class FakePool:
+    """Stand-in for MySQLConnectionPool that fails like it when empty."""
+
+    def __init__(self, pool_size):
+        self.pool_size = pool_size
+        self.free = pool_size
+        self.fail_next = False
+
+    def get_connection(self):
+        from mysql.connector.errors import PoolError, InterfaceError
+
+        if self.fail_next:
+            self.fail_next = False
+            raise InterfaceError("Lost connection to MySQL server")
+        if self.free == 0:
+            raise PoolError("Failed getting connection; pool exhausted")
+        self.free -= 1
+        conn = MagicMock()
+        conn.close.side_effect = self._give_back
+        return conn
+
+    def _give_back(self):
+        self.free += 1
+
+
+def _pool(size=2, timeout=0.05):
+    from app.database.connection.pool import MonitoredPool
+    return MonitoredPool(FakePool(size), timeout)
+
+
+class TestMonitoredPool:
+    """Test the bounded wait and the counters of the pool wrapper."""
+
+    def test_checkout_and_return(self):
+        """Test that checkouts are counted and close returns the connection exactly once."""
+        pool = _pool()
+
+        first = pool.get_connection()
+        second = pool.get_connection()
+        assert pool.stats()['in_use'] == 2
+
+        first.close()
+        first.close()
+        second.close()
+
+        stats = pool.stats()
+        assert stats['checkouts'] == 2
+        assert stats['in_use'] == 0
+        assert stats['high_water'] == 2
+        assert stats['exhausted'] == 0
+
+    def test_exhaustion_times_out(self):
+        """Test that a checkout fails with PoolExhaustedError only after waiting for the timeout."""
+        from app.database.connection.pool import PoolExhaustedError
+
+        pool = _pool(size=1, timeout=0.05)
+        held = pool.get_connection()
+
+        start = time.perf_counter()
+        with pytest.raises(PoolExhaustedError):
+            pool.get_connection()
+
+        assert time.perf_counter() - start >= 0.04
+        assert pool.stats()['exhausted'] == 1
+        held.close()
+        pool.get_connection().close()
+
+    def test_waits_for_a_returned_connection(self):
+        """Test that a checkout blocks until another thread returns its connection."""
+        pool = _pool(size=1, timeout=2)
+        held = pool.get_connection()
+        threading.Timer(0.05, held.close).start()
+
+        conn = pool.get_connection()
+        conn.close()
+
+        stats = pool.stats()
+        assert stats['waits'] == 1
+        assert stats['wait_ms_max'] >= 40
+        assert stats['exhausted'] == 0
+
+    def test_failed_reconnect_frees_the_slot(self):
+        """Test that a stale connection that cannot be reconnected does not leak a slot."""
+        from mysql.connector.errors import InterfaceError
+
+        pool = _pool(size=1)
+        pool._pool.fail_next = True
+
+        with pytest.raises(InterfaceError):
+            pool.get_connection()
+
+        assert pool.stats()['failed'] == 1
+        pool.get_connection().close()
+        assert pool.stats()['in_use'] == 0
+
+    def test_connection_passthrough(self):
+        """Test that the wrapped connection behaves like the pooled connection."""
+        pool = _pool()
+
+        with pool.get_connection() as conn:
+            conn.cursor(dictionary=True)
+            conn._conn.cursor.assert_called_once_with(dictionary=True)
+
+        assert pool.stats()['in_use'] == 0
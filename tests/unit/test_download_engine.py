@@ -0,0 +1,145 @@
+"""
+Chunked price download engine tests for Portfolio Analyzer.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+END_DATE = '2024-06-28'
+
+
+class TestTokenBucket:
+    """Test the rate limiter shared by the download threads."""
+
+    def test_burst_then_rate(self):
+        """Test that a full bucket allows a burst and then waits for new tokens."""
+        from app.api.download_engine import TokenBucket
+
+        bucket = TokenBucket(rate_per_second=20, capacity=3)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        burst = time.monotonic() - start
+        for _ in range(2):
+            bucket.acquire()
+        total = time.monotonic() - start
+
+        assert burst < 0.05
+        assert total >= 0.09
+
+    def test_zero_rate_disables_limit(self):
+        """Test that a rate of 0 never blocks."""
+        from app.api.download_engine import TokenBucket
+
+        bucket = TokenBucket(rate_per_second=0, capacity=1)
+        start = time.monotonic()
+        for _ in range(100):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.05
+
+
+class TestChunkedDownload:
+    """Test chunking, concurrency and retries of the download engine."""
+
+    def test_chunks_cover_all_symbols(self):
+        """Test that every symbol is downloaded once and chunks respect the chunk size."""
+        from app.api.download_engine import iter_chunked_download
+
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(chunk):
+            with lock:
+                calls.append(list(chunk))
+            return {symbol: symbol.lower() for symbol in chunk}
+
+        symbols = [f"S{i}" for i in range(10)] + ['S0']
+        outcomes = list(iter_chunked_download(symbols, fetch, chunk_size=3, max_workers=2))
+
+        assert sorted(o.symbol for o in outcomes) == sorted(set(symbols))
+        assert all(o.error is None and o.value == o.symbol.lower() for o in outcomes)
+        assert max(len(chunk) for chunk in calls) == 3
+        assert len(calls) == 4
+
+    def test_transient_failure_is_retried(self):
+        """Test that a chunk failing once succeeds on the retry."""
+        from app.api.download_engine import iter_chunked_download
+
+        attempts = {'count': 0}
+
+        def fetch(chunk):
+            attempts['count'] += 1
+            if attempts['count'] == 1:
+                raise ConnectionError("Too Many Requests")
+            return {symbol: 1.0 for symbol in chunk}
+
+        outcomes = list(iter_chunked_download(['A', 'B'], fetch, chunk_size=5, backoff_seconds=0))
+
+        assert all(o.value == 1.0 and o.attempts == 2 for o in outcomes)
+
+    def test_failing_chunk_stays_partial(self):
+        """Test that a permanently failing chunk only fails its own symbols."""
+        from app.api.download_engine import iter_chunked_download
+
+        def fetch(chunk):
+            if 'BAD' in chunk:
+                raise ConnectionError("timeout")
+            return {symbol: 1.0 for symbol in chunk}
+
+        outcomes = {o.symbol: o for o in iter_chunked_download(
+            ['A', 'B', 'BAD', 'C'], fetch, chunk_size=2, max_retries=2, backoff_seconds=0)}
+
+        assert outcomes['A'].value == 1.0 and outcomes['B'].error is None
+        assert outcomes['BAD'].value is None and outcomes['C'].value is None
+        assert 'timeout' in outcomes['BAD'].error
+        assert outcomes['C'].attempts == 3
+
+    def test_missing_symbol_reported(self):
+        """Test that a symbol missing from the chunk response gets an error outcome."""
+        from app.api.download_engine import iter_chunked_download
+
+        outcomes = {o.symbol: o for o in iter_chunked_download(['A', 'B'], lambda chunk: {'A': 1.0})}
+
+        assert outcomes['A'].error is None
+        assert outcomes['B'].value is None and outcomes['B'].error
+
+
+class TestEodPrices:
+    """Test get_eod_prices on top of the download engine."""
+
+    @pytest.fixture
+    def replay(self):
+        """Install a replay provider with one failing symbol and small chunks."""
+        from app.api import get_eod_prices as module
+        from app.api.providers import set_market_data_provider
+        from app.api.providers.replay_provider import ReplayProvider
+
+        provider = ReplayProvider(end_date=END_DATE, history_days=30, seed=3, failing_symbols=['DEAD'])
+        set_market_data_provider(provider)
+        with patch.object(module, 'MARKET_DATA_CHUNK_SIZE', 2), \
+             patch.object(module, 'MARKET_DATA_RETRY_BACKOFF_SECONDS', 0), \
+             patch.object(module, 'get_rate_limiter', return_value=None):
+            yield module, provider
+        set_market_data_provider(None)
+
+    def test_prices_across_chunks(self, replay):
+        """Test that prices from several chunks are merged into one result."""
+        module, provider = replay
+
+        prices = module.get_eod_prices(['AAPL', 'MSFT', 'NESN.SW', 'ROG.SW', 'SPY'])
+
+        assert set(prices) == {'AAPL', 'MSFT', 'NESN.SW', 'ROG.SW', 'SPY'}
+        assert prices['SPY'][0] == pytest.approx(provider.history('SPY', 5)['Close'].iloc[-1])
+        assert all(value[2] == END_DATE for value in prices.values())
+
+    def test_failed_chunk_is_partial(self, replay):
+        """Test that a chunk without data fails only its symbols and is streamed with an error."""
+        module, _ = replay
+
+        outcomes = {o.symbol: o for o in module.iter_eod_prices(['AAPL', 'MSFT', 'DEAD'])}
+
+        assert outcomes['AAPL'].value is not None
+        assert outcomes['DEAD'].value is None and outcomes['DEAD'].error
+        assert module.get_eod_prices(['DEAD']) == {'DEAD': (None, None, None)}
@@ -0,0 +1,117 @@
+"""
+Exchange rate matrix tests for Portfolio Analyzer.
+"""
+
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+
+class TestCrossRateMatrix:
+    """Test deriving the full rate matrix from anchor legs."""
+
+    def test_cross_rate_matrix_derives_all_pairs(self):
+        """Test that cross rates, inverses and identities are derived."""
+        from app.utils.exchange_rate_matrix import cross_rate_matrix
+
+        # USD anchor: USDCHF = 0.8, USDEUR = 0.9
+        matrix = cross_rate_matrix(np.array([1.0, 0.8, 0.9]))
+
+        assert np.isclose(matrix[0, 1], 0.8)
+        assert np.isclose(matrix[1, 0], 1 / 0.8)
+        assert np.isclose(matrix[1, 2], 0.9 / 0.8)
+        assert np.allclose(np.diag(matrix), 1.0)
+
+    def test_cross_rate_matrix_missing_leg(self):
+        """Test that a missing or non-positive leg only affects its own row and column."""
+        from app.utils.exchange_rate_matrix import cross_rate_matrix
+
+        matrix = cross_rate_matrix(np.array([1.0, np.nan, 0.9, 0.0]))
+
+        assert np.isnan(matrix[0, 1]) and np.isnan(matrix[1, 2])
+        assert np.isnan(matrix[3, 0])
+        assert np.isclose(matrix[2, 0], 1 / 0.9)
+        assert matrix[1, 1] == 1.0
+
+    def test_matrix_to_pairs(self):
+        """Test flattening a matrix into a pair mapping."""
+        from app.utils.exchange_rate_matrix import cross_rate_matrix, matrix_to_pairs
+
+        pairs = matrix_to_pairs(['USD', 'CHF'], cross_rate_matrix(np.array([1.0, np.nan])))
+
+        assert pairs == {'USDUSD': 1.0, 'USDCHF': None, 'CHFUSD': None, 'CHFCHF': 1.0}
+
+
+class TestExchangeRateMatrixDownload:
+    """Test that only the anchor legs are downloaded."""
+
+    def _download(self, closes):
+        columns = pd.MultiIndex.from_product([list(closes), ['Close']])
+        return pd.DataFrame([list(closes.values())], columns=columns)
+
+    def test_downloads_only_anchor_legs(self):
+        """Test that n-1 tickers are requested and the rest is derived."""
+        from app.api.get_exchange_matrix import get_exchange_rate_matrix
+
+        data = self._download({'USDCHF=X': 0.8, 'USDEUR=X': 0.9})
+        with patch('yfinance.download', return_value=data) as mock_download:
+            matrix, observed = get_exchange_rate_matrix(['USD', 'CHF', 'EUR'], anchor='USD')
+
+        assert mock_download.call_args[0][0] == ['USDCHF=X', 'USDEUR=X']
+        assert np.isclose(matrix[1, 2], 0.9 / 0.8)
+        assert observed[0, 1] and observed[0, 2]
+        assert not observed[1, 2] and not observed[1, 0] and not observed[0, 0]
+
+    def test_adds_anchor_when_not_requested(self):
+        """Test that a pair without the anchor is triangulated through it."""
+        from app.api.get_exchange_matrix import get_exchange_matrix
+
+        data = self._download({'USDEUR=X': 0.9, 'USDCHF=X': 0.8})
+        with patch('yfinance.download', return_value=data):
+            rates = get_exchange_matrix(['EUR', 'CHF'], anchor='USD')
+
+        assert np.isclose(rates['EURCHF'], 0.8 / 0.9)
+        assert rates['EUREUR'] == 1.0
+
+    def test_download_failure_keeps_identities(self):
+        """Test that a failed download leaves only identity rates."""
+        from app.api.get_exchange_matrix import get_exchange_matrix
+
+        with patch('yfinance.download', side_effect=Exception("API Error")):
+            rates = get_exchange_matrix(['USD', 'CHF'], anchor='USD')
+
+        assert rates == {'USDUSD': 1.0, 'USDCHF': None, 'CHFUSD': None, 'CHFCHF': 1.0}
+
+
+class TestLatestRateMatrixCache:
+    """Test the cached latest rate matrix used for all conversions."""
+
+    ROWS = [(1, 2, 0.8), (2, 1, 1.25), (1, 3, 0.9)]
+
+    def test_build_rate_matrix(self):
+        """Test that rates are placed by currency id with an identity diagonal."""
+        from app.database.cache.exchange_rates import build_rate_matrix
+
+        matrix, index = build_rate_matrix(self.ROWS)
+
+        assert matrix[index[1], index[2]] == 0.8
+        assert np.isnan(matrix[index[3], index[2]])
+        assert np.allclose(np.diag(matrix), 1.0)
+
+    def test_lookups_load_once(self):
+        """Test single and vectorized lookups and that the table is loaded once."""
+        from app.database.cache import exchange_rates as module
+
+        module.invalidate_exchange_rates()
+        with patch.object(module, 'fetch_all', return_value=self.ROWS) as fetch_all, \
+             patch.object(module, 'fetch_one', return_value=(3, None, 2.95)):
+            assert module.get_exchange_rate(1, 2) == 0.8
+            assert module.get_exchange_rate(3, 2) is None
+            assert module.get_exchange_rate(3, 2, default=1.0) == 1.0
+            assert module.get_exchange_rate(7, 7) == 1.0
+
+            rates = module.get_exchange_rates_to([1, 2, 3, 99], 2)
+            assert np.allclose(rates, [0.8, 1.0, 1.0, 1.0])
+
+            assert fetch_all.call_count == 1
+        module.invalidate_exchange_rates()
@@ -0,0 +1,140 @@
+"""
+Market data provider tests for Portfolio Analyzer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+END_DATE = '2024-06-28'
+
+
+@pytest.fixture
+def replay():
+    """Install a replay provider for the duration of a test."""
+    from app.api.providers import set_market_data_provider
+    from app.api.providers.replay_provider import ReplayProvider
+
+    provider = ReplayProvider(end_date=END_DATE, history_days=60, seed=7)
+    set_market_data_provider(provider)
+    yield provider
+    set_market_data_provider(None)
+
+
+class TestReplayProvider:
+    """Test the deterministic offline provider."""
+
+    def test_history_is_deterministic(self):
+        """Test that two providers with the same seed return identical bars."""
+        from app.api.providers.replay_provider import ReplayProvider
+
+        first = ReplayProvider(end_date=END_DATE, seed=1).history('AAPL', 30)
+        second = ReplayProvider(end_date=END_DATE, seed=1).history('AAPL', 30)
+        other_seed = ReplayProvider(end_date=END_DATE, seed=2).history('AAPL', 30)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert not np.allclose(first['Close'], other_seed['Close'])
+        assert first.index[-1] == pd.Timestamp(END_DATE)
+        assert (first['High'] >= first[['Open', 'Close']].max(axis=1)).all()
+        assert (first['Low'] <= first[['Open', 'Close']].min(axis=1)).all()
+
+    def test_download_is_grouped_by_ticker(self):
+        """Test the yfinance style (symbol, field) layout of download."""
+        from app.api.providers.replay_provider import ReplayProvider
+
+        data = ReplayProvider(end_date=END_DATE).download(['AAPL', 'MSFT'], 5, auto_adjust=False)
+
+        assert isinstance(data.columns, pd.MultiIndex)
+        assert set(data.columns.get_level_values(0)) == {'AAPL', 'MSFT'}
+        assert 'Adj Close' in data['AAPL'].columns
+        assert data.index.min() > pd.Timestamp(END_DATE) - pd.Timedelta(days=5)
+
+    def test_fx_crosses_are_consistent(self):
+        """Test that synthetic FX pairs triangulate exactly."""
+        from app.api.providers.replay_provider import ReplayProvider
+
+        provider = ReplayProvider(end_date=END_DATE)
+        usd_chf = provider.history('USDCHF=X', 10)['Close']
+        usd_eur = provider.history('USDEUR=X', 10)['Close']
+        eur_chf = provider.history('EURCHF=X', 10)['Close']
+
+        assert np.allclose(eur_chf, usd_chf / usd_eur)
+
+    def test_failure_injection(self):
+        """Test that failing symbols are dropped from downloads and raise on single requests."""
+        from app.api.providers.base import MarketDataError
+        from app.api.providers.replay_provider import ReplayProvider
+
+        provider = ReplayProvider(end_date=END_DATE, failing_symbols=['BAD'])
+        data = provider.download(['AAPL', 'BAD'], 5)
+
+        assert set(data.columns.get_level_values(0)) == {'AAPL'}
+        with pytest.raises(MarketDataError):
+            provider.history('BAD', 5)
+        with pytest.raises(MarketDataError):
+            provider.info('BAD')
+
+    def test_failure_rate_is_reproducible(self):
+        """Test that the same attempts fail for providers with the same seed."""
+        from app.api.providers.replay_provider import ReplayProvider, generate_symbols
+
+        symbols = generate_symbols(200)
+        runs = []
+        for _ in range(2):
+            provider = ReplayProvider(end_date=END_DATE, history_days=10, failure_rate=0.25, seed=3)
+            data = provider.download(symbols, 5)
+            runs.append(set(data.columns.get_level_values(0)))
+
+        assert runs[0] == runs[1]
+        assert 100 < len(runs[0]) < 200
+
+    def test_fixture_round_trip(self, tmp_path):
+        """Test that written CSV fixtures are replayed and take precedence over synthetic data."""
+        from app.api.providers.replay_provider import ReplayProvider, write_fixtures
+
+        rows = write_fixtures(str(tmp_path), ['AAPL', 'USDCHF=X'], days=20, end_date=END_DATE, seed=5)
+        provider = ReplayProvider(fixtures_dir=str(tmp_path), end_date=END_DATE, synthetic=False)
+
+        assert rows == 40
+        assert len(provider.history('AAPL', 60)) == 20
+        assert provider.info('AAPL')['longName'] == 'AAPL Synthetic Inc.'
+        assert provider.history('UNKNOWN', 5).empty
+        assert provider.info('UNKNOWN') == {}
+
+
+class TestProviderSelection:
+    """Test selecting the backend used by the app/api functions."""
+
+    def test_unknown_provider(self):
+        """Test that an unknown provider name is rejected."""
+        from app.api.providers import create_market_data_provider
+
+        with pytest.raises(ValueError):
+            create_market_data_provider('bloomberg')
+
+    def test_incomplete_provider(self):
+        """Test that a provider missing a method fails when it is created, not on first use."""
+        from app.api.providers.base import MarketDataProvider
+
+        class PricesOnly(MarketDataProvider):
+            def download(self, symbols, period_days, auto_adjust=True):
+                return None
+
+        with pytest.raises(TypeError):
+            PricesOnly()
+
+    def test_api_functions_use_active_provider(self, replay):
+        """Test that the fetch functions read from the installed provider."""
+        from app.api.get_eod_prices import get_eod_prices
+        from app.api.get_info import get_info
+        from app.api.get_exchange_matrix import get_exchange_matrix
+
+        prices = get_eod_prices(['AAPL', 'MSFT'])
+        close = replay.history('AAPL', 5)['Close'].iloc[-1]
+
+        assert prices['AAPL'][0] == pytest.approx(close)
+        assert prices['MSFT'][2] == END_DATE
+        assert get_info('AAPL')['category'] in ('Share', 'ETF')
+
+        rates = get_exchange_matrix(['USD', 'CHF', 'EUR'], anchor='USD')
+        assert rates['EURCHF'] == pytest.approx(rates['USDCHF'] / rates['USDEUR'])
@@ -0,0 +1,106 @@
+"""
+Portfolio risk and return analytics tests for Portfolio Analyzer.
+"""
+
+import warnings
+import numpy as np
+import pytest
+
+
+class TestRiskMetrics:
+    """Test the column-wise risk metrics."""
+
+    def test_drawdown_and_total_return(self):
+        """Test total return and max drawdown on a known series."""
+        from app.utils.risk_metrics import compute_risk_metrics
+
+        levels = np.array([[100.0], [120.0], [90.0], [110.0]])
+        metrics = compute_risk_metrics(levels)
+
+        assert metrics['total_return'][0] == pytest.approx(0.10)
+        assert metrics['max_drawdown'][0] == pytest.approx(-0.25)
+
+    def test_beta_and_correlation(self):
+        """Test that a series with twice the benchmark returns has beta 2 and correlation 1."""
+        from app.utils.risk_metrics import compute_risk_metrics
+
+        rng = np.random.default_rng(3)
+        benchmark_returns = rng.normal(0, 0.01, 250)
+        benchmark = 100 * np.cumprod(np.concatenate([[1.0], 1 + benchmark_returns]))
+        levered = 100 * np.cumprod(np.concatenate([[1.0], 1 + 2 * benchmark_returns]))
+
+        metrics = compute_risk_metrics(np.column_stack([levered, benchmark]), benchmark_column=1)
+
+        assert metrics['beta'][0] == pytest.approx(2.0)
+        assert metrics['beta'][1] == pytest.approx(1.0)
+        assert metrics['correlation'][0, 1] == pytest.approx(1.0)
+        assert metrics['volatility'][0] == pytest.approx(2 * metrics['volatility'][1])
+        assert metrics['volatility'][1] == pytest.approx(np.std(benchmark_returns, ddof=1) * np.sqrt(252))
+
+    def test_missing_values_use_shared_days(self):
+        """Test that NaN gaps are skipped and all-NaN columns give NaN without warnings."""
+        from app.utils.risk_metrics import compute_risk_metrics
+
+        levels = np.array([
+            [np.nan, 100.0, np.nan],
+            [100.0, 101.0, np.nan],
+            [101.0, 102.0, np.nan],
+            [102.0, 103.0, np.nan],
+        ])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            metrics = compute_risk_metrics(levels, benchmark_column=1)
+
+        assert metrics['total_return'][0] == pytest.approx(0.02)
+        assert np.isnan(metrics['volatility'][2])
+        assert np.isnan(metrics['correlation'][0, 2])
+
+
+class TestPortfolioAnalytics:
+    """Test the portfolio index and the analytics result."""
+
+    def test_late_holding_is_not_a_jump(self):
+        """Test that a holding priced only from day 2 on does not count as a gain."""
+        from app.database.tables.portfolio.get_portfolio_analytics import portfolio_value_index
+
+        position_values = np.array([
+            [100.0, np.nan],
+            [100.0, np.nan],
+            [110.0, 500.0],
+            [110.0, 550.0],
+        ])
+        index = portfolio_value_index(position_values)
+
+        np.testing.assert_allclose(index, [1.0, 1.0, 1.1, 1.1 * 660 / 610])
+
+    def test_result_shape(self):
+        """Test weights, per-holding metrics and the correlation matrix layout."""
+        from app.database.tables.portfolio.get_portfolio_analytics import compute_portfolio_analytics
+
+        holdings = [(1, 2.0, 1, 'AAA', 'Alpha'), (2, 1.0, 1, 'BBB', 'Beta')]
+        prices = np.array([[10.0, 20.0], [11.0, 19.0], [12.0, 22.0], [12.0, 20.0]])
+        benchmark = np.array([100.0, 102.0, 104.0, 103.0])
+
+        result = compute_portfolio_analytics(holdings, prices, benchmark_prices=benchmark)
+
+        assert [h['symbol'] for h in result['holdings']] == ['AAA', 'BBB']
+        assert result['holdings'][0]['weight'] == pytest.approx(24 / 44, abs=1e-4)
+        assert result['correlation']['symbols'] == ['AAA', 'BBB']
+        assert result['correlation']['matrix'][0][0] == 1.0
+        assert result['benchmark']['beta'] == 1.0
+        assert result['portfolio']['total_return'] == pytest.approx(0.1, abs=1e-4)
+        assert result['observations'] == 4
+
+    def test_five_hundred_holdings(self):
+        """Test that 10 years × 500 holdings, some listed later, are analysed (timed by benchmarks.run_benchmarks)."""
+        from app.database.tables.portfolio.get_portfolio_analytics import compute_portfolio_analytics
+
+        rng = np.random.default_rng(5)
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (2600, 500)), axis=0)
+        prices[:300, :50] = np.nan
+        holdings = [(b, 1.0, 1, f'S{b}', f'Security {b}') for b in range(500)]
+
+        result = compute_portfolio_analytics(holdings, prices, benchmark_prices=prices[:, 0])
+
+        assert len(result['correlation']['matrix']) == 500
+        assert result['holdings'][0]['beta'] == 1.0
@@ -0,0 +1,105 @@
+"""
+Portfolio allocation breakdown tests for Portfolio Analyzer.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+
+def _holding(portfolio_id, value, category='Stock', sector='technology', region='North America',
+             currency='USD', exchange='NASDAQ', country='United States'):
+    return {
+        'portfolioid': portfolio_id, 'value': value, 'bondcategoryname': category, 'sectorname': sector,
+        'region': region, 'currencycode': currency, 'exchangename': exchange, 'bondcountry': country,
+    }
+
+
+HOLDINGS = [
+    _holding(1, 300.0),
+    _holding(1, 100.0, category='ETF', sector=None, region=None, currency='CHF', exchange=None, country=None),
+    _holding(1, None, sector='energy'),
+    _holding(2, 50.0, currency='EUR', country='Germany'),
+]
+
+
+def _fake_fetch_all(query, args=None, dictionary=False):
+    return [(portfolio_id, 'USD') for portfolio_id in args if portfolio_id in (1, 2, 3)]
+
+
+def _fake_fetch_columns(query, args=None, dtypes=None):
+    from app.database.helpers.row_mapping import to_columns
+
+    columns = list(HOLDINGS[0])
+    rows = [tuple(row.values()) for row in HOLDINGS if row['portfolioid'] in args]
+    return to_columns(rows, columns, dtypes)
+
+
+class TestBreakdownEngine:
+    """Test the vectorized group-by over several portfolios and dimensions."""
+
+    def test_dimensions_from_one_load(self):
+        """Test that all dimensions come from one holdings query with fallback labels."""
+        from app.database.tables.portfolio import get_portfolio_breakdown as module
+
+        with patch.object(module, 'fetch_all', side_effect=_fake_fetch_all) as fetch_all, \
+             patch.object(module, 'fetch_columns', side_effect=_fake_fetch_columns) as fetch_columns:
+            breakdowns = module.get_portfolio_breakdowns([1, 2, 3, 99])
+
+        assert fetch_all.call_count == 1
+        assert fetch_columns.call_count == 1
+        assert set(breakdowns) == {1, 2, 3}
+
+        first = breakdowns[1]
+        assert first.total_value == 400.0
+        assert first.values('currency') == {'USD': 300.0, 'CHF': 100.0}
+        assert first.values('country') == {'United States': 300.0, 'Unknown': 100.0}
+        assert first.values('exchange') == {'NASDAQ': 300.0, 'Other': 100.0}
+        assert [item.label for item in first['category']] == ['Stock', 'ETF']
+        assert first['category'][0].percent == 75.0
+
+        assert breakdowns[2].values('country') == {'Germany': 50.0}
+        assert breakdowns[3].total_value == 0.0
+        assert breakdowns[3]['sector'] == []
+
+    def test_unknown_dimension(self):
+        """Test that an unknown dimension is rejected before querying."""
+        from app.database.tables.portfolio import get_portfolio_breakdown as module
+
+        with patch.object(module, 'fetch_all') as fetch_all, pytest.raises(ValueError):
+            module.get_portfolio_breakdowns([1], ['category', 'colour'])
+        fetch_all.assert_not_called()
+
+    def test_legacy_shares(self):
+        """Test the flat keys of the templates: lower-case sectors with zeros, positive regions only."""
+        from app.utils.breakdown import compute_breakdowns
+
+        labels = {
+            'sector': np.array(['technology', 'other'], dtype=object),
+            'region': np.array(['North America', 'Other'], dtype=object),
+        }
+        breakdown = compute_breakdowns([1], {1: 'USD'}, [1, 1], np.array([300.0, 100.0]), labels)[1]
+
+        sectors = breakdown.shares('sector', lower=True, include=['Technology', 'energy'])
+        assert sectors == {
+            'technology_value': 300.0, 'technology_percent': 75.0,
+            'other_value': 100.0, 'other_percent': 25.0,
+            'energy_value': 0.0, 'energy_percent': 0.0,
+        }
+        assert breakdown.shares('region', positive_only=True)['Other_percent'] == 25.0
+        assert breakdown.to_dict()['breakdowns']['region'][0] == {'label': 'North America', 'value': 300.0, 'percent': 75.0}
+
+    def test_many_holdings(self):
+        """Test that thousands of holdings across portfolios are grouped exactly."""
+        from app.utils.breakdown import compute_breakdowns
+
+        rng = np.random.default_rng(2)
+        portfolios = rng.integers(0, 20, 20000)
+        values = rng.uniform(0, 100, 20000)
+        sectors = np.array([f's{i}' for i in rng.integers(0, 11, 20000)], dtype=object)
+
+        breakdowns = compute_breakdowns(list(range(20)), {}, portfolios, values, {'sector': sectors})
+
+        expected = values[(portfolios == 7) & (sectors == 's3')].sum()
+        assert breakdowns[7].values('sector')['s3'] == pytest.approx(expected, abs=0.01)
+        assert breakdowns[7].total_value == pytest.approx(values[portfolios == 7].sum(), abs=0.01)
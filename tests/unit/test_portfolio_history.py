@@ -0,0 +1,73 @@
+"""
+Portfolio value history tests for Portfolio Analyzer.
+"""
+
+from datetime import date
+import numpy as np
+import pytest
+
+
+class TestPanels:
+    """Test the dense panel helpers."""
+
+    def test_build_panel_and_forward_fill(self):
+        """Test that rows are scattered into the panel and gaps carry the last value."""
+        from app.utils.timeseries import build_panel, forward_fill
+
+        rows = [(7, 1, 10.0), (7, 4, 12.0), (3, 0, 5.0), (9, 2, 1.0), (7, 9, 99.0)]
+        panel = build_panel(rows, {7: 0, 3: 1}, 5)
+        filled = forward_fill(panel)
+
+        np.testing.assert_array_equal(filled[:, 0], [np.nan, 10.0, 10.0, 10.0, 12.0])
+        np.testing.assert_array_equal(filled[:, 1], [5.0] * 5)
+        assert np.isnan(panel[2, 0])
+
+
+class TestValueHistory:
+    """Test the vectorized holdings × prices × FX alignment."""
+
+    def test_values_with_fx_and_fill(self):
+        """Test conversion by direct and inverted rates and the fill over missing days."""
+        from app.database.tables.portfolio.get_portfolio_history import compute_value_history
+
+        # Mon 2024-06-03 .. Fri 2024-06-07, origin on Fri 2024-05-31; CHF portfolio (id 1)
+        origin, start, end = date(2024, 5, 31), date(2024, 6, 3), date(2024, 6, 7)
+        holdings = [(10, 2.0, 1), (20, 1.0, 2), (30, 1.0, 3)]
+        prices = [(10, 0, 100.0), (10, 5, 110.0), (20, 5, 50.0), (30, 5, 10.0)]
+        fx = [(2, 1, 0, 0.9), (2, 1, 6, 0.8), (1, 3, 0, 2.0)]
+
+        dates, values = compute_value_history(holdings, prices, fx, 1, origin, start, end)
+
+        assert [str(d) for d in dates] == ['2024-06-03', '2024-06-04', '2024-06-05', '2024-06-06', '2024-06-07']
+        # Monday: only bond 10 priced (carried from Friday)
+        assert values[0] == pytest.approx(200.0)
+        # Wednesday: 220 + 50 × 0.9 + 10 × 0.5
+        assert values[2] == pytest.approx(220 + 45 + 5)
+        # Thursday: CHF rate changed to 0.8
+        assert values[3] == pytest.approx(220 + 40 + 5)
+
+    def test_no_prices_is_nan(self):
+        """Test that days before any price are NaN rather than 0."""
+        from app.database.tables.portfolio.get_portfolio_history import compute_value_history
+
+        _, values = compute_value_history([(1, 1.0, 1)], [], [], 1, date(2024, 6, 3), date(2024, 6, 3), date(2024, 6, 7))
+
+        assert np.isnan(values).all()
+
+    def test_ten_years_of_five_hundred_holdings(self):
+        """Test that 10 years × 500 holdings are aligned without gaps (timed by benchmarks.run_benchmarks)."""
+        from app.database.tables.portfolio.get_portfolio_history import compute_value_history
+
+        rng = np.random.default_rng(1)
+        origin, start, end = date(2014, 5, 18), date(2014, 6, 1), date(2024, 6, 1)
+        n_days = (end - origin).days + 1
+        days = np.flatnonzero(np.is_busday(np.datetime64(origin) + np.arange(n_days)))
+
+        holdings = [(b, 10.0, 1 + b % 5) for b in range(500)]
+        price_rows = [(b, int(d), float(p)) for b in range(500) for d, p in zip(days, rng.uniform(50, 150, len(days)))]
+        fx_rows = [(c, 1, int(d), 1.1) for c in range(2, 6) for d in days]
+
+        dates, values = compute_value_history(holdings, price_rows, fx_rows, 1, origin, start, end)
+
+        assert len(dates) == len(values) > 2500
+        assert not np.isnan(values).any()
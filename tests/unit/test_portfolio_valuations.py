@@ -0,0 +1,99 @@
+"""
+Batched portfolio valuation tests for Portfolio Analyzer.
+"""
+
+from unittest.mock import patch
+
+
+CATEGORIES = [
+    {'bondcategoryid': 1, 'bondcategoryname': 'Stock'},
+    {'bondcategoryid': 2, 'bondcategoryname': 'ETF'},
+]
+SECTORS = [
+    {'sectorname': 'technology'},
+    {'sectorname': 'energy'},
+]
+
+
+HOLDINGS = [
+    {'portfolioid': 1, 'value': 300.0, 'bondcategoryname': 'Stock', 'sectorname': 'technology', 'region': 'North America'},
+    {'portfolioid': 1, 'value': 100.0, 'bondcategoryname': 'ETF', 'sectorname': None, 'region': None},
+    {'portfolioid': 2, 'value': 50.0, 'bondcategoryname': 'Stock', 'sectorname': 'technology', 'region': 'Europe'},
+]
+
+
+def _fake_fetch_columns(query, args=None, dtypes=None):
+    from app.database.helpers.row_mapping import to_columns
+
+    columns = list(HOLDINGS[0])
+    rows = [tuple(row.values()) for row in HOLDINGS if row['portfolioid'] in args]
+    return to_columns(rows, columns, dtypes)
+
+
+def _fake_fetch_all(query, args=None, dictionary=False):
+    return [
+        {'portfolioid': portfolio_id, 'portfolioname': f'Portfolio {portfolio_id}', 'portfoliodescription': None,
+         'currencycode': 'USD', 'portfoliocurrencyid': portfolio_id}
+        for portfolio_id in args if portfolio_id in (1, 2, 3)
+    ]
+
+
+class TestPortfolioValuations:
+    """Test valuing the dashboard portfolios with the breakdown engine."""
+
+    def _valuations(self, portfolio_ids, base_currency=None, rates=None):
+        from app.database.tables.portfolio import get_portfolio_valuations as module
+        from app.database.tables.portfolio import get_portfolio_breakdown as breakdown_module
+
+        with patch.object(module, 'fetch_all', side_effect=_fake_fetch_all) as fetch_all, \
+             patch.object(breakdown_module, 'fetch_all') as breakdown_fetch_all, \
+             patch.object(breakdown_module, 'fetch_columns', side_effect=_fake_fetch_columns) as fetch_columns, \
+             patch.object(breakdown_module, 'get_categories', return_value=CATEGORIES), \
+             patch.object(breakdown_module, 'get_sectors', return_value=SECTORS), \
+             patch.object(module, 'currency_id_by_code', return_value=9), \
+             patch.object(module, 'get_exchange_rates_to', return_value=rates):
+            valuations = module.get_portfolio_valuations(portfolio_ids, base_currency)
+
+        # Metadata and holdings, each loaded once for all portfolios
+        assert fetch_all.call_count == 1
+        breakdown_fetch_all.assert_not_called()
+        assert fetch_columns.call_count == 1
+        return valuations
+
+    def test_totals_and_breakdowns_per_portfolio(self):
+        """Test that every portfolio gets its own totals, categories, sectors and regions."""
+        valuations = self._valuations([2, 99, 1, 3])
+
+        assert list(valuations) == [2, 1, 3]
+
+        first = valuations[1]
+        assert first['portfolioname'] == 'Portfolio 1'
+        assert first['total_value'] == 400.0
+        assert first['stock_value'] == 300.0
+        assert first['etf_value'] == 100.0
+        assert first['technology_value'] == 300.0
+        assert first['other_value'] == 100.0
+        assert first['energy_value'] == 0.0
+        assert first['North America_percent'] == 75.0
+        assert first['Other_value'] == 100.0
+        assert 'exchange_rate_to_base' not in first
+
+        assert valuations[2]['total_value'] == 50.0
+        assert valuations[2]['etf_value'] == 0
+
+    def test_empty_portfolio(self):
+        """Test that a portfolio without holdings is valued at zero with all sectors listed."""
+        empty = self._valuations([3])[3]
+
+        assert empty['total_value'] == 0.0
+        assert empty['stock_value'] == 0
+        assert empty['technology_value'] == 0.0
+        assert not any(key.startswith('North America') for key in empty)
+
+    def test_conversion_to_base_currency(self):
+        """Test that each portfolio is converted with the rate of its own currency."""
+        valuations = self._valuations([1, 2], base_currency='EUR', rates=[0.5, 2.0])
+
+        assert valuations[1]['exchange_rate_to_base'] == 0.5
+        assert valuations[1]['converted_value'] == 200.0
+        assert valuations[2]['converted_value'] == 100.0
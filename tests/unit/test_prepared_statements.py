@@ -0,0 +1,148 @@
+"""
+Prepared statement cache tests for Portfolio Analyzer.
+"""
+
+from unittest.mock import MagicMock, patch
+
+
+def _connection(connection_id=1):
+    """A mocked connection whose prepared cursors return one row."""
+    conn = MagicMock()
+    conn.raw_connection = conn
+    conn.connection_id = connection_id
+    conn.cursor.side_effect = lambda **kwargs: MagicMock(fetchall=MagicMock(return_value=[(1,)]))
+    return conn
+
+
+class TestStatementCache:
+    """Test preparing, reuse and eviction of cached statements."""
+
+    def test_statement_is_prepared_once(self):
+        """Test that equal statement text reuses the prepared cursor with the cached str object."""
+        from app.database.connection.statements import StatementCache
+
+        conn = _connection()
+        cache = StatementCache(4)
+        sql = "SELECT bondid FROM bond WHERE bondid = %s"
+
+        first = cache.get(conn, sql)
+        second = cache.get(conn, "".join(["SELECT bondid FROM bond ", "WHERE bondid = %s"]))
+        second.execute("ignored", (5,))
+
+        assert first is second
+        conn.cursor.assert_called_once_with(prepared=True, dictionary=False)
+        assert first._cursor.execute.call_args[0][0] is sql
+
+    def test_dictionary_cursors_are_separate(self):
+        """Test that tuple and dictionary rows use different prepared cursors."""
+        from app.database.connection.statements import StatementCache
+
+        conn = _connection()
+        cache = StatementCache(4)
+
+        assert cache.get(conn, "SELECT 1") is not cache.get(conn, "SELECT 1", dictionary=True)
+
+    def test_lru_eviction_deallocates(self):
+        """Test that the least recently used statement is closed on the server when the cache is full."""
+        from app.database.connection.statements import StatementCache
+
+        conn = _connection()
+        cache = StatementCache(2)
+        oldest = cache.get(conn, "SELECT 1")
+        cache.get(conn, "SELECT 2")
+        cache.get(conn, "SELECT 3")
+
+        assert len(cache) == 2
+        oldest._cursor.close.assert_called_once()
+
+    def test_close_keeps_statement_prepared(self):
+        """Test that ending the use of a statement does not deallocate it."""
+        from app.database.connection.statements import StatementCache
+
+        conn = _connection()
+        statement = StatementCache(2).get(conn, "SELECT 1")
+        statement.close()
+
+        statement._cursor.close.assert_not_called()
+
+    def test_reconnect_replaces_cache(self):
+        """Test that a new server session starts with an empty cache."""
+        from app.database.connection.statements import get_statement_cache, drop_statement_cache
+
+        conn = _connection(connection_id=1)
+        cache = get_statement_cache(conn)
+        cache.get(conn, "SELECT 1")
+
+        assert get_statement_cache(conn) is cache
+        conn.connection_id = 2
+        assert len(get_statement_cache(conn)) == 0
+        drop_statement_cache(conn)
+
+
+class TestPreparedHelpers:
+    """Test prepared execution through the helpers."""
+
+    def test_fetch_all_prepared_in_unit_of_work(self):
+        """Test that repeated prepared queries of a request prepare once on the shared connection."""
+        from app.database.connection.unit_of_work import unit_of_work
+        from app.database.connection.statements import drop_statement_cache
+        from app.database.helpers import fetch_all as module
+
+        conn = _connection()
+        with patch('app.database.connection.unit_of_work.get_db_connection', return_value=conn), \
+             patch.object(module, 'DB_PREPARED_STATEMENTS', True):
+            with unit_of_work():
+                assert module.fetch_all("SELECT 1", prepared=True) == [(1,)]
+                assert module.fetch_all("SELECT 1", prepared=True) == [(1,)]
+
+        conn.cursor.assert_called_once_with(prepared=True, dictionary=False)
+        drop_statement_cache(conn)
+
+    def test_prepared_can_be_disabled(self):
+        """Test that DB_PREPARED_STATEMENTS=false sends the query as text."""
+        from app.database.helpers import fetch_one as module
+
+        conn = _connection()
+        conn.cursor.side_effect = None
+        conn.cursor.return_value.fetchone.return_value = (1,)
+        with patch('app.database.connection.cursor.get_db_connection', return_value=conn), \
+             patch.object(module, 'DB_PREPARED_STATEMENTS', False):
+            assert module.fetch_one("SELECT 1", prepared=True) == (1,)
+
+        conn.cursor.assert_called_once_with(dictionary=False)
+
+
+class TestPoolSessionReset:
+    """Test how returned connections keep or drop their statements."""
+
+    def _checkout(self, reset_session, in_transaction=False):
+        from app.database.connection.pool import MonitoredPool
+
+        pooled = MagicMock()
+        pooled.in_transaction = in_transaction
+        pool = MagicMock(pool_size=1, reset_session=reset_session)
+        pool.get_connection.return_value = pooled
+        return MonitoredPool(pool, 0.01).get_connection(), pooled
+
+    def test_reset_session_drops_statements(self):
+        """Test that statements are deallocated before the pool resets the session."""
+        from app.database.connection.statements import get_statement_cache
+
+        conn, pooled = self._checkout(reset_session=True)
+        statement = get_statement_cache(conn).get(conn, "SELECT 1")
+        conn.close()
+
+        statement._cursor.close.assert_called_once()
+        pooled.close.assert_called_once()
+
+    def test_kept_session_rolls_back_open_transaction(self):
+        """Test that without a session reset an open transaction is not handed to the next checkout."""
+        from app.database.connection.statements import get_statement_cache, drop_statement_cache
+
+        conn, pooled = self._checkout(reset_session=False, in_transaction=True)
+        statement = get_statement_cache(conn).get(conn, "SELECT 1")
+        conn.close()
+
+        pooled.rollback.assert_called_once()
+        statement._cursor.close.assert_not_called()
+        drop_statement_cache(conn)
@@ -0,0 +1,163 @@
+"""
+Query result cache tests for Portfolio Analyzer.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def query_cache():
+    """Provide the query cache module with a fresh memory backend and a mocked version."""
+    from app.database.cache import query_cache as module
+
+    module.set_query_cache_backend(module.MemoryBackend(100))
+    with patch.object(module, 'fetch_one', return_value=(1, 0)) as fetch_one, \
+         patch.object(module, 'QUERY_CACHE_ENABLED', True):
+        yield module, fetch_one
+    module.set_query_cache_backend(None)
+
+
+def _counting_query(module):
+    """A cached function that records its calls."""
+    calls = []
+
+    @module.cached_query
+    def get_values(portfolio_id, base_currency='USD'):
+        calls.append((portfolio_id, base_currency))
+        return {'portfolioid': portfolio_id, 'currency': base_currency, 'bonds': [{'quantity': 1.0}]}
+
+    return get_values, calls
+
+
+class TestQueryCache:
+    """Test keys, copies, invalidation and eviction of the query cache."""
+
+    def test_repeated_calls_hit_the_cache(self, query_cache):
+        """Test that equal arguments, with defaults applied, are computed once."""
+        module, _ = query_cache
+        get_values, calls = _counting_query(module)
+
+        get_values(1)
+        get_values(1, 'USD')
+        get_values(portfolio_id=1)
+        get_values(1, 'CHF')
+
+        assert calls == [(1, 'USD'), (1, 'CHF')]
+
+    def test_results_are_copies(self, query_cache):
+        """Test that modifying a result does not modify the cached entry."""
+        module, _ = query_cache
+        get_values, _ = _counting_query(module)
+
+        get_values(1)['bonds'][0]['quantity'] = 99.0
+
+        assert get_values(1)['bonds'][0]['quantity'] == 1.0
+
+    def test_version_change_misses(self, query_cache):
+        """Test that a new data version from another worker is picked up after the check interval."""
+        module, fetch_one = query_cache
+        get_values, calls = _counting_query(module)
+
+        with patch.object(module, 'QUERY_CACHE_CHECK_SECONDS', 0):
+            get_values(1)
+            get_values(1)
+            fetch_one.return_value = (2, 0)
+            get_values(1)
+
+        assert len(calls) == 2
+
+    def test_bump_invalidates_local_version(self, query_cache):
+        """Test that a bump in this worker re-reads the version immediately."""
+        module, fetch_one = query_cache
+        get_values, calls = _counting_query(module)
+
+        get_values(1)
+        with patch('app.database.helpers.execute_change_query.execute_change_query') as execute:
+            fetch_one.return_value = (2, 0)
+            module.bump_portfolio_data_version()
+            execute.assert_called_once()
+        get_values(1)
+
+        assert len(calls) == 2
+
+    def test_bump_in_transaction(self, query_cache):
+        """Test that a cursor runs the bump inside the caller's transaction."""
+        module, _ = query_cache
+        cursor = MagicMock()
+
+        module.bump_portfolio_data_version(cursor)
+
+        assert 'portfoliodata_version' in cursor.execute.call_args[0][0]
+
+    def test_bump_invalidates_after_commit(self, query_cache):
+        """Test that a bump inside a unit of work keeps the local version until the commit."""
+        from app.database.connection.unit_of_work import unit_of_work
+
+        module, _ = query_cache
+        module.get_data_version()
+        with patch('app.database.helpers.execute_change_query.execute_change_query'), \
+             patch.object(module, 'invalidate_data_version') as invalidate, \
+             patch('app.database.connection.unit_of_work.get_db_connection'):
+            with unit_of_work():
+                module.bump_portfolio_data_version()
+                invalidate.assert_not_called()
+            invalidate.assert_called_once()
+
+            with pytest.raises(RuntimeError):
+                with unit_of_work():
+                    module.bump_portfolio_data_version()
+                    raise RuntimeError("failed")
+            invalidate.assert_called_once()
+
+    def test_failed_bump_raises(self, query_cache):
+        """Test that a failed bump reaches the caller so its changes roll back."""
+        module, _ = query_cache
+        cursor = MagicMock()
+        cursor.execute.side_effect = RuntimeError("lock wait timeout")
+
+        with pytest.raises(RuntimeError):
+            module.bump_portfolio_data_version(cursor)
+
+    def test_lru_eviction(self):
+        """Test that the memory backend keeps the most recently used entries."""
+        from app.database.cache.query_cache import MemoryBackend
+
+        backend = MemoryBackend(2)
+        backend.set('a', b'1')
+        backend.set('b', b'2')
+        backend.get('a')
+        backend.set('c', b'3')
+
+        assert len(backend) == 2
+        assert backend.get('b') is None
+        assert backend.get('a') == b'1'
+
+    def test_unknown_version_bypasses_cache(self, query_cache):
+        """Test that nothing is cached while the version cannot be read."""
+        module, fetch_one = query_cache
+        get_values, calls = _counting_query(module)
+        fetch_one.side_effect = Exception("Unknown column 'portfoliodata_version'")
+
+        get_values(1)
+        get_values(1)
+
+        assert len(calls) == 2
+
+    def test_backend_error_falls_back(self, query_cache):
+        """Test that a failing shared backend does not fail the query."""
+        module, _ = query_cache
+        get_values, calls = _counting_query(module)
+        backend = MagicMock()
+        backend.get.side_effect = ConnectionError("redis down")
+        module.set_query_cache_backend(backend)
+
+        assert get_values(1)['portfolioid'] == 1
+        assert module.get_query_cache_stats()['errors'] >= 1
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        from app.database.cache.query_cache import create_query_cache_backend
+
+        with pytest.raises(ValueError):
+            create_query_cache_backend('memcached')
@@ -0,0 +1,135 @@
+"""
+SQL instrumentation tests for Portfolio Analyzer.
+"""
+
+from unittest.mock import patch
+
+
+class FakeCursor:
+    """Minimal stand-in for a mysql.connector cursor."""
+
+    rowcount = 2
+
+    def __init__(self):
+        self.executed = []
+        self.closed = False
+
+    def execute(self, operation, params=None):
+        self.executed.append((operation, params))
+
+    def executemany(self, operation, seq_params):
+        self.executed.append((operation, list(seq_params)))
+
+    def fetchall(self):
+        return [(1,), (2,)]
+
+    def close(self):
+        self.closed = True
+
+
+class TestFingerprint:
+    """Test SQL normalization."""
+
+    def test_values_are_replaced(self):
+        """Test that literals, placeholders and whitespace do not change the fingerprint."""
+        from app.database.connection.instrumentation import fingerprint
+
+        first = fingerprint("SELECT * FROM bond  WHERE bondid = 5 AND bondsymbol = 'AAPL'")
+        second = fingerprint("SELECT *\n FROM bond WHERE bondid = %s AND bondsymbol = %s -- lookup")
+
+        assert first == second == "SELECT * FROM bond WHERE bondid = ? AND bondsymbol = ?"
+
+    def test_lists_collapse(self):
+        """Test that IN lists and multi-row VALUES of any length share one fingerprint."""
+        from app.database.connection.instrumentation import fingerprint
+
+        assert fingerprint("SELECT 1 FROM p WHERE id IN (%s, %s, %s)") == fingerprint("SELECT 1 FROM p WHERE id IN (7)")
+        assert fingerprint("INSERT INTO t (a, b) VALUES (1, 2), (3, 4);") == "INSERT INTO t (a, b) VALUES (?, ?)"
+
+    def test_identifiers_with_digits_are_kept(self):
+        """Test that numbers inside identifiers are not treated as literals."""
+        from app.database.connection.instrumentation import fingerprint
+
+        assert fingerprint("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+class TestInstrumentedCursor:
+    """Test statement recording through the cursor wrapper."""
+
+    def test_statements_are_recorded(self):
+        """Test counts per fingerprint and that results pass through."""
+        from app.database.connection.instrumentation import instrument, track_queries
+
+        fake = FakeCursor()
+        with track_queries() as stats:
+            cursor = instrument(fake)
+            for bond_id in (1, 2, 3):
+                cursor.execute("SELECT bondrate FROM bond_latest WHERE bondid = %s", (bond_id,))
+                assert cursor.fetchall() == [(1,), (2,)]
+            cursor.executemany("INSERT INTO t (a) VALUES (%s)", [(1,), (2,)])
+            cursor.close()
+
+        assert fake.closed
+        assert stats.count == 4
+        assert stats.top(1)[0][:2] == ("SELECT bondrate FROM bond_latest WHERE bondid = ?", 3)
+        assert cursor.rowcount == 2
+
+    def test_untracked_statements_are_ignored(self):
+        """Test that the wrapper works without an active request."""
+        from app.database.connection.instrumentation import instrument, current_stats
+
+        cursor = instrument(FakeCursor())
+        cursor.execute("SELECT 1")
+        cursor.close()
+
+        assert current_stats() is None
+
+    def test_slow_statement_is_logged(self):
+        """Test that statements over the threshold go to the slow query log."""
+        from app.database.connection import instrumentation
+
+        with patch.object(instrumentation, 'SLOW_QUERY_MS', 0), \
+             patch.object(instrumentation.slow_query_logger, 'warning') as warning:
+            cursor = instrumentation.instrument(FakeCursor())
+            cursor.execute("SELECT * FROM bonddata WHERE bondid = 1")
+            cursor.close()
+
+        warning.assert_called_once()
+        assert "SELECT * FROM bonddata WHERE bondid = ?" in warning.call_args[0][0]
+
+
+class TestServerTiming:
+    """Test the per-request response header."""
+
+    def test_header_format(self):
+        """Test the Server-Timing metric for a request."""
+        from app.database.connection.instrumentation import QueryStats, server_timing_header
+
+        stats = QueryStats()
+        stats.record("SELECT 1", 1.0)
+        stats.record("SELECT 2", 2.5)
+
+        assert server_timing_header(stats) == 'db;dur=3.5;desc="2 queries"'
+
+    def test_header_added_to_responses(self):
+        """Test that every request gets its own statement totals."""
+        from flask import Flask
+        from app.database.connection.instrumentation import init_query_instrumentation, instrument
+
+        app = Flask(__name__)
+        init_query_instrumentation(app)
+
+        @app.route('/two')
+        def two_queries():
+            cursor = instrument(FakeCursor())
+            cursor.execute("SELECT 1")
+            cursor.execute("SELECT 2")
+            cursor.close()
+            return 'ok'
+
+        client = app.test_client()
+        first = client.get('/two')
+        second = client.get('/two')
+
+        assert 'desc="2 queries"' in first.headers['Server-Timing']
+        assert 'desc="2 queries"' in second.headers['Server-Timing']
@@ -0,0 +1,118 @@
+"""
+Reference data cache tests for Portfolio Analyzer.
+"""
+
+import pytest
+from unittest.mock import patch
+
+
+def _fake_fetch_all(query, args=None, dictionary=False):
+    if 'FROM currency' in query:
+        return [
+            {'currencyid': 1, 'currencycode': 'USD', 'currencyname': 'US Dollar'},
+            {'currencyid': 2, 'currencycode': 'CHF', 'currencyname': 'Swiss Franc'},
+        ]
+    if 'FROM bondcategory' in query:
+        return [{'bondcategoryid': 1, 'bondcategoryname': 'Stock'}]
+    if 'FROM sector' in query:
+        return [{'sectorid': 1, 'sectorname': 'technology', 'sectordisplayname': 'Technology'}]
+    if 'FROM exchange' in query:
+        return [{'exchangeid': 1, 'exchangename': 'NASDAQ', 'region': 'North America', 'regionid': 1}]
+    if 'FROM region' in query:
+        return [{'regionid': 1, 'region': 'North America'}]
+    return []
+
+
+@pytest.fixture
+def reference_data():
+    """Provide the reference data module with mocked queries and an empty cache."""
+    from app.database.cache import reference_data as module
+
+    module.invalidate_reference_data()
+    with patch.object(module, 'fetch_all', side_effect=_fake_fetch_all) as fetch_all, \
+         patch.object(module, 'fetch_one', return_value=(0,)) as fetch_one:
+        yield module, fetch_all, fetch_one
+    module.invalidate_reference_data()
+
+
+class TestReferenceDataCache:
+    """Test lookups and invalidation of the reference data cache."""
+
+    def test_lookups(self, reference_data):
+        """Test currency lookups and list shapes used by the views."""
+        module, _, _ = reference_data
+
+        assert module.currency_id_by_code('CHF') == 2
+        assert module.currency_code_by_id(1) == 'USD'
+        assert module.currency_id_by_code('XXX') is None
+        assert module.get_currencies()[0]['id'] == 1
+        assert module.get_sectors()[0]['sectordisplayname'] == 'Technology'
+        assert module.get_exchanges()[0]['exchangename'] == 'NASDAQ'
+
+    def test_tables_loaded_once(self, reference_data):
+        """Test that repeated lookups within the check interval do not query again."""
+        module, fetch_all, fetch_one = reference_data
+
+        for _ in range(10):
+            module.currency_id_by_code('USD')
+            module.get_categories()
+
+        assert fetch_all.call_count == 5
+        assert fetch_one.call_count == 1
+
+    def test_returned_rows_are_copies(self, reference_data):
+        """Test that callers cannot modify the cached rows."""
+        module, _, _ = reference_data
+
+        module.get_currencies()[0]['currencycode'] = 'EUR'
+
+        assert module.get_currencies()[0]['currencycode'] == 'USD'
+
+    def test_version_change_reloads(self, reference_data):
+        """Test that a changed shared version reloads the tables after the check interval."""
+        module, fetch_all, fetch_one = reference_data
+
+        with patch.object(module, 'REFERENCE_DATA_CHECK_SECONDS', 0):
+            module.get_currencies()
+            module.get_currencies()
+            assert fetch_all.call_count == 5
+
+            fetch_one.return_value = (1,)
+            module.get_currencies()
+            assert fetch_all.call_count == 10
+
+    def test_bump_invalidates_local_cache(self, reference_data):
+        """Test that bumping the version drops the local snapshot immediately."""
+        module, fetch_all, _ = reference_data
+
+        module.get_currencies()
+        with patch.object(module, 'execute_change_query') as execute:
+            module.bump_reference_data_version()
+            execute.assert_called_once()
+        module.get_currencies()
+
+        assert fetch_all.call_count == 10
+
+    def test_bump_invalidates_after_commit(self, reference_data):
+        """Test that inside a unit of work the snapshot is kept until the bump is committed."""
+        from app.database.connection.unit_of_work import unit_of_work
+
+        module, fetch_all, _ = reference_data
+
+        module.get_currencies()
+        with patch.object(module, 'execute_change_query'), \
+             patch('app.database.connection.unit_of_work.get_db_connection'):
+            with pytest.raises(RuntimeError):
+                with unit_of_work():
+                    module.bump_reference_data_version()
+                    raise RuntimeError("failed")
+            module.get_currencies()
+            assert fetch_all.call_count == 5
+
+            with unit_of_work():
+                module.bump_reference_data_version()
+                module.get_currencies()
+                assert fetch_all.call_count == 5
+            module.get_currencies()
+
+        assert fetch_all.call_count == 10
@@ -0,0 +1,124 @@
+"""
+Row mapping tests for Portfolio Analyzer.
+"""
+
+import pickle
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@dataclass(slots=True)
+class Holding:
+    bondid: int
+    bondsymbol: str
+    bondrate: Optional[float]
+    quantity: float
+    bonddatalogtime: Optional[date]
+    exchange_rate_to_base: Optional[float] = None
+
+
+COLUMNS = ['bondid', 'bondsymbol', 'bondrate', 'quantity', 'bonddatalogtime']
+
+
+class TestMapRows:
+    """Test decoding result tuples into slotted dataclasses."""
+
+    def test_native_types_and_nulls(self):
+        """Test that DECIMAL values become float and NULL stays None."""
+        from app.database.helpers.row_mapping import map_rows
+
+        rows = map_rows([
+            (1, 'AAPL', Decimal('187.12500'), Decimal('3.00000'), date(2024, 5, 2)),
+            (2, 'NEW', None, Decimal('1'), None),
+        ], COLUMNS, Holding)
+
+        assert rows[0].bondrate == 187.125 and type(rows[0].bondrate) is float
+        assert type(rows[0].quantity) is float
+        assert rows[1].bondrate is None
+        assert rows[1].bonddatalogtime is None
+        assert rows[0].exchange_rate_to_base is None
+        assert not hasattr(rows[0], '__dict__')
+
+    def test_column_order_is_free(self):
+        """Test that columns are matched to fields by name."""
+        from app.database.helpers.row_mapping import map_rows
+
+        row = map_rows([(Decimal('2'), date(2024, 1, 2), 'MSFT', Decimal('5'), 7)],
+                       ['quantity', 'bonddatalogtime', 'bondsymbol', 'bondrate', 'bondid'], Holding)[0]
+
+        assert (row.bondid, row.bondsymbol, row.bondrate, row.quantity) == (7, 'MSFT', 5.0, 2.0)
+
+    def test_column_mismatch(self):
+        """Test that unknown columns and missing fields without default are rejected."""
+        from app.database.helpers.row_mapping import map_rows
+
+        with pytest.raises(ValueError):
+            map_rows([], COLUMNS + ['colour'], Holding)
+        with pytest.raises(ValueError):
+            map_rows([], ['bondid', 'bondsymbol'], Holding)
+
+    def test_rows_pickle(self):
+        """Test that rows survive the query result cache."""
+        from app.database.helpers.row_mapping import map_rows
+
+        row = map_rows([(1, 'AAPL', Decimal('1.5'), Decimal('2'), None)], COLUMNS, Holding)[0]
+
+        assert pickle.loads(pickle.dumps(row, protocol=pickle.HIGHEST_PROTOCOL)) == row
+
+
+class TestToColumns:
+    """Test decoding result tuples into NumPy columns."""
+
+    def test_columns(self):
+        """Test float columns with NaN for NULL, int columns and object columns with None."""
+        from app.database.helpers.row_mapping import to_columns
+
+        columns = to_columns(
+            [(1, Decimal('10.5'), 'Stock'), (2, None, None)],
+            ['portfolioid', 'value', 'bondcategoryname'],
+            dtypes={'portfolioid': int, 'value': float}
+        )
+
+        assert columns['portfolioid'].dtype == np.int64
+        assert columns['value'][0] == 10.5 and np.isnan(columns['value'][1])
+        assert columns['bondcategoryname'].dtype == object
+        assert columns['bondcategoryname'][1] is None
+
+    def test_empty_result(self):
+        """Test that an empty result gives empty arrays."""
+        from app.database.helpers.row_mapping import to_columns
+
+        columns = to_columns([], ['portfolioid', 'value'], dtypes={'value': float})
+
+        assert len(columns['portfolioid']) == 0 and columns['value'].dtype == np.float64
+
+    def test_null_in_int_column(self):
+        """Test that NULL cannot be stored in an int column."""
+        from app.database.helpers.row_mapping import to_columns
+
+        with pytest.raises(ValueError):
+            to_columns([(None,)], ['portfolioid'], dtypes={'portfolioid': int})
+
+
+class TestFetchRows:
+    """Test the fetch_rows helper."""
+
+    def test_reads_tuples(self):
+        """Test that rows are read with a tuple cursor and named by the result description."""
+        from app.database.helpers import fetch_rows as module
+
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [(1, 'AAPL', Decimal('1.25'), Decimal('4'), None)]
+        cursor.description = [(name,) for name in COLUMNS]
+        with patch('app.database.connection.cursor.get_db_connection', return_value=conn):
+            rows = module.fetch_rows("SELECT ...", Holding, (1,))
+
+        conn.cursor.assert_called_once_with(dictionary=False)
+        assert rows == [Holding(1, 'AAPL', 1.25, 4.0, None)]
@@ -0,0 +1,59 @@
+"""
+Scheduler leader election tests for Portfolio Analyzer.
+"""
+
+from unittest.mock import patch, MagicMock
+
+
+class FakeLease:
+    """In-memory stand-in for the lease columns of the status row."""
+
+    def __init__(self):
+        self.owner = None
+        self.expired = False
+
+    def acquire(self, owner, ttl_seconds):
+        if self.owner is None or self.owner == owner or self.expired:
+            self.owner = owner
+            self.expired = False
+        return self.owner == owner
+
+
+class TestSchedulerLeader:
+    """Test that only the lease holder runs scheduled jobs."""
+
+    def test_single_leader(self):
+        """Test that a second worker is refused while the lease is held and takes over once it expires."""
+        from app.utils import scheduler_leader
+
+        lease = FakeLease()
+        job = MagicMock()
+        with patch.object(scheduler_leader, 'acquire_scheduler_lease', side_effect=lease.acquire):
+            with patch.object(scheduler_leader, 'get_worker_id', return_value='web-1:10:a'):
+                assert scheduler_leader.run_as_leader(job, 'job') is True
+                assert scheduler_leader.run_as_leader(job, 'job') is True
+
+            with patch.object(scheduler_leader, 'get_worker_id', return_value='web-1:11:b'):
+                assert scheduler_leader.run_as_leader(job, 'job') is False
+                lease.expired = True
+                assert scheduler_leader.run_as_leader(job, 'job') is True
+
+        assert job.call_count == 3
+
+    def test_database_error_means_not_leader(self):
+        """Test that a worker without database access never runs the jobs."""
+        from app.utils import scheduler_leader
+
+        job = MagicMock()
+        with patch.object(scheduler_leader, 'acquire_scheduler_lease', side_effect=Exception("no database")):
+            assert scheduler_leader.run_as_leader(job, 'job') is False
+            scheduler_leader.renew_scheduler_lease()
+
+        job.assert_not_called()
+
+    def test_worker_ids_differ_per_process(self):
+        """Test that the worker id contains the process id."""
+        import os
+        from app.utils.scheduler_leader import get_worker_id
+
+        assert f":{os.getpid()}:" in get_worker_id()
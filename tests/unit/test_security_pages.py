@@ -0,0 +1,114 @@
+"""
+Security overview pagination tests for Portfolio Analyzer.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from unittest.mock import patch
+
+
+def _security(bondid, symbol, rate=None, logtime=None):
+    from app.database.tables.bond.get_bonds_page import SecurityRow
+    return SecurityRow(
+        bondid=bondid, bondsymbol=symbol, bondname=f"{symbol} Inc", bonddescription=None,
+        bondcountry=None, bondexchangeid=None, bondwebsite=None, bondindustry=None,
+        bondsectorid=None, bondcategoryid=1, bondcurrencyid=1, bondcategoryname='Stock',
+        bondrate=rate, bondvolume=None, bonddatalogtime=logtime, currencycode='USD',
+        region=None, sectorname=None, sectordisplayname=None,
+    )
+
+
+class TestCursor:
+    """Test the opaque keyset position passed between pages."""
+
+    def test_round_trip(self):
+        """Test that every sort key decodes to the value and bondid it was encoded from."""
+        from app.database.tables.bond.get_bonds_page import encode_cursor, decode_cursor
+
+        row = _security(7, 'AAPL', rate=187.125, logtime=date(2024, 5, 2))
+
+        assert decode_cursor(encode_cursor(row, 'symbol'), 'symbol') == ('AAPL', 7)
+        assert decode_cursor(encode_cursor(row, 'name'), 'name') == ('AAPL Inc', 7)
+        assert decode_cursor(encode_cursor(row, 'price'), 'price') == (Decimal('187.125'), 7)
+        assert decode_cursor(encode_cursor(row, 'date'), 'date') == (date(2024, 5, 2), 7)
+        assert decode_cursor(encode_cursor(_security(8, 'NEW'), 'price'), 'price') == (None, 8)
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors and cursors of another sort key are rejected."""
+        from app.database.tables.bond.get_bonds_page import encode_cursor, decode_cursor
+
+        with pytest.raises(ValueError):
+            decode_cursor('not a cursor', 'name')
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(_security(1, 'AAPL', rate=1.5), 'price'), 'name')
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(_security(1, 'AAPL'), 'price'), 'name')
+
+
+class TestGetBondsPage:
+    """Test the keyset queries of the security listing."""
+
+    def _page(self, rows, **kwargs):
+        import app.database.tables.bond.get_bonds_page as module
+
+        with patch.object(module, 'fetch_rows', return_value=rows) as fetch_rows:
+            result = module.get_bonds_page(**kwargs)
+        query, _, params = fetch_rows.call_args[0]
+        return result, ' '.join(query.split()), params
+
+    def test_first_page(self):
+        """Test that one row more than the page is read to find out whether another page follows."""
+        rows = [_security(i, f"S{i}") for i in range(1, 4)]
+
+        (page, next_cursor), query, params = self._page(rows, limit=2, sort='symbol', category_filter='Stock')
+
+        assert [row.bondid for row in page] == [1, 2]
+        assert next_cursor is not None
+        assert 'ORDER BY b.bondsymbol ASC, b.bondid ASC' in query
+        assert 'bc.bondcategoryname = %s' in query
+        assert 'OFFSET' not in query
+        assert params == ['Stock', 3]
+
+    def test_last_page(self):
+        """Test that a short page has no next cursor."""
+        (page, next_cursor), _, _ = self._page([_security(1, 'AAPL')], limit=2)
+
+        assert len(page) == 1
+        assert next_cursor is None
+
+    def test_continues_after_cursor(self):
+        """Test that a page continues after the position of the previous page's last row."""
+        from app.database.tables.bond.get_bonds_page import encode_cursor
+
+        after = encode_cursor(_security(5, 'MSFT'), 'name')
+
+        _, query, params = self._page([], sort='name', descending=True, after=after, limit=10, search='soft')
+
+        assert '(b.bondname < %s OR (b.bondname = %s AND b.bondid < %s))' in query
+        assert 'ORDER BY b.bondname DESC, b.bondid DESC' in query
+        assert params == ['%soft%', '%soft%', 'MSFT Inc', 'MSFT Inc', 5, 11]
+
+    def test_nullable_key_lists_missing_values_last(self):
+        """Test that securities without a price follow all priced ones in both directions."""
+        from app.database.tables.bond.get_bonds_page import encode_cursor
+
+        priced = encode_cursor(_security(3, 'AAPL', rate=10.5), 'price')
+        unpriced = encode_cursor(_security(9, 'NEW'), 'price')
+
+        _, query, params = self._page([], sort='price', after=priced)
+        assert 'ORDER BY bd.bondrate IS NULL, bd.bondrate ASC, b.bondid ASC' in query
+        assert '(bd.bondrate IS NULL OR bd.bondrate > %s OR (bd.bondrate = %s AND b.bondid > %s))' in query
+        assert params[:3] == [Decimal('10.5'), Decimal('10.5'), 3]
+
+        _, query, params = self._page([], sort='price', after=unpriced)
+        assert '(bd.bondrate IS NULL AND b.bondid > %s)' in query
+        assert params[:1] == [9]
+
+    def test_unknown_sort_key(self):
+        """Test that only the listed sort keys reach the query."""
+        from app.database.tables.bond.get_bonds_page import get_bonds_page
+
+        with pytest.raises(ValueError):
+            get_bonds_page(sort='bondname; DROP TABLE bond')
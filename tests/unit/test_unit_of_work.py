@@ -0,0 +1,250 @@
+"""
+Unit of work tests for Portfolio Analyzer.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+class FakePool:
+    """Hands out mocked connections and records every checkout."""
+
+    def __init__(self):
+        self.connections = []
+        self.commit_error = None
+
+    def get_connection(self):
+        conn = MagicMock()
+        conn.cursor.return_value.fetchone.return_value = (1,)
+        conn.commit.side_effect = self.commit_error
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.fixture
+def pool():
+    """Route all helper connections to a FakePool."""
+    fake = FakePool()
+    with patch('app.database.connection.unit_of_work.get_db_connection', side_effect=fake.get_connection), \
+         patch('app.database.connection.cursor.get_db_connection', side_effect=fake.get_connection), \
+         patch('app.database.helpers.execute_change_query.get_db_connection', side_effect=fake.get_connection):
+        yield fake
+
+
+class TestUnitOfWork:
+    """Test connection reuse, commit and rollback of a unit of work."""
+
+    def test_helpers_share_one_connection(self, pool):
+        """Test that all statements of a block use one connection committed once at the end."""
+        from app.database.connection.unit_of_work import unit_of_work
+        from app.database.helpers.fetch_one import fetch_one
+        from app.database.helpers.fetch_all import fetch_all
+        from app.database.helpers.execute_change_query import execute_change_query
+
+        with unit_of_work():
+            fetch_one("SELECT 1")
+            fetch_all("SELECT 2")
+            execute_change_query("UPDATE status SET securities = NULL WHERE id = 1")
+            assert pool.connections[0].commit.call_count == 0
+
+        assert len(pool.connections) == 1
+        conn = pool.connections[0]
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+        conn.close.assert_called_once()
+
+    def test_error_rolls_back(self, pool):
+        """Test that a failing block discards its changes and still returns the connection."""
+        from app.database.connection.unit_of_work import unit_of_work, current_unit_of_work
+        from app.database.helpers.execute_change_query import execute_change_query
+
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                execute_change_query("DELETE FROM portfolio WHERE portfolioid = 1")
+                raise ValueError("failed")
+
+        conn = pool.connections[0]
+        conn.commit.assert_not_called()
+        conn.rollback.assert_called_once()
+        conn.close.assert_called_once()
+        assert current_unit_of_work() is None
+
+    def test_block_without_queries_borrows_nothing(self, pool):
+        """Test that the connection is only checked out on the first statement."""
+        from app.database.connection.unit_of_work import unit_of_work
+
+        with unit_of_work():
+            pass
+
+        assert pool.connections == []
+
+    def test_nested_blocks_join(self, pool):
+        """Test that a nested unit of work reuses the outer one and does not commit early."""
+        from app.database.connection.unit_of_work import unit_of_work
+        from app.database.helpers.fetch_one import fetch_one
+
+        with unit_of_work() as outer:
+            with unit_of_work() as inner:
+                fetch_one("SELECT 1")
+            assert inner is outer
+            pool.connections[0].commit.assert_not_called()
+            fetch_one("SELECT 2")
+
+        assert len(pool.connections) == 1
+
+    def test_without_unit_of_work(self, pool):
+        """Test that helpers outside a unit of work keep one committed connection per call."""
+        from app.database.helpers.fetch_one import fetch_one
+
+        fetch_one("SELECT 1")
+        fetch_one("SELECT 2")
+
+        assert len(pool.connections) == 2
+        for conn in pool.connections:
+            conn.commit.assert_called_once()
+            conn.close.assert_called_once()
+
+    def test_transaction_block_is_durable(self, pool):
+        """Test that db_transaction commits on the shared connection without returning it."""
+        from app.database.connection.unit_of_work import unit_of_work
+        from app.database.connection.cursor import db_transaction
+
+        with unit_of_work():
+            with db_transaction() as cursor:
+                cursor.execute("UPDATE portfolio_bond SET quantity = 1")
+            conn = pool.connections[0]
+            assert conn.commit.call_count == 2
+            conn.close.assert_not_called()
+
+            with pytest.raises(RuntimeError):
+                with db_transaction() as cursor:
+                    raise RuntimeError("failed")
+            conn.rollback.assert_called_once()
+
+        assert len(pool.connections) == 1
+        conn.close.assert_called_once()
+
+    def test_after_commit_waits_for_the_commit(self, pool):
+        """Test that after_commit callbacks run once the changes are committed and are dropped on rollback."""
+        from app.database.connection.unit_of_work import unit_of_work, after_commit
+        from app.database.connection.cursor import db_transaction
+        from app.database.helpers.execute_change_query import execute_change_query
+
+        calls = []
+        with unit_of_work():
+            execute_change_query("UPDATE status SET portfoliodata_version = 2")
+            after_commit(lambda: calls.append('unit'))
+            assert calls == []
+        assert calls == ['unit']
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work():
+                execute_change_query("UPDATE status SET portfoliodata_version = 3")
+                after_commit(lambda: calls.append('rolled back'))
+                raise RuntimeError("failed")
+        assert calls == ['unit']
+
+        with unit_of_work():
+            with db_transaction() as cursor:
+                cursor.execute("UPDATE status SET portfoliodata_version = 4")
+                after_commit(lambda: calls.append('block'))
+                assert calls == ['unit']
+            assert calls == ['unit', 'block']
+
+            with pytest.raises(RuntimeError):
+                with db_transaction():
+                    after_commit(lambda: calls.append('rolled back block'))
+                    raise RuntimeError("failed")
+        assert calls == ['unit', 'block']
+
+        after_commit(lambda: calls.append('autocommit'))
+        assert calls == ['unit', 'block', 'autocommit']
+
+
+class TestRequestUnitOfWork:
+    """Test the unit of work opened for every Flask request."""
+
+    @pytest.fixture
+    def app(self):
+        from flask import Flask, redirect, flash
+        from app.database.connection.unit_of_work import init_unit_of_work, mark_unit_of_work_failed
+        from app.database.helpers.fetch_one import fetch_one
+        from app.database.helpers.execute_change_query import execute_change_query
+
+        app = Flask(__name__)
+        app.secret_key = 'test'
+        init_unit_of_work(app)
+
+        @app.route('/read')
+        def read():
+            fetch_one("SELECT 1")
+            fetch_one("SELECT 2")
+            return 'ok'
+
+        @app.route('/write')
+        def write():
+            execute_change_query("UPDATE status SET securities = NULL WHERE id = 1")
+            return 'ok'
+
+        @app.route('/save')
+        def save():
+            execute_change_query("UPDATE status SET securities = NULL WHERE id = 1")
+            flash("Saved", "success")
+            return redirect('/read')
+
+        @app.route('/fail')
+        def fail():
+            execute_change_query("UPDATE status SET securities = NULL WHERE id = 1")
+            raise RuntimeError("failed")
+
+        @app.route('/error')
+        def error():
+            execute_change_query("UPDATE status SET securities = NULL WHERE id = 1")
+            return 'error', 500
+
+        @app.errorhandler(Exception)
+        def handle_exception(e):
+            mark_unit_of_work_failed()
+            return redirect('/read')
+
+        return app
+
+    def test_request_commits_once(self, app, pool):
+        """Test that a request borrows one connection and commits it when it ends."""
+        response = app.test_client().get('/write')
+
+        assert response.status_code == 200
+        assert len(pool.connections) == 1
+        pool.connections[0].commit.assert_called_once()
+        pool.connections[0].close.assert_called_once()
+
+    def test_reads_share_a_connection(self, app, pool):
+        """Test that several statements of a request use one checkout."""
+        app.test_client().get('/read')
+
+        assert len(pool.connections) == 1
+
+    @pytest.mark.parametrize('path', ['/fail', '/error'])
+    def test_failed_request_rolls_back(self, app, pool, path):
+        """Test that handled exceptions and 5xx responses discard the request's changes."""
+        app.test_client().get(path)
+
+        conn = pool.connections[0]
+        conn.commit.assert_not_called()
+        conn.rollback.assert_called_once()
+        conn.close.assert_called_once()
+
+    def test_failed_commit_is_an_error(self, app, pool):
+        """Test that a commit failing at the end of a request answers with an error instead of the view's redirect."""
+        from mysql.connector.errors import DatabaseError
+
+        pool.commit_error = DatabaseError("Deadlock found when trying to get lock")
+        client = app.test_client()
+        response = client.get('/save')
+
+        assert response.status_code == 500
+        conn = pool.connections[0]
+        conn.rollback.assert_called_once()
+        conn.close.assert_called_once()
+        with client.session_transaction() as session:
+            assert [category for category, _ in session['_flashes']] == ['danger']
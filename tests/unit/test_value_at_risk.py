@@ -0,0 +1,115 @@
+"""
+Value at risk tests for Portfolio Analyzer.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+
+
+def _normal_returns(n_days=5000, seed=11):
+    """Two correlated normal return series."""
+    rng = np.random.default_rng(seed)
+    cov = np.array([[0.0001, 0.00006], [0.00006, 0.0004]])
+    return rng.multivariate_normal([0.0002, 0.0001], cov, n_days)
+
+
+class TestValueAtRisk:
+    """Test the historical, parametric and Monte Carlo estimators."""
+
+    def test_tail_risk(self):
+        """Test VaR as the loss quantile and CVaR as the mean loss beyond it."""
+        from app.utils.value_at_risk import tail_risk
+
+        var, cvar = tail_risk(np.arange(-50.0, 50.0), 0.95)
+
+        assert var == pytest.approx(45.05)
+        assert cvar == pytest.approx(48.0)
+
+    def test_horizon_pnl(self):
+        """Test the overlapping multi-day sums."""
+        from app.utils.value_at_risk import horizon_pnl
+
+        np.testing.assert_array_equal(horizon_pnl([1.0, -2.0, 3.0, 4.0], 2), [-1.0, 1.0, 7.0])
+        assert horizon_pnl([1.0], 5).size == 0
+
+    def test_methods_agree_on_normal_returns(self):
+        """Test that all three methods converge for normally distributed returns."""
+        from app.utils.value_at_risk import historical_var, parametric_var, monte_carlo_var
+
+        returns = _normal_returns()
+        exposures = np.array([60000.0, 40000.0])
+
+        parametric = parametric_var(returns, exposures, 0.99)
+        historical = historical_var(returns, exposures, 0.99)
+        simulated = monte_carlo_var(returns, exposures, 0.99, paths=200000, chunk_paths=50000, seed=1)
+
+        assert parametric[1] > parametric[0] > 0
+        assert historical[0] == pytest.approx(parametric[0], rel=0.1)
+        assert simulated[0] == pytest.approx(parametric[0], rel=0.03)
+        assert simulated[1] == pytest.approx(parametric[1], rel=0.03)
+
+    def test_monte_carlo_is_reproducible_in_a_process_pool(self):
+        """Test that the chunks give the same result inline and in spawned processes."""
+        from app.utils.value_at_risk import monte_carlo_var
+
+        returns = _normal_returns(500)
+        exposures = np.array([1000.0, 2000.0])
+        inline = monte_carlo_var(returns, exposures, 0.95, horizon_days=10, paths=20000, chunk_paths=5000, seed=7)
+
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+            pooled = monte_carlo_var(returns, exposures, 0.95, horizon_days=10, paths=20000, chunk_paths=5000, seed=7, executor=executor)
+
+        assert pooled == pytest.approx(inline)
+
+    def test_singular_covariance(self):
+        """Test that a constant holding does not break the correlated factor."""
+        from app.utils.value_at_risk import monte_carlo_var
+
+        returns = np.column_stack([_normal_returns(300)[:, 0], np.zeros(300)])
+        var, cvar = monte_carlo_var(returns, np.array([100.0, 100.0]), 0.99, paths=1000, chunk_paths=1000, seed=3)
+
+        assert np.isfinite(var) and cvar >= var
+
+
+class TestPortfolioRisk:
+    """Test the portfolio level result and the job parameters."""
+
+    def test_compute_portfolio_risk(self):
+        """Test exposures from the latest prices, unpriced days and the optional simulation."""
+        from app.database.tables.portfolio.get_portfolio_risk import compute_portfolio_risk
+
+        levels = 100 * np.cumprod(1 + _normal_returns(300), axis=0)
+        levels[:100, 1] = np.nan
+        quantities = np.array([2.0, 3.0])
+
+        without = compute_portfolio_risk(levels, quantities, 0.99)
+        result = compute_portfolio_risk(levels, quantities, 0.99, paths=5000, chunk_paths=1000, seed=1)
+
+        assert result['value'] == pytest.approx(float(levels[-1] @ quantities), abs=0.01)
+        assert result['observations'] == 299
+        assert 'montecarlo' not in without
+        assert result['montecarlo']['paths'] == 5000
+        assert result['historical']['var_pct'] == pytest.approx(result['historical']['var'] / result['value'], rel=1e-3)
+
+    def test_risk_params(self):
+        """Test the defaults and the range checks of the job parameters."""
+        from app.utils.risk_jobs import risk_params
+
+        params = risk_params({'confidence': '0.95', 'paths': '0'})
+
+        assert params['confidence'] == 0.95
+        assert params['paths'] == 0
+        assert params['horizon_days'] >= 1
+        with pytest.raises(ValueError):
+            risk_params({'confidence': '1.5'})
+        with pytest.raises(ValueError):
+            risk_params({'paths': '-1'})
+
+    def test_params_key_ignores_order(self):
+        """Test that equal parameters share one cache entry."""
+        from app.database.tables.portfolio_risk.portfolio_risk import params_key
+
+        assert params_key({'a': 1, 'b': 2}) == params_key({'b': 2, 'a': 1})
+        assert params_key({'a': 1}) != params_key({'a': 2})
@@ -0,0 +1,100 @@
+"""
+Startup warm-up tests for Portfolio Analyzer.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+
+@pytest.fixture
+def warmup():
+    """Provide the warm-up module with a fresh state and mocked data functions."""
+    from flask import Flask
+    from app.utils import warmup as module
+
+    initial = module.get_warmup_status()
+    mocks = {
+        'exchangerates': MagicMock(),
+        'securityrates': MagicMock(),
+        'reference_data': MagicMock(),
+        'rate_matrix': MagicMock(),
+    }
+    with patch.object(module, '_wait_for_database', return_value=True), \
+         patch('app.database.tables.exchangerate.fetch_daily_exchangerates.fetch_daily_exchangerates', mocks['exchangerates']), \
+         patch('app.database.tables.bond.fetch_daily_securityrates.fetch_daily_securityrates', mocks['securityrates']), \
+         patch('app.database.cache.reference_data.get_reference_data', mocks['reference_data']), \
+         patch('app.database.cache.exchange_rates.get_latest_rate_matrix', mocks['rate_matrix']):
+        yield module, Flask(__name__), mocks
+
+    module._state.update(initial)
+
+
+class TestWarmup:
+    """Test the background warm-up steps and readiness."""
+
+    def test_leader_refreshes_data(self, warmup):
+        """Test that the leader fetches data and every step is done."""
+        module, app, mocks = warmup
+
+        with patch('app.utils.scheduler_leader.is_scheduler_leader', return_value=True):
+            module.run_warmup(app)
+
+        status = module.get_warmup_status()
+        assert status['status'] == 'ready'
+        assert set(status['steps'].values()) == {'done'}
+        mocks['exchangerates'].assert_called_once()
+        mocks['rate_matrix'].assert_called_once()
+
+    def test_follower_only_primes_caches(self, warmup):
+        """Test that other workers skip the data refresh."""
+        module, app, mocks = warmup
+
+        with patch('app.utils.scheduler_leader.is_scheduler_leader', return_value=False):
+            module.run_warmup(app)
+
+        steps = module.get_warmup_status()['steps']
+        assert steps['securityrates'] == 'skipped'
+        assert steps['reference_data'] == 'done'
+        mocks['securityrates'].assert_not_called()
+
+    def test_failed_step_does_not_stop_warmup(self, warmup):
+        """Test that a failing fetch is recorded and the caches are still primed."""
+        module, app, mocks = warmup
+        mocks['exchangerates'].side_effect = Exception("Yahoo unavailable")
+
+        with patch('app.utils.scheduler_leader.is_scheduler_leader', return_value=True):
+            module.run_warmup(app)
+
+        status = module.get_warmup_status()
+        assert status['status'] == 'ready'
+        assert status['steps']['exchangerates'] == 'failed'
+        mocks['reference_data'].assert_called_once()
+
+    def test_readiness(self, warmup):
+        """Test that readiness needs a finished warm-up and a reachable database."""
+        module, _, _ = warmup
+
+        module._set_status('running')
+        with patch('app.database.helpers.fetch_one.fetch_one', return_value=(1,)):
+            assert module.get_readiness()['ready'] is False
+            module._set_status('ready')
+            assert module.get_readiness()['ready'] is True
+        with patch('app.database.helpers.fetch_one.fetch_one', side_effect=Exception("down")):
+            assert module.get_readiness()['ready'] is False
+        with patch('app.database.helpers.fetch_one.fetch_one', return_value=(1,)):
+            module._set_status('failed')
+            assert module.get_readiness()['ready'] is False
+
+    def test_readiness_is_public(self, warmup):
+        """Test that /ready only reports the warm-up status and steps, the pool counters are for admins."""
+        module, _, _ = warmup
+
+        module._set_status('ready')
+        with patch('app.database.helpers.fetch_one.fetch_one', return_value=(1,)):
+            readiness = module.get_readiness()
+            system = module.get_system_status()
+
+        assert set(readiness) == {'ready', 'status', 'steps'}
+        assert set(readiness['steps']) == set(module.STEPS)
+        assert system['database'] is True
+        assert 'pool' in system